@@ -0,0 +1,114 @@
+"""
+BENCHMARK DE ARRANQUE
+=====================
+Mide con `python -X importtime` cuánto tarda en importarse cada punto de
+entrada y verifica que no cargue módulos pesados que no usa (plotly,
+Selenium, APScheduler...). Sale con código 1 si alguno los carga.
+
+Uso:
+    python benchmark_arranque.py [--repeticiones 5] [--top 10]
+"""
+
+import argparse
+import os
+import re
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+from typing import List, Tuple
+
+RAIZ = Path(__file__).parent
+
+# Punto de entrada -> módulos de primer nivel que NO debe importar
+PUNTOS_DE_ENTRADA = {
+    'menu_principal': ['plotly', 'selenium', 'webdriver_manager', 'streamlit', 'pandas'],
+    'src.background_service': ['plotly', 'selenium', 'webdriver_manager', 'streamlit', 'apscheduler', 'supabase'],
+    'src.scraper': ['selenium', 'webdriver_manager', 'apscheduler', 'bs4', 'httpx'],
+    'src.database.data_manager': ['supabase', 'pandas', 'plotly'],
+}
+
+# "import time:       self [us] |  cumulative | imported package"
+PATRON_LINEA = re.compile(r'import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)')
+
+def medir_importacion(modulo: str) -> Tuple[List[Tuple[str, int]], List[str], int]:
+    """
+    Importa el módulo en un intérprete limpio con -X importtime
+
+    Returns:
+        (importaciones directas del módulo [(nombre, acumulado µs)],
+         todos los módulos que cargó, total en µs del módulo pedido)
+    """
+    entorno = dict(os.environ, PYTHONPATH=str(RAIZ))
+    proceso = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', f'import {modulo}'],
+        cwd=RAIZ, env=entorno, capture_output=True, text=True
+    )
+    if proceso.returncode != 0:
+        ultima = proceso.stderr.strip().splitlines()[-1] if proceso.stderr.strip() else 'sin salida'
+        raise RuntimeError(f"No se pudo importar {modulo}: {ultima}")
+
+    # (nombre, acumulado, sangría) en el orden de salida: los hijos van antes que el padre
+    filas = [
+        (m.group(4), int(m.group(2)), len(m.group(3)))
+        for m in map(PATRON_LINEA.match, proceso.stderr.splitlines()) if m
+    ]
+    indice = next(i for i, fila in enumerate(filas) if fila[0] == modulo and fila[2] == 1)
+
+    cargados = []
+    directos = []
+    for nombre, acumulado, sangria in reversed(filas[:indice]):
+        if sangria <= 1:
+            break
+        cargados.append(nombre)
+        if sangria == 3:
+            directos.append((nombre, acumulado))
+    return directos, cargados, filas[indice][1]
+
+def prohibidos_cargados(cargados: List[str], prohibidos: List[str]) -> List[str]:
+    """Paquetes prohibidos que aparecen (por sí o por algún submódulo) en la importación"""
+    raices = {nombre.split('.')[0] for nombre in cargados}
+    return [paquete for paquete in prohibidos if paquete in raices]
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark de arranque con -X importtime")
+    parser.add_argument('--repeticiones', type=int, default=5, help="importaciones por punto de entrada")
+    parser.add_argument('--top', type=int, default=8, help="módulos más pesados a listar")
+    args = parser.parse_args()
+
+    print("⏱️ BENCHMARK DE ARRANQUE (-X importtime)")
+    print("=" * 60)
+
+    fallos = 0
+    for modulo, prohibidos in PUNTOS_DE_ENTRADA.items():
+        try:
+            # La primera corrida compila .pyc; se mide con caché caliente
+            medir_importacion(modulo)
+            corridas = [medir_importacion(modulo) for _ in range(args.repeticiones)]
+        except RuntimeError as e:
+            print(f"⚠️ {e}")
+            continue
+
+        directos, cargados, _ = corridas[-1]
+        mediana_ms = statistics.median(total for _, _, total in corridas) / 1000
+        print(f"\n📦 {modulo}: {mediana_ms:.1f} ms (mediana de {args.repeticiones}, {len(cargados)} módulos)")
+
+        for nombre, us in sorted(directos, key=lambda item: item[1], reverse=True)[:args.top]:
+            print(f"   {us / 1000:8.1f} ms  {nombre}")
+
+        sobrantes = prohibidos_cargados(cargados, prohibidos)
+        if sobrantes:
+            fallos += 1
+            print(f"   ❌ Carga módulos que no usa: {', '.join(sobrantes)}")
+        else:
+            print("   ✅ Sin módulos pesados innecesarios")
+
+    print()
+    print("=" * 60)
+    if fallos:
+        print(f"❌ {fallos} puntos de entrada cargan módulos de más")
+        sys.exit(1)
+    print("✅ Todos los puntos de entrada arrancan sin módulos de más")
+
+if __name__ == "__main__":
+    main()
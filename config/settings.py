@@ -12,6 +12,11 @@ from dotenv import load_dotenv
 dotenv_path = os.path.join(os.path.dirname(__file__), '.env')
 load_dotenv(dotenv_path)
 
+def _umbral_consenso_mlb() -> int:
+    """Umbral de alerta de MLB del snapshot de deportes (ya aplica MLB_CONSENSUS_THRESHOLD)"""
+    from src.utils.sports_config import get_sports_config
+    return int(get_sports_config().snapshot().deporte('MLB').umbral_alerta)
+
 class Settings(BaseSettings):
     """Configuración del sistema usando Pydantic"""
     
@@ -32,7 +37,8 @@ class Settings(BaseSettings):
     RETRY_DELAY: int = Field(default=60, env="RETRY_DELAY")
     
     # === ALERT THRESHOLDS ===
-    MLB_CONSENSUS_THRESHOLD: int = Field(default=70, env="MLB_CONSENSUS_THRESHOLD")
+    # Una sola fuente: config/sports_config.json, con MLB_CONSENSUS_THRESHOLD encima
+    MLB_CONSENSUS_THRESHOLD: int = Field(default_factory=_umbral_consenso_mlb, env="MLB_CONSENSUS_THRESHOLD")
     MIN_EXPERTS_VOTING: int = Field(default=23, env="MIN_EXPERTS_VOTING")
     
     # === LOGGING ===
@@ -73,42 +79,6 @@ DEFAULT_HEADERS = {
     'Upgrade-Insecure-Requests': '1',
 }
 
-# Configuración de deportes
-SPORTS_CONFIG = {
-    "mlb": {
-        "enabled": True,
-        "consensus_threshold": settings.MLB_CONSENSUS_THRESHOLD,
-        "min_experts": settings.MIN_EXPERTS_VOTING,
-        "scraping_url": COVERS_MLB_URL,
-        "season_active": True,
-        "timezone": "US/Eastern"
-    },
-    "nba": {
-        "enabled": False,  # Para implementación futura
-        "consensus_threshold": 75,
-        "min_experts": 4,
-        "scraping_url": f"{COVERS_BASE_URL}/sports/nba/picks",
-        "season_active": False,
-        "timezone": "US/Eastern"
-    },
-    "nfl": {
-        "enabled": False,  # Para implementación futura
-        "consensus_threshold": 70,
-        "min_experts": 4,
-        "scraping_url": f"{COVERS_BASE_URL}/sports/nfl/picks",
-        "season_active": False,
-        "timezone": "US/Eastern"
-    },
-    "nhl": {
-        "enabled": False,  # Para implementación futura
-        "consensus_threshold": 75,
-        "min_experts": 4,
-        "scraping_url": f"{COVERS_BASE_URL}/sports/nhl/picks",
-        "season_active": False,
-        "timezone": "US/Eastern"
-    }
-}
-
 # Configuración de base de datos
 DATABASE_TABLES = {
     "consensus_alerts": "fase4_consensus_alerts",
@@ -118,16 +88,22 @@ DATABASE_TABLES = {
     "consensus_data": "fase4_consensus_data"
 }
 
+# La configuración por deporte vive en config/sports_config.json y se compila
+# en src.utils.sports_config; estas funciones la consultan
+
 def get_sport_config(sport: str) -> Optional[dict]:
     """Obtener configuración específica de un deporte"""
-    return SPORTS_CONFIG.get(sport.lower())
+    from src.utils.sports_config import get_sports_config
+    deporte = get_sports_config().snapshot().deportes.get(sport.upper())
+    return dict(deporte.como_dict) if deporte else None
 
 def is_sport_enabled(sport: str) -> bool:
     """Verificar si un deporte está habilitado"""
-    config = get_sport_config(sport)
-    return config and config.get("enabled", False)
+    from src.utils.sports_config import get_sports_config
+    return get_sports_config().is_sport_enabled(sport)
 
 def get_consensus_threshold(sport: str) -> int:
-    """Obtener umbral de consenso para un deporte"""
-    config = get_sport_config(sport)
-    return config.get("consensus_threshold", 80) if config else 80
+    """Obtener umbral de alerta de un deporte (el entorno pisa al archivo, ver Settings)"""
+    from src.utils.sports_config import get_sports_config
+    deporte = get_sports_config().snapshot().deportes.get(sport.upper())
+    return deporte.umbral_alerta if deporte else 80
@@ -7,15 +7,37 @@ import asyncio
 import schedule
 import time
 import threading
+from concurrent.futures import Future
 from datetime import datetime, timedelta
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional
 import logging
+import re
+import json
+import hashlib
+import uuid
 from pathlib import Path
 
 from src.database.data_manager import data_manager, ScraperProgramado
-from src.scraper.mlb_selenium_scraper import MLBSeleniumScraper
+from src.scraper.timer_scheduler import TimerScheduler
+from src.scraper.coalescer import ScrapeCoalescer
+from src.scraper.scrape_pool import ScrapePool, scrape_mlb_selenium
+from src.scraper.job_queue import cola_trabajos, PRIORIDAD_PREPARTIDO, PRIORIDAD_REPORTE
 from src.notifications.telegram_bot import TelegramNotifier
-from src.utils.logger import setup_logger
+from src.notifications.outbox import OutboxSender
+from src.notifications.templates import (
+    PLANTILLA_CAMBIO_CONSENSO, FRAGMENTO_CAMBIO_PORCENTAJE, FRAGMENTO_CAMBIO_DIRECCION
+)
+from src.utils.logger import instalar_eventos, setup_logger
+from src.utils.metrics import metricas
+
+# Minutos antes del inicio del partido en que se ejecuta el scraper
+MINUTOS_ANTES_PARTIDO = 15
+
+# Navegadores Selenium concurrentes como máximo
+MAX_PROCESOS_SCRAPING = 2
+
+# Intervalo para detectar scrapers programados desde otros procesos
+MINUTOS_SINCRONIZACION = 10
 
 class ScrapingBackgroundService:
     """Servicio que maneja la ejecución automática de scrapers"""
@@ -23,7 +45,6 @@ class ScrapingBackgroundService:
     def __init__(self):
         self.logger = setup_logger(__name__)
         self.is_running = False
-        self.scraper = MLBSeleniumScraper()
         self.telegram_bot = None  # Se inicializa si está configurado
         self.stats = {
             'scrapers_ejecutados_hoy': 0,
@@ -32,6 +53,18 @@ class ScrapingBackgroundService:
             'servicio_iniciado_en': datetime.now().isoformat()
         }
         
+        # Un temporizador por partido, persistido en SQLite para recuperarse de caídas
+        self.temporizadores = TimerScheduler(self._ejecutar_temporizador, persistencia=data_manager)
+        
+        # Partidos con inicio cercano comparten una sola descarga de consensos
+        self.coalescer = ScrapeCoalescer()
+        
+        # Los scrapings corren en procesos aparte para no bloquear el scheduler
+        self.pool = ScrapePool(max_workers=MAX_PROCESOS_SCRAPING)
+        
+        # Las notificaciones pasan por el outbox en SQLite: entrega con reintentos y ack
+        self.outbox = OutboxSender('servicio', self._enviar_lote_notificaciones, data_manager)
+        
         # Configurar Telegram si está disponible
         self._init_telegram()
         
@@ -59,14 +92,27 @@ class ScrapingBackgroundService:
         self.is_running = True
         self.logger.info("🟢 Iniciando servicio de scrapers automáticos...")
         
-        # Programar verificaciones cada minuto
-        schedule.every(1).minutes.do(self._verificar_scrapers_pendientes)
+        # Eventos y errores a la tabla `eventos` (reporte diario)
+        instalar_eventos(data_manager)
+        
+        # Entregar también lo que quedó pendiente de una ejecución anterior
+        self.outbox.start()
+        
+        # Endpoint local /metrics (latencias, rechazos de filtros, profundidad de colas)
+        metricas.iniciar_servidor()
+        
+        # Armar un temporizador por partido (recupera también los persistidos)
+        self.temporizadores.start()
+        self.sincronizar_temporizadores()
+        
+        # Detectar scrapers nuevos programados fuera de este proceso
+        schedule.every(MINUTOS_SINCRONIZACION).minutes.do(self.sincronizar_temporizadores)
         
-        # Programar limpieza diaria a las 2:00 AM
-        schedule.every().day.at("02:00").do(self._limpieza_diaria)
+        # Programar limpieza diaria a las 2:00 AM (baja prioridad en la cola compartida)
+        schedule.every().day.at("02:00").do(self._encolar_tarea, 'limpieza_diaria', self._limpieza_diaria)
         
         # Programar reporte diario a las 9:00 AM
-        schedule.every().day.at("09:00").do(self._enviar_reporte_diario)
+        schedule.every().day.at("09:00").do(self._encolar_tarea, 'reporte_diario', self._enviar_reporte_diario)
         
         # Ejecutar en thread separado para no bloquear
         service_thread = threading.Thread(target=self._run_scheduler, daemon=True)
@@ -82,53 +128,79 @@ class ScrapingBackgroundService:
         """Detiene el servicio"""
         self.is_running = False
         schedule.clear()
+        self.temporizadores.stop()
+        self.pool.stop()
         self.logger.info("🔴 Servicio de scrapers automáticos detenido")
         
         self._enviar_notificacion("🛑 Servicio Detenido", 
                                  "El servicio de scrapers automáticos ha sido detenido.")
+        self.outbox.stop()
     
     def _run_scheduler(self):
         """Ejecuta el scheduler en un loop continuo"""
         while self.is_running:
             try:
                 schedule.run_pending()
-                time.sleep(30)  # Verificar cada 30 segundos
+                # Dormir hasta la próxima tarea diaria/sincronización
+                espera = schedule.idle_seconds()
+                time.sleep(min(max(espera or 0, 1), 60))
             except Exception as e:
                 self.logger.error(f"❌ Error en scheduler: {e}")
                 time.sleep(60)  # Esperar más tiempo si hay error
     
-    def _verificar_scrapers_pendientes(self):
-        """Verifica si hay scrapers que deben ejecutarse"""
+    def _encolar_tarea(self, nombre: str, funcion, prioridad: int = PRIORIDAD_REPORTE):
+        """Envía una tarea periódica a la cola compartida de trabajos"""
+        cola_trabajos.enviar(nombre, funcion, prioridad=prioridad)
+    
+    def sincronizar_temporizadores(self) -> int:
+        """Arma temporizadores para los scrapers programados que aún no tienen uno"""
+        armados = 0
+        
         try:
-            scrapers_programados = data_manager.obtener_scrapers_programados(solo_activos=True)
-            ahora = datetime.now()
+            for scraper in data_manager.obtener_scrapers_programados(solo_activos=True):
+                if self.temporizadores.esta_programado(scraper.id):
+                    continue
+                
+                momento_ejecucion = self._calcular_momento_ejecucion(scraper)
+                if momento_ejecucion and self.temporizadores.programar(
+                        scraper.id, momento_ejecucion, {'partido_id': scraper.partido_id}):
+                    armados += 1
             
-            for scraper in scrapers_programados:
-                if self._debe_ejecutar_scraper(scraper, ahora):
-                    self.logger.info(f"🎯 Ejecutando scraper: {scraper.partido_id}")
-                    self._ejecutar_scraper_automatico(scraper)
-                    
+            if armados:
+                self.logger.info(f"⏱️ Temporizadores armados: {armados}")
+                
         except Exception as e:
-            self.logger.error(f"❌ Error verificando scrapers: {e}")
+            self.logger.error(f"❌ Error sincronizando temporizadores: {e}")
+        
+        return armados
     
-    def _debe_ejecutar_scraper(self, scraper: ScraperProgramado, ahora: datetime) -> bool:
-        """Determina si un scraper debe ejecutarse ahora"""
+    def _ejecutar_temporizador(self, scraper_id: str, payload: Dict[str, Any]):
+        """Callback del TimerScheduler al vencer el temporizador de un partido"""
+        scraper = next(
+            (s for s in data_manager.obtener_scrapers_programados(solo_activos=True) if s.id == scraper_id),
+            None
+        )
+        
+        if scraper is None:
+            self.logger.info(f"⏭️ Scraper {scraper_id} ya no está programado")
+            return
+        
+        self.logger.info(f"🎯 Ejecutando scraper: {scraper.partido_id}")
+        self._ejecutar_scraper_automatico(scraper)
+    
+    def _calcular_momento_ejecucion(self, scraper: ScraperProgramado) -> Optional[datetime]:
+        """Calcula cuándo ejecutar el scraper (15 minutos antes del partido)"""
         try:
             # Parsear fecha y hora del partido
             fecha_str = scraper.fecha_partido  # "2025-01-21"
             hora_str = scraper.hora_partido    # "7:10 pm ET"
             
             if not fecha_str or not hora_str:
-                return False
-            
-            # Convertir hora del partido a datetime
-            # Simplificado: asumir que es para hoy y convertir PM/AM
-            from datetime import datetime
-            import re
+                return None
             
             hora_match = re.search(r'(\d{1,2}):(\d{2})\s*(am|pm)', hora_str, re.IGNORECASE)
             if not hora_match:
-                return False
+                return None
             
             hora = int(hora_match.group(1))
             minuto = int(hora_match.group(2))
@@ -147,29 +219,44 @@ class ScrapingBackgroundService:
                 # Si no se puede parsear la fecha, usar hoy
                 datetime_partido = datetime.now().replace(hour=hora, minute=minuto, second=0, microsecond=0)
             
-            # Calcular cuándo ejecutar (15 minutos antes)
-            momento_ejecucion = datetime_partido - timedelta(minutes=15)
-            
-            # Verificar si es el momento (con ventana de 2 minutos)
-            diferencia = abs((ahora - momento_ejecucion).total_seconds())
-            
-            return diferencia <= 120  # Dentro de 2 minutos
+            return datetime_partido - timedelta(minutes=MINUTOS_ANTES_PARTIDO)
             
         except Exception as e:
             self.logger.error(f"❌ Error evaluando tiempo de scraper {scraper.id}: {e}")
-            return False
+            return None
     
     def _ejecutar_scraper_automatico(self, scraper: ScraperProgramado):
-        """Ejecuta un scraper automático específico"""
+        """Envía el scraping al pool de procesos sin bloquear el thread del scheduler"""
         try:
             self.logger.info(f"🤖 Ejecutando scraper automático: {scraper.visitante} @ {scraper.local}")
             
             # Marcar como en proceso
             data_manager.actualizar_estado_scraper(scraper.id, "ejecutando")
             
-            # Ejecutar scraper
+            # Ejecutar scraper en un proceso aparte (compartido con los partidos de la misma ventana)
             inicio = time.time()
-            resultados = self.scraper.scrape_mlb_consensus()
+            # Plazo: inicio del partido. Los pre-partido tienen prioridad sobre reportes y backfills
+            deadline = datetime.now() + timedelta(minutes=MINUTOS_ANTES_PARTIDO)
+            futuro = self.coalescer.obtener_futuro(
+                'mlb', lambda: cola_trabajos.enviar(
+                    f"pregame_{scraper.id}",
+                    # Devuelve el Future del pool: la cola no bloquea un worker esperándolo
+                    lambda: self.pool.enviar(scrape_mlb_selenium, job_id=f"mlb_{scraper.id}"),
+                    deadline=deadline,
+                    prioridad=PRIORIDAD_PREPARTIDO
+                )
+            )
+            futuro.add_done_callback(lambda f: self._procesar_resultado_scraper(scraper, f, inicio))
+            
+        except Exception as e:
+            self.logger.error(f"❌ Error ejecutando scraper {scraper.id}: {e}")
+            data_manager.actualizar_estado_scraper(scraper.id, "error", {"error": str(e)})
+            self.stats['errores_hoy'] += 1
+    
+    def _procesar_resultado_scraper(self, scraper: ScraperProgramado, futuro: Future, inicio: float):
+        """Procesa el resultado del pool para un partido específico"""
+        try:
+            resultados = futuro.result()
             duracion = time.time() - inicio
             
             if resultados:
@@ -195,6 +282,11 @@ class ScrapingBackgroundService:
                     
                     data_manager.actualizar_estado_scraper(scraper.id, "ejecutado", resultado_completo)
                     
+                    # Publicar al canal de cambios (solo llegan a la app los partidos que cambiaron)
+                    publicados = data_manager.publicar_cambios_partidos(resultados, scraper.fecha_partido, 'servicio')
+                    if publicados:
+                        self.logger.info(f"📡 {publicados} partidos cambiados publicados")
+
                     # Enviar alerta si hay cambios significativos
                     if cambios:
                         self._enviar_alerta_cambios(scraper, partido_encontrado, cambios)
@@ -271,34 +363,72 @@ class ScrapingBackgroundService:
     
     def _enviar_alerta_cambios(self, scraper: ScraperProgramado, datos: Dict, cambios: List[Dict]):
         """Envía alerta por cambios significativos"""
-        mensaje = f"🚨 **CAMBIO DETECTADO** 🚨\n\n"
-        mensaje += f"🏟️ **Partido:** {scraper.visitante} @ {scraper.local}\n"
-        mensaje += f"⏰ **Hora:** {scraper.hora_partido}\n\n"
-        
+        lineas = []
         for cambio in cambios:
             if cambio['tipo'] == 'cambio_porcentaje':
-                mensaje += f"📊 **Consenso:** {cambio['anterior']} → {cambio['actual']} ({cambio['diferencia']})\n"
+                lineas.append({'linea': FRAGMENTO_CAMBIO_PORCENTAJE(cambio)})
             elif cambio['tipo'] == 'cambio_direccion':
-                mensaje += f"🔄 **Dirección:** {cambio['anterior']} → {cambio['actual']}\n"
+                lineas.append({'linea': FRAGMENTO_CAMBIO_DIRECCION(cambio)})
+        
+        mensaje = PLANTILLA_CAMBIO_CONSENSO.render(
+            {
+                'visitante': scraper.visitante,
+                'local': scraper.local,
+                'hora_partido': scraper.hora_partido,
+                'over': datos.get('over_percentage', 'N/A'),
+                'under': datos.get('under_percentage', 'N/A'),
+                'expertos': datos.get('num_experts', 'N/A')
+            },
+            lineas
+        )
         
-        mensaje += f"\n💡 **Estado Actual:**\n"
-        mensaje += f"  OVER: {datos.get('over_percentage', 'N/A')}\n"
-        mensaje += f"  UNDER: {datos.get('under_percentage', 'N/A')}\n"
-        mensaje += f"  Expertos: {datos.get('num_experts', 'N/A')}\n"
+        # Mismo partido y mismos cambios = misma alerta (no se duplica si se reintenta)
+        huella = hashlib.md5(json.dumps(cambios, sort_keys=True, default=str).encode()).hexdigest()[:12]
+        self._enviar_notificacion("🚨 Cambio de Consenso Detectado", mensaje,
+                                  clave=f"cambio:{scraper.id}:{huella}", partido_id=scraper.partido_id)
+    
+    def _enviar_notificacion(self, titulo: str, mensaje: str, clave: Optional[str] = None,
+                             partido_id: Optional[str] = None):
+        """
+        Encola una notificación en el outbox; el worker la entrega por Telegram
         
-        self._enviar_notificacion("🚨 Cambio de Consenso Detectado", mensaje)
+        Args:
+            clave: clave de deduplicación (None = notificación única)
+            partido_id: partido asociado, para el registro de alertas_enviadas
+        """
+        try:
+            encoladas = self.outbox.encolar([{
+                'dedup_key': clave or f"notificacion:{uuid.uuid4().hex}",
+                'tipo_alerta': 'notificacion',
+                'titulo': titulo,
+                'mensaje': mensaje,
+                'payload': {'partido_id': partido_id}
+            }])
+            if not encoladas:
+                self.logger.info(f"⏭️ Notificación ya encolada: {titulo}")
+        except Exception as e:
+            self.logger.error(f"❌ Error encolando notificación: {e}")
     
-    def _enviar_notificacion(self, titulo: str, mensaje: str):
-        """Envía notificación por Telegram (si está configurado)"""
+    def _enviar_lote_notificaciones(self, filas: List[Dict]):
+        """Entrega un lote del outbox (Telegram si está configurado, si no log)"""
         if self.telegram_bot and self.telegram_bot.chat_ids:
-            try:
-                # Para el desarrollo, solo hacer log
-                self.logger.info(f"📱 [TELEGRAM] {titulo}: {mensaje}")
-                # Aquí iría: await self.telegram_bot.send_alert_message(f"{titulo}\n\n{mensaje}")
-            except Exception as e:
-                self.logger.error(f"❌ Error enviando notificación Telegram: {e}")
-        else:
-            self.logger.info(f"📱 [LOG] {titulo}: {mensaje}")
+            return self._enviar_lote_telegram(filas)
+        
+        for fila in filas:
+            self.logger.info(f"📱 [LOG] {fila['titulo']}: {fila['mensaje']}")
+        return True
+    
+    async def _enviar_lote_telegram(self, filas: List[Dict]) -> List[int]:
+        """Envía el lote en paralelo (el dispatcher respeta los límites) y devuelve los ids entregados"""
+        resultados = await asyncio.gather(*(
+            self.telegram_bot.send_message(f"{fila['titulo']}\n\n{fila['mensaje']}")
+            for fila in filas
+        ), return_exceptions=True)
+        
+        return [
+            fila['id'] for fila, resultado in zip(filas, resultados)
+            if isinstance(resultado, dict) and resultado and all(resultado.values())
+        ]
     
     def _limpieza_diaria(self):
         """Limpieza diaria de datos antiguos"""
@@ -343,11 +473,18 @@ class ScrapingBackgroundService:
     
     def get_status(self) -> Dict[str, Any]:
         """Obtiene el estado actual del servicio"""
+        proximo = self.temporizadores.proximo_vencimiento()
         return {
             'servicio_activo': self.is_running,
             'telegram_configurado': self.telegram_bot is not None,
             'estadisticas': self.stats,
-            'scrapers_pendientes': len(data_manager.obtener_scrapers_programados(solo_activos=True))
+            'scrapers_pendientes': len(data_manager.obtener_scrapers_programados(solo_activos=True)),
+            'temporizadores_armados': len(self.temporizadores.pendientes()),
+            'scraping_compartido': self.coalescer.get_stats(),
+            'pool_scraping': self.pool.get_stats(),
+            'cola_trabajos': cola_trabajos.get_stats(),
+            'outbox': self.outbox.get_stats(),
+            'proximo_temporizador': proximo.isoformat() if proximo else None
         }
 
 # Instancia global del servicio
@@ -17,6 +17,12 @@ sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from src.scraper.mlb_scraper_puro import MLBScraperPuro
 from src.sistema_filtros_post_extraccion import FiltroConsensus
+from src.notifications.digest import TODOS_LOS_CHATS, VENTANA_DIGEST_SEGUNDOS, fusionar_por_partido
+from src.notifications.outbox import OutboxSender
+from src.notifications.templates import FRAGMENTO_DIGEST_ACTUALIZACIONES, PLANTILLA_DIGEST
+from src.database.data_manager import data_manager
+from src.utils.metrics import CICLO_SEGUNDOS
+from src.utils.tracing import span_actual, traza, trazado
 import json
 import time
 from datetime import datetime, timedelta
@@ -62,6 +68,11 @@ class HistorialAlertas:
         data = f"{consenso.get('equipo_visitante', '')}_{consenso.get('equipo_local', '')}_{consenso.get('direccion_consenso', '')}_{consenso.get('porcentaje_consenso', 0)}"
         return hashlib.md5(data.encode()).hexdigest()[:12]
     
+    def clave_outbox(self, consenso: Dict) -> str:
+        """Clave de deduplicación del outbox: un consenso por día"""
+        fecha_hoy = datetime.now(self.timezone).strftime('%Y-%m-%d')
+        return f"{fecha_hoy}:{self.generar_id_consenso(consenso)}"
+    
     def es_consenso_nuevo(self, consenso: Dict) -> bool:
         """Verificar si es nuevo (no enviado antes)"""
         consenso_id = self.generar_id_consenso(consenso)
@@ -109,7 +120,7 @@ class HistorialAlertas:
 class CoordinadorScraping:
     """Coordinador principal del sistema"""
     
-    def __init__(self):
+    def __init__(self, notificador=None):
         self.timezone = pytz.timezone('America/Argentina/Buenos_Aires')
         
         # Inicializar componentes
@@ -117,12 +128,22 @@ class CoordinadorScraping:
         self.filtro = FiltroConsensus()
         self.historial = HistorialAlertas()
         
+        # Outbox: la alerta se encola junto con su marca de deduplicación y un
+        # worker la entrega (un mensaje consolidado por ventana) con reintentos
+        self.notificador = notificador
+        self.outbox = OutboxSender('coordinador', self._enviar_lote_outbox, data_manager,
+                                   intervalo_segundos=VENTANA_DIGEST_SEGUNDOS)
+        
         logger.info("🚀 Coordinador de scraping inicializado")
     
+    @trazado('ciclo_scraping', pipeline='coordinador')
     def ejecutar_scraping_completo(self, fecha: Optional[str] = None) -> Dict:
         """
         FLUJO COMPLETO: Scraper → Filtros → Alertas
         
+        Cada paso es un span de la traza del ciclo (ver src/utils/tracing.py)
+        y su duración queda en 'tiempos_etapas' del resultado.
+        
         Returns:
             Dict con resultados y estadísticas
         """
@@ -138,7 +159,9 @@ class CoordinadorScraping:
         try:
             # PASO 1: SCRAPING PURO (sin filtros)
             logger.info("📡 PASO 1: Extrayendo TODOS los datos...")
-            datos_puros = self.scraper.obtener_consensos_del_dia(fecha)
+            with traza('scraping', fecha=fecha) as span:
+                datos_puros = self.scraper.obtener_consensos_del_dia(fecha)
+                span.atributos['consensos'] = len(datos_puros or [])
             
             if not datos_puros:
                 return {
@@ -146,35 +169,43 @@ class CoordinadorScraping:
                     'error': 'No se obtuvieron datos del scraper',
                     'datos_extraidos': 0,
                     'alertas_nuevas': 0,
-                    'tiempo_total': time.time() - inicio
+                    'tiempo_total': time.time() - inicio,
+                    'tiempos_etapas': span_actual().etapas()
                 }
             
             logger.info(f"✅ Datos extraídos: {len(datos_puros)} consensos totales")
             
             # PASO 2: APLICAR FILTROS
             logger.info("🔍 PASO 2: Aplicando filtros...")
-            consensos_filtrados, stats_filtros = self.filtro.aplicar_filtros(datos_puros, "alerta")
+            with traza('filtro', tipo_filtro='alerta') as span:
+                consensos_filtrados, stats_filtros = self.filtro.aplicar_filtros(datos_puros, "alerta")
+                span.atributos['aprobados'] = len(consensos_filtrados)
             
             logger.info(f"✅ Filtros aplicados: {len(consensos_filtrados)} consensos válidos")
             
             # PASO 3: VERIFICAR DUPLICADOS
             logger.info("🔄 PASO 3: Verificando duplicados...")
-            consensos_nuevos = []
-            
-            for consenso in consensos_filtrados:
-                if self.historial.es_consenso_nuevo(consenso):
-                    consensos_nuevos.append(consenso)
-                else:
-                    logger.debug(f"⏭️ Ya enviado: {consenso.get('equipo_visitante', '?')} @ {consenso.get('equipo_local', '?')}")
+            with traza('dedup') as span:
+                consensos_nuevos = []
+                
+                for consenso in consensos_filtrados:
+                    if self.historial.es_consenso_nuevo(consenso):
+                        consensos_nuevos.append(consenso)
+                    else:
+                        logger.debug(f"⏭️ Ya enviado: {consenso.get('equipo_visitante', '?')} @ {consenso.get('equipo_local', '?')}")
+                span.atributos['nuevos'] = len(consensos_nuevos)
             
             logger.info(f"✅ Consensos nuevos: {len(consensos_nuevos)}")
             
             # PASO 4: PROCESAR ALERTAS
             logger.info("📢 PASO 4: Procesando alertas...")
-            alertas_enviadas = self.procesar_alertas(consensos_nuevos)
+            with traza('alertas') as span:
+                alertas_enviadas = self.procesar_alertas(consensos_nuevos)
+                span.atributos['encoladas'] = len(alertas_enviadas)
             
             # PASO 5: ESTADÍSTICAS
             tiempo_total = time.time() - inicio
+            CICLO_SEGUNDOS.observe(tiempo_total, pipeline='coordinador')
             
             resultado = {
                 'exito': True,
@@ -196,7 +227,8 @@ class CoordinadorScraping:
                 
                 # Performance
                 'tiempo_total': round(tiempo_total, 2),
-                'consensos_por_segundo': round(len(datos_puros) / tiempo_total, 2) if tiempo_total > 0 else 0
+                'consensos_por_segundo': round(len(datos_puros) / tiempo_total, 2) if tiempo_total > 0 else 0,
+                'tiempos_etapas': span_actual().etapas()
             }
             
             logger.info("📊 RESULTADO COMPLETO:")
@@ -204,6 +236,7 @@ class CoordinadorScraping:
             logger.info(f"   🔍 Consensos filtrados: {resultado['consensos_filtrados']}")
             logger.info(f"   📢 Alertas nuevas: {resultado['alertas_nuevas']}")
             logger.info(f"   ⏱️  Tiempo total: {resultado['tiempo_total']} segundos")
+            logger.info(f"   ⏱️  Por etapa: {resultado['tiempos_etapas']}")
             
             return resultado
             
@@ -211,13 +244,15 @@ class CoordinadorScraping:
             logger.error(f"💥 Error en scraping completo: {e}")
             import traceback
             traceback.print_exc()
+            CICLO_SEGUNDOS.observe(time.time() - inicio, pipeline='coordinador')
             
             return {
                 'exito': False,
                 'error': str(e),
                 'datos_extraidos': 0,
                 'alertas_nuevas': 0,
-                'tiempo_total': time.time() - inicio
+                'tiempo_total': time.time() - inicio,
+                'tiempos_etapas': span_actual().etapas()
             }
     
     def ejecutar_con_reintentos(self, max_intentos: int = 3, delay_minutos: int = 2) -> Dict:
@@ -257,26 +292,49 @@ class CoordinadorScraping:
         }
     
     def procesar_alertas(self, consensos: List[Dict]) -> List[Dict]:
-        """Procesar consensos como alertas"""
-        alertas_procesadas = []
+        """Procesar consensos como alertas (encolándolas en el outbox)"""
+        alertas = []
         
         for consenso in consensos:
+            # Enriquecer con datos de alerta
+            alerta = consenso.copy()
+            alerta['tipo'] = 'nueva_alerta'
+            alerta['timestamp_alerta'] = datetime.now(self.timezone).isoformat()
+            alerta['urgencia'] = self._calcular_urgencia(consenso)
+            alertas.append(alerta)
+        
+        if not alertas:
+            return []
+        
+        # Encolar + marcar en una sola transacción: las ya encoladas se ignoran
+        try:
+            encoladas = set(self.outbox.encolar([
+                {
+                    'dedup_key': self.historial.clave_outbox(alerta),
+                    'tipo_alerta': alerta['tipo'],
+                    'payload': alerta
+                }
+                for alerta in alertas
+            ], despertar=False))
+        except Exception as e:
+            logger.error(f"Error encolando alertas en el outbox: {e}")
+            return []
+        
+        alertas_procesadas = []
+        
+        for alerta in alertas:
+            if self.historial.clave_outbox(alerta) not in encoladas:
+                continue
+            
             try:
-                # Marcar como enviado
-                self.historial.marcar_consenso_enviado(consenso)
-                
-                # Enriquecer con datos de alerta
-                alerta = consenso.copy()
-                alerta['tipo'] = 'nueva_alerta'
-                alerta['timestamp_alerta'] = datetime.now(self.timezone).isoformat()
-                alerta['urgencia'] = self._calcular_urgencia(consenso)
-                
+                # El historial JSON queda como registro para estadísticas
+                self.historial.marcar_consenso_enviado(alerta)
                 alertas_procesadas.append(alerta)
                 
                 # Log de alerta
-                partido = f"{consenso.get('equipo_visitante', '?')} @ {consenso.get('equipo_local', '?')}"
-                consenso_info = f"{consenso.get('direccion_consenso', '?')} {consenso.get('porcentaje_consenso', 0)}%"
-                expertos = consenso.get('num_experts', 0)
+                partido = f"{alerta.get('equipo_visitante', '?')} @ {alerta.get('equipo_local', '?')}"
+                consenso_info = f"{alerta.get('direccion_consenso', '?')} {alerta.get('porcentaje_consenso', 0)}%"
+                expertos = alerta.get('num_experts', 0)
                 
                 logger.info(f"📢 ALERTA: {partido} - {consenso_info} ({expertos} expertos)")
                 
@@ -285,6 +343,42 @@ class CoordinadorScraping:
         
         return alertas_procesadas
     
+    def _enviar_lote_outbox(self, filas: List[Dict]):
+        """Entrega un lote del outbox como un único digest (actualizaciones fusionadas por partido)"""
+        alertas = fusionar_por_partido([fila['payload'] for fila in filas])
+        envio = self._enviar_digest(TODOS_LOS_CHATS, alertas)
+        
+        # Sin notificador el log del digest es la entrega
+        if envio is None:
+            return True
+        return self._confirmar_envio(envio)
+    
+    async def _confirmar_envio(self, envio) -> bool:
+        """True solo si todos los chats recibieron el mensaje"""
+        resultados = await envio
+        return bool(resultados) and all(resultados.values())
+    
+    def _enviar_digest(self, chat_id: str, alertas: List[Dict]):
+        """Arma el mensaje consolidado de la ventana y lo envía (si hay notificador)"""
+        texto = PLANTILLA_DIGEST.render({'cantidad': len(alertas)}, (
+            {
+                'visitante': alerta.get('equipo_visitante', '?'),
+                'local': alerta.get('equipo_local', '?'),
+                'direccion': alerta.get('direccion_consenso', '?'),
+                'porcentaje': alerta.get('porcentaje_consenso', 0),
+                'urgencia': alerta.get('urgencia', 'BAJA'),
+                'actualizaciones': FRAGMENTO_DIGEST_ACTUALIZACIONES(
+                    alerta.get('porcentaje_inicial'), alerta['actualizaciones']
+                ) if alerta.get('actualizaciones', 1) > 1 else ''
+            }
+            for alerta in sorted(alertas, key=lambda a: a.get('porcentaje_consenso', 0), reverse=True)
+        ))
+        logger.info(texto)
+        
+        if self.notificador is not None:
+            chat_ids = None if chat_id == TODOS_LOS_CHATS else [chat_id]
+            return self.notificador.send_message(texto, chat_ids=chat_ids)
+    
     def _calcular_urgencia(self, consenso: Dict) -> str:
         """Calcular urgencia de la alerta"""
         porcentaje = consenso.get('porcentaje_consenso', 0)
@@ -341,7 +435,8 @@ class CoordinadorScraping:
             'historial': {
                 'archivo': self.historial.archivo,
                 'alertas_hoy': len(self.historial.historial.get(datetime.now(self.timezone).strftime('%Y-%m-%d'), {}))
-            }
+            },
+            'outbox': self.outbox.get_stats()
         }
 
 def test_coordinador():
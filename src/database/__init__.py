@@ -2,7 +2,15 @@
 Módulo de base de datos
 """
 
-from .supabase_client import SupabaseClient
-from .models import ConsensusModel, AlertModel, LogModel
+from src.utils.lazy_import import atributos_perezosos
+
+# El cliente de Supabase (y su SDK) solo se importa si alguien lo usa;
+# data_manager y analytics no lo necesitan
+__getattr__, __dir__ = atributos_perezosos(__name__, {
+    'SupabaseClient': '.supabase_client',
+    'ConsensusModel': '.models',
+    'AlertModel': '.models',
+    'LogModel': '.models',
+})
 
 __all__ = ['SupabaseClient', 'ConsensusModel', 'AlertModel', 'LogModel']
@@ -0,0 +1,114 @@
+"""
+Analítica histórica sobre los rollups de DataManager
+Consensos por día, volumen de alertas, distribución por rango de consenso
+y percentiles de duración del scraping. Solo lee las tablas rollup_*,
+que se mantienen al guardar cada sesión: el costo no crece con el
+histórico de sesiones crudas.
+"""
+
+from datetime import date, datetime, timedelta
+from typing import Any, Dict, Iterable, List, Optional, Union
+
+from .data_manager import RANGOS_CONSENSO
+
+Fecha = Union[str, date]
+
+def _texto_fecha(fecha: Fecha) -> str:
+    return fecha if isinstance(fecha, str) else fecha.strftime('%Y-%m-%d')
+
+def _dias(desde: str, hasta: str) -> List[str]:
+    inicio = datetime.strptime(desde, '%Y-%m-%d').date()
+    fin = datetime.strptime(hasta, '%Y-%m-%d').date()
+    return [(inicio + timedelta(days=i)).strftime('%Y-%m-%d') for i in range((fin - inicio).days + 1)]
+
+def percentil_histograma(buckets: Dict[float, int], percentil: float) -> Optional[float]:
+    """
+    Percentil estimado de un histograma {límite superior: conteo}
+
+    Interpola linealmente dentro del bucket (como histogram_quantile de
+    Prometheus); si cae en el bucket +Inf devuelve el último límite finito.
+    """
+    total = sum(buckets.values())
+    if not total:
+        return None
+
+    objetivo = percentil * total
+    acumulado = 0
+    limite_anterior = 0.0
+    for limite in sorted(buckets):
+        conteo = buckets[limite]
+        if conteo and acumulado + conteo >= objetivo:
+            if limite == float('inf'):
+                return limite_anterior
+            return round(limite_anterior + (limite - limite_anterior) * (objetivo - acumulado) / conteo, 3)
+        acumulado += conteo
+        if limite != float('inf'):
+            limite_anterior = limite
+    return limite_anterior
+
+class AnalyticsService:
+    """Consultas de estadísticas para la app, servidas desde los rollups"""
+
+    def __init__(self, persistencia=None):
+        if persistencia is None:
+            from .data_manager import data_manager
+            persistencia = data_manager
+        self.persistencia = persistencia
+
+    def consensos_por_dia(self, desde: Fecha, hasta: Fecha, deporte: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Partidos, consensos fuertes (≥70%) y sesiones por día; los días sin datos van en 0"""
+        desde, hasta = _texto_fecha(desde), _texto_fecha(hasta)
+        por_dia = {dia: {'fecha': dia, 'partidos': 0, 'consensos_fuertes': 0, 'sesiones': 0}
+                   for dia in _dias(desde, hasta)}
+
+        for fila in self.persistencia.leer_rollup('consensos', desde, hasta, deporte):
+            dia = por_dia.get(fila['fecha'])
+            if dia is not None:
+                dia['partidos'] += fila['partidos']
+                dia['consensos_fuertes'] += fila['consensos_fuertes']
+                dia['sesiones'] += fila['sesiones']
+
+        return list(por_dia.values())
+
+    def volumen_alertas(self, desde: Fecha, hasta: Fecha) -> List[Dict[str, Any]]:
+        """Alertas confirmadas por día y canal"""
+        desde, hasta = _texto_fecha(desde), _texto_fecha(hasta)
+        por_clave: Dict[tuple, int] = {}
+        for fila in self.persistencia.leer_rollup('alertas', desde, hasta):
+            clave = (fila['fecha'], fila['canal'])
+            por_clave[clave] = por_clave.get(clave, 0) + fila['enviadas']
+
+        return [{'fecha': fecha, 'canal': canal, 'enviadas': enviadas}
+                for (fecha, canal), enviadas in sorted(por_clave.items())]
+
+    def distribucion_rangos(self, desde: Fecha, hasta: Fecha, deporte: Optional[str] = None) -> Dict[str, int]:
+        """Partidos por rango_consenso ('<70', '70-75', ..., '90+'), en orden"""
+        distribucion = {'<70': 0, **{nombre: 0 for nombre, _ in RANGOS_CONSENSO}}
+        for fila in self.persistencia.leer_rollup('rangos', _texto_fecha(desde), _texto_fecha(hasta), deporte):
+            distribucion[fila['rango_consenso']] = distribucion.get(fila['rango_consenso'], 0) + fila['partidos']
+        return distribucion
+
+    def percentiles_latencia(self, desde: Fecha, hasta: Fecha,
+                             percentiles: Iterable[float] = (0.5, 0.9, 0.99)) -> Dict[str, Any]:
+        """Percentiles (segundos) de la duración de las sesiones de scraping"""
+        buckets: Dict[float, int] = {}
+        for fila in self.persistencia.leer_rollup('latencia', _texto_fecha(desde), _texto_fecha(hasta)):
+            buckets[fila['limite_segundos']] = buckets.get(fila['limite_segundos'], 0) + fila['sesiones']
+
+        resultado = {f"p{int(p * 100)}": percentil_histograma(buckets, p) for p in percentiles}
+        resultado['sesiones'] = sum(buckets.values())
+        return resultado
+
+    def resumen_periodo(self, desde: Fecha, hasta: Fecha, deporte: Optional[str] = None) -> Dict[str, Any]:
+        """Totales del período para las métricas de la página de estadísticas"""
+        dias = self.consensos_por_dia(desde, hasta, deporte)
+        return {
+            'partidos': sum(d['partidos'] for d in dias),
+            'consensos_fuertes': sum(d['consensos_fuertes'] for d in dias),
+            'sesiones': sum(d['sesiones'] for d in dias),
+            'alertas': sum(a['enviadas'] for a in self.volumen_alertas(desde, hasta)),
+            'latencia': self.percentiles_latencia(desde, hasta, (0.5, 0.95))
+        }
+
+# Servicio global de analítica
+analytics = AnalyticsService()
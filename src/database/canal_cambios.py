@@ -0,0 +1,93 @@
+"""
+Canal de cambios de partidos sobre SQLite
+Los escritores (sesiones guardadas, servicio de fondo) publican en la tabla
+cambios_partidos solo los partidos nuevos o modificados; cada suscriptor
+recuerda el último seq leído y pide únicamente lo posterior, que es una
+lectura por clave primaria sin importar el tamaño del histórico.
+"""
+
+from typing import Any, Dict, List, Optional, Tuple
+
+from ..utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+def fila_tabla(dato: Dict[str, Any], fecha_defecto: str = '') -> Dict[str, Any]:
+    """
+    Partido publicado (formato del scraper o de la tabla) -> fila de la tabla de la app
+
+    Mismas columnas y formato que procesar_consensos_para_tabla: porcentajes
+    como '72.0%' y 'N/A' para total o expertos que falten.
+    """
+    from .data_manager import _numero, _primero
+
+    over = _numero(_primero(dato, 'over_percentage', 'porcentaje_over', 'consenso_over')) or 0.0
+    under = _numero(_primero(dato, 'under_percentage', 'porcentaje_under', 'consenso_under')) or 0.0
+    total = _numero(_primero(dato, 'total', 'total_line')) or 0.0
+    expertos = int(_numero(_primero(dato, 'expertos', 'num_experts')) or 0)
+
+    return {
+        'fecha': str(_primero(dato, 'fecha', 'fecha_juego') or fecha_defecto),
+        'hora': _primero(dato, 'hora', 'hora_juego', 'hora_partido') or 'TBD',
+        'visitante': _primero(dato, 'visitante', 'equipo_visitante') or 'N/A',
+        'local': _primero(dato, 'local', 'equipo_local') or 'N/A',
+        'over_percentage': f"{round(over, 1)}%",
+        'under_percentage': f"{round(under, 1)}%",
+        'total': str(round(total, 1)) if total > 0 else 'N/A',
+        'expertos': str(expertos) if expertos > 0 else 'N/A'
+    }
+
+def aplicar_cambios(filas: List[Dict[str, Any]], cambios: List[Dict[str, Any]]) -> Tuple[List[Dict[str, Any]], List[str]]:
+    """
+    Mezcla los partidos cambiados en una lista de filas ya cargada
+
+    Reemplaza por clave_partido las filas existentes y agrega los partidos
+    nuevos al final, ya en el formato de la tabla (fila_tabla); el resto de
+    filas queda intacto.
+
+    Returns:
+        (filas actualizadas, claves de los partidos que cambiaron)
+    """
+    from .data_manager import clave_partido
+
+    resultado = list(filas)
+    posiciones = {clave_partido(fila): i for i, fila in enumerate(resultado) if isinstance(fila, dict)}
+    claves = []
+
+    for cambio in cambios:
+        clave = cambio['partido_id']
+        fila = fila_tabla(cambio['datos'], cambio['fecha'])
+        if clave in posiciones:
+            resultado[posiciones[clave]] = fila
+        else:
+            posiciones[clave] = len(resultado)
+            resultado.append(fila)
+        if clave not in claves:
+            claves.append(clave)
+
+    return resultado, claves
+
+class SuscriptorCambios:
+    """Lector incremental del feed de cambios de partidos (la app guarda uno por sesión)"""
+
+    def __init__(self, persistencia=None, desde_seq: Optional[int] = None, fecha: Optional[str] = None):
+        """
+        Args:
+            persistencia: DataManager (por defecto el global)
+            desde_seq: seq a partir del cual leer; None = solo cambios futuros
+            fecha: limitar a los partidos de una fecha
+        """
+        if persistencia is None:
+            from .data_manager import data_manager
+            persistencia = data_manager
+        self.persistencia = persistencia
+        self.fecha = fecha
+        self.seq = persistencia.ultimo_seq_cambios() if desde_seq is None else desde_seq
+
+    def nuevos(self, limite: int = 500) -> List[Dict[str, Any]]:
+        """Cambios publicados desde la última lectura (y avanza la posición)"""
+        lote = self.persistencia.obtener_cambios_partidos(self.seq, limite)
+        self.seq = lote['ultimo_seq']
+        if self.fecha:
+            return [cambio for cambio in lote['cambios'] if cambio['fecha'] == self.fecha]
+        return lote['cambios']
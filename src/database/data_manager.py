@@ -5,12 +5,64 @@ Maneja el almacenamiento y recuperación de datos de scraping
 
 import json
 import os
-from datetime import datetime, date
+from datetime import datetime, date, timedelta
 from pathlib import Path
-from typing import Dict, List, Any, Optional
+from typing import Dict, Iterator, List, Any, Optional
 import sqlite3
 from dataclasses import dataclass, asdict
 
+# Columnas consultables de partidos_sesion (proyección de consultar_partidos)
+COLUMNAS_PARTIDOS = ('sesion_id', 'fecha', 'hora', 'visitante', 'local', 'over_pct', 'under_pct',
+                     'consenso_pct', 'direccion', 'total_line', 'expertos')
+
+# Rangos de consenso (HistoricalStatsModel.rango_consenso); debajo de 70 va a '<70'
+RANGOS_CONSENSO = (('70-75', 70), ('75-80', 75), ('80-85', 80), ('85-90', 85), ('90+', 90))
+
+# PRAGMA user_version desde la que las sesiones viejas ya están en partidos_sesion
+VERSION_PARTIDOS_SESION = 1
+
+# Días que se conservan las filas de partidos_sesion; 0 o sin definir = siempre
+# (las exportaciones y el historial consultan rangos de fechas viejos)
+DIAS_RETENCION_PARTIDOS = int(os.getenv('DIAS_RETENCION_PARTIDOS', '0')) or None
+
+# Límites superiores (segundos) del histograma de duración de sesiones
+BUCKETS_LATENCIA_SEGUNDOS = (1, 2, 5, 10, 20, 30, 60, 120, 300, 600, float('inf'))
+
+def rango_consenso(porcentaje: Optional[float]) -> str:
+    """Rango de HistoricalStatsModel para un porcentaje de consenso"""
+    rango = '<70'
+    for nombre, minimo in RANGOS_CONSENSO:
+        if porcentaje is not None and porcentaje >= minimo:
+            rango = nombre
+    return rango
+
+def _primero(dato: Dict[str, Any], *claves: str) -> Any:
+    """Primer valor presente entre varias claves equivalentes"""
+    for clave in claves:
+        valor = dato.get(clave)
+        if valor not in (None, ''):
+            return valor
+    return None
+
+def clave_partido(dato: Dict[str, Any]) -> Optional[str]:
+    """'VISITANTE@LOCAL' en cualquiera de los formatos de fila; None si faltan equipos"""
+    visitante = _primero(dato, 'visitante', 'equipo_visitante')
+    local = _primero(dato, 'local', 'equipo_local')
+    if not visitante or not local:
+        return None
+    return f"{visitante}@{local}".upper()
+
+def _numero(valor: Any) -> Optional[float]:
+    """83, 83.0 o '83.0%' -> 83.0; None si no es numérico ('N/A')"""
+    if isinstance(valor, bool):
+        return None
+    if isinstance(valor, (int, float)):
+        return float(valor)
+    try:
+        return float(str(valor).strip().rstrip('%'))
+    except (TypeError, ValueError):
+        return None
+
 @dataclass
 class ScrapingSession:
     """Representa una sesión de scraping"""
@@ -43,10 +95,18 @@ class ScraperProgramado:
 class DataManager:
     """Gestor principal de datos del sistema"""
     
-    def __init__(self):
+    def __init__(self, db_path: Optional[Path] = None):
+        """
+        Args:
+            db_path: Base SQLite a usar (por defecto data/scraping_data.db)
+        """
         self.base_dir = Path(__file__).parent.parent.parent
-        self.data_dir = self.base_dir / "data"
-        self.db_path = self.data_dir / "scraping_data.db"
+        if db_path is None:
+            self.data_dir = self.base_dir / "data"
+            self.db_path = self.data_dir / "scraping_data.db"
+        else:
+            self.db_path = Path(db_path)
+            self.data_dir = self.db_path.parent
         
         # Crear directorio si no existe
         self.data_dir.mkdir(exist_ok=True)
@@ -57,6 +117,9 @@ class DataManager:
     def _init_database(self):
         """Inicializa la base de datos SQLite local"""
         with sqlite3.connect(self.db_path) as conn:
+            # WAL: el worker del outbox escribe mientras la app lee
+            conn.execute('PRAGMA journal_mode=WAL')
+            
             conn.execute('''
                 CREATE TABLE IF NOT EXISTS scraping_sessions (
                     id TEXT PRIMARY KEY,
@@ -100,8 +163,218 @@ class DataManager:
                 )
             ''')
             
+            conn.execute('''
+                CREATE TABLE IF NOT EXISTS temporizadores (
+                    clave TEXT PRIMARY KEY,
+                    run_at TEXT NOT NULL,
+                    payload TEXT,
+                    estado TEXT,
+                    creado_en TEXT,
+                    actualizado_en TEXT
+                )
+            ''')
+            
+            # Outbox: la fila es a la vez la marca de deduplicación y el envío pendiente
+            conn.execute('''
+                CREATE TABLE IF NOT EXISTS alertas_outbox (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    dedup_key TEXT NOT NULL UNIQUE,
+                    canal TEXT NOT NULL,
+                    tipo_alerta TEXT,
+                    titulo TEXT,
+                    mensaje TEXT,
+                    payload TEXT,
+                    estado TEXT NOT NULL DEFAULT 'pendiente',
+                    intentos INTEGER NOT NULL DEFAULT 0,
+                    proximo_intento TEXT NOT NULL,
+                    reservado_hasta TEXT,
+                    ultimo_error TEXT,
+                    creado_en TEXT NOT NULL,
+                    enviado_en TEXT
+                )
+            ''')
+            
+            conn.execute('''
+                CREATE INDEX IF NOT EXISTS idx_outbox_pendientes
+                ON alertas_outbox (canal, estado, proximo_intento)
+            ''')
+            
+            # Eventos tipados de scraping/alertas y errores (reemplaza el parseo de logs)
+            conn.execute('''
+                CREATE TABLE IF NOT EXISTS eventos (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    fecha TEXT NOT NULL,
+                    timestamp TEXT NOT NULL,
+                    categoria TEXT NOT NULL,
+                    nivel TEXT,
+                    logger TEXT,
+                    sport TEXT,
+                    alert_type TEXT,
+                    event_type TEXT,
+                    consensus_count INTEGER,
+                    high_consensus_count INTEGER,
+                    duration_seconds REAL,
+                    mensaje TEXT,
+                    detalles TEXT
+                )
+            ''')
+            
+            conn.execute('''
+                CREATE INDEX IF NOT EXISTS idx_eventos_fecha
+                ON eventos (fecha, categoria, event_type)
+            ''')
+            
+            # Una fila por partido de cada sesión: filtros y paginación sin deserializar datos_raw
+            conn.execute('''
+                CREATE TABLE IF NOT EXISTS partidos_sesion (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    sesion_id TEXT NOT NULL,
+                    fecha TEXT NOT NULL,
+                    hora TEXT,
+                    visitante TEXT,
+                    local TEXT,
+                    over_pct REAL,
+                    under_pct REAL,
+                    consenso_pct REAL,
+                    direccion TEXT,
+                    total_line REAL,
+                    expertos INTEGER
+                )
+            ''')
+            
+            conn.execute('''
+                CREATE INDEX IF NOT EXISTS idx_partidos_fecha
+                ON partidos_sesion (fecha, id)
+            ''')
+            
+            conn.execute('''
+                CREATE INDEX IF NOT EXISTS idx_partidos_sesion
+                ON partidos_sesion (sesion_id)
+            ''')
+            
+            self._migrar_partidos_sesion(conn)
+            
+            # Rollups de analítica: se actualizan en la misma transacción que cada sesión/alerta
+            conn.execute('''
+                CREATE TABLE IF NOT EXISTS rollup_consensos_dia (
+                    fecha TEXT NOT NULL,
+                    deporte TEXT NOT NULL,
+                    sesiones INTEGER NOT NULL DEFAULT 0,
+                    partidos INTEGER NOT NULL DEFAULT 0,
+                    consensos_fuertes INTEGER NOT NULL DEFAULT 0,
+                    PRIMARY KEY (fecha, deporte)
+                )
+            ''')
+            
+            conn.execute('''
+                CREATE TABLE IF NOT EXISTS rollup_rangos_consenso (
+                    fecha TEXT NOT NULL,
+                    deporte TEXT NOT NULL,
+                    rango_consenso TEXT NOT NULL,
+                    partidos INTEGER NOT NULL DEFAULT 0,
+                    PRIMARY KEY (fecha, deporte, rango_consenso)
+                )
+            ''')
+            
+            conn.execute('''
+                CREATE TABLE IF NOT EXISTS rollup_latencia_scraping (
+                    fecha TEXT NOT NULL,
+                    limite_segundos REAL NOT NULL,
+                    sesiones INTEGER NOT NULL DEFAULT 0,
+                    PRIMARY KEY (fecha, limite_segundos)
+                )
+            ''')
+            
+            conn.execute('''
+                CREATE TABLE IF NOT EXISTS rollup_alertas_dia (
+                    fecha TEXT NOT NULL,
+                    canal TEXT NOT NULL,
+                    tipo_alerta TEXT NOT NULL,
+                    enviadas INTEGER NOT NULL DEFAULT 0,
+                    PRIMARY KEY (fecha, canal, tipo_alerta)
+                )
+            ''')
+            
+            # Canal de cambios: último estado conocido por partido y feed de partidos cambiados
+            conn.execute('''
+                CREATE TABLE IF NOT EXISTS estado_partidos (
+                    fecha TEXT NOT NULL,
+                    partido_id TEXT NOT NULL,
+                    huella TEXT NOT NULL,
+                    actualizado_en TEXT NOT NULL,
+                    PRIMARY KEY (fecha, partido_id)
+                )
+            ''')
+            
+            conn.execute('''
+                CREATE TABLE IF NOT EXISTS cambios_partidos (
+                    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+                    fecha TEXT NOT NULL,
+                    partido_id TEXT NOT NULL,
+                    tipo TEXT NOT NULL,
+                    origen TEXT,
+                    datos TEXT NOT NULL,
+                    creado_en TEXT NOT NULL
+                )
+            ''')
+            
+            # Trabajos de scraping lanzados desde la app (progreso compartido entre usuarios)
+            conn.execute('''
+                CREATE TABLE IF NOT EXISTS trabajos_scraping (
+                    id TEXT PRIMARY KEY,
+                    tipo TEXT NOT NULL,
+                    clave TEXT NOT NULL,
+                    estado TEXT NOT NULL,
+                    progreso INTEGER NOT NULL DEFAULT 0,
+                    mensaje TEXT,
+                    filas TEXT,
+                    resultado TEXT,
+                    error TEXT,
+                    creado_en TEXT NOT NULL,
+                    actualizado_en TEXT NOT NULL,
+                    finalizado_en TEXT
+                )
+            ''')
+            
+            conn.execute('''
+                CREATE INDEX IF NOT EXISTS idx_trabajos_clave
+                ON trabajos_scraping (clave, estado)
+            ''')
+            
+            # Contador de cambios por tabla: clave de invalidación de las cachés de lectura
+            conn.execute('''
+                CREATE TABLE IF NOT EXISTS versiones_datos (
+                    tabla TEXT PRIMARY KEY,
+                    version INTEGER NOT NULL DEFAULT 0
+                )
+            ''')
+            
+            # Bases previas a los rollups: se calculan una vez desde el histórico
+            if (conn.execute('SELECT COUNT(*) FROM rollup_latencia_scraping').fetchone()[0] == 0
+                    and conn.execute('SELECT COUNT(*) FROM scraping_sessions').fetchone()[0] > 0):
+                self._reconstruir_rollups(conn)
+            
             conn.commit()
     
+    # === VERSIONES DE DATOS ===
+    
+    def _incrementar_version(self, conn: sqlite3.Connection, tabla: str):
+        """Marca un cambio en la tabla (dentro de la misma transacción que la escritura)"""
+        conn.execute('''
+            INSERT INTO versiones_datos (tabla, version) VALUES (?, 1)
+            ON CONFLICT(tabla) DO UPDATE SET version = version + 1
+        ''', (tabla,))
+    
+    def version_datos(self) -> Dict[str, int]:
+        """
+        Versión actual de cada tabla con escrituras versionadas
+        
+        Es una lectura mínima: sirve como clave de caché para que la app
+        vea al instante las sesiones guardadas por este u otro proceso.
+        """
+        with sqlite3.connect(self.db_path) as conn:
+            return dict(conn.execute('SELECT tabla, version FROM versiones_datos').fetchall())
+    
     # === GESTIÓN DE SESIONES DE SCRAPING ===
     
     def guardar_sesion_scraping(self, datos: List[Dict], filtros: Dict = None, 
@@ -133,6 +406,11 @@ class DataManager:
                 json.dumps(sesion.datos_raw), json.dumps(sesion.filtros_aplicados),
                 sesion.estado, sesion.duracion_segundos, json.dumps(sesion.errores)
             ))
+            partidos = self._guardar_partidos_sesion(conn, sesion.id, sesion.fecha, datos)
+            if sesion.estado == 'completado':
+                self._publicar_cambios(conn, datos, sesion.fecha, 'sesion')
+            self._actualizar_rollups_sesion(conn, sesion.fecha, sesion.estado, sesion.duracion_segundos, partidos)
+            self._incrementar_version(conn, 'scraping_sessions')
             conn.commit()
         
         return session_id
@@ -182,6 +460,210 @@ class DataManager:
             
             return sesiones
     
+    # === CONSULTAS PAGINADAS ===
+    
+    def consultar_partidos(self, fecha_desde: Optional[str] = None, fecha_hasta: Optional[str] = None,
+                           equipo: Optional[str] = None, consenso_minimo: Optional[float] = None,
+                           columnas: Optional[List[str]] = None, despues_de: Optional[tuple] = None,
+                           limite: int = 50) -> Dict[str, Any]:
+        """
+        Partidos guardados, del más reciente al más antiguo, una página por llamada
+        
+        Los filtros se resuelven en SQL sobre partidos_sesion y la paginación
+        es por keyset: el costo de una página no depende de cuántas haya antes.
+        
+        Args:
+            fecha_desde / fecha_hasta: rango YYYY-MM-DD (inclusive)
+            equipo: abreviatura del visitante o del local (sin distinguir mayúsculas)
+            consenso_minimo: porcentaje mínimo del lado mayoritario
+            columnas: proyección (subconjunto de COLUMNAS_PARTIDOS); por defecto todas
+            despues_de: cursor 'siguiente' devuelto por la página anterior
+            limite: filas por página
+        
+        Returns:
+            {'filas': [...], 'siguiente': cursor o None si es la última página}
+        """
+        columnas = [c for c in (columnas or COLUMNAS_PARTIDOS) if c in COLUMNAS_PARTIDOS]
+        condiciones, params = self._filtros_partidos(fecha_desde, fecha_hasta, equipo, consenso_minimo)
+        
+        if despues_de:
+            condiciones.append('(fecha, id) < (?, ?)')
+            params.extend(despues_de)
+        
+        where = f"WHERE {' AND '.join(condiciones)}" if condiciones else ''
+        seleccion = ', '.join(['fecha AS _cursor_fecha', 'id AS _cursor_id'] + columnas)
+        
+        with sqlite3.connect(self.db_path) as conn:
+            conn.row_factory = sqlite3.Row
+            filas = conn.execute(f'''
+                SELECT {seleccion} FROM partidos_sesion
+                {where}
+                ORDER BY fecha DESC, id DESC
+                LIMIT ?
+            ''', (*params, limite + 1)).fetchall()
+        
+        siguiente = None
+        if len(filas) > limite:
+            filas = filas[:limite]
+            siguiente = (filas[-1]['_cursor_fecha'], filas[-1]['_cursor_id'])
+        
+        return {
+            'filas': [{columna: fila[columna] for columna in columnas} for fila in filas],
+            'siguiente': siguiente
+        }
+    
+    def iterar_partidos(self, fecha_desde: Optional[str] = None, fecha_hasta: Optional[str] = None,
+                        equipo: Optional[str] = None, consenso_minimo: Optional[float] = None,
+                        sesion_id: Optional[str] = None, columnas: Optional[List[str]] = None,
+                        tamano_lote: int = 5000) -> Iterator[List[Dict[str, Any]]]:
+        """
+        Partidos filtrados en orden cronológico, en lotes de tamano_lote filas
+        
+        Un solo cursor de SQLite recorre el resultado con fetchmany: en memoria
+        hay como mucho un lote, sin importar cuántos partidos coincidan.
+        Mismos filtros que consultar_partidos, más sesion_id.
+        """
+        columnas = [c for c in (columnas or COLUMNAS_PARTIDOS) if c in COLUMNAS_PARTIDOS]
+        condiciones, params = self._filtros_partidos(fecha_desde, fecha_hasta, equipo, consenso_minimo)
+        if sesion_id:
+            condiciones.append('sesion_id = ?')
+            params.append(sesion_id)
+        
+        where = f"WHERE {' AND '.join(condiciones)}" if condiciones else ''
+        
+        conn = sqlite3.connect(self.db_path)
+        try:
+            cursor = conn.execute(f'''
+                SELECT {', '.join(columnas)} FROM partidos_sesion
+                {where}
+                ORDER BY fecha, id
+            ''', params)
+            while True:
+                lote = cursor.fetchmany(tamano_lote)
+                if not lote:
+                    break
+                yield [dict(zip(columnas, fila)) for fila in lote]
+        finally:
+            conn.close()
+    
+    def _filtros_partidos(self, fecha_desde: Optional[str], fecha_hasta: Optional[str],
+                          equipo: Optional[str], consenso_minimo: Optional[float]) -> tuple:
+        """Condiciones WHERE y parámetros comunes a las consultas de partidos_sesion"""
+        condiciones, params = [], []
+        
+        if fecha_desde:
+            condiciones.append('fecha >= ?')
+            params.append(fecha_desde)
+        if fecha_hasta:
+            condiciones.append('fecha <= ?')
+            params.append(fecha_hasta)
+        if equipo:
+            condiciones.append('(visitante = ? COLLATE NOCASE OR local = ? COLLATE NOCASE)')
+            params.extend([equipo, equipo])
+        if consenso_minimo:
+            condiciones.append('consenso_pct >= ?')
+            params.append(consenso_minimo)
+        
+        return condiciones, params
+    
+    def listar_sesiones(self, fecha_desde: Optional[str] = None, fecha_hasta: Optional[str] = None,
+                        despues_de: Optional[tuple] = None, limite: int = 20) -> Dict[str, Any]:
+        """Sesiones sin datos_raw (solo metadatos), paginadas por keyset como consultar_partidos"""
+        condiciones, params = [], []
+        
+        if fecha_desde:
+            condiciones.append('fecha >= ?')
+            params.append(fecha_desde)
+        if fecha_hasta:
+            condiciones.append('fecha <= ?')
+            params.append(fecha_hasta)
+        if despues_de:
+            condiciones.append('(fecha, hora_ejecucion, id) < (?, ?, ?)')
+            params.extend(despues_de)
+        
+        where = f"WHERE {' AND '.join(condiciones)}" if condiciones else ''
+        
+        with sqlite3.connect(self.db_path) as conn:
+            conn.row_factory = sqlite3.Row
+            filas = [dict(fila) for fila in conn.execute(f'''
+                SELECT id, fecha, hora_ejecucion, total_partidos, estado, duracion_segundos
+                FROM scraping_sessions
+                {where}
+                ORDER BY fecha DESC, hora_ejecucion DESC, id DESC
+                LIMIT ?
+            ''', (*params, limite + 1)).fetchall()]
+        
+        siguiente = None
+        if len(filas) > limite:
+            filas = filas[:limite]
+            siguiente = (filas[-1]['fecha'], filas[-1]['hora_ejecucion'], filas[-1]['id'])
+        
+        return {'filas': filas, 'siguiente': siguiente}
+    
+    def _guardar_partidos_sesion(self, conn: sqlite3.Connection, sesion_id: str, fecha: str,
+                                 datos: List[Dict]) -> List[Dict[str, Any]]:
+        """
+        Normaliza las filas de una sesión (formato del scraper o de la tabla de la app)
+        
+        Returns:
+            deporte y consenso_pct de cada partido, para los rollups
+        """
+        filas = []
+        partidos = []
+        for dato in datos or []:
+            if not isinstance(dato, dict):
+                continue
+            over = _numero(_primero(dato, 'over_percentage', 'porcentaje_over', 'consenso_over'))
+            under = _numero(_primero(dato, 'under_percentage', 'porcentaje_under', 'consenso_under'))
+            porcentajes = [v for v in (over, under) if v is not None]
+            direccion = None
+            if over is not None and under is not None and over != under:
+                direccion = 'OVER' if over > under else 'UNDER'
+            expertos = _numero(_primero(dato, 'expertos', 'num_experts'))
+            partidos.append({
+                'deporte': str(_primero(dato, 'deporte', 'sport') or 'MLB').upper(),
+                'consenso_pct': max(porcentajes) if porcentajes else None
+            })
+            
+            filas.append((
+                sesion_id,
+                str(_primero(dato, 'fecha', 'fecha_juego') or fecha),
+                _primero(dato, 'hora', 'hora_juego', 'hora_partido'),
+                _primero(dato, 'visitante', 'equipo_visitante'),
+                _primero(dato, 'local', 'equipo_local'),
+                over, under, max(porcentajes) if porcentajes else None, direccion,
+                _numero(_primero(dato, 'total', 'total_line')),
+                int(expertos) if expertos is not None else None
+            ))
+        
+        conn.executemany('''
+            INSERT INTO partidos_sesion
+            (sesion_id, fecha, hora, visitante, local, over_pct, under_pct,
+             consenso_pct, direccion, total_line, expertos)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+        ''', filas)
+        
+        return partidos
+    
+    def _migrar_partidos_sesion(self, conn: sqlite3.Connection):
+        """Normaliza una sola vez las sesiones guardadas antes de existir partidos_sesion"""
+        # La versión del esquema evita el NOT IN sobre todas las sesiones en cada arranque
+        if conn.execute('PRAGMA user_version').fetchone()[0] >= VERSION_PARTIDOS_SESION:
+            return
+        
+        pendientes = conn.execute('''
+            SELECT id, fecha, datos_raw FROM scraping_sessions
+            WHERE id NOT IN (SELECT DISTINCT sesion_id FROM partidos_sesion)
+        ''').fetchall()
+        
+        for sesion_id, fecha, datos_raw in pendientes:
+            try:
+                self._guardar_partidos_sesion(conn, sesion_id, fecha, json.loads(datos_raw or '[]'))
+            except (ValueError, TypeError):
+                continue
+        
+        conn.execute(f'PRAGMA user_version = {VERSION_PARTIDOS_SESION}')
+    
     # === GESTIÓN DE SCRAPERS PROGRAMADOS ===
     
     def programar_scraper(self, partido_data: Dict) -> str:
@@ -213,6 +695,7 @@ class DataManager:
                 scraper.fecha_partido, scraper.hora_partido, scraper.hora_scraping,
                 scraper.consenso_actual, scraper.estado, scraper.creado_en
             ))
+            self._incrementar_version(conn, 'scrapers_programados')
             conn.commit()
         
         return scraper_id
@@ -259,8 +742,550 @@ class DataManager:
                 json.dumps(resultado) if resultado else None,
                 scraper_id
             ))
+            self._incrementar_version(conn, 'scrapers_programados')
+            conn.commit()
+    
+    # === TEMPORIZADORES PRE-PARTIDO ===
+    
+    def guardar_temporizador(self, clave: str, run_at: str, payload: Dict = None):
+        """Persiste un temporizador armado para poder recuperarlo tras un reinicio"""
+        now = datetime.now().isoformat()
+        
+        with sqlite3.connect(self.db_path) as conn:
+            conn.execute('''
+                INSERT OR REPLACE INTO temporizadores 
+                (clave, run_at, payload, estado, creado_en, actualizado_en)
+                VALUES (?, ?, ?, 'pendiente', ?, ?)
+            ''', (clave, run_at, json.dumps(payload or {}), now, now))
+            conn.commit()
+    
+    def obtener_temporizadores_pendientes(self) -> List[Dict[str, Any]]:
+        """Obtiene los temporizadores que aún no se dispararon"""
+        with sqlite3.connect(self.db_path) as conn:
+            cursor = conn.execute('''
+                SELECT clave, run_at, payload FROM temporizadores
+                WHERE estado = 'pendiente'
+                ORDER BY run_at
+            ''')
+            
+            return [
+                {'clave': row[0], 'run_at': row[1], 'payload': json.loads(row[2]) if row[2] else {}}
+                for row in cursor.fetchall()
+            ]
+    
+    def actualizar_estado_temporizador(self, clave: str, estado: str):
+        """Marca un temporizador como 'disparado', 'cancelado' o 'expirado'"""
+        with sqlite3.connect(self.db_path) as conn:
+            conn.execute('''
+                UPDATE temporizadores SET estado = ?, actualizado_en = ?
+                WHERE clave = ?
+            ''', (estado, datetime.now().isoformat(), clave))
+            conn.commit()
+    
+    # === CANAL DE CAMBIOS ===
+    
+    def publicar_cambios_partidos(self, datos: List[Dict], fecha: Optional[str] = None,
+                                  origen: str = 'scraping') -> int:
+        """
+        Publica en el feed solo los partidos que cambiaron desde su último estado
+        
+        Returns:
+            cantidad de partidos publicados (nuevos o con cambios)
+        """
+        with sqlite3.connect(self.db_path) as conn:
+            publicados = self._publicar_cambios(conn, datos, fecha or datetime.now().strftime('%Y-%m-%d'), origen)
+            conn.commit()
+        return publicados
+    
+    def obtener_cambios_partidos(self, desde_seq: int = 0, limite: int = 500) -> Dict[str, Any]:
+        """
+        Partidos cambiados después de desde_seq, en orden de publicación
+        
+        Returns:
+            {'cambios': [{'seq', 'fecha', 'partido_id', 'tipo', 'origen', 'datos', 'creado_en'}],
+             'ultimo_seq': seq del último cambio leído (o desde_seq si no hubo)}
+        """
+        with sqlite3.connect(self.db_path) as conn:
+            filas = conn.execute('''
+                SELECT seq, fecha, partido_id, tipo, origen, datos, creado_en
+                FROM cambios_partidos
+                WHERE seq > ?
+                ORDER BY seq
+                LIMIT ?
+            ''', (desde_seq, limite)).fetchall()
+        
+        cambios = [
+            {'seq': fila[0], 'fecha': fila[1], 'partido_id': fila[2], 'tipo': fila[3],
+             'origen': fila[4], 'datos': json.loads(fila[5]), 'creado_en': fila[6]}
+            for fila in filas
+        ]
+        return {'cambios': cambios, 'ultimo_seq': cambios[-1]['seq'] if cambios else desde_seq}
+    
+    def ultimo_seq_cambios(self) -> int:
+        """Posición actual del feed (para suscribirse sin recibir el histórico)"""
+        with sqlite3.connect(self.db_path) as conn:
+            return conn.execute('SELECT COALESCE(MAX(seq), 0) FROM cambios_partidos').fetchone()[0]
+    
+    def _publicar_cambios(self, conn: sqlite3.Connection, datos: List[Dict], fecha: str, origen: str) -> int:
+        """Compara cada partido con estado_partidos y agrega al feed los nuevos o distintos"""
+        now = datetime.now().isoformat()
+        huellas = {}
+        for dato in datos or []:
+            if not isinstance(dato, dict) or not clave_partido(dato):
+                continue
+            fecha_partido = str(_primero(dato, 'fecha', 'fecha_juego') or fecha)
+            huella = json.dumps([
+                _primero(dato, 'hora', 'hora_juego', 'hora_partido'),
+                _numero(_primero(dato, 'over_percentage', 'porcentaje_over', 'consenso_over')),
+                _numero(_primero(dato, 'under_percentage', 'porcentaje_under', 'consenso_under')),
+                _numero(_primero(dato, 'total', 'total_line')),
+                _numero(_primero(dato, 'expertos', 'num_experts'))
+            ], default=str)
+            huellas[(fecha_partido, clave_partido(dato))] = (huella, dato)
+        
+        if not huellas:
+            return 0
+        
+        fechas = sorted({fecha_partido for fecha_partido, _ in huellas})
+        marcadores = ', '.join('?' for _ in fechas)
+        anteriores = {
+            (fila[0], fila[1]): fila[2]
+            for fila in conn.execute(
+                f'SELECT fecha, partido_id, huella FROM estado_partidos WHERE fecha IN ({marcadores})', fechas
+            )
+        }
+        
+        cambios = []
+        for (fecha_partido, partido_id), (huella, dato) in huellas.items():
+            anterior = anteriores.get((fecha_partido, partido_id))
+            if anterior == huella:
+                continue
+            tipo = 'nuevo' if anterior is None else 'actualizado'
+            cambios.append((fecha_partido, partido_id, huella, tipo, dato))
+        
+        conn.executemany('''
+            INSERT INTO estado_partidos (fecha, partido_id, huella, actualizado_en) VALUES (?, ?, ?, ?)
+            ON CONFLICT(fecha, partido_id) DO UPDATE SET huella = excluded.huella, actualizado_en = excluded.actualizado_en
+        ''', [(c[0], c[1], c[2], now) for c in cambios])
+        
+        conn.executemany('''
+            INSERT INTO cambios_partidos (fecha, partido_id, tipo, origen, datos, creado_en)
+            VALUES (?, ?, ?, ?, ?, ?)
+        ''', [(c[0], c[1], c[3], origen, json.dumps(c[4], default=str), now) for c in cambios])
+        
+        return len(cambios)
+    
+    # === TRABAJOS DE SCRAPING ===
+    
+    def crear_trabajo_scraping(self, trabajo_id: str, tipo: str, clave: str):
+        """Registra un trabajo en cola"""
+        now = datetime.now().isoformat()
+        with sqlite3.connect(self.db_path) as conn:
+            conn.execute('''
+                INSERT INTO trabajos_scraping (id, tipo, clave, estado, creado_en, actualizado_en)
+                VALUES (?, ?, ?, 'en_cola', ?, ?)
+            ''', (trabajo_id, tipo, clave, now, now))
+            conn.commit()
+    
+    def actualizar_trabajo_scraping(self, trabajo_id: str, estado: Optional[str] = None,
+                                    progreso: Optional[int] = None, mensaje: Optional[str] = None,
+                                    filas: Optional[List[Dict]] = None, resultado: Optional[Dict] = None,
+                                    error: Optional[str] = None):
+        """Actualiza el progreso de un trabajo; los campos en None no se tocan"""
+        now = datetime.now().isoformat()
+        campos = {
+            'estado': estado,
+            'progreso': progreso,
+            'mensaje': mensaje,
+            'filas': json.dumps(filas, default=str) if filas is not None else None,
+            'resultado': json.dumps(resultado, default=str) if resultado is not None else None,
+            'error': error
+        }
+        campos = {columna: valor for columna, valor in campos.items() if valor is not None}
+        campos['actualizado_en'] = now
+        if estado in ('completado', 'error'):
+            campos['finalizado_en'] = now
+        
+        asignaciones = ', '.join(f"{columna} = ?" for columna in campos)
+        with sqlite3.connect(self.db_path) as conn:
+            conn.execute(f'UPDATE trabajos_scraping SET {asignaciones} WHERE id = ?',
+                         (*campos.values(), trabajo_id))
+            conn.commit()
+    
+    def obtener_trabajo_scraping(self, trabajo_id: str) -> Optional[Dict[str, Any]]:
+        """Estado, progreso, filas parciales y resultado de un trabajo"""
+        with sqlite3.connect(self.db_path) as conn:
+            conn.row_factory = sqlite3.Row
+            fila = conn.execute('SELECT * FROM trabajos_scraping WHERE id = ?', (trabajo_id,)).fetchone()
+        
+        if not fila:
+            return None
+        
+        trabajo = dict(fila)
+        trabajo['filas'] = json.loads(trabajo['filas']) if trabajo['filas'] else []
+        trabajo['resultado'] = json.loads(trabajo['resultado']) if trabajo['resultado'] else None
+        return trabajo
+    
+    def obtener_trabajo_activo(self, clave: str) -> Optional[Dict[str, Any]]:
+        """Trabajo en cola o en ejecución con esa clave (el más reciente)"""
+        with sqlite3.connect(self.db_path) as conn:
+            fila = conn.execute('''
+                SELECT id FROM trabajos_scraping
+                WHERE clave = ? AND estado IN ('en_cola', 'ejecutando')
+                ORDER BY creado_en DESC
+                LIMIT 1
+            ''', (clave,)).fetchone()
+        
+        return self.obtener_trabajo_scraping(fila[0]) if fila else None
+    
+    # === OUTBOX DE ALERTAS ===
+    
+    def encolar_alertas(self, canal: str, alertas: List[Dict[str, Any]]) -> List[str]:
+        """
+        Encola alertas en el outbox en una sola transacción
+        
+        Cada alerta lleva 'dedup_key' y opcionalmente 'tipo_alerta', 'titulo',
+        'mensaje' y 'payload'. La clave única hace de marca de envío: una
+        alerta ya encolada (enviada o no) se ignora.
+        
+        Returns:
+            dedup_key de las alertas efectivamente encoladas
+        """
+        now = datetime.now().isoformat()
+        encoladas = []
+        
+        with sqlite3.connect(self.db_path) as conn:
+            for alerta in alertas:
+                cursor = conn.execute('''
+                    INSERT OR IGNORE INTO alertas_outbox
+                    (dedup_key, canal, tipo_alerta, titulo, mensaje, payload, proximo_intento, creado_en)
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                ''', (
+                    alerta['dedup_key'],
+                    canal,
+                    alerta.get('tipo_alerta'),
+                    alerta.get('titulo'),
+                    alerta.get('mensaje'),
+                    json.dumps(alerta.get('payload') or {}, default=str),
+                    now,
+                    now
+                ))
+                if cursor.rowcount:
+                    encoladas.append(alerta['dedup_key'])
+            conn.commit()
+        
+        return encoladas
+    
+    def alerta_encolada(self, dedup_key: str) -> bool:
+        """Indica si una alerta ya pasó por el outbox"""
+        with sqlite3.connect(self.db_path) as conn:
+            cursor = conn.execute('SELECT 1 FROM alertas_outbox WHERE dedup_key = ?', (dedup_key,))
+            return cursor.fetchone() is not None
+    
+    def reservar_alertas(self, canal: str, limite: int = 20, reserva_segundos: int = 60) -> List[Dict[str, Any]]:
+        """
+        Reserva un lote de alertas listas para enviar
+        
+        Las reservas vencidas (worker caído a mitad de envío) vuelven a
+        entregarse; el receptor debe tolerar un reenvío en ese caso.
+        """
+        ahora = datetime.now()
+        now = ahora.isoformat()
+        hasta = (ahora + timedelta(seconds=reserva_segundos)).isoformat()
+        
+        with sqlite3.connect(self.db_path, isolation_level=None) as conn:
+            conn.execute('BEGIN IMMEDIATE')
+            try:
+                cursor = conn.execute('''
+                    SELECT id, dedup_key, tipo_alerta, titulo, mensaje, payload, intentos, creado_en
+                    FROM alertas_outbox
+                    WHERE canal = ?
+                      AND ((estado = 'pendiente' AND proximo_intento <= ?)
+                           OR (estado = 'en_envio' AND reservado_hasta < ?))
+                    ORDER BY id
+                    LIMIT ?
+                ''', (canal, now, now, limite))
+                filas = cursor.fetchall()
+                
+                conn.executemany('''
+                    UPDATE alertas_outbox SET estado = 'en_envio', reservado_hasta = ?
+                    WHERE id = ?
+                ''', [(hasta, fila[0]) for fila in filas])
+                conn.execute('COMMIT')
+            except Exception:
+                conn.execute('ROLLBACK')
+                raise
+        
+        return [
+            {
+                'id': fila[0],
+                'dedup_key': fila[1],
+                'tipo_alerta': fila[2],
+                'titulo': fila[3],
+                'mensaje': fila[4],
+                'payload': json.loads(fila[5]) if fila[5] else {},
+                'intentos': fila[6],
+                'creado_en': fila[7]
+            }
+            for fila in filas
+        ]
+    
+    def confirmar_alertas(self, ids: List[int]):
+        """Acuse de envío: marca las alertas como enviadas y las registra en alertas_enviadas"""
+        now = datetime.now().isoformat()
+        
+        with sqlite3.connect(self.db_path) as conn:
+            # Rollup antes del UPDATE: una alerta ya confirmada no se vuelve a contar
+            marcadores = ', '.join('?' for _ in ids)
+            conn.execute(f'''
+                INSERT INTO rollup_alertas_dia (fecha, canal, tipo_alerta, enviadas)
+                SELECT ?, canal, COALESCE(tipo_alerta, ''), COUNT(*) FROM alertas_outbox
+                WHERE id IN ({marcadores}) AND estado != 'enviado'
+                GROUP BY canal, COALESCE(tipo_alerta, '')
+                ON CONFLICT(fecha, canal, tipo_alerta) DO UPDATE SET enviadas = enviadas + excluded.enviadas
+            ''', (now[:10], *ids))
+            
+            conn.executemany('''
+                UPDATE alertas_outbox SET estado = 'enviado', enviado_en = ?, reservado_hasta = NULL
+                WHERE id = ?
+            ''', [(now, alerta_id) for alerta_id in ids])
+            
+            conn.executemany('''
+                INSERT OR REPLACE INTO alertas_enviadas
+                (id, partido_id, tipo_alerta, mensaje, canal, enviado_en, exitoso)
+                SELECT dedup_key, json_extract(payload, '$.partido_id'), tipo_alerta, mensaje, canal, enviado_en, 1
+                FROM alertas_outbox WHERE id = ?
+            ''', [(alerta_id,) for alerta_id in ids])
+            self._incrementar_version(conn, 'alertas_enviadas')
+            conn.commit()
+    
+    def reintentar_alertas(self, ids: List[int], error: str, espera_segundos: float, max_intentos: int = 5):
+        """Devuelve alertas al outbox con backoff; tras max_intentos quedan como 'fallido'"""
+        proximo = (datetime.now() + timedelta(seconds=espera_segundos)).isoformat()
+        
+        with sqlite3.connect(self.db_path) as conn:
+            conn.executemany('''
+                UPDATE alertas_outbox
+                SET intentos = intentos + 1,
+                    estado = CASE WHEN intentos + 1 >= ? THEN 'fallido' ELSE 'pendiente' END,
+                    proximo_intento = ?, reservado_hasta = NULL, ultimo_error = ?
+                WHERE id = ?
+            ''', [(max_intentos, proximo, error[:500], alerta_id) for alerta_id in ids])
+            conn.commit()
+    
+    def obtener_estadisticas_outbox(self, canal: Optional[str] = None) -> Dict[str, Any]:
+        """Profundidad del outbox por estado y latencia de entrega de las últimas 24h"""
+        filtro_canal = 'AND canal = ?' if canal else ''
+        params = (canal,) if canal else ()
+        desde = (datetime.now() - timedelta(days=1)).isoformat()
+        
+        with sqlite3.connect(self.db_path) as conn:
+            cursor = conn.execute(f'''
+                SELECT estado, COUNT(*), MIN(creado_en) FROM alertas_outbox
+                WHERE 1 = 1 {filtro_canal}
+                GROUP BY estado
+            ''', params)
+            por_estado = {fila[0]: fila[1] for fila in cursor.fetchall()}
+            
+            cursor = conn.execute(f'''
+                SELECT AVG((julianday(enviado_en) - julianday(creado_en)) * 86400),
+                       MAX((julianday(enviado_en) - julianday(creado_en)) * 86400)
+                FROM alertas_outbox
+                WHERE estado = 'enviado' AND enviado_en >= ? {filtro_canal}
+            ''', (desde,) + params)
+            latencia = cursor.fetchone()
+        
+        return {
+            'por_estado': por_estado,
+            'pendientes': por_estado.get('pendiente', 0) + por_estado.get('en_envio', 0),
+            'latencia_promedio_24h': round(latencia[0] or 0, 3),
+            'latencia_max_24h': round(latencia[1] or 0, 3)
+        }
+    
+    # === EVENTOS Y MÉTRICAS ===
+    
+    def registrar_evento(self, evento: Dict[str, Any]):
+        """
+        Guarda un evento tipado
+        
+        Campos reconocidos: timestamp, categoria ('scraping', 'alerta', 'error'),
+        nivel, logger, sport, alert_type, event_type, consensus_count,
+        high_consensus_count, duration_seconds, mensaje; el resto va a detalles.
+        """
+        columnas = ('categoria', 'nivel', 'logger', 'sport', 'alert_type', 'event_type',
+                    'consensus_count', 'high_consensus_count', 'duration_seconds', 'mensaje')
+        timestamp = evento.get('timestamp') or datetime.now().isoformat()
+        detalles = {k: v for k, v in evento.items() if k not in columnas and k != 'timestamp'}
+        
+        with sqlite3.connect(self.db_path) as conn:
+            conn.execute('''
+                INSERT INTO eventos
+                (fecha, timestamp, categoria, nivel, logger, sport, alert_type, event_type,
+                 consensus_count, high_consensus_count, duration_seconds, mensaje, detalles)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            ''', (
+                timestamp[:10],
+                timestamp,
+                *(evento.get(columna) for columna in columnas),
+                json.dumps(detalles, default=str) if detalles else None
+            ))
             conn.commit()
     
+    def obtener_resumen_eventos(self, fecha: str = None, sport: Optional[str] = None) -> Dict[str, Any]:
+        """Agregados de eventos del día (una sola consulta sobre el índice por fecha)"""
+        if fecha is None:
+            fecha = datetime.now().strftime('%Y-%m-%d')
+        
+        filtro_sport = 'AND sport = ?' if sport else ''
+        params = (fecha, sport) if sport else (fecha,)
+        es_red = "(lower(mensaje) LIKE '%network%' OR lower(mensaje) LIKE '%connection%')"
+        
+        with sqlite3.connect(self.db_path) as conn:
+            cursor = conn.execute(f'''
+                SELECT
+                    SUM(categoria = 'scraping' AND event_type = 'start'),
+                    SUM(categoria = 'scraping' AND event_type = 'success'),
+                    SUM(categoria = 'scraping' AND event_type = 'error'),
+                    SUM(categoria = 'scraping' AND event_type = 'retry'),
+                    SUM(CASE WHEN categoria = 'scraping' AND event_type = 'success' THEN consensus_count END),
+                    SUM(CASE WHEN categoria = 'scraping' AND event_type = 'success' THEN high_consensus_count END),
+                    SUM(categoria = 'alerta' AND event_type = 'sent'),
+                    SUM(categoria = 'alerta' AND event_type = 'failed'),
+                    SUM(categoria = 'alerta' AND event_type = 'sent' AND alert_type = 'consensus'),
+                    SUM(categoria = 'alerta' AND event_type = 'sent' AND alert_type = 'error'),
+                    SUM(categoria = 'alerta' AND event_type = 'sent' AND alert_type = 'daily_report'),
+                    SUM(nivel = 'ERROR'),
+                    SUM(nivel = 'CRITICAL'),
+                    SUM(nivel = 'ERROR' AND {es_red}),
+                    SUM(nivel = 'ERROR' AND NOT {es_red} AND lower(mensaje) LIKE '%telegram%'),
+                    COUNT(*)
+                FROM eventos
+                WHERE fecha = ? {filtro_sport}
+            ''', params)
+            fila = [valor or 0 for valor in cursor.fetchone()]
+        
+        return {
+            'fecha': fecha,
+            'scraping_events': {
+                'total_attempts': fila[0],
+                'successful': fila[1],
+                'failed': fila[2],
+                'retries': fila[3],
+                'total_consensus': fila[4],
+                'high_consensus': fila[5]
+            },
+            'alert_events': {
+                'total_sent': fila[6],
+                'failed': fila[7],
+                'consensus_alerts': fila[8],
+                'error_alerts': fila[9],
+                'daily_reports': fila[10]
+            },
+            'error_summary': {
+                'total_errors': fila[11],
+                'critical_errors': fila[12],
+                'network_errors': fila[13],
+                'telegram_errors': fila[14]
+            },
+            'total_eventos': fila[15]
+        }
+    
+    # === ANALÍTICA (ROLLUPS) ===
+    
+    def _actualizar_rollups_sesion(self, conn: sqlite3.Connection, fecha: str, estado: str,
+                                   duracion: float, partidos: List[Dict[str, Any]]):
+        """
+        Suma la sesión a los rollups del día
+        
+        La latencia acumula todas las sesiones. Los conteos de consensos y
+        rangos son la foto de la última sesión completada del día (cada
+        sesión vuelve a scrapear los mismos partidos: sumarlas duplicaría).
+        """
+        limite = next(b for b in BUCKETS_LATENCIA_SEGUNDOS if (duracion or 0) <= b)
+        conn.execute('''
+            INSERT INTO rollup_latencia_scraping (fecha, limite_segundos, sesiones) VALUES (?, ?, 1)
+            ON CONFLICT(fecha, limite_segundos) DO UPDATE SET sesiones = sesiones + 1
+        ''', (fecha, limite))
+        
+        if estado != 'completado':
+            return
+        
+        por_deporte: Dict[str, Dict[str, int]] = {}
+        for partido in partidos:
+            rangos = por_deporte.setdefault(partido['deporte'], {})
+            rango = rango_consenso(partido['consenso_pct'])
+            rangos[rango] = rangos.get(rango, 0) + 1
+        
+        for deporte, rangos in por_deporte.items():
+            total = sum(rangos.values())
+            fuertes = total - rangos.get('<70', 0)
+            conn.execute('''
+                INSERT INTO rollup_consensos_dia (fecha, deporte, sesiones, partidos, consensos_fuertes)
+                VALUES (?, ?, 1, ?, ?)
+                ON CONFLICT(fecha, deporte) DO UPDATE SET
+                    sesiones = sesiones + 1, partidos = excluded.partidos,
+                    consensos_fuertes = excluded.consensos_fuertes
+            ''', (fecha, deporte, total, fuertes))
+            
+            conn.execute('DELETE FROM rollup_rangos_consenso WHERE fecha = ? AND deporte = ?', (fecha, deporte))
+            conn.executemany('''
+                INSERT INTO rollup_rangos_consenso (fecha, deporte, rango_consenso, partidos)
+                VALUES (?, ?, ?, ?)
+            ''', [(fecha, deporte, rango, cantidad) for rango, cantidad in rangos.items()])
+    
+    def _reconstruir_rollups(self, conn: sqlite3.Connection):
+        """Recalcula todos los rollups desde las sesiones y alertas guardadas"""
+        for tabla in ('rollup_consensos_dia', 'rollup_rangos_consenso', 'rollup_latencia_scraping', 'rollup_alertas_dia'):
+            conn.execute(f'DELETE FROM {tabla}')
+        
+        sesiones = conn.execute('''
+            SELECT id, fecha, estado, duracion_segundos FROM scraping_sessions
+            ORDER BY fecha, hora_ejecucion
+        ''').fetchall()
+        
+        # El histórico previo a los rollups es todo de MLB
+        for sesion_id, fecha, estado, duracion in sesiones:
+            partidos = [
+                {'deporte': 'MLB', 'consenso_pct': fila[0]}
+                for fila in conn.execute('SELECT consenso_pct FROM partidos_sesion WHERE sesion_id = ?', (sesion_id,))
+            ]
+            self._actualizar_rollups_sesion(conn, fecha, estado, duracion, partidos)
+        
+        conn.execute('''
+            INSERT INTO rollup_alertas_dia (fecha, canal, tipo_alerta, enviadas)
+            SELECT substr(enviado_en, 1, 10), COALESCE(canal, ''), COALESCE(tipo_alerta, ''), COUNT(*)
+            FROM alertas_enviadas
+            WHERE exitoso = 1 AND enviado_en IS NOT NULL
+            GROUP BY 1, 2, 3
+        ''')
+    
+    def leer_rollup(self, nombre: str, fecha_desde: str, fecha_hasta: str,
+                    deporte: Optional[str] = None) -> List[Dict[str, Any]]:
+        """
+        Filas de un rollup en el rango de fechas
+        
+        Args:
+            nombre: 'consensos', 'rangos', 'latencia' o 'alertas'
+            deporte: filtra los rollups que lo tienen (consensos y rangos)
+        """
+        tablas = {
+            'consensos': 'rollup_consensos_dia',
+            'rangos': 'rollup_rangos_consenso',
+            'latencia': 'rollup_latencia_scraping',
+            'alertas': 'rollup_alertas_dia'
+        }
+        tabla = tablas[nombre]
+        condicion_deporte = 'AND deporte = ?' if deporte and nombre in ('consensos', 'rangos') else ''
+        params = (fecha_desde, fecha_hasta) + ((deporte,) if condicion_deporte else ())
+        
+        with sqlite3.connect(self.db_path) as conn:
+            conn.row_factory = sqlite3.Row
+            return [dict(fila) for fila in conn.execute(f'''
+                SELECT * FROM {tabla}
+                WHERE fecha BETWEEN ? AND ? {condicion_deporte}
+                ORDER BY fecha
+            ''', params)]
+    
     # === ESTADÍSTICAS Y REPORTES ===
     
     def obtener_estadisticas_hoy(self) -> Dict[str, Any]:
@@ -302,13 +1327,44 @@ class DataManager:
                 }
             }
     
-    def limpiar_datos_antiguos(self, dias: int = 7):
-        """Limpia datos antiguos para mantener la base de datos eficiente"""
+    def limpiar_datos_antiguos(self, dias: int = 7, dias_partidos: Optional[int] = DIAS_RETENCION_PARTIDOS):
+        """
+        Limpia datos antiguos para mantener la base de datos eficiente
+        
+        Args:
+            dias: antigüedad a partir de la cual se borran eventos, estados,
+                  trabajos y el JSON crudo (datos_raw) de las sesiones
+            dias_partidos: retención de las filas por partido y sus sesiones;
+                           None las conserva (exportación e historial)
+        """
         fecha_limite = datetime.now().strftime('%Y-%m-%d')
         
         with sqlite3.connect(self.db_path) as conn:
+            # El JSON crudo ya está normalizado en partidos_sesion: solo se recorta
+            conn.execute('''
+                UPDATE scraping_sessions SET datos_raw = '[]'
+                WHERE fecha < date(?, '-{} days') AND datos_raw != '[]'
+            '''.format(dias), (fecha_limite,))
+            
+            if dias_partidos is not None:
+                conn.execute('''
+                    DELETE FROM partidos_sesion 
+                    WHERE fecha < date(?, '-{} days')
+                '''.format(dias_partidos), (fecha_limite,))
+                
+                conn.execute('''
+                    DELETE FROM scraping_sessions 
+                    WHERE fecha < date(?, '-{} days')
+                      AND id NOT IN (SELECT DISTINCT sesion_id FROM partidos_sesion)
+                '''.format(dias_partidos), (fecha_limite,))
+            
             conn.execute('''
-                DELETE FROM scraping_sessions 
+                DELETE FROM estado_partidos 
+                WHERE fecha < date(?, '-{} days')
+            '''.format(dias), (fecha_limite,))
+            
+            conn.execute('''
+                DELETE FROM cambios_partidos 
                 WHERE fecha < date(?, '-{} days')
             '''.format(dias), (fecha_limite,))
             
@@ -317,6 +1373,27 @@ class DataManager:
                 WHERE fecha_partido < date(?, '-{} days')
             '''.format(dias), (fecha_limite,))
             
+            conn.execute('''
+                DELETE FROM temporizadores 
+                WHERE estado != 'pendiente' AND run_at < date(?, '-{} days')
+            '''.format(dias), (fecha_limite,))
+            
+            conn.execute('''
+                DELETE FROM eventos 
+                WHERE fecha < date(?, '-{} days')
+            '''.format(dias), (fecha_limite,))
+            
+            conn.execute('''
+                DELETE FROM trabajos_scraping 
+                WHERE estado IN ('completado', 'error') AND creado_en < date(?, '-{} days')
+            '''.format(dias), (fecha_limite,))
+            
+            # Las filas enviadas o fallidas conservan la deduplicación durante `dias`
+            conn.execute('''
+                DELETE FROM alertas_outbox 
+                WHERE estado IN ('enviado', 'fallido') AND creado_en < date(?, '-{} days')
+            '''.format(dias), (fecha_limite,))
+            
             conn.commit()
 
 # Instancia global del gestor de datos
@@ -0,0 +1,124 @@
+"""
+Exportación de partidos guardados a CSV, JSONL o Parquet
+Lee partidos_sesion por lotes (DataManager.iterar_partidos) y escribe cada
+lote directamente al archivo: exportar una temporada completa no necesita
+tenerla entera en memoria.
+"""
+
+import csv
+import io
+import json
+import tempfile
+from datetime import datetime
+from pathlib import Path
+from typing import BinaryIO, List, Optional, Union
+
+from .data_manager import COLUMNAS_PARTIDOS
+from ..utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+# Formato -> (tipo MIME, extensión)
+FORMATOS_EXPORTACION = {
+    'csv': ('text/csv', 'csv'),
+    'jsonl': ('application/x-ndjson', 'jsonl'),
+    'parquet': ('application/vnd.apache.parquet', 'parquet'),
+}
+
+# Filas leídas de SQLite y escritas por vez
+TAMANO_LOTE_EXPORTACION = 5000
+
+# Tipos de columna para Parquet (las demás columnas son texto)
+_COLUMNAS_DECIMALES = ('over_pct', 'under_pct', 'consenso_pct', 'total_line')
+_COLUMNAS_ENTERAS = ('expertos',)
+
+def exportar_partidos(formato: str = 'csv', fecha_desde: Optional[str] = None, fecha_hasta: Optional[str] = None,
+                      equipo: Optional[str] = None, consenso_minimo: Optional[float] = None,
+                      sesion_id: Optional[str] = None, columnas: Optional[List[str]] = None,
+                      destino: Optional[Union[str, Path]] = None, tamano_lote: int = TAMANO_LOTE_EXPORTACION,
+                      persistencia=None) -> BinaryIO:
+    """
+    Exporta los partidos que cumplen los filtros, lote por lote
+
+    Args:
+        formato: 'csv', 'jsonl' o 'parquet' (este último requiere pyarrow)
+        fecha_desde / fecha_hasta / equipo / consenso_minimo / sesion_id: filtros
+        columnas: subconjunto de COLUMNAS_PARTIDOS; por defecto todas
+        destino: ruta del archivo; por defecto un archivo temporal
+        persistencia: DataManager (por defecto el global)
+
+    Returns:
+        archivo binario abierto y posicionado al inicio (quien lo recibe lo cierra)
+    """
+    if formato not in FORMATOS_EXPORTACION:
+        raise ValueError(f"Formato no soportado: {formato} (usar {', '.join(FORMATOS_EXPORTACION)})")
+
+    if persistencia is None:
+        from .data_manager import data_manager
+        persistencia = data_manager
+
+    columnas = [c for c in (columnas or COLUMNAS_PARTIDOS) if c in COLUMNAS_PARTIDOS]
+    lotes = persistencia.iterar_partidos(
+        fecha_desde=fecha_desde, fecha_hasta=fecha_hasta, equipo=equipo, consenso_minimo=consenso_minimo,
+        sesion_id=sesion_id, columnas=columnas, tamano_lote=tamano_lote
+    )
+
+    archivo = open(destino, 'w+b') if destino else tempfile.TemporaryFile()
+    try:
+        escritor = {'csv': _escribir_csv, 'jsonl': _escribir_jsonl, 'parquet': _escribir_parquet}[formato]
+        filas = escritor(archivo, lotes, columnas)
+        archivo.flush()
+        archivo.seek(0)
+    except Exception:
+        archivo.close()
+        raise
+
+    logger.info(f"📤 Exportados {filas} partidos a {formato.upper()}")
+    return archivo
+
+def nombre_exportacion(formato: str, prefijo: str = 'consensos') -> str:
+    """Nombre de archivo sugerido para la descarga"""
+    return f"{prefijo}_{datetime.now().strftime('%Y%m%d_%H%M')}.{FORMATOS_EXPORTACION[formato][1]}"
+
+def _escribir_csv(archivo: BinaryIO, lotes, columnas: List[str]) -> int:
+    texto = io.TextIOWrapper(archivo, encoding='utf-8', newline='')
+    escritor = csv.DictWriter(texto, fieldnames=columnas)
+    escritor.writeheader()
+    filas = 0
+    for lote in lotes:
+        escritor.writerows(lote)
+        filas += len(lote)
+    texto.flush()
+    # Soltar el archivo binario sin cerrarlo
+    texto.detach()
+    return filas
+
+def _escribir_jsonl(archivo: BinaryIO, lotes, columnas: List[str]) -> int:
+    filas = 0
+    for lote in lotes:
+        archivo.write(''.join(json.dumps(fila, ensure_ascii=False) + '\n' for fila in lote).encode('utf-8'))
+        filas += len(lote)
+    return filas
+
+def _escribir_parquet(archivo: BinaryIO, lotes, columnas: List[str]) -> int:
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError:
+        raise ImportError("La exportación a Parquet requiere pyarrow (pip install pyarrow)")
+
+    def tipo(columna: str):
+        if columna in _COLUMNAS_DECIMALES:
+            return pa.float64()
+        if columna in _COLUMNAS_ENTERAS:
+            return pa.int64()
+        return pa.string()
+
+    esquema = pa.schema([(columna, tipo(columna)) for columna in columnas])
+    filas = 0
+    # Un row group por lote
+    with pq.ParquetWriter(archivo, esquema) as escritor:
+        for lote in lotes:
+            escritor.write_table(pa.Table.from_pylist(lote, schema=esquema))
+            filas += len(lote)
+    return filas
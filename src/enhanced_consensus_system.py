@@ -11,15 +11,21 @@ import asyncio
 from datetime import datetime, timedelta
 import pytz
 from typing import Dict, List, Optional
-from src.utils.logger import get_logger, log_scraping_event, log_alert_event, generate_daily_report
+from src.utils.logger import get_logger, instalar_eventos, log_scraping_event, log_alert_event, generate_daily_report
 from src.utils.sports_config import get_sports_config
-from src.scraper.mlb_scraper import MLBScraper
+from src.scraper.registro_scrapers import crear_scraper, tiene_scraper
 from src.scraper.pregame_scheduler import PregameScheduler
 from src.notifications.telegram_bot import TelegramNotifier
+from src.notifications.digest import AlertDigest, TODOS_LOS_CHATS
+from src.notifications.templates import PLANTILLA_ALERTA_DEPORTE, lineas_porcentajes, marca_tiempo
 from src.database.supabase_client import SupabaseClient
+from src.database.data_manager import data_manager
 
 logger = get_logger(__name__)
 
+# Tiempo máximo del scraping diario de un deporte: uno lento no frena a los demás
+TIMEOUT_SCRAPING_DEPORTE_SEGUNDOS = 300
+
 class EnhancedConsensusSystem:
     """Sistema de consensos mejorado con todas las características específicas"""
     
@@ -30,12 +36,17 @@ class EnhancedConsensusSystem:
         self.telegram_notifier = None
         self.supabase_client = None
         self.active_scrapers = {}
+        # Agrupa las alertas por partido y envía un mensaje consolidado por chat
+        self.alert_digest = AlertDigest(self.send_alert_digest)
         
         logger.info("🚀 Sistema de consensos mejorado inicializado")
     
     async def initialize(self):
         """Inicializa todos los componentes del sistema"""
         try:
+            # Eventos de scraping/alertas a la tabla `eventos` (reporte diario)
+            instalar_eventos()
+            
             # Inicializar base de datos
             self.supabase_client = SupabaseClient()
             await self.supabase_client.initialize()
@@ -61,58 +72,74 @@ class EnhancedConsensusSystem:
         active_sports = self.sports_config.get_active_sports()
         
         for sport in active_sports:
-            if sport == 'MLB':
-                self.active_scrapers[sport] = MLBScraper()
-            # Agregar otros deportes cuando estén implementados
-            # elif sport == 'NBA':
-            #     self.active_scrapers[sport] = NBAScraper()
+            # El scraper sale del registro por deporte (registro_scrapers)
+            if tiene_scraper(sport):
+                self.active_scrapers[sport] = crear_scraper(sport)
+            else:
+                logger.warning(f"⚠️ {sport} activo pero sin scraper registrado")
         
         logger.info(f"🏈 Scrapers activos: {list(self.active_scrapers.keys())}")
     
     async def run_daily_consensus_scraping(self):
         """
         Ejecuta scraping diario completo para todos los deportes activos
-        con configuración específica por deporte
+        con configuración específica por deporte (en paralelo sobre el event loop)
+        
+        Cada deporte corre en su propia tarea con su cliente HTTP: el ciclo dura
+        lo que el deporte más lento, no la suma de todos.
         """
+        inicio = datetime.now(self.timezone)
+        resultados = await asyncio.gather(*(
+            self.run_sport_daily_scraping(sport, scraper)
+            for sport, scraper in self.active_scrapers.items()
+        ), return_exceptions=True)
+        
+        for sport, resultado in zip(self.active_scrapers, resultados):
+            if isinstance(resultado, Exception):
+                logger.error(f"❌ Scraping diario de {sport} falló: {resultado}")
+        
+        duracion = (datetime.now(self.timezone) - inicio).total_seconds()
+        logger.info(f"🏁 Ciclo diario de {len(self.active_scrapers)} deportes en {duracion:.1f}s")
+    
+    async def run_sport_daily_scraping(self, sport: str, scraper):
+        """Scraping diario de un deporte"""
         start_time = datetime.now(self.timezone)
         
-        for sport, scraper in self.active_scrapers.items():
-            try:
-                sport_config = self.sports_config.get_sport_config(sport)
-                
-                # Log inicio del scraping
-                log_scraping_event(logger, sport, 'start', {
-                    'url': sport_config.get('url_base', 'N/A'),
-                    'scraping_type': 'daily'
-                })
-                
-                # Ejecutar scraping
-                if sport == 'MLB':
-                    consensus_data = await scraper.scrape_mlb_consensus()
-                
-                # Procesar resultados
-                await self.process_consensus_results(sport, consensus_data, 'daily')
-                
-                # Programar scraping pregame para partidos del día
-                await self.pregame_scheduler.schedule_daily_pregame_scraping(sport)
-                
-                # Log éxito
-                duration = (datetime.now(self.timezone) - start_time).total_seconds()
-                log_scraping_event(logger, sport, 'success', {
-                    'consensus_count': len(consensus_data),
-                    'duration_seconds': duration,
-                    'high_consensus_count': len([c for c in consensus_data if self.is_high_consensus(sport, c)])
-                })
-                
-            except Exception as e:
-                log_scraping_event(logger, sport, 'error', {
-                    'error_message': str(e),
-                    'attempt': 1,
-                    'retries_left': 2
-                })
-                
-                # Intentar reintentos
-                await self.retry_scraping(sport, scraper, 'daily')
+        try:
+            config_deporte = self.sports_config.snapshot().deporte(sport)
+            
+            # Log inicio del scraping
+            log_scraping_event(logger, sport, 'start', {
+                'url': config_deporte.url_base or 'N/A',
+                'scraping_type': 'daily'
+            })
+            
+            # Ejecutar scraping
+            consensus_data = await asyncio.wait_for(scraper.scrape_consensus(), TIMEOUT_SCRAPING_DEPORTE_SEGUNDOS)
+            
+            # Procesar resultados
+            await self.process_consensus_results(sport, consensus_data, 'daily')
+            
+            # Programar scraping pregame para partidos del día
+            await self.pregame_scheduler.schedule_daily_pregame_scraping(sport)
+            
+            # Log éxito
+            duration = (datetime.now(self.timezone) - start_time).total_seconds()
+            log_scraping_event(logger, sport, 'success', {
+                'consensus_count': len(consensus_data),
+                'duration_seconds': duration,
+                'high_consensus_count': len([c for c in consensus_data if self.is_high_consensus(sport, c)])
+            })
+            
+        except Exception as e:
+            log_scraping_event(logger, sport, 'error', {
+                'error_message': str(e),
+                'attempt': 1,
+                'retries_left': 2
+            })
+            
+            # Intentar reintentos
+            await self.retry_scraping(sport, scraper, 'daily')
     
     def is_high_consensus(self, sport: str, consensus_data: Dict) -> bool:
         """
@@ -125,19 +152,8 @@ class EnhancedConsensusSystem:
         Returns:
             True si es consenso alto
         """
-        sport_config = self.sports_config.get_sport_config(sport)
-        thresholds = sport_config.get('consensus_thresholds', {})
-        
-        # Verificar cada tipo de consenso con su umbral específico
-        spread_threshold = thresholds.get('spread', 75)
-        total_threshold = thresholds.get('total', 75)
-        moneyline_threshold = thresholds.get('moneyline', 75)
-        
-        return any([
-            consensus_data.get('porcentaje_spread', 0) >= spread_threshold,
-            consensus_data.get('porcentaje_total', 0) >= total_threshold,
-            consensus_data.get('porcentaje_moneyline', 0) >= moneyline_threshold
-        ])
+        # Umbrales precompilados en el snapshot de configuración
+        return self.sports_config.is_high_consensus(sport, consensus_data)
     
     async def process_consensus_results(self, sport: str, consensus_data: List[Dict], scraping_type: str):
         """
@@ -176,31 +192,61 @@ class EnhancedConsensusSystem:
             scraping_type: Tipo de scraping
         """
         try:
-            sport_config = self.sports_config.get_sport_config(sport)
-            alert_settings = sport_config.get('alert_settings', {})
+            config_deporte = self.sports_config.snapshot().deporte(sport)
             
             # Verificar si estamos en horas silenciosas
-            if self.is_quiet_hours(alert_settings):
+            if config_deporte.en_horas_silencio(datetime.now(self.timezone).hour):
                 logger.info(f"🔇 Alerta de {sport} pospuesta por horas silenciosas")
                 return
             
-            # Crear mensaje personalizado por deporte
-            alert_message = self.create_sport_alert_message(sport, high_consensus, scraping_type)
+            # Acumular en el digest: las actualizaciones del mismo partido se fusionan
+            for consensus in high_consensus:
+                self.alert_digest.agregar(dict(consensus, sport=sport, scraping_type=scraping_type))
+            
+            logger.info(f"📥 {len(high_consensus)} alertas de {sport} en el digest "
+                        f"({self.alert_digest.pendientes()} partidos pendientes)")
+            
+        except Exception as e:
+            logger.error(f"Error encolando alertas de {sport}: {e}")
+    
+    async def send_alert_digest(self, chat_id: str, alertas: List[Dict]):
+        """
+        Envía el lote consolidado de una ventana del digest
+        
+        Args:
+            chat_id: Chat destino (TODOS_LOS_CHATS = todos los configurados)
+            alertas: Última versión de cada partido en la ventana
+        """
+        if not self.telegram_notifier:
+            return
+        
+        try:
+            # Un bloque por deporte dentro del mismo mensaje
+            por_deporte: Dict[str, List[Dict]] = {}
+            for alerta in alertas:
+                por_deporte.setdefault(alerta.get('sport', 'MLB'), []).append(alerta)
+            
+            alert_message = "\n".join(
+                self.create_sport_alert_message(sport, consensos, consensos[-1].get('scraping_type', 'daily'))
+                for sport, consensos in por_deporte.items()
+            )
             
-            # Enviar alerta
-            await self.telegram_notifier.send_message(alert_message)
+            chat_ids = None if chat_id == TODOS_LOS_CHATS else [chat_id]
+            await self.telegram_notifier.send_message(alert_message, chat_ids=chat_ids)
             
             # Log evento de alerta
             log_alert_event(logger, 'consensus', 'sent', {
-                'chat_count': len(self.telegram_notifier.chat_ids),
+                'chat_count': len(chat_ids or self.telegram_notifier.chat_ids),
                 'message_length': len(alert_message),
-                'consensus_count': len(high_consensus)
+                'consensus_count': len(alertas),
+                # Deporte del evento (para el reporte por deporte) si el lote es de uno solo
+                'sport': next(iter(por_deporte)) if len(por_deporte) == 1 else None
             })
             
         except Exception as e:
             log_alert_event(logger, 'consensus', 'failed', {
                 'error_message': str(e),
-                'chat_id': 'multiple',
+                'chat_id': chat_id if chat_id != TODOS_LOS_CHATS else 'multiple',
                 'attempt': 1
             })
     
@@ -216,8 +262,7 @@ class EnhancedConsensusSystem:
         Returns:
             Mensaje formateado para Telegram
         """
-        sport_config = self.sports_config.get_sport_config(sport)
-        thresholds = sport_config.get('consensus_thresholds', {})
+        umbrales = self.sports_config.snapshot().deporte(sport).umbrales
         
         # Emojis por deporte
         sport_emojis = {
@@ -237,56 +282,24 @@ class EnhancedConsensusSystem:
         else:
             title = f"{emoji} CONSENSOS ALTOS - {sport}"
         
-        message = f"🚨 *{title}*\n\n"
-        message += f"🕐 {datetime.now(self.timezone).strftime('%d/%m/%Y %H:%M ART')}\n"
-        message += f"📊 *{len(high_consensus)} consensos detectados*\n\n"
-        
-        # Configuración específica del deporte
-        message += f"⚙️ *Umbrales {sport}:*\n"
-        message += f"  • Spread: {thresholds.get('spread', 75)}%\n"
-        message += f"  • Total: {thresholds.get('total', 75)}%\n"
-        message += f"  • ML: {thresholds.get('moneyline', 75)}%\n\n"
-        
-        # Detalles de consensos
-        for i, consensus in enumerate(high_consensus[:5]):
-            away = consensus.get('equipo_visitante', 'TBD')
-            home = consensus.get('equipo_local', 'TBD')
-            
-            message += f"*{i+1}. {away} @ {home}*\n"
-            
-            # Mostrar solo consensos que superan el umbral
-            spread_pct = consensus.get('porcentaje_spread', 0)
-            total_pct = consensus.get('porcentaje_total', 0)
-            ml_pct = consensus.get('porcentaje_moneyline', 0)
-            
-            if spread_pct >= thresholds.get('spread', 75):
-                message += f"   🎯 Spread: *{spread_pct}%*\n"
-            if total_pct >= thresholds.get('total', 75):
-                message += f"   🔢 Total: *{total_pct}%*\n"
-            if ml_pct >= thresholds.get('moneyline', 75):
-                message += f"   💰 ML: *{ml_pct}%*\n"
-            
-            message += "\n"
-        
-        if len(high_consensus) > 5:
-            message += f"... y {len(high_consensus) - 5} más\n\n"
-        
-        return message
-    
-    def is_quiet_hours(self, alert_settings: Dict) -> bool:
-        """Verifica si estamos en horas silenciosas"""
-        quiet_hours = alert_settings.get('quiet_hours', {})
-        if not quiet_hours.get('enabled', False):
-            return False
-        
-        current_hour = datetime.now(self.timezone).hour
-        start_hour = quiet_hours.get('start', 23)
-        end_hour = quiet_hours.get('end', 7)
-        
-        if start_hour <= end_hour:
-            return start_hour <= current_hour <= end_hour
-        else:  # Cruza medianoche
-            return current_hour >= start_hour or current_hour <= end_hour
+        # Todos los partidos: TelegramNotifier.send_message divide los mensajes largos
+        return PLANTILLA_ALERTA_DEPORTE.render(
+            {
+                'titulo': title,
+                'fecha': marca_tiempo(self.timezone),
+                'cantidad': len(high_consensus),
+                'sport': sport,
+                'umbral_spread': umbrales['spread'],
+                'umbral_total': umbrales['total'],
+                'umbral_moneyline': umbrales['moneyline']
+            },
+            ({
+                'visitante': consensus.get('equipo_visitante', 'TBD'),
+                'local': consensus.get('equipo_local', 'TBD'),
+                # Mostrar solo consensos que superan el umbral
+                'lineas': lineas_porcentajes(consensus, umbrales)
+            } for consensus in high_consensus)
+        )
     
     async def update_historical_stats(self, sport: str, consensus_data: List[Dict]):
         """
@@ -326,17 +339,16 @@ class EnhancedConsensusSystem:
                 await asyncio.sleep(delay)
                 
                 # Intentar scraping nuevamente
-                if sport == 'MLB':
-                    consensus_data = await scraper.scrape_mlb_consensus()
-                    await self.process_consensus_results(sport, consensus_data, scraping_type)
-                    
-                    log_scraping_event(logger, sport, 'success', {
-                        'consensus_count': len(consensus_data),
-                        'duration_seconds': 0,
-                        'high_consensus_count': len([c for c in consensus_data if self.is_high_consensus(sport, c)])
-                    })
-                    
-                    return  # Éxito, salir del loop
+                consensus_data = await asyncio.wait_for(scraper.scrape_consensus(), TIMEOUT_SCRAPING_DEPORTE_SEGUNDOS)
+                await self.process_consensus_results(sport, consensus_data, scraping_type)
+                
+                log_scraping_event(logger, sport, 'success', {
+                    'consensus_count': len(consensus_data),
+                    'duration_seconds': 0,
+                    'high_consensus_count': len([c for c in consensus_data if self.is_high_consensus(sport, c)])
+                })
+                
+                return  # Éxito, salir del loop
                 
             except Exception as e:
                 if attempt == max_retries:
@@ -360,8 +372,8 @@ class EnhancedConsensusSystem:
             today = datetime.now(self.timezone).strftime('%Y-%m-%d')
             log_file = f"logs/scraper_{today}.log"
             
-            # Generar estadísticas del día
-            stats = generate_daily_report(logger, log_file)
+            # Generar estadísticas del día (consulta agregada sobre la tabla de eventos)
+            stats = generate_daily_report(logger, log_file, fecha=today)
             
             # Agregar estadísticas específicas por deporte
             for sport in self.active_scrapers.keys():
@@ -389,11 +401,13 @@ class EnhancedConsensusSystem:
         Returns:
             Estadísticas del deporte
         """
-        # Implementar consultas específicas a la base de datos
+        resumen = data_manager.obtener_resumen_eventos(datetime.now(self.timezone).strftime('%Y-%m-%d'), sport)
+        scraping = resumen['scraping_events']
+        
         return {
-            'partidos_procesados': 0,
-            'consensos_altos': 0,
-            'alertas_enviadas': 0,
+            'partidos_procesados': scraping['total_consensus'],
+            'consensos_altos': scraping['high_consensus'],
+            'alertas_enviadas': resumen['alert_events']['total_sent'],
             'umbral_promedio': 0.0
         }
     
@@ -442,11 +456,14 @@ class EnhancedConsensusSystem:
         try:
             await self.pregame_scheduler.stop()
             
+            # No perder las alertas que quedaron en la ventana del digest
+            await self.alert_digest.enviar_pendientes_async()
+            
             if self.telegram_notifier:
                 await self.telegram_notifier.stop()
             
             for scraper in self.active_scrapers.values():
-                scraper.close()
+                await scraper.close()
             
             logger.info("🛑 Sistema completamente cerrado")
             
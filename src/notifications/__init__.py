@@ -3,5 +3,9 @@ Módulo de notificaciones y comunicación
 """
 
 from .telegram_bot import TelegramNotifier
+from .dispatcher import TelegramDispatcher
+from .digest import AlertDigest
+from .outbox import OutboxSender
+from .templates import PlantillaMensaje, dividir_mensaje, escapar_markdown
 
-__all__ = ['TelegramNotifier']
+__all__ = ['TelegramNotifier', 'TelegramDispatcher', 'AlertDigest', 'OutboxSender', 'PlantillaMensaje', 'dividir_mensaje', 'escapar_markdown']
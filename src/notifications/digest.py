@@ -0,0 +1,141 @@
+"""
+Digest de alertas por ventana de tiempo
+Acumula las alertas de varios ciclos de scraping, las agrupa por partido
+(las actualizaciones del mismo partido se fusionan) y al cerrar la ventana
+entrega un único lote consolidado por chat.
+"""
+
+import asyncio
+import inspect
+import threading
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional
+
+from src.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+# Ventana por defecto para agrupar alertas consecutivas
+VENTANA_DIGEST_SEGUNDOS = 120
+
+# Clave de chat cuando la alerta va a todos los chats configurados
+TODOS_LOS_CHATS = '*'
+
+def clave_partido(alerta: Dict[str, Any]) -> str:
+    """Clave estable de partido: deporte + visitante @ local"""
+    return (f"{alerta.get('sport', 'MLB')}:"
+            f"{alerta.get('equipo_visitante', '?')}@{alerta.get('equipo_local', '?')}")
+
+def fusionar_alerta(anterior: Optional[Dict[str, Any]], alerta: Dict[str, Any]) -> Dict[str, Any]:
+    """La última actualización del partido reemplaza a la anterior conservando el origen"""
+    if anterior is None:
+        return dict(alerta, actualizaciones=1,
+                    primera_alerta=alerta.get('timestamp_alerta') or datetime.now().isoformat(),
+                    porcentaje_inicial=alerta.get('porcentaje_consenso'))
+
+    return dict(alerta,
+                actualizaciones=anterior['actualizaciones'] + 1,
+                primera_alerta=anterior['primera_alerta'],
+                porcentaje_inicial=anterior['porcentaje_inicial'])
+
+def fusionar_por_partido(alertas: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Una entrada por partido (en orden de llegada) con sus actualizaciones fusionadas"""
+    partidos: Dict[str, Dict[str, Any]] = {}
+    for alerta in alertas:
+        clave = clave_partido(alerta)
+        partidos[clave] = fusionar_alerta(partidos.get(clave), alerta)
+    return list(partidos.values())
+
+class AlertDigest:
+    """Agrupa alertas por partido y por chat durante una ventana"""
+
+    def __init__(self, enviar: Callable[[str, List[Dict[str, Any]]], Any],
+                 ventana_segundos: float = VENTANA_DIGEST_SEGUNDOS):
+        """
+        Args:
+            enviar: función(chat_id, alertas) llamada al cerrar la ventana;
+                    puede ser síncrona o una corutina
+            ventana_segundos: duración de la ventana desde la primera alerta
+        """
+        self.enviar = enviar
+        self.ventana_segundos = ventana_segundos
+        self._pendientes: Dict[str, Dict[str, Dict[str, Any]]] = {}  # chat -> partido -> alerta
+        self._lock = threading.Lock()
+        self._temporizador = None
+        self.stats = {
+            'alertas_recibidas': 0,
+            'actualizaciones_fusionadas': 0,
+            'lotes_enviados': 0
+        }
+
+    def agregar(self, alerta: Dict[str, Any], chat_ids: Optional[List[str]] = None):
+        """Agrega una alerta a la ventana actual (abre la ventana si estaba cerrada)"""
+        clave = clave_partido(alerta)
+
+        with self._lock:
+            self.stats['alertas_recibidas'] += 1
+
+            for chat_id in chat_ids or [TODOS_LOS_CHATS]:
+                partidos = self._pendientes.setdefault(chat_id, {})
+                anterior = partidos.get(clave)
+                if anterior is not None:
+                    self.stats['actualizaciones_fusionadas'] += 1
+
+                partidos[clave] = fusionar_alerta(anterior, alerta)
+
+            if self._temporizador is None:
+                self._armar_temporizador()
+
+    def vaciar(self) -> Dict[str, List[Dict[str, Any]]]:
+        """Cierra la ventana y devuelve los lotes pendientes por chat"""
+        with self._lock:
+            lotes = {chat: list(partidos.values()) for chat, partidos in self._pendientes.items() if partidos}
+            self._pendientes = {}
+            if self._temporizador is not None and hasattr(self._temporizador, 'cancel'):
+                self._temporizador.cancel()
+            self._temporizador = None
+        return lotes
+
+    def enviar_pendientes(self):
+        """Cierra la ventana y entrega los lotes (contexto síncrono)"""
+        for chat_id, alertas in self.vaciar().items():
+            try:
+                resultado = self.enviar(chat_id, alertas)
+                if inspect.isawaitable(resultado):
+                    asyncio.run(resultado)
+                self._registrar_lote(chat_id, alertas)
+            except Exception as e:
+                logger.error(f"❌ Error enviando digest a {chat_id}: {e}")
+
+    async def enviar_pendientes_async(self):
+        """Cierra la ventana y entrega los lotes (dentro de un event loop)"""
+        for chat_id, alertas in self.vaciar().items():
+            try:
+                resultado = self.enviar(chat_id, alertas)
+                if inspect.isawaitable(resultado):
+                    await resultado
+                self._registrar_lote(chat_id, alertas)
+            except Exception as e:
+                logger.error(f"❌ Error enviando digest a {chat_id}: {e}")
+
+    def pendientes(self) -> int:
+        """Cantidad de partidos esperando en la ventana (todos los chats)"""
+        with self._lock:
+            return sum(len(partidos) for partidos in self._pendientes.values())
+
+    def _armar_temporizador(self):
+        """Programa el cierre de la ventana en el loop actual o en un thread (requiere lock)"""
+        try:
+            loop = asyncio.get_running_loop()
+            self._temporizador = loop.call_later(
+                self.ventana_segundos, lambda: loop.create_task(self.enviar_pendientes_async())
+            )
+        except RuntimeError:
+            self._temporizador = threading.Timer(self.ventana_segundos, self.enviar_pendientes)
+            self._temporizador.daemon = True
+            self._temporizador.start()
+
+    def _registrar_lote(self, chat_id: str, alertas: List[Dict[str, Any]]):
+        with self._lock:
+            self.stats['lotes_enviados'] += 1
+        logger.info(f"📦 Digest enviado a {chat_id}: {len(alertas)} partidos")
@@ -0,0 +1,170 @@
+"""
+Cola de despacho asíncrona para mensajes de Telegram
+Envía a muchos chats en paralelo respetando el límite global del bot
+(~30 msg/s) y el límite por chat (~1 msg/s), aplica RetryAfter con la
+espera exacta que indica Telegram y registra la latencia de cada mensaje.
+"""
+
+import asyncio
+import time
+from collections import deque
+from typing import Dict, List, Optional
+
+from telegram.error import BadRequest, Forbidden, NetworkError, RetryAfter, TimedOut
+
+from src.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+class _Limitador:
+    """Espaciado mínimo entre envíos (tasa sostenida sin ráfagas)"""
+
+    def __init__(self, por_segundo: float):
+        self.intervalo = 1.0 / por_segundo
+        self._siguiente = 0.0
+        self._pausa_hasta = 0.0
+        self._loop = None
+        self._lock: Optional[asyncio.Lock] = None
+
+    def _lock_del_loop(self) -> asyncio.Lock:
+        """Lock creado dentro del loop que lo usa (un asyncio.Lock queda atado a su loop)"""
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            self._loop = loop
+            self._lock = asyncio.Lock()
+        return self._lock
+
+    async def adquirir(self):
+        """Espera el próximo turno disponible"""
+        async with self._lock_del_loop():
+            ahora = time.monotonic()
+            turno = max(ahora, self._siguiente, self._pausa_hasta)
+            self._siguiente = turno + self.intervalo
+
+        if turno > ahora:
+            await asyncio.sleep(turno - ahora)
+
+    def reservar_desde(self, momento: float):
+        """Corre el próximo turno si el envío salió después del turno reservado"""
+        self._siguiente = max(self._siguiente, momento + self.intervalo)
+
+    def pausar(self, segundos: float):
+        """Bloquea nuevos turnos durante el tiempo indicado (RetryAfter)"""
+        self._pausa_hasta = max(self._pausa_hasta, time.monotonic() + segundos)
+
+class TelegramDispatcher:
+    """Despacho concurrente con límites global y por chat"""
+
+    def __init__(self, bot, mensajes_por_segundo: float = 30, mensajes_por_segundo_chat: float = 1,
+                 max_concurrencia: int = 20, max_reintentos: int = 3):
+        self.bot = bot
+        self.max_reintentos = max_reintentos
+        self._global = _Limitador(mensajes_por_segundo)
+        self._por_chat_tasa = mensajes_por_segundo_chat
+        self._por_chat: Dict[str, _Limitador] = {}
+        self.max_concurrencia = max_concurrencia
+        # Se crea dentro del loop que envía (ver _semaforo_del_loop)
+        self._loop = None
+        self._semaforo: Optional[asyncio.Semaphore] = None
+        self._latencias = deque(maxlen=1000)
+        self.stats = {
+            'enviados': 0,
+            'fallidos': 0,
+            'reintentos': 0,
+            'retry_after': 0
+        }
+
+    def _semaforo_del_loop(self) -> asyncio.Semaphore:
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            self._loop = loop
+            self._semaforo = asyncio.Semaphore(self.max_concurrencia)
+        return self._semaforo
+
+    async def enviar(self, chat_ids: List[str], text: str, parse_mode: Optional[str] = 'Markdown',
+                     **kwargs) -> Dict[str, bool]:
+        """
+        Envía el mismo mensaje a todos los chats en paralelo
+
+        Returns:
+            Diccionario chat_id -> True si se entregó
+        """
+        encolado_en = time.monotonic()
+        resultados = await asyncio.gather(*(
+            self._enviar_a_chat(chat_id, text, parse_mode, encolado_en, **kwargs)
+            for chat_id in chat_ids
+        ))
+
+        entregados = sum(resultados)
+        logger.info(f"📨 Mensaje despachado a {entregados}/{len(chat_ids)} chats "
+                    f"en {time.monotonic() - encolado_en:.2f}s")
+        return dict(zip(chat_ids, resultados))
+
+    async def _enviar_a_chat(self, chat_id: str, text: str, parse_mode: Optional[str],
+                             encolado_en: float, **kwargs) -> bool:
+        """Envía a un chat con reintentos; devuelve True si se entregó"""
+        limitador_chat = self._por_chat.setdefault(chat_id, _Limitador(self._por_chat_tasa))
+
+        for intento in range(1, self.max_reintentos + 1):
+            await limitador_chat.adquirir()
+            await self._global.adquirir()
+            # La espera del límite global pudo atrasar el envío: el chat cuenta desde ahora
+            limitador_chat.reservar_desde(time.monotonic())
+
+            try:
+                async with self._semaforo_del_loop():
+                    await self.bot.send_message(
+                        chat_id=chat_id,
+                        text=text,
+                        parse_mode=parse_mode,
+                        disable_web_page_preview=True,
+                        **kwargs
+                    )
+
+                latencia = time.monotonic() - encolado_en
+                self._latencias.append(latencia)
+                self.stats['enviados'] += 1
+                logger.debug("Mensaje enviado a chat %s (%.3fs)", chat_id, latencia)
+                return True
+
+            except RetryAfter as e:
+                espera = e.retry_after.total_seconds() if hasattr(e.retry_after, 'total_seconds') else float(e.retry_after)
+                self.stats['retry_after'] += 1
+                logger.warning(f"⏳ RetryAfter {espera}s (chat {chat_id})")
+                # El flood control de Telegram aplica al bot completo
+                self._global.pausar(espera)
+                limitador_chat.pausar(espera)
+
+            except (BadRequest, Forbidden) as e:
+                # Errores permanentes: no tiene sentido reintentar
+                logger.error(f"Error al enviar mensaje a chat {chat_id}: {e}")
+                break
+
+            except (TimedOut, NetworkError) as e:
+                logger.warning(f"⚠️ Error de red enviando a chat {chat_id} (intento {intento}): {e}")
+                await asyncio.sleep(2 ** (intento - 1))
+
+            except Exception as e:
+                logger.error(f"Error al enviar mensaje a chat {chat_id}: {e}")
+                break
+
+            self.stats['reintentos'] += 1
+
+        self.stats['fallidos'] += 1
+        return False
+
+    def get_stats(self) -> Dict:
+        """Contadores y percentiles de latencia (encolado -> entregado)"""
+        latencias = sorted(self._latencias)
+
+        def percentil(p: float) -> float:
+            if not latencias:
+                return 0.0
+            return round(latencias[min(len(latencias) - 1, int(p * len(latencias)))], 3)
+
+        return {
+            **self.stats,
+            'latencia_p50': percentil(0.50),
+            'latencia_p95': percentil(0.95),
+            'latencia_max': round(latencias[-1], 3) if latencias else 0.0
+        }
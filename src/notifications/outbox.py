@@ -0,0 +1,210 @@
+"""
+Worker de envío del outbox de alertas
+Las alertas se encolan en SQLite (tabla alertas_outbox) en la misma
+escritura que las marca como enviadas; este worker las reserva por lotes,
+las entrega y confirma (ack) o reprograma con backoff exponencial.
+Así una caída entre marcar y enviar no pierde ni duplica alertas.
+"""
+
+import asyncio
+import inspect
+import threading
+from collections import deque
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional
+
+from src.utils.logger import get_logger
+from src.utils.metrics import ALERTAS_ENVIADAS, ENTREGA_ALERTA_SEGUNDOS, PROFUNDIDAD_COLA
+
+logger = get_logger(__name__)
+
+# Reintentos antes de dar una alerta por fallida
+MAX_INTENTOS_ENVIO = 5
+
+class OutboxSender:
+    """Drena un canal del outbox con reintentos y acuses de envío"""
+
+    def __init__(self, canal: str, enviar_lote: Callable[[List[Dict[str, Any]]], Any], persistencia,
+                 intervalo_segundos: float = 2, tamano_lote: int = 50, max_intentos: int = MAX_INTENTOS_ENVIO,
+                 backoff_base_segundos: float = 5, reserva_segundos: int = 120):
+        """
+        Args:
+            canal: nombre del canal (cada productor drena solo el suyo)
+            enviar_lote: función(filas) que entrega un lote; puede ser corutina.
+                         Devuelve True (todo entregado), False, o los ids entregados
+            persistencia: objeto con los métodos de outbox de DataManager
+            intervalo_segundos: espera entre sondeos cuando el outbox está vacío
+            tamano_lote: máximo de alertas reservadas por vuelta
+            reserva_segundos: tras este tiempo sin ack la alerta vuelve a entregarse
+        """
+        self.canal = canal
+        self.enviar_lote = enviar_lote
+        self.persistencia = persistencia
+        self.intervalo_segundos = intervalo_segundos
+        self.tamano_lote = tamano_lote
+        self.max_intentos = max_intentos
+        self.backoff_base_segundos = backoff_base_segundos
+        self.reserva_segundos = reserva_segundos
+
+        self._despertar = threading.Event()
+        self._procesando = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        # Loop propio: los clientes async (Telegram) quedan ligados a un único loop
+        self._loop = asyncio.new_event_loop()
+        self._latencias = deque(maxlen=1000)
+        self.is_running = False
+        self.stats = {
+            'encoladas': 0,
+            'duplicadas': 0,
+            'enviadas': 0,
+            'reintentos': 0,
+            'lotes': 0
+        }
+        PROFUNDIDAD_COLA.set_funcion(self._pendientes, cola=f'outbox_{canal}')
+
+    def start(self):
+        """Inicia el worker de envío"""
+        if self.is_running:
+            return
+
+        self.is_running = True
+        self._thread = threading.Thread(target=self._run, name=f"outbox-{self.canal}", daemon=True)
+        self._thread.start()
+        logger.info(f"📤 Outbox '{self.canal}' iniciado")
+
+    def stop(self, vaciar: bool = True):
+        """Detiene el worker; con vaciar=True intenta entregar lo pendiente antes"""
+        self.is_running = False
+        self._despertar.set()
+        if self._thread:
+            self._thread.join(timeout=10)
+            self._thread = None
+
+        if vaciar:
+            self.procesar_pendientes()
+
+        logger.info(f"🛑 Outbox '{self.canal}' detenido")
+
+    def encolar(self, alertas: List[Dict[str, Any]], despertar: bool = True) -> List[str]:
+        """
+        Encola alertas (ver DataManager.encolar_alertas) y arranca el worker
+
+        Returns:
+            dedup_key de las alertas nuevas; las ya encoladas se ignoran
+        """
+        encoladas = self.persistencia.encolar_alertas(self.canal, alertas)
+        self.stats['encoladas'] += len(encoladas)
+        self.stats['duplicadas'] += len(alertas) - len(encoladas)
+
+        if not self.is_running:
+            self.start()
+        if encoladas and despertar:
+            self._despertar.set()
+
+        return encoladas
+
+    def procesar_pendientes(self) -> int:
+        """Entrega todo lo que está listo en el hilo actual; devuelve cuántas se confirmaron"""
+        confirmadas = 0
+        while True:
+            lote = self.persistencia.reservar_alertas(self.canal, self.tamano_lote, self.reserva_segundos)
+            if not lote:
+                return confirmadas
+            confirmadas += self._procesar_lote(lote)
+            if len(lote) < self.tamano_lote:
+                return confirmadas
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Contadores, latencia encolado -> ack y profundidad del outbox"""
+        latencias = sorted(self._latencias)
+
+        def percentil(p: float) -> float:
+            if not latencias:
+                return 0.0
+            return round(latencias[min(len(latencias) - 1, int(p * len(latencias)))], 3)
+
+        try:
+            outbox = self.persistencia.obtener_estadisticas_outbox(self.canal)
+        except Exception as e:
+            logger.error(f"❌ Error leyendo estadísticas del outbox: {e}")
+            outbox = {}
+
+        return {
+            **self.stats,
+            'worker_activo': self.is_running,
+            'latencia_p50': percentil(0.50),
+            'latencia_p95': percentil(0.95),
+            'outbox': outbox
+        }
+
+    def _pendientes(self) -> int:
+        """Profundidad del outbox para el gauge queue_depth"""
+        return self.persistencia.obtener_estadisticas_outbox(self.canal)['pendientes']
+
+    def _run(self):
+        """Loop del worker: drena por lotes y espera cuando no hay trabajo"""
+        while self.is_running:
+            try:
+                lote = self.persistencia.reservar_alertas(self.canal, self.tamano_lote, self.reserva_segundos)
+                if lote:
+                    self._procesar_lote(lote)
+            except Exception as e:
+                # Lo reservado y no confirmado vuelve al outbox al vencer la reserva
+                logger.error(f"❌ Error procesando el outbox '{self.canal}': {e}")
+                lote = []
+
+            # Lote lleno: en ráfagas se sigue drenando sin esperar
+            if len(lote) == self.tamano_lote:
+                continue
+
+            self._despertar.wait(self.intervalo_segundos)
+            self._despertar.clear()
+
+    def _procesar_lote(self, lote: List[Dict[str, Any]]) -> int:
+        """Entrega un lote y registra acks/reintentos; devuelve los confirmados"""
+        ids = [fila['id'] for fila in lote]
+
+        with self._procesando:
+            try:
+                resultado = self.enviar_lote(lote)
+                if inspect.isawaitable(resultado):
+                    resultado = self._loop.run_until_complete(resultado)
+                error = "Entrega no confirmada"
+            except Exception as e:
+                resultado = False
+                error = str(e)
+
+        if resultado is True:
+            confirmados = set(ids)
+        elif not resultado:
+            confirmados = set()
+        else:
+            confirmados = set(resultado)
+
+        entregados = [alerta_id for alerta_id in ids if alerta_id in confirmados]
+        pendientes = [alerta_id for alerta_id in ids if alerta_id not in confirmados]
+        self.stats['lotes'] += 1
+
+        if entregados:
+            self.persistencia.confirmar_alertas(entregados)
+            self.stats['enviadas'] += len(entregados)
+            ALERTAS_ENVIADAS.inc(len(entregados), canal=self.canal)
+            ahora = datetime.now()
+            for fila in lote:
+                if fila['id'] in confirmados:
+                    latencia = (ahora - datetime.fromisoformat(fila['creado_en'])).total_seconds()
+                    self._latencias.append(latencia)
+                    ENTREGA_ALERTA_SEGUNDOS.observe(latencia, canal=self.canal)
+
+        if pendientes:
+            intentos = max(fila['intentos'] for fila in lote if fila['id'] in pendientes)
+            espera = self.backoff_base_segundos * (2 ** intentos)
+            self.persistencia.reintentar_alertas(pendientes, error, espera, self.max_intentos)
+            self.stats['reintentos'] += len(pendientes)
+            logger.warning(f"⚠️ Outbox '{self.canal}': {len(pendientes)} alertas reprogramadas "
+                           f"en {espera:.0f}s ({error})")
+
+        if entregados:
+            logger.info(f"📤 Outbox '{self.canal}': {len(entregados)}/{len(ids)} alertas confirmadas")
+
+        return len(entregados)
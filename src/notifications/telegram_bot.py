@@ -4,13 +4,22 @@ Bot de Telegram para enviar alertas y notificaciones automáticas
 
 import asyncio
 import telegram
-from telegram.ext import Application, CommandHandler, ContextTypes
 from datetime import datetime
 import pytz
-from typing import List, Dict, Optional, Union
+from typing import TYPE_CHECKING, List, Dict, Optional, Union
 import json
 from src.utils.logger import get_logger
 from src.utils.error_handler import ErrorHandler, log_exception
+from src.utils.metrics import ENVIO_ALERTA_SEGUNDOS
+from src.notifications.dispatcher import TelegramDispatcher
+from src.notifications.templates import (
+    PLANTILLA_ALERTA_CONSENSOS, PLANTILLA_REPORTE_DIARIO, FORMATO_HORA,
+    dividir_mensaje, lineas_porcentajes, marca_tiempo
+)
+
+if TYPE_CHECKING:
+    # telegram.ext importa APScheduler: solo se carga al configurar el bot
+    from telegram.ext import ContextTypes
 
 logger = get_logger(__name__)
 
@@ -28,6 +37,7 @@ class TelegramNotifier:
         self.token = token
         self.chat_ids = chat_ids
         self.bot = telegram.Bot(token=token)
+        self.dispatcher = TelegramDispatcher(self.bot)
         self.application = None
         self.timezone = pytz.timezone('America/Argentina/Buenos_Aires')
         
@@ -36,6 +46,8 @@ class TelegramNotifier:
     async def setup_bot(self):
         """Configura la aplicación del bot"""
         try:
+            from telegram.ext import Application, CommandHandler
+            
             self.application = Application.builder().token(self.token).build()
             
             # Agregar comandos
@@ -49,7 +61,7 @@ class TelegramNotifier:
             logger.error(f"Error al configurar bot de Telegram: {e}")
             raise
     
-    async def _cmd_start(self, update, context: ContextTypes.DEFAULT_TYPE):
+    async def _cmd_start(self, update, context: 'ContextTypes.DEFAULT_TYPE'):
         """Comando /start"""
         welcome_msg = """
 🤖 *Bot de Alertas Deportivas - Fase 4*
@@ -69,7 +81,7 @@ class TelegramNotifier:
             parse_mode='Markdown'
         )
     
-    async def _cmd_status(self, update, context: ContextTypes.DEFAULT_TYPE):
+    async def _cmd_status(self, update, context: 'ContextTypes.DEFAULT_TYPE'):
         """Comando /status"""
         status_msg = f"""
 📊 *Estado del Sistema*
@@ -92,7 +104,7 @@ class TelegramNotifier:
             parse_mode='Markdown'
         )
     
-    async def _cmd_help(self, update, context: ContextTypes.DEFAULT_TYPE):
+    async def _cmd_help(self, update, context: 'ContextTypes.DEFAULT_TYPE'):
         """Comando /help"""
         help_msg = """
 🆘 *Ayuda - Bot de Alertas Deportivas*
@@ -146,36 +158,21 @@ class TelegramNotifier:
             logger.info("No hay consensos altos para alertar")
             return
         
-        # Crear mensaje de alerta
-        emoji = "🚨" if tipo == 'live' else "📊"
-        titulo = "ALERTA EN VIVO" if tipo == 'live' else "CONSENSOS ALTOS DETECTADOS"
-        
-        mensaje = f"{emoji} *{titulo}*\n\n"
-        mensaje += f"🕐 {datetime.now(self.timezone).strftime('%d/%m/%Y %H:%M ART')}\n"
-        mensaje += f"🏈 *MLB - {len(high_consensus)} consensos altos*\n\n"
-        
-        for i, consenso in enumerate(high_consensus[:5]):  # Máximo 5 para no saturar
-            equipo_vis = consenso.get('equipo_visitante', 'TBD')
-            equipo_loc = consenso.get('equipo_local', 'TBD')
-            pct_spread = consenso.get('porcentaje_spread', 0)
-            pct_total = consenso.get('porcentaje_total', 0)
-            pct_ml = consenso.get('porcentaje_moneyline', 0)
-            
-            mensaje += f"*{i+1}. {equipo_vis} @ {equipo_loc}*\n"
-            
-            if pct_spread >= 75:
-                mensaje += f"   🎯 Spread: *{pct_spread}%*\n"
-            if pct_total >= 75:
-                mensaje += f"   🔢 Total: *{pct_total}%*\n"
-            if pct_ml >= 75:
-                mensaje += f"   💰 ML: *{pct_ml}%*\n"
-            
-            mensaje += "\n"
-        
-        if len(high_consensus) > 5:
-            mensaje += f"... y {len(high_consensus) - 5} más\n\n"
-        
-        mensaje += f"📈 *Total procesados: {len(consensos)}*"
+        # Crear mensaje de alerta (todos los partidos; send_message divide si es largo)
+        mensaje = PLANTILLA_ALERTA_CONSENSOS.render(
+            {
+                'emoji': "🚨" if tipo == 'live' else "📊",
+                'titulo': "ALERTA EN VIVO" if tipo == 'live' else "CONSENSOS ALTOS DETECTADOS",
+                'fecha': marca_tiempo(self.timezone),
+                'cantidad': len(high_consensus),
+                'procesados': len(consensos)
+            },
+            ({
+                'visitante': consenso.get('equipo_visitante', 'TBD'),
+                'local': consenso.get('equipo_local', 'TBD'),
+                'lineas': lineas_porcentajes(consenso)
+            } for consenso in high_consensus)
+        )
         
         await self.send_message(mensaje)
         logger.info(f"Alerta enviada: {len(high_consensus)} consensos altos")
@@ -192,28 +189,13 @@ class TelegramNotifier:
         total_jobs = report_data.get('total_jobs_ejecutados', 0)
         estado = report_data.get('estado_sistema', 'unknown')
         
-        emoji_estado = "✅" if estado == 'operational' else "⚠️"
-        
-        mensaje = f"""
-📋 *REPORTE DIARIO - {fecha}*
-
-{emoji_estado} Estado del sistema: *{estado.upper()}*
-🔄 Jobs ejecutados: *{total_jobs}*
-🕐 Generado: {datetime.now(self.timezone).strftime('%H:%M ART')}
-
-*Resumen de actividad:*
-• Scraping diario completado
-• Monitoreo en vivo activo
-• Alertas funcionando correctamente
-
-🏈 *MLB Monitoring*
-• Fuente: covers.com
-• Frecuencia: Cada 2 horas
-• Umbral de alerta: 75%
-
----
-¡Hasta mañana! 🌙
-        """
+        mensaje = PLANTILLA_REPORTE_DIARIO.render({
+            'fecha': fecha,
+            'emoji_estado': "✅" if estado == 'operational' else "⚠️",
+            'estado': estado.upper(),
+            'total_jobs': total_jobs,
+            'hora': marca_tiempo(self.timezone, FORMATO_HORA)
+        })
         
         await self.send_message(mensaje)
         logger.info("Reporte diario enviado")
@@ -283,30 +265,35 @@ Si el problema persiste, se requiere intervención manual.
         logger.info("Estado del sistema enviado")
     
     @log_exception
-    async def send_message(self, text: str, parse_mode: str = 'Markdown'):
+    async def send_message(self, text: str, parse_mode: str = 'Markdown',
+                           chat_ids: Optional[List[str]] = None):
         """
         Envía mensaje a todos los chats configurados
         
+        Los mensajes de más de 4096 caracteres se envían en varias partes.
+        
         Args:
             text: Texto del mensaje
             parse_mode: Modo de parsing ('Markdown' o 'HTML')
+            chat_ids: Subconjunto de chats destino (None = todos)
+            
+        Returns:
+            Diccionario chat_id -> True si se entregaron todas las partes
         """
-        for chat_id in self.chat_ids:
-            try:
-                await self.bot.send_message(
-                    chat_id=chat_id,
-                    text=text,
-                    parse_mode=parse_mode,
-                    disable_web_page_preview=True
-                )
-                logger.debug(f"Mensaje enviado a chat {chat_id}")
-                
-                # Pausa entre mensajes para evitar rate limiting
-                await asyncio.sleep(0.5)
-                
-            except Exception as e:
-                logger.error(f"Error al enviar mensaje a chat {chat_id}: {e}")
-                continue
+        resultados = {}
+        
+        # Partes en orden; cada una en paralelo a todos los chats
+        with ENVIO_ALERTA_SEGUNDOS.medir(canal='telegram'):
+            for parte in dividir_mensaje(text):
+                entregados = await self.dispatcher.enviar(chat_ids or self.chat_ids, parte, parse_mode)
+                for chat_id, entregado in entregados.items():
+                    resultados[chat_id] = resultados.get(chat_id, True) and entregado
+        
+        return resultados
+    
+    def get_dispatch_stats(self) -> Dict:
+        """Métricas de envío: entregados, fallidos, RetryAfter y latencias"""
+        return self.dispatcher.get_stats()
     
     @log_exception
     async def test_connection(self) -> bool:
@@ -0,0 +1,340 @@
+"""
+Plantillas precompiladas para los mensajes de Telegram
+Los textos se compilan una sola vez (los fragmentos estáticos quedan
+cacheados), los valores se escapan para Markdown y los mensajes que
+superan el límite de Telegram (4096 caracteres) se dividen en partes.
+"""
+
+import re
+import time
+from datetime import datetime
+from functools import lru_cache
+from string import Formatter
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+# Límite de caracteres por mensaje de la API de Telegram
+LIMITE_TELEGRAM = 4096
+
+# Caracteres especiales del modo 'Markdown' (legacy) de Telegram
+_ESPECIALES_MARKDOWN = str.maketrans({c: '\\' + c for c in '_*`['})
+
+FORMATO_FECHA_HORA = '%d/%m/%Y %H:%M ART'
+FORMATO_HORA = '%H:%M ART'
+
+_PATRON_ESPECIALES = re.compile(r'[_*`\[]')
+
+# Equipos y horas se repiten en todos los mensajes: se escapan una sola vez
+_escapados: Dict[str, str] = {}
+_MAX_ESCAPADOS = 4096
+
+def escapar_markdown(texto: Any) -> str:
+    """Escapa los caracteres que Telegram interpreta en modo Markdown"""
+    texto = str(texto)
+    escapado = _escapados.get(texto)
+    if escapado is None:
+        if _PATRON_ESPECIALES.search(texto) is None:
+            escapado = texto
+        else:
+            escapado = texto.translate(_ESPECIALES_MARKDOWN)
+        if len(_escapados) >= _MAX_ESCAPADOS:
+            _escapados.clear()
+        _escapados[texto] = escapado
+    return escapado
+
+@lru_cache(maxsize=64)
+def _formatear_minuto(minuto: int, timezone, formato: str) -> str:
+    return datetime.fromtimestamp(minuto * 60, timezone).strftime(formato)
+
+def marca_tiempo(timezone, formato: str = FORMATO_FECHA_HORA) -> str:
+    """Fecha/hora actual formateada; se formatea una vez por minuto y zona"""
+    return _formatear_minuto(int(time.time() // 60), timezone, formato)
+
+def _compilar(texto: str, crudos: Iterable[str] = ()) -> Callable[..., str]:
+    """
+    Compila un texto con campos {nombre[:spec]} a una función render(valores, indice)
+
+    El texto se parsea una sola vez a una tupla de segmentos: literales tal
+    cual y campos con su conversión (escape Markdown salvo los `crudos`).
+    """
+    crudos = frozenset(crudos)
+    segmentos = []  # (literal, None, None) o (None, campo, spec o conversión)
+
+    for literal, campo, spec, _ in Formatter().parse(texto):
+        if literal:
+            segmentos.append((literal, None, None))
+        if campo is None:
+            continue
+        if not campo.isidentifier():
+            raise ValueError(f"Campo de plantilla inválido: {campo!r}")
+
+        if spec:
+            segmentos.append((None, campo, spec))
+        elif campo in crudos or campo == 'indice':
+            segmentos.append((None, campo, str))
+        else:
+            segmentos.append((None, campo, escapar_markdown))
+
+    # Fragmento sin campos: se devuelve siempre el mismo string
+    if all(campo is None for _, campo, _ in segmentos):
+        estatico = ''.join(literal for literal, _, _ in segmentos)
+        return lambda valores=None, indice=0: estatico
+
+    segmentos = tuple(segmentos)
+
+    def render(valores: Dict[str, Any], indice: int = 0) -> str:
+        partes = []
+        for literal, campo, conversion in segmentos:
+            if campo is None:
+                partes.append(literal)
+                continue
+            valor = indice if campo == 'indice' else valores[campo]
+            partes.append(format(valor, conversion) if type(conversion) is str else conversion(valor))
+        return ''.join(partes)
+
+    return render
+
+class PlantillaMensaje:
+    """Plantilla compilada: encabezado + un bloque por elemento + pie"""
+
+    def __init__(self, encabezado: str = '', item: str = '', pie: str = '', crudos: Iterable[str] = ()):
+        """
+        Args:
+            encabezado, item, pie: textos con campos {nombre}; item se repite
+            crudos: campos con Markdown propio que no deben escaparse
+        """
+        self._encabezado = _compilar(encabezado, crudos)
+        self._item = _compilar(item, crudos)
+        self._pie = _compilar(pie, crudos)
+
+    def render(self, contexto: Optional[Dict[str, Any]] = None, items: Iterable[Dict[str, Any]] = ()) -> str:
+        """
+        Renderiza el mensaje completo
+
+        Args:
+            contexto: valores del encabezado y el pie
+            items: un diccionario por bloque repetido; el campo 'indice' es su posición
+        """
+        contexto = contexto or {}
+        render_item = self._item
+
+        partes = [self._encabezado(contexto)]
+        partes.extend(render_item(item, indice) for indice, item in enumerate(items, 1))
+        partes.append(self._pie(contexto))
+
+        return ''.join(partes)
+
+def dividir_mensaje(texto: str, limite: int = LIMITE_TELEGRAM) -> List[str]:
+    """
+    Divide un mensaje en partes de como máximo `limite` caracteres
+
+    Corta preferentemente entre bloques (línea en blanco), luego entre
+    líneas y solo como último recurso en medio de una línea.
+    """
+    if len(texto) <= limite:
+        return [texto]
+
+    partes = []
+    resto = texto
+    while len(resto) > limite:
+        ventana = resto[:limite]
+        corte = ventana.rfind('\n\n')
+        if corte <= 0:
+            corte = ventana.rfind('\n')
+        if corte <= 0:
+            corte = limite
+
+        partes.append(resto[:corte].rstrip('\n'))
+        resto = resto[corte:].lstrip('\n')
+
+    if resto.strip():
+        partes.append(resto)
+
+    return partes
+
+# === FRAGMENTOS DE PORCENTAJES ===
+
+FRAGMENTO_SPREAD = "   🎯 Spread: *{}%*\n"
+FRAGMENTO_TOTAL = "   🔢 Total: *{}%*\n"
+FRAGMENTO_MONEYLINE = "   💰 ML: *{}%*\n"
+FRAGMENTO_ACTUALIZACIONES = "   🔄 {} actualizaciones en la ventana\n"
+
+_CAMPOS_PORCENTAJE = (
+    ('porcentaje_spread', 'spread', FRAGMENTO_SPREAD),
+    ('porcentaje_total', 'total', FRAGMENTO_TOTAL),
+    ('porcentaje_moneyline', 'moneyline', FRAGMENTO_MONEYLINE)
+)
+
+_UMBRALES_POR_DEFECTO = {'spread': 75, 'total': 75, 'moneyline': 75}
+
+# Los porcentajes se repiten mucho: cada línea se formatea una sola vez
+_lineas_cacheadas: Dict[tuple, str] = {}
+
+def _linea(fragmento: str, valor: Any) -> str:
+    clave = (fragmento, valor)
+    linea = _lineas_cacheadas.get(clave)
+    if linea is None:
+        linea = _lineas_cacheadas[clave] = fragmento.format(valor)
+    return linea
+
+def lineas_porcentajes(consenso: Dict[str, Any], umbrales: Optional[Dict[str, float]] = None) -> str:
+    """Líneas de spread/total/ML que superan su umbral (75% por defecto)"""
+    umbrales = umbrales or _UMBRALES_POR_DEFECTO
+    lineas = ''
+
+    actualizaciones = consenso.get('actualizaciones', 1)
+    if actualizaciones > 1:
+        lineas = _linea(FRAGMENTO_ACTUALIZACIONES, actualizaciones)
+
+    for campo, clave_umbral, fragmento in _CAMPOS_PORCENTAJE:
+        pct = consenso.get(campo, 0)
+        if pct >= umbrales.get(clave_umbral, 75):
+            lineas += _linea(fragmento, pct)
+
+    return lineas
+
+# === PLANTILLAS DE MENSAJES ===
+
+PLANTILLA_ALERTA_CONSENSOS = PlantillaMensaje(
+    encabezado=(
+        "{emoji} *{titulo}*\n\n"
+        "🕐 {fecha}\n"
+        "🏈 *MLB - {cantidad} consensos altos*\n\n"
+    ),
+    item="*{indice}. {visitante} @ {local}*\n{lineas}\n",
+    pie="📈 *Total procesados: {procesados}*",
+    crudos=('fecha', 'lineas')
+)
+
+PLANTILLA_ALERTA_DEPORTE = PlantillaMensaje(
+    encabezado=(
+        "🚨 *{titulo}*\n\n"
+        "🕐 {fecha}\n"
+        "📊 *{cantidad} consensos detectados*\n\n"
+        "⚙️ *Umbrales {sport}:*\n"
+        "  • Spread: {umbral_spread}%\n"
+        "  • Total: {umbral_total}%\n"
+        "  • ML: {umbral_moneyline}%\n\n"
+    ),
+    item="*{indice}. {visitante} @ {local}*\n{lineas}\n",
+    crudos=('fecha', 'lineas')
+)
+
+PLANTILLA_REPORTE_DIARIO = PlantillaMensaje(
+    encabezado="""
+📋 *REPORTE DIARIO - {fecha}*
+
+{emoji_estado} Estado del sistema: *{estado}*
+🔄 Jobs ejecutados: *{total_jobs}*
+🕐 Generado: {hora}
+
+*Resumen de actividad:*
+• Scraping diario completado
+• Monitoreo en vivo activo
+• Alertas funcionando correctamente
+
+🏈 *MLB Monitoring*
+• Fuente: covers.com
+• Frecuencia: Cada 2 horas
+• Umbral de alerta: 75%
+
+---
+¡Hasta mañana! 🌙
+        """
+)
+
+PLANTILLA_CAMBIO_CONSENSO = PlantillaMensaje(
+    encabezado=(
+        "🚨 **CAMBIO DETECTADO** 🚨\n\n"
+        "🏟️ **Partido:** {visitante} @ {local}\n"
+        "⏰ **Hora:** {hora_partido}\n\n"
+    ),
+    item="{linea}",
+    pie=(
+        "\n💡 **Estado Actual:**\n"
+        "  OVER: {over}\n"
+        "  UNDER: {under}\n"
+        "  Expertos: {expertos}\n"
+    ),
+    crudos=('linea',)
+)
+
+PLANTILLA_DIGEST = PlantillaMensaje(
+    encabezado="📢 *DIGEST DE ALERTAS* - {cantidad} partidos\n\n",
+    item="• {visitante} @ {local} - {direccion} {porcentaje}% \\[{urgencia}]{actualizaciones}\n",
+    crudos=('actualizaciones',)
+)
+
+FRAGMENTO_DIGEST_ACTUALIZACIONES = " (antes {}%, {} actualizaciones)".format
+
+FRAGMENTO_CAMBIO_PORCENTAJE = "📊 **Consenso:** {anterior} → {actual} ({diferencia})\n".format_map
+FRAGMENTO_CAMBIO_DIRECCION = "🔄 **Dirección:** {anterior} → {actual}\n".format_map
+
+def benchmark_render(partidos: int = 50, repeticiones: int = 200) -> Dict[str, float]:
+    """
+    Compara el render con plantillas contra la concatenación con +=
+
+    La versión += reproduce el código anterior (sin escapar valores) y
+    'concatenacion_escapada' la misma con escape, que produce el mismo
+    texto que la plantilla; devuelve milisegundos por mensaje.
+    """
+    consensos = [
+        {'equipo_visitante': f'Visitante {i}', 'equipo_local': f'Local {i}',
+         'porcentaje_spread': 80, 'porcentaje_total': 70, 'porcentaje_moneyline': 90}
+        for i in range(partidos)
+    ]
+
+    def con_concatenacion():
+        mensaje = "📊 *CONSENSOS ALTOS DETECTADOS*\n\n"
+        mensaje += f"🕐 {datetime.now().strftime(FORMATO_FECHA_HORA)}\n"
+        mensaje += f"🏈 *MLB - {len(consensos)} consensos altos*\n\n"
+        for i, c in enumerate(consensos):
+            mensaje += f"*{i+1}. {c['equipo_visitante']} @ {c['equipo_local']}*\n"
+            if c['porcentaje_spread'] >= 75:
+                mensaje += f"   🎯 Spread: *{c['porcentaje_spread']}%*\n"
+            if c['porcentaje_total'] >= 75:
+                mensaje += f"   🔢 Total: *{c['porcentaje_total']}%*\n"
+            if c['porcentaje_moneyline'] >= 75:
+                mensaje += f"   💰 ML: *{c['porcentaje_moneyline']}%*\n"
+            mensaje += "\n"
+        return mensaje
+
+    def con_concatenacion_escapada():
+        mensaje = "📊 *CONSENSOS ALTOS DETECTADOS*\n\n"
+        mensaje += f"🕐 {datetime.now().strftime(FORMATO_FECHA_HORA)}\n"
+        mensaje += f"🏈 *MLB - {len(consensos)} consensos altos*\n\n"
+        for i, c in enumerate(consensos):
+            mensaje += f"*{i+1}. {escapar_markdown(c['equipo_visitante'])} @ {escapar_markdown(c['equipo_local'])}*\n"
+            if c['porcentaje_spread'] >= 75:
+                mensaje += f"   🎯 Spread: *{c['porcentaje_spread']}%*\n"
+            if c['porcentaje_total'] >= 75:
+                mensaje += f"   🔢 Total: *{c['porcentaje_total']}%*\n"
+            if c['porcentaje_moneyline'] >= 75:
+                mensaje += f"   💰 ML: *{c['porcentaje_moneyline']}%*\n"
+            mensaje += "\n"
+        return mensaje
+
+    def con_plantilla():
+        return PLANTILLA_ALERTA_CONSENSOS.render(
+            {'emoji': '📊', 'titulo': 'CONSENSOS ALTOS DETECTADOS', 'fecha': marca_tiempo(None),
+             'cantidad': len(consensos), 'procesados': len(consensos)},
+            ({'visitante': c['equipo_visitante'], 'local': c['equipo_local'],
+              'lineas': lineas_porcentajes(c)} for c in consensos)
+        )
+
+    resultados = {}
+    for nombre, funcion in (('concatenacion', con_concatenacion),
+                            ('concatenacion_escapada', con_concatenacion_escapada),
+                            ('plantilla', con_plantilla)):
+        inicio = time.perf_counter()
+        for _ in range(repeticiones):
+            funcion()
+        resultados[nombre] = (time.perf_counter() - inicio) / repeticiones * 1000
+
+    return resultados
+
+if __name__ == "__main__":
+    for partidos in (5, 50, 500):
+        tiempos = benchmark_render(partidos)
+        print(f"{partidos:>4} partidos: += {tiempos['concatenacion']:.3f} ms | "
+              f"+= con escape {tiempos['concatenacion_escapada']:.3f} ms | "
+              f"plantilla {tiempos['plantilla']:.3f} ms")
@@ -3,60 +3,32 @@ Módulo de scraping para obtener consensos deportivos desde covers.com
 Soporte para múltiples deportes: MLB, NBA, NFL, NHL
 """
 
-from .mlb_scraper import MLBScraper
-from .scheduler import ConsensusScheduler
+from src.utils.lazy_import import atributos_perezosos
 
-# Importaciones futuras (cuando estén implementadas)
-# from .nba_scraper import NBAScraper
-# from .nfl_scraper import NFLScraper
-# from .nhl_scraper import NHLScraper
+# Se importan al primer acceso: requests/bs4, APScheduler y httpx no se
+# cargan en procesos que solo usan la cola, el pool o los temporizadores
+_EXPORTADOS = {
+    'MLBScraper': '.mlb_scraper',
+    'ConsensusScheduler': '.scheduler',
+    'AsyncMLBScraper': '.async_scraper',
+    'AsyncCoversScraper': '.covers_extractor',
+    'ExtractorConsensosCovers': '.covers_extractor',
+    'crear_scraper': '.registro_scrapers',
+    'registrar_scraper': '.registro_scrapers',
+    'deportes_registrados': '.registro_scrapers',
+    # Importaciones futuras (cuando estén implementadas)
+    # 'NBAScraper': '.nba_scraper',
+    # 'NFLScraper': '.nfl_scraper',
+    # 'NHLScraper': '.nhl_scraper',
+}
 
-__all__ = ['MLBScraper', 'ConsensusScheduler']
+__getattr__, __dir__ = atributos_perezosos(__name__, _EXPORTADOS)
 
-# Configuración de deportes disponibles
-SPORTS_CONFIG = {
-    'MLB': {
-        'scraper_class': MLBScraper,
-        'enabled': True,
-        'season_months': [3, 4, 5, 6, 7, 8, 9, 10],
-        'consensus_threshold': 75,
-        'url_base': 'https://www.covers.com/sports/mlb/consensus',
-        'schedule_url': 'https://www.covers.com/sports/mlb/schedule'
-    },
-    'NBA': {
-        'scraper_class': None,  # NBAScraper cuando esté implementado
-        'enabled': False,
-        'season_months': [10, 11, 12, 1, 2, 3, 4, 5, 6],
-        'consensus_threshold': 70,
-        'url_base': 'https://www.covers.com/sports/nba/consensus',
-        'schedule_url': 'https://www.covers.com/sports/nba/schedule'
-    },
-    'NFL': {
-        'scraper_class': None,  # NFLScraper cuando esté implementado
-        'enabled': False,
-        'season_months': [9, 10, 11, 12, 1, 2],
-        'consensus_threshold': 75,
-        'url_base': 'https://www.covers.com/sports/nfl/consensus',
-        'schedule_url': 'https://www.covers.com/sports/nfl/schedule'
-    },
-    'NHL': {
-        'scraper_class': None,  # NHLScraper cuando esté implementado
-        'enabled': False,
-        'season_months': [10, 11, 12, 1, 2, 3, 4, 5, 6],
-        'consensus_threshold': 75,
-        'url_base': 'https://www.covers.com/sports/nhl/consensus',
-        'schedule_url': 'https://www.covers.com/sports/nhl/schedule'
-    }
-}
+__all__ = ['MLBScraper', 'ConsensusScheduler', 'AsyncMLBScraper',
+           'AsyncCoversScraper', 'ExtractorConsensosCovers', 'crear_scraper', 'registrar_scraper',
+           'deportes_registrados']
 
 def get_active_sports():
-    """Obtiene los deportes activos basados en la temporada"""
-    from datetime import datetime
-    current_month = datetime.now().month
-    
-    active_sports = []
-    for sport, config in SPORTS_CONFIG.items():
-        if config['enabled'] and current_month in config['season_months']:
-            active_sports.append(sport)
-    
-    return active_sports
+    """Obtiene los deportes activos basados en la temporada (configuración unificada)"""
+    from src.utils.sports_config import get_sports_config
+    return get_sports_config().get_active_sports()
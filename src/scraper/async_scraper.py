@@ -0,0 +1,92 @@
+"""
+Interfaz asíncrona de scraping
+AsyncMLBScraper: HTTP asíncrono nativo (httpx) + parser de MLBScraper.
+Así varios partidos pueden scrapearse en paralelo sobre un mismo event loop.
+"""
+
+import asyncio
+from datetime import datetime
+from typing import Dict, List, Optional
+
+import httpx
+from bs4 import BeautifulSoup
+
+from src.utils.logger import get_logger
+from src.utils.metrics import FETCH_SEGUNDOS, PARSE_SEGUNDOS
+from src.utils.tracing import traza
+from .mlb_scraper import MLBScraper
+
+logger = get_logger(__name__)
+
+class AsyncMLBScraper:
+    """Scraper de consensos MLB con cliente HTTP asíncrono"""
+
+    def __init__(self, base_url: str = "https://contests.covers.com/consensus/topoverunderconsensus/all/expert",
+                 timeout: int = 30):
+        self.base_url = base_url
+        self.timeout = timeout
+        # El parser es el mismo del scraper síncrono; su sesión requests no se usa
+        self._parser = MLBScraper(base_url)
+        self.timezone = self._parser.timezone
+        self.client = httpx.AsyncClient(
+            headers=dict(self._parser.session.headers),
+            timeout=timeout,
+            follow_redirects=True
+        )
+
+    async def get_page_content(self, url: str, timeout: Optional[int] = None) -> Optional[BeautifulSoup]:
+        """Obtiene el contenido HTML de una página sin bloquear el event loop"""
+        try:
+            logger.info(f"Obteniendo contenido de: {url}")
+            with traza('fetch', tier='httpx', url=url), FETCH_SEGUNDOS.medir(tier='httpx'):
+                response = await self.client.get(url, timeout=timeout or self.timeout)
+            response.raise_for_status()
+
+            # El parseo es CPU: se hace fuera del loop
+            loop = asyncio.get_running_loop()
+            with traza('parse_html'), PARSE_SEGUNDOS.medir(parser='html'):
+                soup = await loop.run_in_executor(None, BeautifulSoup, response.content, 'html.parser')
+            logger.info(f"Contenido obtenido exitosamente. Tamaño: {len(response.content)} bytes")
+            return soup
+
+        except httpx.HTTPError as e:
+            logger.error(f"Error al obtener página {url}: {e}")
+            raise
+
+    async def scrape_mlb_consensus(self, date: Optional[str] = None) -> List[Dict]:
+        """Versión asíncrona de MLBScraper.scrape_mlb_consensus"""
+        if date is None:
+            date = datetime.now(self.timezone).strftime('%Y-%m-%d')
+
+        logger.info(f"Iniciando scraping asíncrono de consensos MLB para fecha: {date}")
+
+        soup = await self.get_page_content(f"{self.base_url}/{date}")
+        if not soup:
+            logger.warning(f"No se pudo obtener contenido para fecha {date}")
+            return []
+
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, self._parser.parse_consensus_page, soup, date)
+
+    async def scrape_consensus(self, date: Optional[str] = None) -> List[Dict]:
+        """Interfaz común del registro de scrapers (ver registro_scrapers)"""
+        return await self.scrape_mlb_consensus(date)
+
+    async def get_live_consensus(self) -> List[Dict]:
+        """Consensos del día actual"""
+        try:
+            return await self.scrape_mlb_consensus()
+        except Exception as e:
+            logger.error(f"Error obteniendo consensos en vivo: {e}")
+            return []
+
+    async def close(self):
+        """Cierra el cliente HTTP"""
+        await self.client.aclose()
+        self._parser.close()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.close()
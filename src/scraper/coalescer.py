@@ -0,0 +1,202 @@
+"""
+Coalescencia de scrapings pre-partido
+Los trabajos que vencen dentro de una misma ventana comparten una única
+descarga de la página de consensos y cada partido filtra su fila del
+resultado compartido.
+"""
+
+import asyncio
+import inspect
+import threading
+import time
+from concurrent.futures import Future
+from typing import Any, Callable, Dict, Optional
+
+from src.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+# Ventana por defecto: partidos de 7:05 y 7:10 comparten la misma descarga
+VENTANA_COALESCENCIA_SEGUNDOS = 300
+
+class ScrapeCoalescer:
+    """Comparte una descarga entre todos los trabajos de la misma ventana"""
+
+    def __init__(self, ventana_segundos: int = VENTANA_COALESCENCIA_SEGUNDOS):
+        self.ventana_segundos = ventana_segundos
+        self._lock = threading.Lock()
+        self._resultados: Dict[str, Dict[str, Any]] = {}  # clave -> {'valor', 'obtenido_en'}
+        self._en_vuelo: Dict[str, Dict[str, Any]] = {}     # clave -> {'evento', 'valor', 'error'}
+        self._en_vuelo_async: Dict[str, asyncio.Future] = {}
+        self._en_vuelo_futuros: Dict[str, Future] = {}
+        self.stats = {
+            'descargas': 0,
+            'reutilizados': 0,
+            'esperas_compartidas': 0,
+            'errores': 0
+        }
+
+    def obtener(self, clave: str, fetch: Callable[[], Any]) -> Any:
+        """
+        Devuelve el resultado de fetch() compartido por clave (thread-safe)
+
+        Si hay un resultado dentro de la ventana se reutiliza; si otra
+        llamada ya está descargando, se espera a esa misma descarga.
+        """
+        with self._lock:
+            valor = self._resultado_vigente(clave)
+            if valor is not None:
+                self.stats['reutilizados'] += 1
+                return valor
+
+            vuelo = self._en_vuelo.get(clave)
+            propietario = vuelo is None
+            if propietario:
+                vuelo = {'evento': threading.Event(), 'valor': None, 'error': None}
+                self._en_vuelo[clave] = vuelo
+            else:
+                self.stats['esperas_compartidas'] += 1
+
+        if not propietario:
+            vuelo['evento'].wait()
+            if vuelo['error'] is not None:
+                raise vuelo['error']
+            return vuelo['valor']
+
+        try:
+            valor = fetch()
+            vuelo['valor'] = valor
+            self._guardar_resultado(clave, valor)
+            return valor
+        except Exception as e:
+            vuelo['error'] = e
+            with self._lock:
+                self.stats['errores'] += 1
+            raise
+        finally:
+            with self._lock:
+                self._en_vuelo.pop(clave, None)
+            vuelo['evento'].set()
+
+    async def obtener_async(self, clave: str, fetch: Callable[[], Any]) -> Any:
+        """
+        Versión asíncrona de obtener() para el AsyncIOScheduler
+
+        fetch puede devolver un valor o un awaitable.
+        """
+        with self._lock:
+            valor = self._resultado_vigente(clave)
+            if valor is not None:
+                self.stats['reutilizados'] += 1
+                return valor
+
+            futuro = self._en_vuelo_async.get(clave)
+            propietario = futuro is None
+            if propietario:
+                futuro = asyncio.get_running_loop().create_future()
+                self._en_vuelo_async[clave] = futuro
+            else:
+                self.stats['esperas_compartidas'] += 1
+
+        if not propietario:
+            # shield: si un partido se cancela no cancela la descarga de los demás
+            return await asyncio.shield(futuro)
+
+        try:
+            valor = fetch()
+            if inspect.isawaitable(valor):
+                valor = await valor
+            self._guardar_resultado(clave, valor)
+            futuro.set_result(valor)
+            return valor
+        except Exception as e:
+            with self._lock:
+                self.stats['errores'] += 1
+            futuro.set_exception(e)
+            # Marcar la excepción como recuperada si nadie más esperaba
+            futuro.exception()
+            raise
+        except BaseException:
+            # Se canceló la corutina dueña: los que esperaban no quedan colgados
+            with self._lock:
+                self.stats['errores'] += 1
+            futuro.cancel()
+            raise
+        finally:
+            with self._lock:
+                if self._en_vuelo_async.get(clave) is futuro:
+                    del self._en_vuelo_async[clave]
+
+    def obtener_futuro(self, clave: str, crear: Callable[[], Future]) -> Future:
+        """
+        Versión no bloqueante: comparte el Future de un trabajo en curso
+
+        crear() debe encolar el trabajo (p.ej. ScrapePool.enviar) y devolver
+        su Future; dentro de la ventana se devuelve un Future ya resuelto.
+        """
+        with self._lock:
+            valor = self._resultado_vigente(clave)
+            if valor is not None:
+                self.stats['reutilizados'] += 1
+                futuro = Future()
+                futuro.set_result(valor)
+                return futuro
+
+            futuro = self._en_vuelo_futuros.get(clave)
+            if futuro is not None:
+                self.stats['esperas_compartidas'] += 1
+                return futuro
+
+            futuro = crear()
+            self._en_vuelo_futuros[clave] = futuro
+
+        futuro.add_done_callback(lambda f: self._completar_futuro(clave, f))
+        return futuro
+
+    def invalidar(self, clave: Optional[str] = None):
+        """Descarta el resultado compartido de una clave (o de todas)"""
+        with self._lock:
+            if clave is None:
+                self._resultados.clear()
+            else:
+                self._resultados.pop(clave, None)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Estadísticas de descargas compartidas"""
+        with self._lock:
+            solicitudes = self.stats['descargas'] + self.stats['reutilizados'] + self.stats['esperas_compartidas']
+            return {
+                **self.stats,
+                'ventana_segundos': self.ventana_segundos,
+                'solicitudes': solicitudes,
+                'descargas_evitadas': solicitudes - self.stats['descargas']
+            }
+
+    def _completar_futuro(self, clave: str, futuro: Future):
+        """Libera la clave en vuelo y comparte el resultado si fue exitoso"""
+        with self._lock:
+            if self._en_vuelo_futuros.get(clave) is futuro:
+                del self._en_vuelo_futuros[clave]
+
+        if futuro.cancelled() or futuro.exception() is not None:
+            with self._lock:
+                self.stats['errores'] += 1
+            return
+
+        self._guardar_resultado(clave, futuro.result())
+
+    def _resultado_vigente(self, clave: str) -> Any:
+        """Resultado dentro de la ventana o None (requiere lock)"""
+        entrada = self._resultados.get(clave)
+        if entrada and time.monotonic() - entrada['obtenido_en'] <= self.ventana_segundos:
+            return entrada['valor']
+        return None
+
+    def _guardar_resultado(self, clave: str, valor: Any):
+        """Registra una descarga; los resultados vacíos no se comparten en la ventana"""
+        with self._lock:
+            self.stats['descargas'] += 1
+            if valor:
+                self._resultados[clave] = {'valor': valor, 'obtenido_en': time.monotonic()}
+
+        logger.debug("🔗 Descarga compartida '%s' (%s registros)", clave, len(valor) if valor else 0)
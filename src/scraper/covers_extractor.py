@@ -0,0 +1,190 @@
+"""
+Extractor genérico de consensos de covers.com
+La tabla de consensos de totales tiene la misma forma en todos los
+deportes; lo que cambia es la URL, el orden de las columnas y el rango de
+la línea de total. ExtractorConsensosCovers recibe eso en un PerfilCovers
+y devuelve filas con el mismo formato que MLBScraper.
+"""
+
+import asyncio
+import re
+from datetime import datetime
+from typing import Dict, List, Optional
+
+import httpx
+import pytz
+from bs4 import BeautifulSoup
+
+from src.utils.logger import get_logger
+from src.utils.metrics import FETCH_SEGUNDOS, FILAS_EXTRAIDAS, PARSE_SEGUNDOS
+from src.utils.tracing import traza
+from .registro_scrapers import PerfilCovers
+
+logger = get_logger(__name__)
+
+# "CHI @ HOU" o "CHI@HOU", en cualquier celda
+PATRON_EQUIPOS = re.compile(r'\b([A-Z]{2,4})\s*@\s*([A-Z]{2,4})\b')
+# "CHI HOU" solo en la celda del partido: "7:05 PM ET" tiene la misma forma
+PATRON_EQUIPOS_SIN_ARROBA = re.compile(r'\b([A-Z]{2,4})\s+([A-Z]{2,4})\b')
+PATRON_HORA = re.compile(r'(\d{1,2}:\d{2}\s*[ap]m\s*ET)', re.IGNORECASE)
+PATRON_CONSENSO = re.compile(r'(\d+)%\s*(Over|Under)', re.IGNORECASE)
+PATRON_NUMERO = re.compile(r'\d+(?:\.\d+)?')
+
+ENCABEZADOS_HTTP = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
+    'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8',
+    'Accept-Language': 'es-ES,es;q=0.8,en-US;q=0.5,en;q=0.3',
+}
+
+class ExtractorConsensosCovers:
+    """Parser de la tabla de consensos de covers.com según el perfil del deporte"""
+
+    def __init__(self, perfil: PerfilCovers):
+        self.perfil = perfil
+        self.timezone = pytz.timezone('America/Argentina/Buenos_Aires')
+
+    def url(self, fecha: str) -> str:
+        return f"{self.perfil.url_base}/{fecha}"
+
+    def parse_consensus_page(self, soup: BeautifulSoup, fecha: str) -> List[Dict]:
+        """Consensos válidos de la página (una fila por partido)"""
+        parser = f"covers_{self.perfil.deporte.lower()}"
+        with traza('parse', parser=parser) as span, PARSE_SEGUNDOS.medir(parser=parser):
+            tabla = soup.find('table', class_='responsive') or soup.find('table')
+            if not tabla:
+                logger.warning(f"⚠️ No se encontró la tabla de consensos de {self.perfil.deporte}")
+                return []
+
+            consensos = []
+            for fila in tabla.find_all('tr'):
+                consenso = self._extraer_fila([celda.get_text(' ', strip=True) for celda in fila.find_all('td')], fecha)
+                if consenso:
+                    consensos.append(consenso)
+            span.atributos['consensos'] = len(consensos)
+
+        FILAS_EXTRAIDAS.inc(len(consensos), parser=parser)
+        logger.info(f"✅ {len(consensos)} consensos de {self.perfil.deporte} extraídos")
+        return consensos
+
+    def _buscar(self, textos: List[str], campo: str, patron: re.Pattern) -> Optional[re.Match]:
+        """Busca en la columna del perfil y, si ahí no aparece, en el resto de la fila"""
+        indice = self.perfil.columnas.get(campo)
+        orden = ([textos[indice]] if indice is not None and indice < len(textos) else []) + textos
+        for texto in orden:
+            coincidencia = patron.search(texto)
+            if coincidencia:
+                return coincidencia
+        return None
+
+    def _celda(self, textos: List[str], campo: str) -> str:
+        indice = self.perfil.columnas.get(campo)
+        return textos[indice] if indice is not None and indice < len(textos) else ''
+
+    def _extraer_fila(self, textos: List[str], fecha: str) -> Optional[Dict]:
+        """Fila de la tabla -> consenso (None si no tiene equipos y consenso o expertos)"""
+        if len(textos) < 3:
+            return None
+
+        equipos = (self._buscar(textos, 'partido', PATRON_EQUIPOS)
+                   or PATRON_EQUIPOS_SIN_ARROBA.search(self._celda(textos, 'partido')))
+        if not equipos:
+            return None
+        visitante, local = equipos.group(1), equipos.group(2)
+
+        over = under = 0
+        direccion = ''
+        consenso = self._buscar(textos, 'consenso', PATRON_CONSENSO)
+        if consenso:
+            porcentaje = int(consenso.group(1))
+            direccion = consenso.group(2).upper()
+            over, under = (porcentaje, 100 - porcentaje) if direccion == 'OVER' else (100 - porcentaje, porcentaje)
+
+        minimo, maximo = self.perfil.rango_total
+        total = next(
+            (float(n) for texto in [self._celda(textos, 'total')] + textos
+             for n in PATRON_NUMERO.findall(texto) if minimo <= float(n) <= maximo),
+            0.0
+        )
+
+        # "15 + 4" = 19 expertos; solo en su columna para no confundirlos con la línea
+        numeros = [int(n) for n in re.findall(r'\b\d+\b', self._celda(textos, 'expertos')) if 1 <= int(n) <= 100]
+        expertos = sum(numeros[:2])
+
+        if not direccion and not expertos:
+            return None
+
+        hora = self._buscar(textos, 'hora', PATRON_HORA)
+        porcentaje_consenso = max(over, under) if direccion else 0
+        return {
+            'fecha': fecha,
+            'fecha_scraping': datetime.now(self.timezone).isoformat(),
+            'deporte': self.perfil.deporte,
+            'tipo_consenso': 'TOTAL',
+            'equipo_local': local,
+            'equipo_visitante': visitante,
+            'total_line': total,
+            'consenso_over': over,
+            'consenso_under': under,
+            'porcentaje_consenso': porcentaje_consenso,
+            'porcentaje_total': porcentaje_consenso,
+            'direccion_consenso': direccion,
+            'num_experts': expertos,
+            'hora_partido': hora.group(1) if hora else '',
+            'url_fuente': self.perfil.url_base
+        }
+
+class AsyncCoversScraper:
+    """Scraper asíncrono de consensos de covers.com para cualquier deporte con perfil"""
+
+    def __init__(self, perfil: PerfilCovers, timeout: int = 30):
+        self.perfil = perfil
+        self.timeout = timeout
+        self.extractor = ExtractorConsensosCovers(perfil)
+        self.timezone = self.extractor.timezone
+        self.client = httpx.AsyncClient(headers=ENCABEZADOS_HTTP, timeout=timeout, follow_redirects=True)
+
+    async def get_page_content(self, url: str, timeout: Optional[int] = None) -> Optional[BeautifulSoup]:
+        """Descarga y parsea el HTML sin bloquear el event loop"""
+        try:
+            with traza('fetch', tier='httpx', url=url), FETCH_SEGUNDOS.medir(tier='httpx'):
+                response = await self.client.get(url, timeout=timeout or self.timeout)
+            response.raise_for_status()
+
+            loop = asyncio.get_running_loop()
+            with traza('parse_html'), PARSE_SEGUNDOS.medir(parser='html'):
+                return await loop.run_in_executor(None, BeautifulSoup, response.content, 'html.parser')
+
+        except httpx.HTTPError as e:
+            logger.error(f"❌ Error al obtener página {url}: {e}")
+            raise
+
+    async def scrape_consensus(self, date: Optional[str] = None) -> List[Dict]:
+        """Consensos del deporte para la fecha (hoy por defecto)"""
+        if date is None:
+            date = datetime.now(self.timezone).strftime('%Y-%m-%d')
+
+        logger.info(f"🕷️ Scraping de consensos {self.perfil.deporte} para fecha: {date}")
+        soup = await self.get_page_content(self.extractor.url(date))
+        if not soup:
+            return []
+
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, self.extractor.parse_consensus_page, soup, date)
+
+    async def get_live_consensus(self) -> List[Dict]:
+        """Consensos del día actual"""
+        try:
+            return await self.scrape_consensus()
+        except Exception as e:
+            logger.error(f"❌ Error obteniendo consensos en vivo de {self.perfil.deporte}: {e}")
+            return []
+
+    async def close(self):
+        """Cierra el cliente HTTP"""
+        await self.client.aclose()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.close()
@@ -0,0 +1,285 @@
+"""
+Cola única de trabajos de scraping con plazos (deadline)
+Todos los schedulers (APScheduler, AsyncIOScheduler, schedule) encolan aquí
+sus trabajos: se despachan por prioridad y, dentro de cada prioridad, por
+plazo más próximo (EDF). El control de admisión rechaza o desplaza trabajos
+de baja prioridad cuando la cola no puede cumplir sus plazos.
+
+Un trabajo puede devolver un Future (p.ej. el de ScrapePool.enviar): la cola
+lo despacha en orden y su Future se resuelve cuando termina ese otro
+ejecutor, sin que un worker quede bloqueado esperándolo.
+"""
+
+import heapq
+import itertools
+import threading
+import time
+from concurrent.futures import CancelledError, Future
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from src.utils.logger import get_logger
+from src.utils.metrics import PROFUNDIDAD_COLA
+
+logger = get_logger(__name__)
+
+# Prioridades (menor = más urgente)
+PRIORIDAD_PREPARTIDO = 0
+PRIORIDAD_EN_VIVO = 1
+PRIORIDAD_DIARIO = 2
+PRIORIDAD_BACKFILL = 3
+PRIORIDAD_REPORTE = 4
+
+NOMBRES_PRIORIDAD = {
+    PRIORIDAD_PREPARTIDO: 'prepartido',
+    PRIORIDAD_EN_VIVO: 'en_vivo',
+    PRIORIDAD_DIARIO: 'diario',
+    PRIORIDAD_BACKFILL: 'backfill',
+    PRIORIDAD_REPORTE: 'reporte'
+}
+
+# Plazo por defecto si el trabajo no indica deadline
+PLAZO_POR_DEFECTO_SEGUNDOS = 3600
+
+class TrabajoRechazadoError(Exception):
+    """El trabajo no fue admitido, fue desplazado o venció su plazo en cola"""
+    pass
+
+class DeadlineJobQueue:
+    """Cola de trabajos con prioridad + EDF y control de admisión"""
+
+    def __init__(self, max_workers: int = 2, max_pendientes: int = 50,
+                 duracion_estimada_segundos: float = 60):
+        self.max_workers = max_workers
+        self.max_pendientes = max_pendientes
+        self.duracion_estimada_segundos = duracion_estimada_segundos
+
+        self._heap = []  # (prioridad, deadline, secuencia, trabajo)
+        self._condicion = threading.Condition()
+        self._secuencia = itertools.count()
+        self._workers: List[threading.Thread] = []
+        self._en_ejecucion = 0
+        self.is_running = False
+        self.stats = {
+            'admitidos': 0,
+            'completados': 0,
+            'errores': 0,
+            'rechazados': 0,
+            'desplazados': 0,
+            'expirados': 0,
+            'fuera_de_plazo': 0
+        }
+        PROFUNDIDAD_COLA.set_funcion(lambda: len(self._heap), cola='job_queue')
+
+    def start(self):
+        """Inicia los workers de la cola"""
+        with self._condicion:
+            if self.is_running:
+                return
+            self.is_running = True
+
+            for i in range(self.max_workers):
+                worker = threading.Thread(target=self._worker, name=f"job-queue-{i}", daemon=True)
+                worker.start()
+                self._workers.append(worker)
+
+        logger.info(f"📋 Cola de trabajos iniciada con {self.max_workers} workers")
+
+    def stop(self):
+        """Detiene los workers; los trabajos pendientes se rechazan"""
+        with self._condicion:
+            self.is_running = False
+            pendientes = [entrada[3] for entrada in self._heap]
+            self._heap = []
+            self._condicion.notify_all()
+
+        for trabajo in pendientes:
+            self._rechazar(trabajo, "Cola detenida")
+
+        for worker in self._workers:
+            worker.join(timeout=5)
+        self._workers = []
+
+        logger.info("🛑 Cola de trabajos detenida")
+
+    def enviar(self, nombre: str, funcion: Callable, *args, deadline: Optional[datetime] = None,
+               prioridad: int = PRIORIDAD_DIARIO, duracion_estimada: Optional[float] = None,
+               **kwargs) -> Future:
+        """
+        Encola un trabajo
+
+        Args:
+            nombre: nombre descriptivo (para logs y métricas)
+            funcion: callable a ejecutar en un worker
+            deadline: momento límite para terminar (p.ej. inicio del partido)
+            prioridad: PRIORIDAD_* (menor = más urgente)
+            duracion_estimada: segundos estimados, para el control de admisión
+
+        Returns:
+            Future con el resultado; falla con TrabajoRechazadoError si no se admite
+        """
+        if not self.is_running:
+            self.start()
+
+        ahora = time.time()
+        trabajo = {
+            'nombre': nombre,
+            'funcion': funcion,
+            'args': args,
+            'kwargs': kwargs,
+            'prioridad': prioridad,
+            'deadline': deadline.timestamp() if deadline else ahora + PLAZO_POR_DEFECTO_SEGUNDOS,
+            'duracion': duracion_estimada or self.duracion_estimada_segundos,
+            'encolado_en': ahora,
+            'futuro': Future()
+        }
+
+        with self._condicion:
+            motivo, desplazado = self._admitir(trabajo, ahora)
+            if motivo is None:
+                heapq.heappush(self._heap, self._entrada(trabajo))
+                self.stats['admitidos'] += 1
+                self._condicion.notify()
+
+        # Los Futures se resuelven fuera del lock: sus callbacks pueden volver a la cola
+        if desplazado is not None:
+            self._rechazar(desplazado, f"Desplazado por {nombre}")
+
+        if motivo is not None:
+            self._rechazar(trabajo, motivo)
+            with self._condicion:
+                self.stats['rechazados'] += 1
+        else:
+            logger.debug("📥 Trabajo admitido %s (prioridad %s)", nombre, NOMBRES_PRIORIDAD.get(prioridad, prioridad))
+
+        return trabajo['futuro']
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Profundidad de cola por prioridad y contadores"""
+        with self._condicion:
+            por_prioridad = {}
+            for prioridad, _, _, _ in self._heap:
+                nombre = NOMBRES_PRIORIDAD.get(prioridad, str(prioridad))
+                por_prioridad[nombre] = por_prioridad.get(nombre, 0) + 1
+
+            return {
+                'en_cola': len(self._heap),
+                'en_cola_por_prioridad': por_prioridad,
+                'en_ejecucion': self._en_ejecucion,
+                'max_workers': self.max_workers,
+                **self.stats
+            }
+
+    def _entrada(self, trabajo: Dict[str, Any]) -> tuple:
+        """Orden del heap: prioridad, luego plazo más próximo"""
+        return (trabajo['prioridad'], trabajo['deadline'], next(self._secuencia), trabajo)
+
+    def _admitir(self, trabajo: Dict[str, Any], ahora: float) -> Tuple[Optional[str], Optional[Dict[str, Any]]]:
+        """
+        Control de admisión (requiere lock)
+
+        Returns:
+            (motivo de rechazo o None, trabajo desplazado o None); el
+            desplazado ya salió del heap y lo rechaza quien llama, sin el lock
+        """
+        clave = (trabajo['prioridad'], trabajo['deadline'])
+
+        # Los trabajos pre-partido se admiten siempre; el resto, si llega a su plazo
+        if trabajo['prioridad'] != PRIORIDAD_PREPARTIDO:
+            # Estimar cuándo terminaría detrás de los trabajos que se despachan antes
+            trabajo_previo = sum(e[3]['duracion'] for e in self._heap if (e[0], e[1]) <= clave)
+            fin_estimado = ahora + (trabajo_previo / self.max_workers) + trabajo['duracion']
+            if fin_estimado > trabajo['deadline']:
+                return "No puede cumplir su plazo", None
+
+        # Cola llena: desplazar el peor trabajo si el nuevo es más importante
+        if len(self._heap) >= self.max_pendientes:
+            peor = max(self._heap, key=lambda e: (e[0], e[1]))
+            if clave >= (peor[0], peor[1]):
+                return "Cola llena", None
+            self._heap.remove(peor)
+            heapq.heapify(self._heap)
+            self.stats['desplazados'] += 1
+            return None, peor[3]
+
+        return None, None
+
+    def _rechazar(self, trabajo: Dict[str, Any], motivo: str):
+        """Falla el Future de un trabajo no ejecutado"""
+        logger.warning(f"⛔ Trabajo {trabajo['nombre']} rechazado: {motivo}")
+        futuro = trabajo['futuro']
+        if futuro.set_running_or_notify_cancel():
+            futuro.set_exception(TrabajoRechazadoError(f"{trabajo['nombre']}: {motivo}"))
+
+    def _worker(self):
+        """Despacha trabajos por prioridad/EDF"""
+        while True:
+            with self._condicion:
+                while self.is_running and not self._heap:
+                    self._condicion.wait()
+                if not self.is_running:
+                    return
+
+                _, deadline, _, trabajo = heapq.heappop(self._heap)
+
+                if time.time() > deadline:
+                    self.stats['expirados'] += 1
+                    vencido = True
+                else:
+                    vencido = False
+                    self._en_ejecucion += 1
+
+            if vencido:
+                self._rechazar(trabajo, "Plazo vencido en cola")
+                continue
+
+            try:
+                self._ejecutar(trabajo)
+            finally:
+                with self._condicion:
+                    self._en_ejecucion -= 1
+
+    def _ejecutar(self, trabajo: Dict[str, Any]):
+        """Ejecuta un trabajo y resuelve su Future (o lo encadena si devuelve uno)"""
+        futuro = trabajo['futuro']
+        if not futuro.set_running_or_notify_cancel():
+            return
+
+        try:
+            resultado = trabajo['funcion'](*trabajo['args'], **trabajo['kwargs'])
+        except Exception as e:
+            self._fallar(trabajo, e)
+            return
+
+        if isinstance(resultado, Future):
+            # Despachado a otro ejecutor: el worker queda libre para el siguiente
+            resultado.add_done_callback(lambda interno: self._completar_encadenado(trabajo, interno))
+            return
+
+        self._resolver(trabajo, resultado)
+
+    def _completar_encadenado(self, trabajo: Dict[str, Any], interno: Future):
+        """Traslada el resultado del Future devuelto por el trabajo"""
+        if interno.cancelled():
+            self._fallar(trabajo, CancelledError(f"{trabajo['nombre']} cancelado"))
+        elif interno.exception() is not None:
+            self._fallar(trabajo, interno.exception())
+        else:
+            self._resolver(trabajo, interno.result())
+
+    def _resolver(self, trabajo: Dict[str, Any], resultado: Any):
+        with self._condicion:
+            self.stats['completados'] += 1
+            if time.time() > trabajo['deadline']:
+                self.stats['fuera_de_plazo'] += 1
+
+        trabajo['futuro'].set_result(resultado)
+
+    def _fallar(self, trabajo: Dict[str, Any], error: BaseException):
+        logger.error(f"❌ Error en trabajo {trabajo['nombre']}: {error}")
+        with self._condicion:
+            self.stats['errores'] += 1
+        trabajo['futuro'].set_exception(error)
+
+# Cola compartida por todos los schedulers del proceso
+cola_trabajos = DeadlineJobQueue()
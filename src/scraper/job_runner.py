@@ -0,0 +1,176 @@
+"""
+Ejecutor de trabajos de scraping en segundo plano
+La app encola un scraping y recibe un ID de trabajo; el scraping corre en
+un thread del proceso y publica progreso, filas parciales y resultado en
+un almacén compartido (tabla trabajos_scraping). Todas las sesiones que
+piden el mismo scraping (misma clave) comparten el trabajo en vuelo en
+lugar de abrir cada una su propio Chrome.
+"""
+
+import itertools
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, List, Optional
+
+from src.utils.logger import get_logger
+from src.utils.metrics import PROFUNDIDAD_COLA
+
+logger = get_logger(__name__)
+
+# Estados de un trabajo
+ESTADO_EN_COLA = 'en_cola'
+ESTADO_EJECUTANDO = 'ejecutando'
+ESTADO_COMPLETADO = 'completado'
+ESTADO_ERROR = 'error'
+
+ESTADOS_ACTIVOS = (ESTADO_EN_COLA, ESTADO_EJECUTANDO)
+
+# Un trabajo activo sin actualizaciones durante este tiempo se da por abandonado
+TRABAJO_EXPIRA_SEGUNDOS = 900
+
+class ProgresoTrabajo:
+    """Canal por el que la función del trabajo publica su avance"""
+
+    def __init__(self, trabajo_id: str, persistencia):
+        self.trabajo_id = trabajo_id
+        self.persistencia = persistencia
+
+    def reportar(self, porcentaje: int, mensaje: str, filas: Optional[List[Dict[str, Any]]] = None):
+        """Publica porcentaje (0-100), mensaje y, opcionalmente, las filas obtenidas hasta ahora"""
+        try:
+            self.persistencia.actualizar_trabajo_scraping(
+                self.trabajo_id, progreso=max(0, min(100, int(porcentaje))), mensaje=mensaje, filas=filas
+            )
+        except Exception as e:
+            logger.error(f"❌ Error publicando progreso de {self.trabajo_id}: {e}")
+
+class ScrapeJobRunner:
+    """Encola scrapings, los ejecuta en segundo plano y comparte los que están en vuelo"""
+
+    def __init__(self, persistencia=None, max_workers: int = 1):
+        """
+        Args:
+            persistencia: objeto con los métodos de trabajos de DataManager
+                          (por defecto el data_manager global)
+            max_workers: scrapings simultáneos; 1 = un único Chrome por proceso
+        """
+        if persistencia is None:
+            from src.database.data_manager import data_manager
+            persistencia = data_manager
+
+        self.persistencia = persistencia
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="scrape-job")
+        self._lock = threading.Lock()
+        self._en_vuelo: Dict[str, str] = {}  # clave -> trabajo_id
+        self._secuencia = itertools.count(1)
+        self.stats = {
+            'enviados': 0,
+            'compartidos': 0,
+            'completados': 0,
+            'errores': 0
+        }
+        PROFUNDIDAD_COLA.set_funcion(lambda: len(self._en_vuelo), cola='scrape_jobs')
+
+    def enviar(self, tipo: str, funcion: Callable[[ProgresoTrabajo], Dict[str, Any]],
+               clave: Optional[str] = None) -> str:
+        """
+        Encola un scraping o se une al que ya está en vuelo con la misma clave
+
+        Args:
+            tipo: nombre del trabajo ('robusto', 'manual', ...)
+            funcion: función(progreso) que ejecuta el scraping y devuelve un dict
+                     resultado; si incluye 'filas' se publican como filas finales
+            clave: identifica trabajos equivalentes (por defecto tipo + fecha de hoy)
+
+        Returns:
+            ID del trabajo (nuevo o compartido)
+        """
+        clave = clave or f"{tipo}_{datetime.now().strftime('%Y-%m-%d')}"
+
+        with self._lock:
+            trabajo_id = self._en_vuelo.get(clave) or self._trabajo_activo_externo(clave)
+            if trabajo_id:
+                self.stats['compartidos'] += 1
+                logger.info(f"🔗 Scraping '{clave}' ya en curso, se comparte el trabajo {trabajo_id}")
+                return trabajo_id
+
+            trabajo_id = f"job_{datetime.now().strftime('%Y%m%d_%H%M%S')}_{next(self._secuencia)}"
+            self.persistencia.crear_trabajo_scraping(trabajo_id, tipo, clave)
+            self._en_vuelo[clave] = trabajo_id
+            self.stats['enviados'] += 1
+
+        self._executor.submit(self._ejecutar, trabajo_id, clave, funcion)
+        logger.info(f"📥 Trabajo de scraping encolado: {trabajo_id} ({clave})")
+        return trabajo_id
+
+    def estado(self, trabajo_id: str) -> Optional[Dict[str, Any]]:
+        """Estado, progreso, filas parciales y resultado del trabajo (desde el almacén)"""
+        try:
+            return self.persistencia.obtener_trabajo_scraping(trabajo_id)
+        except Exception as e:
+            logger.error(f"❌ Error leyendo el trabajo {trabajo_id}: {e}")
+            return None
+
+    def trabajo_activo(self, tipo: str, clave: Optional[str] = None) -> Optional[str]:
+        """ID del trabajo en vuelo para esa clave, si lo hay"""
+        clave = clave or f"{tipo}_{datetime.now().strftime('%Y-%m-%d')}"
+        with self._lock:
+            return self._en_vuelo.get(clave) or self._trabajo_activo_externo(clave)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Contadores del ejecutor"""
+        with self._lock:
+            return {**self.stats, 'en_vuelo': len(self._en_vuelo)}
+
+    def _trabajo_activo_externo(self, clave: str) -> Optional[str]:
+        """
+        Trabajo activo registrado por otro proceso (requiere lock)
+
+        Si lleva más de TRABAJO_EXPIRA_SEGUNDOS sin actualizarse se marca como
+        abandonado (p.ej. el proceso que lo ejecutaba se reinició).
+        """
+        trabajo = self.persistencia.obtener_trabajo_activo(clave)
+        if not trabajo:
+            return None
+
+        actualizado = datetime.fromisoformat(trabajo['actualizado_en'])
+        if datetime.now() - actualizado > timedelta(seconds=TRABAJO_EXPIRA_SEGUNDOS):
+            self.persistencia.actualizar_trabajo_scraping(
+                trabajo['id'], estado=ESTADO_ERROR, error="Trabajo abandonado (sin progreso)"
+            )
+            logger.warning(f"⚠️ Trabajo {trabajo['id']} abandonado, se lanza uno nuevo")
+            return None
+
+        return trabajo['id']
+
+    def _ejecutar(self, trabajo_id: str, clave: str, funcion: Callable[[ProgresoTrabajo], Dict[str, Any]]):
+        """Corre la función del trabajo y publica el resultado final"""
+        progreso = ProgresoTrabajo(trabajo_id, self.persistencia)
+
+        try:
+            self.persistencia.actualizar_trabajo_scraping(trabajo_id, estado=ESTADO_EJECUTANDO)
+            resultado = funcion(progreso) or {}
+            filas = resultado.pop('filas', None)
+            final = dict(estado=ESTADO_COMPLETADO, progreso=100, mensaje="Completado",
+                         filas=filas, resultado=resultado)
+        except Exception as e:
+            final = dict(estado=ESTADO_ERROR, error=str(e))
+            logger.error(f"❌ Error en trabajo de scraping {trabajo_id}: {e}")
+
+        # Estado final y liberación de la clave juntos: quien vea el trabajo
+        # terminado ya puede lanzar otro con la misma clave
+        with self._lock:
+            try:
+                self.persistencia.actualizar_trabajo_scraping(trabajo_id, **final)
+            except Exception as e:
+                logger.error(f"❌ Error registrando el final de {trabajo_id}: {e}")
+            if self._en_vuelo.get(clave) == trabajo_id:
+                del self._en_vuelo[clave]
+            self.stats['completados' if final['estado'] == ESTADO_COMPLETADO else 'errores'] += 1
+
+        if final['estado'] == ESTADO_COMPLETADO:
+            logger.info(f"✅ Trabajo de scraping completado: {trabajo_id}")
+
+# Ejecutor global: lo comparten todas las sesiones de la app en este proceso
+trabajos_scraping = ScrapeJobRunner()
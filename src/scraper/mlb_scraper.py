@@ -13,6 +13,8 @@ import logging
 import re
 from src.utils.logger import get_logger
 from src.utils.error_handler import ErrorHandler, retry_on_failure, log_exception
+from src.utils.metrics import FETCH_SEGUNDOS, FILAS_EXTRAIDAS, PARSE_SEGUNDOS
+from src.utils.tracing import traza
 
 logger = get_logger(__name__)
 
@@ -38,10 +40,12 @@ class MLBScraper:
         """Obtiene el contenido HTML de una página (versión síncrona)"""
         try:
             logger.info(f"Obteniendo contenido de: {url}")
-            response = self.session.get(url, timeout=timeout)
+            with traza('fetch', tier='requests', url=url), FETCH_SEGUNDOS.medir(tier='requests'):
+                response = self.session.get(url, timeout=timeout)
             response.raise_for_status()
             
-            soup = BeautifulSoup(response.content, 'html.parser')
+            with traza('parse_html', bytes=len(response.content)), PARSE_SEGUNDOS.medir(parser='html'):
+                soup = BeautifulSoup(response.content, 'html.parser')
             logger.info(f"Contenido obtenido exitosamente. Tamaño: {len(response.content)} bytes")
             return soup
             
@@ -80,6 +84,23 @@ class MLBScraper:
             logger.warning(f"No se pudo obtener contenido para fecha {date}")
             return []
         
+        return self.parse_consensus_page(soup, date)
+    
+    def parse_consensus_page(self, soup: BeautifulSoup, date: str) -> List[Dict]:
+        """
+        Extrae los consensos de la página ya descargada
+        
+        Separado de la descarga para reutilizarlo desde el scraper asíncrono.
+        """
+        with traza('parse', parser='covers_tabla') as span, PARSE_SEGUNDOS.medir(parser='covers_tabla'):
+            consensos = self._parse_consensus_page(soup, date)
+            span.atributos['consensos'] = len(consensos)
+        
+        FILAS_EXTRAIDAS.inc(len(consensos), parser='covers_tabla')
+        return consensos
+    
+    def _parse_consensus_page(self, soup: BeautifulSoup, date: str) -> List[Dict]:
+        """Recorre la tabla de consensos (ver parse_consensus_page)"""
         consensos = []
         
         try:
@@ -104,7 +125,7 @@ class MLBScraper:
                 cells = row.find_all('td')
                 row_text = row.get_text(strip=True)
                 
-                logger.debug(f"Fila {i}: {len(cells)} celdas - '{row_text[:100]}...'")
+                logger.debug("Fila %s: %s celdas - '%s...'", i, len(cells), row_text[:100])
                 
                 # Criterios menos restrictivos para encontrar filas válidas
                 if len(cells) >= 3:  # Reducido a 3 columnas mínimo
@@ -116,11 +137,11 @@ class MLBScraper:
                     # Si tiene equipos Y (porcentajes O hora), es candidata
                     if has_teams and (has_percentage or has_time):
                         game_rows.append(row)
-                        logger.debug(f"Fila {i} añadida como válida: equipos={has_teams}, %={has_percentage}, hora={has_time}")
+                        logger.debug("Fila %s añadida como válida: equipos=%s, %%=%s, hora=%s", i, has_teams, has_percentage, has_time)
                     else:
-                        logger.debug(f"Fila {i} descartada: equipos={has_teams}, %={has_percentage}, hora={has_time}")
+                        logger.debug("Fila %s descartada: equipos=%s, %%=%s, hora=%s", i, has_teams, has_percentage, has_time)
                 else:
-                    logger.debug(f"Fila {i} descartada: solo {len(cells)} celdas")
+                    logger.debug("Fila %s descartada: solo %s celdas", i, len(cells))
             
             logger.info(f"Encontradas {len(game_rows)} filas con datos válidos de partidos")
             
@@ -133,7 +154,7 @@ class MLBScraper:
                         logger.info(f"Consenso {i+1} extraído: {consensus_data['equipo_visitante']} @ {consensus_data['equipo_local']} - "
                                   f"{consensus_data['direccion_consenso']}: {consensus_data['porcentaje_consenso']}% ({consensus_data['num_experts']} expertos)")
                 except Exception as e:
-                    logger.debug(f"Fila {i+1} no procesable: {str(e)[:100]}")
+                    logger.debug("Fila %s no procesable: %s", i+1, str(e)[:100])
                     continue
             
             logger.info(f"Total consensos válidos extraídos: {len(consensos)}")
@@ -154,12 +175,12 @@ class MLBScraper:
             
             # Obtener texto de todas las celdas para análisis
             all_row_text = row.get_text(strip=True)
-            logger.debug(f"Analizando fila con {len(cells)} celdas: {all_row_text[:200]}...")
+            logger.debug("Analizando fila con %s celdas: %s...", len(cells), all_row_text[:200])
             
-            # Mostrar contenido de cada celda para depuración
-            for i, cell in enumerate(cells):
-                cell_text = cell.get_text(strip=True)
-                logger.debug(f"  Celda {i}: '{cell_text[:50]}...'")
+            # Mostrar contenido de cada celda para depuración (solo si DEBUG está activo)
+            if logger.isEnabledFor(logging.DEBUG):
+                for i, cell in enumerate(cells):
+                    logger.debug("  Celda %s: '%s...'", i, cell.get_text(strip=True)[:50])
             
             # Inicializar datos del consenso
             consensus_data = {
@@ -197,7 +218,7 @@ class MLBScraper:
                         consensus_data['equipo_visitante'] = team_match.group(1)
                         consensus_data['equipo_local'] = team_match.group(2)
                         team_found = True
-                        logger.debug(f"Equipos encontrados en celda {i}: {consensus_data['equipo_visitante']} @ {consensus_data['equipo_local']}")
+                        logger.debug("Equipos encontrados en celda %s: %s @ %s", i, consensus_data['equipo_visitante'], consensus_data['equipo_local'])
                         break
                 
                 if team_found:
@@ -211,7 +232,7 @@ class MLBScraper:
                 if time_match:
                     consensus_data['hora_partido'] = time_match.group(1)
                     time_found = True
-                    logger.debug(f"Hora encontrada en celda {i}: {consensus_data['hora_partido']}")
+                    logger.debug("Hora encontrada en celda %s: %s", i, consensus_data['hora_partido'])
                     break
             
             # Buscar consenso Over/Under en cualquier celda
@@ -228,14 +249,14 @@ class MLBScraper:
                     consensus_data['porcentaje_consenso'] = int(over_match.group(1))
                     consensus_data['direccion_consenso'] = 'OVER'
                     consensus_found = True
-                    logger.debug(f"Consenso OVER encontrado en celda {i}: {consensus_data['porcentaje_consenso']}%")
+                    logger.debug("Consenso OVER encontrado en celda %s: %s%%", i, consensus_data['porcentaje_consenso'])
                     break
                 elif under_match:
                     consensus_data['consenso_under'] = int(under_match.group(1))
                     consensus_data['porcentaje_consenso'] = int(under_match.group(1))
                     consensus_data['direccion_consenso'] = 'UNDER'
                     consensus_found = True
-                    logger.debug(f"Consenso UNDER encontrado en celda {i}: {consensus_data['porcentaje_consenso']}%")
+                    logger.debug("Consenso UNDER encontrado en celda %s: %s%%", i, consensus_data['porcentaje_consenso'])
                     break
             
             # Si el porcentaje Over/Under no se encuentra, calcular el complementario
@@ -258,7 +279,7 @@ class MLBScraper:
                     if 6.0 <= total_val <= 15.0:  # Rango típico de totales MLB
                         consensus_data['total_line'] = total_val
                         total_found = True
-                        logger.debug(f"Total encontrado en celda {i}: {total_val}")
+                        logger.debug("Total encontrado en celda %s: %s", i, total_val)
                         break
                 if total_found:
                     break
@@ -278,17 +299,17 @@ class MLBScraper:
                     # Si hay dos números válidos, sumarlos (ej: "15 + 4" = 19)
                     consensus_data['num_experts'] = sum(valid_numbers[:2])
                     experts_found = True
-                    logger.debug(f"Expertos (suma) encontrados en celda {i}: {valid_numbers[:2]} = {consensus_data['num_experts']}")
+                    logger.debug("Expertos (suma) encontrados en celda %s: %s = %s", i, valid_numbers[:2], consensus_data['num_experts'])
                     break
                 elif len(valid_numbers) == 1:
                     # Si hay un solo número válido, usarlo directamente
                     consensus_data['num_experts'] = valid_numbers[0]
                     experts_found = True
-                    logger.debug(f"Expertos encontrados en celda {i}: {consensus_data['num_experts']}")
+                    logger.debug("Expertos encontrados en celda %s: %s", i, consensus_data['num_experts'])
                     break
             
             # Logging de depuración de toda la fila
-            logger.debug(f"Fila procesada - Equipos: {team_found}, Hora: {time_found}, Consenso: {consensus_found}, Total: {total_found}, Expertos: {experts_found}")
+            logger.debug("Fila procesada - Equipos: %s, Hora: %s, Consenso: %s, Total: %s, Expertos: %s", team_found, time_found, consensus_found, total_found, experts_found)
             
             # Validar que tenemos datos mínimos válidos (criterios relajados)
             valid_team = (consensus_data['equipo_visitante'] != 'Unknown' and
@@ -298,24 +319,26 @@ class MLBScraper:
             valid_experts = consensus_data['num_experts'] > 0
             
             # Mostrar estado de validación
-            logger.debug(f"Validación - Equipos: {valid_team}, Consenso: {valid_consensus}, Expertos: {valid_experts}")
+            logger.debug("Validación - Equipos: %s, Consenso: %s, Expertos: %s", valid_team, valid_consensus, valid_experts)
             
             # Criterio mínimo: debe tener equipos Y (consenso O expertos)
             if valid_team and (valid_consensus or valid_experts):
-                logger.info(f"Consenso válido extraído: {consensus_data['equipo_visitante']} @ {consensus_data['equipo_local']} - "
-                           f"{consensus_data['direccion_consenso']}: {consensus_data['porcentaje_consenso']}% ({consensus_data['num_experts']} expertos)")
+                logger.info("Consenso válido extraído: %s @ %s - %s: %s%% (%s expertos)",
+                            consensus_data['equipo_visitante'], consensus_data['equipo_local'],
+                            consensus_data['direccion_consenso'], consensus_data['porcentaje_consenso'],
+                            consensus_data['num_experts'])
                 return consensus_data
             else:
-                logger.debug(f"Fila no válida - Equipos válidos: {valid_team}, "
-                           f"Consenso válido: {valid_consensus}, Expertos válidos: {valid_experts}")
-                logger.debug(f"  Equipos: {consensus_data['equipo_visitante']} @ {consensus_data['equipo_local']}")
-                logger.debug(f"  Consenso: {consensus_data['direccion_consenso']} {consensus_data['porcentaje_consenso']}%")
-                logger.debug(f"  Expertos: {consensus_data['num_experts']}")
+                logger.debug("Fila no válida - Equipos válidos: %s, Consenso válido: %s, Expertos válidos: %s",
+                             valid_team, valid_consensus, valid_experts)
+                logger.debug("  Equipos: %s @ %s", consensus_data['equipo_visitante'], consensus_data['equipo_local'])
+                logger.debug("  Consenso: %s %s%%", consensus_data['direccion_consenso'], consensus_data['porcentaje_consenso'])
+                logger.debug("  Expertos: %s", consensus_data['num_experts'])
             
             return None
             
         except Exception as e:
-            logger.debug(f"Error al extraer consenso de fila: {e}")
+            logger.debug("Error al extraer consenso de fila: %s", e)
             return None
     
     @log_exception
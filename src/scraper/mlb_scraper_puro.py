@@ -24,6 +24,9 @@ from typing import List, Dict, Optional
 import logging
 import json
 
+from src.utils.metrics import FETCH_SEGUNDOS, FILAS_EXTRAIDAS, PARSE_SEGUNDOS
+from src.utils.tracing import traza
+
 # Configurar logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -94,12 +97,14 @@ class MLBScraperPuro:
             url = f"{self.base_url}/{fecha}"
             logger.info(f"🌐 Accediendo a: {url}")
             
-            self.driver.get(url)
-            WebDriverWait(self.driver, 30).until(
-                EC.presence_of_element_located((By.TAG_NAME, "body"))
-            )
+            with traza('fetch', tier='selenium'), FETCH_SEGUNDOS.medir(tier='selenium'):
+                self.driver.get(url)
+                WebDriverWait(self.driver, 30).until(
+                    EC.presence_of_element_located((By.TAG_NAME, "body"))
+                )
             
-            time.sleep(8)  # Esperar contenido dinámico
+            with traza('espera_render', segundos=8):
+                time.sleep(8)  # Esperar contenido dinámico
             logger.info("✅ Página cargada")
             
             # Buscar todas las tablas
@@ -111,37 +116,39 @@ class MLBScraperPuro:
                 return []
             
             todos_los_consensos = []
-            
-            # Procesar TODAS las tablas
-            for table_idx, table in enumerate(tables):
-                logger.info(f"🔍 Procesando tabla {table_idx + 1}")
-                
-                try:
-                    rows = table.find_elements(By.TAG_NAME, "tr")
-                    logger.info(f"   Filas en tabla: {len(rows)}")
+            with traza('parse', parser='selenium_puro') as span, PARSE_SEGUNDOS.medir(parser='selenium_puro'):
+                # Procesar TODAS las tablas
+                for table_idx, table in enumerate(tables):
+                    logger.info(f"🔍 Procesando tabla {table_idx + 1}")
                     
-                    for row_idx, row in enumerate(rows):
-                        try:
-                            row_text = row.text.strip()
+                    try:
+                        rows = table.find_elements(By.TAG_NAME, "tr")
+                        logger.info(f"   Filas en tabla: {len(rows)}")
+                        
+                        for row_idx, row in enumerate(rows):
+                            try:
+                                row_text = row.text.strip()
+                                
+                                if not row_text or len(row_text) < 20:
+                                    continue
+                                
+                                # Solo verificar si parece ser una fila de datos
+                                if self._parece_fila_de_consenso(row_text):
+                                    consenso = self._extraer_datos_completos(row_text, fecha)
+                                    if consenso:
+                                        todos_los_consensos.append(consenso)
+                                        logger.info(f"✅ Consenso extraído: {consenso.get('equipo_visitante', '?')} @ {consenso.get('equipo_local', '?')} - {consenso.get('porcentaje_consenso', 0)}%")
                             
-                            if not row_text or len(row_text) < 20:
+                            except Exception as e:
+                                logger.debug("Error procesando fila %s: %s", row_idx, e)
                                 continue
-                            
-                            # Solo verificar si parece ser una fila de datos
-                            if self._parece_fila_de_consenso(row_text):
-                                consenso = self._extraer_datos_completos(row_text, fecha)
-                                if consenso:
-                                    todos_los_consensos.append(consenso)
-                                    logger.info(f"✅ Consenso extraído: {consenso.get('equipo_visitante', '?')} @ {consenso.get('equipo_local', '?')} - {consenso.get('porcentaje_consenso', 0)}%")
-                        
-                        except Exception as e:
-                            logger.debug(f"Error procesando fila {row_idx}: {e}")
-                            continue
-                
-                except Exception as e:
-                    logger.warning(f"Error procesando tabla {table_idx}: {e}")
-                    continue
+                    
+                    except Exception as e:
+                        logger.warning(f"Error procesando tabla {table_idx}: {e}")
+                        continue
+                span.atributos['consensos'] = len(todos_los_consensos)
             
+            FILAS_EXTRAIDAS.inc(len(todos_los_consensos), parser='selenium_puro')
             logger.info(f"🎯 TOTAL EXTRAÍDO: {len(todos_los_consensos)} consensos")
             return todos_los_consensos
             
@@ -173,7 +180,7 @@ class MLBScraperPuro:
         parece_valido = (tiene_equipos or tiene_porcentaje or tiene_numeros) and not es_header_obvio
         
         if parece_valido:
-            logger.debug(f"✅ Fila candidata: {texto[:60]}...")
+            logger.debug("✅ Fila candidata: %s...", texto[:60])
         
         return parece_valido
     
@@ -185,7 +192,7 @@ class MLBScraperPuro:
         - Devuelve el consenso aunque esté incompleto
         """
         try:
-            logger.debug(f"🔍 Extrayendo de: {texto}")
+            logger.debug("🔍 Extrayendo de: %s", texto)
             
             # Estructura base del consenso
             consenso = {
@@ -269,11 +276,11 @@ class MLBScraperPuro:
                 logger.info(f"📊 Consenso extraído ({consenso['completitud']}): {consenso.get('partido_completo', 'Equipos N/A')} - {consenso.get('direccion_consenso', '?')} {consenso.get('porcentaje_consenso', 0)}%")
                 return consenso
             else:
-                logger.debug(f"❌ No se extrajo ningún campo válido")
+                logger.debug("❌ No se extrajo ningún campo válido")
                 return None
                 
         except Exception as e:
-            logger.debug(f"❌ Error extrayendo datos: {e}")
+            logger.debug("❌ Error extrayendo datos: %s", e)
             return None
     
     def _generar_id_unico(self, texto: str) -> str:
@@ -19,13 +19,19 @@ import time
 import re
 from datetime import datetime, timedelta
 import pytz
-from typing import List, Dict, Optional
+from typing import Callable, List, Dict, Optional
 import logging
 
+from src.utils.metrics import FETCH_SEGUNDOS, FILAS_EXTRAIDAS, PARSE_SEGUNDOS
+from src.utils.tracing import traza
+
 # Configurar logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Cada cuántos consensos extraídos se avisa a al_avanzar con las filas parciales
+FILAS_POR_AVANCE = 5
+
 class MLBSeleniumScraper:
     """Scraper MLB 100% Selenium - Sin requests, sin complicaciones"""
     
@@ -85,8 +91,16 @@ class MLBSeleniumScraper:
             logger.error(f"❌ Error configurando driver: {e}")
             return False
     
-    def scrape_mlb_consensus(self, date: Optional[str] = None) -> List[Dict]:
-        """Scraping principal - Solo Selenium"""
+    def scrape_mlb_consensus(self, date: Optional[str] = None,
+                             al_avanzar: Optional[Callable[[List[Dict]], None]] = None) -> List[Dict]:
+        """
+        Scraping principal - Solo Selenium
+        
+        Args:
+            date: fecha YYYY-MM-DD (por defecto hoy)
+            al_avanzar: recibe los consensos extraídos hasta el momento cada
+                        FILAS_POR_AVANCE filas (para mostrar resultados parciales)
+        """
         
         if date is None:
             date = datetime.now(self.timezone).strftime('%Y-%m-%d')
@@ -102,22 +116,24 @@ class MLBSeleniumScraper:
             logger.info(f"🌐 Navegando a: {url}")
             
             # Cargar página
-            self.driver.get(url)
-            logger.info("⏳ Esperando que la página se cargue...")
-            
-            # Esperar que el body se cargue
-            WebDriverWait(self.driver, 30).until(
-                EC.presence_of_element_located((By.TAG_NAME, "body"))
-            )
-            
-            # Esperar contenido dinámico - MÁS TIEMPO para debugging
-            time.sleep(15)  # Aumentado para dar tiempo a inspeccionar
-            logger.info("✅ Página cargada completamente")
-            
-            # PAUSA PARA INSPECCIÓN MANUAL
-            logger.info("🔍 PAUSA DE 10 SEGUNDOS PARA INSPECCIÓN VISUAL")
-            logger.info("   Puedes ver la página ahora en el navegador abierto")
-            time.sleep(10)
+            with traza('fetch', tier='selenium'), FETCH_SEGUNDOS.medir(tier='selenium'):
+                self.driver.get(url)
+                logger.info("⏳ Esperando que la página se cargue...")
+                
+                # Esperar que el body se cargue
+                WebDriverWait(self.driver, 30).until(
+                    EC.presence_of_element_located((By.TAG_NAME, "body"))
+                )
+            
+            with traza('espera_render', segundos=25):
+                # Esperar contenido dinámico - MÁS TIEMPO para debugging
+                time.sleep(15)  # Aumentado para dar tiempo a inspeccionar
+                logger.info("✅ Página cargada completamente")
+                
+                # PAUSA PARA INSPECCIÓN MANUAL
+                logger.info("🔍 PAUSA DE 10 SEGUNDOS PARA INSPECCIÓN VISUAL")
+                logger.info("   Puedes ver la página ahora en el navegador abierto")
+                time.sleep(10)
             
             # Verificar título de la página
             title = self.driver.title
@@ -132,40 +148,44 @@ class MLBSeleniumScraper:
                 return []
             
             consensos_encontrados = []
-            
-            # Procesar cada tabla
-            for table_idx, table in enumerate(tables):
-                logger.info(f"🔍 Procesando tabla {table_idx + 1}")
-                
-                try:
-                    rows = table.find_elements(By.TAG_NAME, "tr")
-                    logger.info(f"   Filas en tabla {table_idx + 1}: {len(rows)}")
+            with traza('parse', parser='selenium_celdas') as span, PARSE_SEGUNDOS.medir(parser='selenium_celdas'):
+                # Procesar cada tabla
+                for table_idx, table in enumerate(tables):
+                    logger.info(f"🔍 Procesando tabla {table_idx + 1}")
                     
-                    # Procesar cada fila (saltar la primera que es header)
-                    for row_idx, row in enumerate(rows[1:], 1):
-                        try:
-                            # Obtener celdas de la fila
-                            cells = row.find_elements(By.TAG_NAME, "td")
+                    try:
+                        rows = table.find_elements(By.TAG_NAME, "tr")
+                        logger.info(f"   Filas en tabla {table_idx + 1}: {len(rows)}")
+                        
+                        # Procesar cada fila (saltar la primera que es header)
+                        for row_idx, row in enumerate(rows[1:], 1):
+                            try:
+                                # Obtener celdas de la fila
+                                cells = row.find_elements(By.TAG_NAME, "td")
+                                
+                                if len(cells) < 6:  # Debe tener al menos 6 celdas
+                                    continue
+                                
+                                logger.info(f"   🔍 Procesando fila {row_idx} con {len(cells)} celdas")
+                                
+                                # Extraer datos directamente de las celdas
+                                consenso = self._extraer_consenso_de_celdas(cells, date, row_idx)
+                                if consenso:
+                                    consensos_encontrados.append(consenso)
+                                    logger.info(f"✅ Consenso {row_idx}: {consenso['equipo_visitante']} @ {consenso['equipo_local']} - {consenso['direccion_consenso']} {consenso['porcentaje_consenso']}%")
+                                    if al_avanzar and len(consensos_encontrados) % FILAS_POR_AVANCE == 0:
+                                        al_avanzar(list(consensos_encontrados))
                             
-                            if len(cells) < 6:  # Debe tener al menos 6 celdas
+                            except Exception as e:
+                                logger.warning(f"Error procesando fila {row_idx}: {e}")
                                 continue
-                            
-                            logger.info(f"   🔍 Procesando fila {row_idx} con {len(cells)} celdas")
-                            
-                            # Extraer datos directamente de las celdas
-                            consenso = self._extraer_consenso_de_celdas(cells, date, row_idx)
-                            if consenso:
-                                consensos_encontrados.append(consenso)
-                                logger.info(f"✅ Consenso {row_idx}: {consenso['equipo_visitante']} @ {consenso['equipo_local']} - {consenso['direccion_consenso']} {consenso['porcentaje_consenso']}%")
-                        
-                        except Exception as e:
-                            logger.warning(f"Error procesando fila {row_idx}: {e}")
-                            continue
-                
-                except Exception as e:
-                    logger.warning(f"Error procesando tabla {table_idx}: {e}")
-                    continue
+                    
+                    except Exception as e:
+                        logger.warning(f"Error procesando tabla {table_idx}: {e}")
+                        continue
+                span.atributos['consensos'] = len(consensos_encontrados)
             
+            FILAS_EXTRAIDAS.inc(len(consensos_encontrados), parser='selenium_celdas')
             logger.info(f"🎯 TOTAL CONSENSOS EXTRAÍDOS: {len(consensos_encontrados)}")
             return consensos_encontrados
             
@@ -196,7 +216,7 @@ class MLBSeleniumScraper:
             
             # CELDA 0: Equipos
             teams_text = cells[0].text.strip()
-            logger.debug(f"   Debug fila {row_num} - Equipos: '{teams_text}'")
+            logger.debug("   Debug fila %s - Equipos: '%s'", row_num, teams_text)
             
             # Extraer equipos (formato: "MLB\nNYY\nATL")
             lines = teams_text.split('\n')
@@ -209,7 +229,7 @@ class MLBSeleniumScraper:
             
             # CELDA 1: Fecha y hora
             datetime_text = cells[1].text.strip()
-            logger.debug(f"   Debug fila {row_num} - Fecha/Hora: '{datetime_text}'")
+            logger.debug("   Debug fila %s - Fecha/Hora: '%s'", row_num, datetime_text)
             
             # Extraer hora (formato: "Sun. Jul. 20\n1:35 pm ET")
             hora_match = re.search(r'(\d{1,2}:\d{2}\s+[ap]m\s+ET)', datetime_text, re.IGNORECASE)
@@ -217,7 +237,7 @@ class MLBSeleniumScraper:
             
             # CELDA 2: Consenso (formato: "86 % Under\n14 % Over")
             consensus_text = cells[2].text.strip()
-            logger.debug(f"   Debug fila {row_num} - Consenso: '{consensus_text}'")
+            logger.debug("   Debug fila %s - Consenso: '%s'", row_num, consensus_text)
             
             # Buscar porcentajes
             over_match = re.search(r'(\d{1,3})\s*%\s*Over', consensus_text, re.IGNORECASE)
@@ -238,7 +258,7 @@ class MLBSeleniumScraper:
             
             # CELDA 3: Total
             total_text = cells[3].text.strip()
-            logger.debug(f"   Debug fila {row_num} - Total: '{total_text}'")
+            logger.debug("   Debug fila %s - Total: '%s'", row_num, total_text)
             
             try:
                 total_line = float(total_text)
@@ -247,7 +267,7 @@ class MLBSeleniumScraper:
             
             # CELDA 4: Picks
             picks_text = cells[4].text.strip()
-            logger.debug(f"   Debug fila {row_num} - Picks: '{picks_text}'")
+            logger.debug("   Debug fila %s - Picks: '%s'", row_num, picks_text)
             
             # Extraer números de picks - Formato esperado: "5\n1" (5 picks over, 1 pick under)
             pick_lines = picks_text.split('\n')
@@ -258,7 +278,7 @@ class MLBSeleniumScraper:
                 numbers = re.findall(r'\b(\d+)\b', line.strip())
                 pick_numbers.extend([int(n) for n in numbers])
             
-            logger.debug(f"   Debug fila {row_num} - Números extraídos de picks: {pick_numbers}")
+            logger.debug("   Debug fila %s - Números extraídos de picks: %s", row_num, pick_numbers)
             
             if len(pick_numbers) >= 2:
                 picks_1 = pick_numbers[0]  # Primer número (generalmente el del consenso)
@@ -275,7 +295,7 @@ class MLBSeleniumScraper:
                 picks_1 = int(total_picks * (porcentaje_over / 100))
                 picks_2 = total_picks - picks_1
             
-            logger.debug(f"   Debug fila {row_num} - Picks calculados: {picks_1} over, {picks_2} under, {total_picks} total")
+            logger.debug("   Debug fila %s - Picks calculados: %s over, %s under, %s total", row_num, picks_1, picks_2, total_picks)
             
             # Construir objeto de consenso
             consenso = {
@@ -326,7 +346,7 @@ class MLBSeleniumScraper:
     def _extraer_consenso(self, texto: str, fecha: str) -> Optional[Dict]:
         """Extraer datos de consenso - VERSIÓN CORREGIDA PARA COVERS.COM"""
         try:
-            logger.debug(f"🔍 Analizando: {texto[:100]}...")
+            logger.debug("🔍 Analizando: %s...", texto[:100])
             
             # Separar las partes del texto (el texto viene todo junto de las celdas)
             # Formato típico: "MLB NYY ATL Sun. Jul. 20 1:35 pm ET 86 % Under 14 % Over 9.5 6 1 Details"
@@ -412,7 +432,7 @@ class MLBSeleniumScraper:
             return consenso
             
         except Exception as e:
-            logger.debug(f"❌ Error extrayendo consenso: {e}")
+            logger.debug("❌ Error extrayendo consenso: %s", e)
             return None
 
     def get_live_consensus(self) -> List[Dict]:
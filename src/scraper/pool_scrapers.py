@@ -0,0 +1,88 @@
+"""
+Pool acotado de scrapers Selenium
+Cada scraping toma un scraper para él solo (prestar) y lo devuelve al
+terminar; al devolverlo se cierra su driver. Así dos sesiones de la app y
+el job runner nunca comparten ni pisan el mismo Chrome, y nunca hay más de
+max_scrapers navegadores abiertos a la vez.
+
+Uso:
+    with pool.prestar() as scraper:
+        consensos = scraper.scrape_mlb_consensus()
+"""
+
+import threading
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+from src.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+# Chromes simultáneos por proceso de la app
+MAX_SCRAPERS_POR_DEFECTO = 2
+
+# Espera máxima por un scraper libre antes de fallar
+ESPERA_PRESTAMO_SEGUNDOS = 300
+
+class ScrapersOcupadosError(RuntimeError):
+    """No se liberó ningún scraper dentro del plazo de espera"""
+
+class PoolScrapers:
+    """Préstamo y devolución de scrapers, con un máximo de instancias en uso"""
+
+    def __init__(self, fabrica: Callable[[], Any], max_scrapers: int = MAX_SCRAPERS_POR_DEFECTO):
+        """
+        Args:
+            fabrica: crea un scraper nuevo (se llama solo cuando no hay uno libre)
+            max_scrapers: scrapers prestados a la vez como máximo
+        """
+        self._fabrica = fabrica
+        self.max_scrapers = max_scrapers
+        self._cupos = threading.BoundedSemaphore(max_scrapers)
+        self._lock = threading.Lock()
+        self._libres: List[Any] = []
+        self.stats = {
+            'prestamos': 0,
+            'creados': 0,
+            'esperas_vencidas': 0
+        }
+
+    @contextmanager
+    def prestar(self, timeout: Optional[float] = ESPERA_PRESTAMO_SEGUNDOS) -> Iterator[Any]:
+        """Presta un scraper exclusivo; al salir se cierra su driver y vuelve al pool"""
+        if not self._cupos.acquire(timeout=timeout):
+            with self._lock:
+                self.stats['esperas_vencidas'] += 1
+            raise ScrapersOcupadosError(f"Los {self.max_scrapers} scrapers siguen ocupados tras {timeout}s")
+
+        try:
+            with self._lock:
+                scraper = self._libres.pop() if self._libres else None
+                self.stats['prestamos'] += 1
+            if scraper is None:
+                scraper = self._fabrica()
+                with self._lock:
+                    self.stats['creados'] += 1
+        except BaseException:
+            self._cupos.release()
+            raise
+
+        try:
+            yield scraper
+        finally:
+            try:
+                scraper.close()
+            except Exception as e:
+                logger.warning(f"⚠️ Error cerrando el driver del scraper: {e}")
+            with self._lock:
+                self._libres.append(scraper)
+            self._cupos.release()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Métricas del pool"""
+        with self._lock:
+            return {
+                **self.stats,
+                'max_scrapers': self.max_scrapers,
+                'libres': len(self._libres)
+            }
@@ -12,20 +12,25 @@ from apscheduler.schedulers.asyncio import AsyncIOScheduler
 from apscheduler.triggers.date import DateTrigger
 from src.utils.logger import get_logger
 from src.utils.sports_config import get_sports_config
-from src.scraper.mlb_scraper import MLBScraper
+from src.scraper.registro_scrapers import crear_scraper, tiene_scraper
+from src.scraper.coalescer import ScrapeCoalescer, VENTANA_COALESCENCIA_SEGUNDOS
+from src.scraper.job_queue import cola_trabajos, PRIORIDAD_PREPARTIDO
 
 logger = get_logger(__name__)
 
 class PregameScheduler:
     """Programador inteligente para scraping pre-partido"""
     
-    def __init__(self):
+    def __init__(self, ventana_coalescencia: int = VENTANA_COALESCENCIA_SEGUNDOS):
         self.scheduler = AsyncIOScheduler()
         self.timezone = pytz.timezone('America/Argentina/Buenos_Aires')
         self.sports_config = get_sports_config()
         self.scheduled_jobs = {}
         self.game_schedules = {}
         
+        # Partidos con inicio cercano comparten una sola descarga de consensos
+        self.coalescer = ScrapeCoalescer(ventana_coalescencia)
+        
         logger.info("PregameScheduler inicializado")
     
     async def start(self):
@@ -79,12 +84,11 @@ class PregameScheduler:
             Lista de partidos con horarios
         """
         try:
-            if sport == 'MLB':
-                scraper = MLBScraper()
-                
+            if tiene_scraper(sport):
                 # Obtener página de horarios
-                schedule_url = f"https://www.covers.com/sports/mlb/schedule"
-                soup = await scraper.get_page_content(schedule_url)
+                schedule_url = f"https://www.covers.com/sports/{sport.lower()}/schedule"
+                async with crear_scraper(sport) as scraper:
+                    soup = await scraper.get_page_content(schedule_url)
                 
                 if not soup:
                     return []
@@ -99,7 +103,6 @@ class PregameScheduler:
                     if game_info:
                         games.append(game_info)
                 
-                scraper.close()
                 return games
                 
         except Exception as e:
@@ -266,11 +269,11 @@ class PregameScheduler:
         try:
             logger.info(f"🕷️ Ejecutando scraping pregame: {game['away_team']} @ {game['home_team']}")
             
-            if sport == 'MLB':
-                scraper = MLBScraper()
-                
-                # Scraping específico del partido
-                consensus_data = await scraper.scrape_mlb_consensus()
+            if tiene_scraper(sport):
+                # Descarga compartida con los demás partidos de la ventana
+                consensus_data = await self.coalescer.obtener_async(
+                    sport, lambda: self._scrape_consensus(sport, game['game_time'])
+                ) or []
                 
                 # Filtrar solo el partido específico
                 game_consensus = [
@@ -287,11 +290,30 @@ class PregameScheduler:
                 else:
                     logger.warning(f"⚠️ No se encontró consenso para: {game['away_team']} @ {game['home_team']}")
                 
-                scraper.close()
-                
         except Exception as e:
             logger.error(f"Error en scraping pregame: {e}")
     
+    async def _scrape_consensus(self, sport: str, deadline: datetime) -> List[Dict]:
+        """
+        Descarga completa de la página de consensos del deporte
+        
+        Pasa por la cola compartida con prioridad pre-partido y plazo = inicio del partido;
+        el worker retiene su turno mientras la descarga corre en este event loop.
+        """
+        loop = asyncio.get_running_loop()
+        
+        async def descargar():
+            async with crear_scraper(sport) as scraper:
+                return await scraper.scrape_consensus()
+        
+        futuro = cola_trabajos.enviar(
+            f"pregame_{sport}",
+            lambda: asyncio.run_coroutine_threadsafe(descargar(), loop).result(),
+            deadline=deadline,
+            prioridad=PRIORIDAD_PREPARTIDO
+        )
+        return await asyncio.wrap_future(futuro)
+    
     async def process_pregame_consensus(self, sport: str, game: Dict, consensus_data: List[Dict]):
         """
         Procesa los datos de consenso pregame
@@ -322,7 +344,8 @@ class PregameScheduler:
         return {
             'total_jobs': len(self.scheduled_jobs),
             'active_jobs': len(self.scheduler.get_jobs()),
-            'scheduled_jobs': self.scheduled_jobs
+            'scheduled_jobs': self.scheduled_jobs,
+            'coalescing': self.coalescer.get_stats()
         }
 
 
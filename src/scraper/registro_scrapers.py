@@ -0,0 +1,78 @@
+"""
+Registro de scrapers por deporte
+Cada deporte registra una fábrica que devuelve un scraper asíncrono con
+scrape_consensus(date), get_page_content(url) y close(). MLB usa su parser
+propio; NBA, NFL y NHL usan el extractor genérico de covers.com con su
+perfil (URL y columnas de la tabla). Agregar un deporte es agregar un
+perfil o registrar una fábrica: no hay que tocar el ciclo diario.
+"""
+
+import functools
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+# URL de consensos de totales de expertos en covers.com ({slug} = deporte)
+URL_CONSENSOS_COVERS = "https://contests.covers.com/consensus/topoverunderconsensus/{slug}/expert"
+
+# Columnas de la tabla de consensos de covers.com (campo -> índice de celda)
+COLUMNAS_COVERS = {'partido': 0, 'hora': 1, 'consenso': 2, 'total': 3, 'expertos': 4}
+
+@dataclass(frozen=True)
+class PerfilCovers:
+    """Parámetros del extractor genérico para un deporte"""
+    deporte: str
+    url_base: str
+    # Rango plausible de la línea de total (descarta números de otras columnas)
+    rango_total: Tuple[float, float]
+    columnas: Dict[str, int] = field(default_factory=lambda: dict(COLUMNAS_COVERS))
+
+# Deportes servidos por el extractor genérico
+PERFILES_COVERS = {
+    'NBA': PerfilCovers('NBA', URL_CONSENSOS_COVERS.format(slug='nba'), (150.0, 280.0)),
+    'NFL': PerfilCovers('NFL', URL_CONSENSOS_COVERS.format(slug='nfl'), (25.0, 70.0)),
+    'NHL': PerfilCovers('NHL', URL_CONSENSOS_COVERS.format(slug='nhl'), (4.0, 9.0)),
+}
+
+_FABRICAS: Dict[str, Callable[[], Any]] = {}
+
+def registrar_scraper(deporte: str, fabrica: Optional[Callable[[], Any]] = None):
+    """
+    Registra la fábrica del scraper de un deporte (reemplaza la anterior)
+
+    Se puede usar como decorador: @registrar_scraper('NBA')
+    """
+    if fabrica is None:
+        return functools.partial(registrar_scraper, deporte)
+    _FABRICAS[deporte.upper()] = fabrica
+    return fabrica
+
+def tiene_scraper(deporte: str) -> bool:
+    """Si hay un scraper registrado para el deporte"""
+    return deporte.upper() in _FABRICAS
+
+def deportes_registrados() -> List[str]:
+    """Deportes con scraper registrado"""
+    return sorted(_FABRICAS)
+
+def crear_scraper(deporte: str):
+    """Nueva instancia del scraper asíncrono del deporte"""
+    fabrica = _FABRICAS.get(deporte.upper())
+    if fabrica is None:
+        raise ValueError(f"No hay scraper registrado para {deporte} (registrados: {', '.join(deportes_registrados())})")
+    return fabrica()
+
+# === SCRAPERS INCLUIDOS ===
+
+# Las fábricas importan al crear: registrar no carga httpx ni BeautifulSoup
+
+@registrar_scraper('MLB')
+def _scraper_mlb():
+    from .async_scraper import AsyncMLBScraper
+    return AsyncMLBScraper()
+
+def _scraper_covers(deporte: str):
+    from .covers_extractor import AsyncCoversScraper
+    return AsyncCoversScraper(PERFILES_COVERS[deporte])
+
+for _deporte in PERFILES_COVERS:
+    registrar_scraper(_deporte, functools.partial(_scraper_covers, _deporte))
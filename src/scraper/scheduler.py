@@ -3,23 +3,62 @@ Programador de tareas para automatizar el scraping de consensos
 """
 
 from apscheduler.schedulers.background import BackgroundScheduler
+from apscheduler.executors.base import BaseExecutor, run_job
 from apscheduler.triggers.cron import CronTrigger
 from apscheduler.triggers.interval import IntervalTrigger
 import pytz
 from datetime import datetime, timedelta
 import logging
 from typing import Optional, Callable
-from src.utils.logger import get_logger
+from src.utils.logger import get_logger, instalar_eventos
 from src.utils.error_handler import ErrorHandler, log_exception
 from .mlb_scraper import MLBScraper
+from .job_queue import (cola_trabajos, DeadlineJobQueue, PRIORIDAD_EN_VIVO,
+                        PRIORIDAD_DIARIO, PRIORIDAD_REPORTE)
 
 logger = get_logger(__name__)
 
+# Prioridad de cada job de APScheduler en la cola compartida
+PRIORIDADES_JOBS = {
+    'mlb_live_scraping': PRIORIDAD_EN_VIVO,
+    'mlb_daily_scraping': PRIORIDAD_DIARIO,
+    'daily_report': PRIORIDAD_REPORTE,
+    'log_cleanup': PRIORIDAD_REPORTE
+}
+
+class DeadlineExecutor(BaseExecutor):
+    """Executor de APScheduler que despacha los jobs a la cola compartida con plazo"""
+    
+    def __init__(self, cola: DeadlineJobQueue, prioridades: dict = None, plazo_segundos: int = 1800):
+        super().__init__()
+        self.cola = cola
+        self.prioridades = prioridades or {}
+        self.plazo_segundos = plazo_segundos
+    
+    def _do_submit_job(self, job, run_times):
+        futuro = self.cola.enviar(
+            job.id, run_job, job, job._jobstore_alias, run_times, self._logger.name,
+            deadline=run_times[-1] + timedelta(seconds=self.plazo_segundos),
+            prioridad=self.prioridades.get(job.id, PRIORIDAD_DIARIO)
+        )
+        
+        def callback(f):
+            exc = f.exception()
+            if exc:
+                self._run_job_error(job.id, exc, exc.__traceback__)
+            else:
+                self._run_job_success(job.id, f.result())
+        
+        futuro.add_done_callback(callback)
+
 class ConsensusScheduler:
     """Programador para ejecutar scraping automático de consensos"""
     
     def __init__(self, timezone: str = 'America/Argentina/Buenos_Aires'):
-        self.scheduler = BackgroundScheduler()
+        # Los jobs compiten con los pre-partido por red y navegador: pasan por la cola compartida
+        self.scheduler = BackgroundScheduler(
+            executors={'default': DeadlineExecutor(cola_trabajos, PRIORIDADES_JOBS)}
+        )
         self.timezone = pytz.timezone(timezone)
         self.mlb_scraper = None
         self.is_running = False
@@ -226,6 +265,8 @@ class ConsensusScheduler:
         """Inicia el scheduler"""
         try:
             if not self.is_running:
+                # Eventos y errores a la tabla `eventos` (reporte diario)
+                instalar_eventos()
                 self.setup_mlb_schedule()
                 self.scheduler.start()
                 self.is_running = True
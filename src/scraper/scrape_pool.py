@@ -0,0 +1,347 @@
+"""
+Pool acotado de procesos para scrapings con Selenium
+Cada scraping corre en su propio proceso (aislamiento del navegador) fuera
+del thread del scheduler, con timeout por trabajo, cancelación y métricas
+de profundidad de cola.
+"""
+
+import itertools
+import multiprocessing
+import os
+import queue
+import signal
+import threading
+import time
+from concurrent.futures import CancelledError, Future
+from typing import Any, Callable, Dict, List, Optional
+
+from src.utils.logger import get_logger
+from src.utils.metrics import PROFUNDIDAD_COLA, metricas
+from src.utils.tracing import RecolectorTrazas, traza, tracer
+
+logger = get_logger(__name__)
+
+# Timeout por defecto de un scraping completo con Selenium (segundos)
+TIMEOUT_SCRAPING_SEGUNDOS = 180
+
+# Gracia entre SIGTERM y SIGKILL al terminar un trabajo
+PLAZO_TERMINACION_SEGUNDOS = 3
+
+class ScrapeTimeoutError(Exception):
+    """El scraping superó su timeout y el proceso fue terminado"""
+    pass
+
+def scrape_mlb_selenium(date: Optional[str] = None) -> List[Dict]:
+    """Scraping completo de MLB con Selenium (se ejecuta dentro del proceso hijo)"""
+    from src.scraper.mlb_selenium_scraper import MLBSeleniumScraper
+
+    scraper = MLBSeleniumScraper()
+    try:
+        return scraper.scrape_mlb_consensus(date)
+    finally:
+        scraper.close()
+
+def _ejecutar_objetivo(conexion, objetivo: Callable, args: tuple, kwargs: dict):
+    """
+    Punto de entrada del proceso hijo: ejecuta y devuelve el resultado por el pipe
+
+    Junto al resultado viajan las métricas y trazas medidas en el hijo
+    (fetch, parse, filas extraídas); sin esto se perderían al terminar el
+    proceso, porque el registro y el tracer del hijo son copias propias.
+    """
+    if hasattr(os, 'setsid'):
+        # Grupo de procesos propio: chromedriver y Chrome quedan dentro y
+        # se terminan junto con el trabajo
+        try:
+            os.setsid()
+        except OSError:
+            pass
+
+    # Con fork el hijo hereda las series del padre: se devuelven solo las propias
+    metricas.vaciar()
+    recolector = RecolectorTrazas()
+    tracer.exportadores = [recolector]
+
+    try:
+        resultado = ('ok', objetivo(*args, **kwargs))
+    except Exception as e:
+        resultado = ('error', f"{type(e).__name__}: {e}")
+
+    try:
+        conexion.send((*resultado, {'metricas': metricas.instantanea(), 'trazas': recolector.trazas}))
+    finally:
+        conexion.close()
+
+def _terminar_proceso(proceso, plazo: float = PLAZO_TERMINACION_SEGUNDOS):
+    """
+    Termina el proceso hijo y su grupo (navegador incluido)
+
+    proceso.terminate() solo mata al hijo: Chrome y chromedriver quedarían
+    huérfanos. Si el grupo ya no existe (el hijo no llegó a crearlo o ya
+    terminó todo) no hace nada más que terminar al hijo.
+    """
+    if proceso.pid is None:
+        return
+
+    if not hasattr(os, 'killpg'):
+        proceso.terminate()
+        return
+
+    try:
+        os.killpg(proceso.pid, signal.SIGTERM)
+    except ProcessLookupError:
+        if proceso.is_alive():
+            proceso.terminate()
+        return
+
+    proceso.join(timeout=plazo)
+    try:
+        os.killpg(proceso.pid, signal.SIGKILL)
+    except ProcessLookupError:
+        pass
+
+class ScrapePool:
+    """Pool de procesos con cola, timeouts y cancelación por trabajo"""
+
+    def __init__(self, max_workers: int = 2, timeout_segundos: int = TIMEOUT_SCRAPING_SEGUNDOS,
+                 contexto: str = 'spawn'):
+        self.max_workers = max_workers
+        self.timeout_segundos = timeout_segundos
+        self._ctx = multiprocessing.get_context(contexto)
+        self._cola: queue.Queue = queue.Queue()
+        self._trabajos: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+        self._workers: List[threading.Thread] = []
+        self._secuencia = itertools.count(1)
+        self.is_running = False
+        self.stats = {
+            'enviados': 0,
+            'completados': 0,
+            'errores': 0,
+            'timeouts': 0,
+            'cancelados': 0,
+            'espera_total_segundos': 0.0,
+            'duracion_total_segundos': 0.0
+        }
+        PROFUNDIDAD_COLA.set_funcion(lambda: self.get_stats()['en_cola'], cola='scrape_pool')
+
+    def start(self):
+        """Inicia los threads despachadores (uno por proceso concurrente)"""
+        with self._lock:
+            if self.is_running:
+                return
+            self.is_running = True
+
+            for i in range(self.max_workers):
+                worker = threading.Thread(target=self._worker, name=f"scrape-pool-{i}", daemon=True)
+                worker.start()
+                self._workers.append(worker)
+
+        logger.info(f"🏭 ScrapePool iniciado con {self.max_workers} procesos")
+
+    def stop(self):
+        """Cancela los trabajos en cola, termina los que corren y detiene el pool"""
+        with self._lock:
+            if not self.is_running:
+                return
+            self.is_running = False
+            trabajos = list(self._trabajos)
+
+        for job_id in trabajos:
+            self.cancelar(job_id)
+
+        for _ in self._workers:
+            self._cola.put(None)
+        for worker in self._workers:
+            worker.join(timeout=5)
+        self._workers = []
+
+        logger.info("🛑 ScrapePool detenido")
+
+    def enviar(self, objetivo: Callable, *args, timeout: Optional[int] = None,
+               job_id: Optional[str] = None, **kwargs) -> Future:
+        """
+        Encola un trabajo para ejecutarse en un proceso hijo
+
+        Args:
+            objetivo: función importable a nivel de módulo (se serializa al hijo)
+            timeout: segundos máximos de ejecución (por defecto el del pool)
+            job_id: identificador para cancelar; se genera si no se indica
+
+        Returns:
+            Future con el resultado; falla con ScrapeTimeoutError si vence el timeout
+        """
+        if not self.is_running:
+            self.start()
+
+        job_id = job_id or f"scrape_{next(self._secuencia)}"
+        futuro = Future()
+        futuro.job_id = job_id
+
+        trabajo = {
+            'job_id': job_id,
+            'objetivo': objetivo,
+            'args': args,
+            'kwargs': kwargs,
+            'timeout': timeout or self.timeout_segundos,
+            'futuro': futuro,
+            'proceso': None,
+            'cancelado': False,
+            # Se apaga solo si el hijo responde: entonces ya cerró su navegador
+            'terminar_grupo': True,
+            'encolado_en': time.monotonic()
+        }
+
+        with self._lock:
+            self._trabajos[job_id] = trabajo
+            self.stats['enviados'] += 1
+
+        self._cola.put(trabajo)
+        logger.debug("📥 Trabajo encolado %s (cola: %s)", job_id, self._cola.qsize())
+        return futuro
+
+    def cancelar(self, job_id: str) -> bool:
+        """Cancela un trabajo en cola o termina su proceso si ya está corriendo"""
+        with self._lock:
+            trabajo = self._trabajos.get(job_id)
+            if trabajo is None:
+                return False
+            trabajo['cancelado'] = True
+            proceso = trabajo['proceso']
+
+        if trabajo['futuro'].cancel():
+            # Todavía estaba en cola: el worker lo descarta al sacarlo
+            logger.info(f"🚫 Trabajo cancelado en cola: {job_id}")
+            return True
+
+        if proceso is not None and proceso.is_alive():
+            _terminar_proceso(proceso)
+            logger.info(f"🚫 Proceso terminado por cancelación: {job_id}")
+            return True
+
+        return False
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Métricas del pool: profundidad de cola, en ejecución y tiempos medios"""
+        with self._lock:
+            en_ejecucion = sum(1 for t in self._trabajos.values() if t['proceso'] is not None)
+            finalizados = self.stats['completados'] + self.stats['errores'] + self.stats['timeouts']
+            iniciados = finalizados + en_ejecucion
+
+            return {
+                'max_workers': self.max_workers,
+                'en_cola': len(self._trabajos) - en_ejecucion,
+                'en_ejecucion': en_ejecucion,
+                **{k: v for k, v in self.stats.items() if not k.endswith('_total_segundos')},
+                'espera_media_segundos': round(self.stats['espera_total_segundos'] / iniciados, 3) if iniciados else 0,
+                'duracion_media_segundos': round(self.stats['duracion_total_segundos'] / finalizados, 3) if finalizados else 0
+            }
+
+    def _worker(self):
+        """Saca trabajos de la cola y los ejecuta de a uno en un proceso hijo"""
+        while True:
+            trabajo = self._cola.get()
+            if trabajo is None:
+                return
+
+            futuro = trabajo['futuro']
+            if not futuro.set_running_or_notify_cancel():
+                self._finalizar(trabajo, 'cancelados')
+                continue
+
+            try:
+                self._ejecutar_en_proceso(trabajo)
+            except Exception as e:
+                logger.error(f"❌ Error en worker del pool ({trabajo['job_id']}): {e}")
+                self._finalizar(trabajo, 'errores')
+                if not futuro.done():
+                    futuro.set_exception(e)
+
+    def _ejecutar_en_proceso(self, trabajo: Dict[str, Any]):
+        """Lanza el proceso hijo y espera el resultado hasta el timeout"""
+        job_id = trabajo['job_id']
+
+        padre, hijo = self._ctx.Pipe(duplex=False)
+        proceso = self._ctx.Process(
+            target=_ejecutar_objetivo,
+            args=(hijo, trabajo['objetivo'], trabajo['args'], trabajo['kwargs']),
+            name=f"scrape-{job_id}",
+            daemon=True
+        )
+
+        inicio = time.monotonic()
+        proceso.start()
+        hijo.close()
+
+        # Recién ahora es visible para cancelar(): no se termina un proceso sin iniciar
+        with self._lock:
+            self.stats['espera_total_segundos'] += inicio - trabajo['encolado_en']
+            trabajo['proceso'] = proceso
+            cancelado = trabajo['cancelado']
+
+        try:
+            with traza('scrape_proceso', job_id=job_id) as span:
+                self._esperar_resultado(trabajo, proceso, padre, cancelado, inicio, span)
+        finally:
+            padre.close()
+            proceso.join(timeout=5)
+            # Tras timeout, cancelación o muerte sin respuesta puede quedar el
+            # navegador; con respuesta limpia el grupo ya no es nuestro (el pid
+            # pudo reutilizarse) salvo que el hijo siga vivo
+            if trabajo['terminar_grupo'] or proceso.is_alive():
+                _terminar_proceso(proceso, plazo=0)
+
+    def _esperar_resultado(self, trabajo: Dict[str, Any], proceso, padre, cancelado: bool,
+                           inicio: float, span):
+        """Espera la respuesta del hijo, incorpora sus mediciones y resuelve el Future"""
+        job_id = trabajo['job_id']
+        futuro = trabajo['futuro']
+
+        if cancelado:
+            # Se canceló mientras arrancaba
+            _terminar_proceso(proceso)
+
+        if not padre.poll(trabajo['timeout']):
+            _terminar_proceso(proceso)
+            logger.warning(f"⏱️ Timeout de scraping: {job_id} ({trabajo['timeout']}s)")
+            # Métricas antes de resolver: quien espera el Future ya las ve actualizadas
+            self._finalizar(trabajo, 'timeouts', inicio)
+            futuro.set_exception(ScrapeTimeoutError(
+                f"Scraping {job_id} superó {trabajo['timeout']}s"
+            ))
+            return
+
+        try:
+            estado, valor, mediciones = padre.recv()
+        except EOFError:
+            # El proceso murió sin responder (cancelado o caída del navegador)
+            if trabajo['cancelado']:
+                self._finalizar(trabajo, 'cancelados', inicio)
+                futuro.set_exception(CancelledError(f"Scraping {job_id} cancelado"))
+            else:
+                self._finalizar(trabajo, 'errores', inicio)
+                futuro.set_exception(RuntimeError(f"El proceso de {job_id} terminó sin resultado"))
+            return
+
+        trabajo['terminar_grupo'] = False
+
+        try:
+            metricas.acumular(mediciones['metricas'])
+            tracer.adoptar(mediciones['trazas'], span)
+        except Exception as e:
+            logger.warning(f"⚠️ No se pudieron incorporar las mediciones de {job_id}: {e}")
+
+        if estado == 'ok':
+            self._finalizar(trabajo, 'completados', inicio)
+            futuro.set_result(valor)
+        else:
+            self._finalizar(trabajo, 'errores', inicio)
+            futuro.set_exception(RuntimeError(valor))
+
+    def _finalizar(self, trabajo: Dict[str, Any], resultado: str, inicio: Optional[float] = None):
+        """Registra métricas y quita el trabajo del registro"""
+        with self._lock:
+            self.stats[resultado] += 1
+            if inicio is not None:
+                self.stats['duracion_total_segundos'] += time.monotonic() - inicio
+            self._trabajos.pop(trabajo['job_id'], None)
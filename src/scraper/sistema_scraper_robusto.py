@@ -22,8 +22,11 @@ import logging
 
 # Agregar rutas para imports
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
 
 from scraper.mlb_selenium_scraper import MLBSeleniumScraper
+from src.utils.metrics import CICLO_SEGUNDOS
+from src.utils.tracing import span_actual, traza, trazado
 
 # Configurar logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
@@ -277,7 +280,8 @@ class ScraperRobusto:
                 logger.info(f"🚀 Intento {intento}/{max_intentos}")
                 
                 # Realizar scraping - EXTRAER TODO
-                consensos = self.scraper.scrape_mlb_consensus()
+                with traza('intento_scraping', intento=intento):
+                    consensos = self.scraper.scrape_mlb_consensus()
                 
                 if consensos:
                     logger.info(f"✅ Éxito en intento {intento}: {len(consensos)} consensos encontrados")
@@ -334,8 +338,9 @@ class ScraperRobusto:
         
         return alertas_procesadas
     
+    @trazado('ciclo_scraping', pipeline='robusto')
     def ejecutar_ciclo_completo(self) -> Dict:
-        """Ejecutar ciclo completo de scraping, filtrado y procesamiento"""
+        """Ejecutar ciclo completo de scraping, filtrado y procesamiento (un span por etapa)"""
         inicio = time.time()
         
         logger.info("🎯 INICIANDO CICLO COMPLETO DE SCRAPING")
@@ -343,13 +348,18 @@ class ScraperRobusto:
         
         try:
             # Limpiar historial antiguo
-            self.historial.limpiar_historial_antiguo()
+            with traza('limpieza_historial'):
+                self.historial.limpiar_historial_antiguo()
             
             # Scraping con reintentos
-            consensos_filtrados = self.scrape_con_reintentos()
+            with traza('scraping') as span:
+                consensos_filtrados = self.scrape_con_reintentos()
+                span.atributos['consensos'] = len(consensos_filtrados)
             
             # Procesar alertas
-            alertas_enviadas = self.procesar_alertas(consensos_filtrados)
+            with traza('alertas') as span:
+                alertas_enviadas = self.procesar_alertas(consensos_filtrados)
+                span.atributos['procesadas'] = len(alertas_enviadas)
             
             # Estadísticas
             tiempo_total = time.time() - inicio
@@ -358,24 +368,29 @@ class ScraperRobusto:
                 'alertas_enviadas': len(alertas_enviadas),
                 'tiempo_procesamiento': round(tiempo_total, 2),
                 'timestamp': datetime.now(self.timezone).isoformat(),
-                'exito': len(alertas_enviadas) > 0
+                'exito': len(alertas_enviadas) > 0,
+                'tiempos_etapas': span_actual().etapas()
             }
+            CICLO_SEGUNDOS.observe(tiempo_total, pipeline='robusto')
             
             logger.info(f"📊 RESULTADO CICLO COMPLETO:")
             logger.info(f"   Consensos encontrados: {resultado['consensos_encontrados']}")
             logger.info(f"   Alertas enviadas: {resultado['alertas_enviadas']}")
             logger.info(f"   Tiempo total: {resultado['tiempo_procesamiento']} segundos")
+            logger.info(f"   Por etapa: {resultado['tiempos_etapas']}")
             
             return resultado
             
         except Exception as e:
             logger.error(f"💥 Error en ciclo completo: {e}")
+            CICLO_SEGUNDOS.observe(time.time() - inicio, pipeline='robusto')
             return {
                 'consensos_encontrados': 0,
                 'alertas_enviadas': 0,
                 'tiempo_procesamiento': time.time() - inicio,
                 'error': str(e),
-                'exito': False
+                'exito': False,
+                'tiempos_etapas': span_actual().etapas()
             }
     
     def actualizar_configuracion(self, **kwargs):
@@ -0,0 +1,211 @@
+"""
+Programador de temporizadores por partido
+Mantiene un heap ordenado por hora de ejecución y duerme hasta el próximo
+vencimiento, en lugar de revisar todos los scrapers cada minuto.
+"""
+
+import heapq
+import itertools
+import threading
+import time
+from datetime import datetime
+from typing import Callable, Dict, List, Optional, Any
+
+from src.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+class TimerScheduler:
+    """Arma un temporizador preciso por partido y lo dispara en su run_at"""
+
+    def __init__(self, callback: Callable[[str, Dict[str, Any]], None],
+                 persistencia=None, tolerancia_segundos: int = 900):
+        """
+        Args:
+            callback: función(clave, payload) a ejecutar al vencer un temporizador
+            persistencia: objeto con guardar_temporizador / obtener_temporizadores_pendientes /
+                          actualizar_estado_temporizador (p.ej. DataManager)
+            tolerancia_segundos: retraso máximo aceptado para disparar un
+                                 temporizador vencido (p.ej. tras un reinicio)
+        """
+        self.callback = callback
+        self.persistencia = persistencia
+        self.tolerancia_segundos = tolerancia_segundos
+
+        self._heap = []  # (timestamp, secuencia, clave)
+        self._timers: Dict[str, Dict[str, Any]] = {}
+        self._secuencia = itertools.count()
+        self._condicion = threading.Condition()
+        self._thread: Optional[threading.Thread] = None
+        self.is_running = False
+
+    def start(self):
+        """Recupera temporizadores persistidos e inicia el thread del heap"""
+        if self.is_running:
+            return
+
+        self.is_running = True
+        self._recuperar_temporizadores()
+
+        self._thread = threading.Thread(target=self._run, name="timer-scheduler", daemon=True)
+        self._thread.start()
+
+        logger.info(f"⏱️ TimerScheduler iniciado con {len(self._timers)} temporizadores")
+
+    def stop(self):
+        """Detiene el thread; los temporizadores pendientes quedan persistidos"""
+        with self._condicion:
+            self.is_running = False
+            self._condicion.notify_all()
+
+        if self._thread and self._thread is not threading.current_thread():
+            self._thread.join(timeout=5)
+
+        logger.info("🛑 TimerScheduler detenido")
+
+    def programar(self, clave: str, run_at: datetime, payload: Dict[str, Any] = None,
+                  persistir: bool = True) -> bool:
+        """
+        Arma (o re-arma) el temporizador de una clave
+
+        Returns:
+            False si run_at ya venció más allá de la tolerancia
+        """
+        timestamp = run_at.timestamp()
+        if timestamp < time.time() - self.tolerancia_segundos:
+            logger.warning(f"⚠️ Temporizador vencido, no se arma: {clave} ({run_at.isoformat()})")
+            return False
+
+        with self._condicion:
+            self._timers[clave] = {
+                'run_at': timestamp,
+                'payload': payload or {}
+            }
+            heapq.heappush(self._heap, (timestamp, next(self._secuencia), clave))
+            # Despertar el thread por si este temporizador es el más próximo
+            self._condicion.notify()
+
+        if persistir and self.persistencia:
+            try:
+                self.persistencia.guardar_temporizador(clave, run_at.isoformat(), payload or {})
+            except Exception as e:
+                logger.error(f"❌ Error persistiendo temporizador {clave}: {e}")
+
+        logger.debug("⏱️ Temporizador armado: %s -> %s", clave, run_at.isoformat())
+        return True
+
+    def cancelar(self, clave: str) -> bool:
+        """Cancela un temporizador (la entrada del heap se descarta al vencer)"""
+        with self._condicion:
+            existia = self._timers.pop(clave, None) is not None
+
+        if existia:
+            self._actualizar_persistencia(clave, 'cancelado')
+
+        return existia
+
+    def esta_programado(self, clave: str) -> bool:
+        """Indica si la clave tiene un temporizador armado"""
+        with self._condicion:
+            return clave in self._timers
+
+    def pendientes(self) -> List[Dict[str, Any]]:
+        """Lista de temporizadores armados ordenados por vencimiento"""
+        with self._condicion:
+            return sorted(
+                (
+                    {
+                        'clave': clave,
+                        'run_at': datetime.fromtimestamp(timer['run_at']).isoformat(),
+                        'payload': timer['payload']
+                    }
+                    for clave, timer in self._timers.items()
+                ),
+                key=lambda t: t['run_at']
+            )
+
+    def proximo_vencimiento(self) -> Optional[datetime]:
+        """Hora del próximo temporizador activo"""
+        with self._condicion:
+            self._descartar_invalidos()
+            if not self._heap:
+                return None
+            return datetime.fromtimestamp(self._heap[0][0])
+
+    def _run(self):
+        """Loop principal: dormir hasta el próximo vencimiento y disparar"""
+        while True:
+            with self._condicion:
+                if not self.is_running:
+                    return
+
+                self._descartar_invalidos()
+
+                if not self._heap:
+                    self._condicion.wait()
+                    continue
+
+                espera = self._heap[0][0] - time.time()
+                if espera > 0:
+                    self._condicion.wait(timeout=espera)
+                    continue
+
+                timestamp, _, clave = heapq.heappop(self._heap)
+                timer = self._timers.pop(clave)
+
+            self._disparar(clave, timestamp, timer['payload'])
+
+    def _descartar_invalidos(self):
+        """Quita del tope del heap entradas canceladas o re-armadas (requiere lock)"""
+        while self._heap:
+            timestamp, _, clave = self._heap[0]
+            timer = self._timers.get(clave)
+            if timer is not None and timer['run_at'] == timestamp:
+                return
+            heapq.heappop(self._heap)
+
+    def _disparar(self, clave: str, timestamp: float, payload: Dict[str, Any]):
+        """Ejecuta el callback de un temporizador vencido"""
+        retraso = time.time() - timestamp
+        logger.info(f"⏰ Disparando temporizador {clave} (retraso {retraso:.2f}s)")
+
+        self._actualizar_persistencia(clave, 'disparado')
+
+        try:
+            self.callback(clave, payload)
+        except Exception as e:
+            logger.error(f"❌ Error ejecutando temporizador {clave}: {e}")
+
+    def _recuperar_temporizadores(self):
+        """Re-arma los temporizadores persistidos antes de una caída"""
+        if not self.persistencia:
+            return
+
+        try:
+            persistidos = self.persistencia.obtener_temporizadores_pendientes()
+        except Exception as e:
+            logger.error(f"❌ Error recuperando temporizadores: {e}")
+            return
+
+        for registro in persistidos:
+            try:
+                run_at = datetime.fromisoformat(registro['run_at'])
+            except (TypeError, ValueError):
+                self._actualizar_persistencia(registro['clave'], 'expirado')
+                continue
+
+            if not self.programar(registro['clave'], run_at, registro.get('payload'), persistir=False):
+                self._actualizar_persistencia(registro['clave'], 'expirado')
+
+        if persistidos:
+            logger.info(f"♻️ Temporizadores recuperados: {len(persistidos)}")
+
+    def _actualizar_persistencia(self, clave: str, estado: str):
+        """Actualiza el estado persistido sin interrumpir el scheduler"""
+        if not self.persistencia:
+            return
+
+        try:
+            self.persistencia.actualizar_estado_temporizador(clave, estado)
+        except Exception as e:
+            logger.error(f"❌ Error actualizando temporizador {clave}: {e}")
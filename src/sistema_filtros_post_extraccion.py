@@ -11,10 +11,16 @@ from typing import List, Dict, Optional, Tuple
 import pytz
 from dataclasses import dataclass, asdict
 import os
+import re
 import logging
 
+from src.utils.metrics import RECHAZOS_FILTRO
+
 logger = logging.getLogger(__name__)
 
+# Hora de juego tal como aparece en covers (ej: "7:10 pm ET")
+PATRON_HORA = re.compile(r'(\d{1,2}):(\d{2})\s*([ap])m')
+
 @dataclass
 class FiltrosConsensus:
     """Configuración de filtros para aplicar a consensos ya extraídos"""
@@ -98,9 +104,84 @@ class FiltroConsensus:
         """
         logger.info(f"🔍 Aplicando filtros '{tipo_filtro}' a {len(consensos)} consensos")
         
-        consensos_validos = []
-        estadisticas = {
-            'total_inicial': len(consensos),
+        buckets, estadisticas_por_perfil = self._evaluar_perfiles(consensos, {tipo_filtro: self.filtros})
+        consensos_validos = buckets[tipo_filtro]
+        estadisticas = estadisticas_por_perfil[tipo_filtro]
+        
+        logger.info(f"✅ Filtros aplicados: {estadisticas['filtrados']}/{estadisticas['total_inicial']} aprobados")
+        self._log_rechazos(estadisticas)
+        
+        return consensos_validos, estadisticas
+    
+    def aplicar_filtros_multiples(self, consensos: List[Dict],
+                                  perfiles: Dict[str, FiltrosConsensus]) -> Tuple[Dict[str, List[Dict]], Dict[str, Dict]]:
+        """
+        Aplicar varios perfiles de filtros en una sola pasada
+        
+        Cada consenso se analiza una única vez y se enruta a todos los
+        perfiles que cumple (p.ej. 'alerta', 'revision' o un perfil por
+        suscriptor de Telegram).
+        
+        Args:
+            consensos: Lista de consensos extraídos
+            perfiles: Diccionario nombre_perfil -> FiltrosConsensus
+            
+        Returns:
+            Tuple[consensos_por_perfil, estadisticas_por_perfil]
+        """
+        logger.info(f"🔍 Aplicando {len(perfiles)} perfiles de filtros a {len(consensos)} consensos")
+        
+        buckets, estadisticas = self._evaluar_perfiles(consensos, perfiles)
+        
+        for nombre, stats in estadisticas.items():
+            logger.info(f"   • {nombre}: {stats['filtrados']}/{stats['total_inicial']} aprobados")
+        
+        return buckets, estadisticas
+    
+    def _evaluar_perfiles(self, consensos: List[Dict],
+                          perfiles: Dict[str, FiltrosConsensus]) -> Tuple[Dict[str, List[Dict]], Dict[str, Dict]]:
+        """Evaluar consensos contra N perfiles recorriendo la lista una vez"""
+        
+        buckets = {nombre: [] for nombre in perfiles}
+        estadisticas = {nombre: self._estadisticas_vacias(len(consensos)) for nombre in perfiles}
+        
+        # La completitud mínima de cada perfil se parsea una sola vez
+        minimos = {nombre: self._ratio_completitud(f.completitud_minima) for nombre, f in perfiles.items()}
+        timestamp = datetime.now(self.timezone).isoformat()
+        
+        for consenso in consensos:
+            atributos = self._extraer_atributos(consenso)
+            
+            for nombre, filtros in perfiles.items():
+                razon_rechazo = self._rechazo_por_atributos(atributos, filtros, minimos[nombre])
+                
+                if razon_rechazo is None:
+                    # Enriquecer consenso con info de filtro
+                    consenso_enriquecido = consenso.copy()
+                    consenso_enriquecido['filtro_aplicado'] = nombre
+                    consenso_enriquecido['timestamp_filtrado'] = timestamp
+                    consenso_enriquecido['razon_aprobacion'] = f'{nombre}_aprobado'
+                    buckets[nombre].append(consenso_enriquecido)
+                else:
+                    # Contar razón de rechazo
+                    rechazados = estadisticas[nombre]['rechazados_por']
+                    if razon_rechazo in rechazados:
+                        rechazados[razon_rechazo] += 1
+                    else:
+                        rechazados['otros'] += 1
+        
+        for nombre, aprobados in buckets.items():
+            estadisticas[nombre]['filtrados'] = len(aprobados)
+            for razon, cantidad in estadisticas[nombre]['rechazados_por'].items():
+                if cantidad:
+                    RECHAZOS_FILTRO.inc(cantidad, perfil=nombre, razon=razon)
+        
+        return buckets, estadisticas
+    
+    def _estadisticas_vacias(self, total_inicial: int) -> Dict:
+        """Estructura de estadísticas de un perfil"""
+        return {
+            'total_inicial': total_inicial,
             'filtrados': 0,
             'rechazados_por': {
                 'umbral_consenso': 0,
@@ -112,30 +193,9 @@ class FiltroConsensus:
                 'otros': 0
             }
         }
-        
-        for consenso in consensos:
-            resultado_filtro = self._evaluar_consenso(consenso, tipo_filtro)
-            
-            if resultado_filtro['aprobado']:
-                # Enriquecer consenso con info de filtro
-                consenso_enriquecido = consenso.copy()
-                consenso_enriquecido['filtro_aplicado'] = tipo_filtro
-                consenso_enriquecido['timestamp_filtrado'] = datetime.now(self.timezone).isoformat()
-                consenso_enriquecido['razon_aprobacion'] = resultado_filtro['razon']
-                consensos_validos.append(consenso_enriquecido)
-            else:
-                # Contar razón de rechazo
-                razon = resultado_filtro['razon_rechazo']
-                if razon in estadisticas['rechazados_por']:
-                    estadisticas['rechazados_por'][razon] += 1
-                else:
-                    estadisticas['rechazados_por']['otros'] += 1
-        
-        estadisticas['filtrados'] = len(consensos_validos)
-        
-        logger.info(f"✅ Filtros aplicados: {estadisticas['filtrados']}/{estadisticas['total_inicial']} aprobados")
-        
-        # Log de rechazos si hay
+    
+    def _log_rechazos(self, estadisticas: Dict):
+        """Log de rechazos si hay"""
         rechazos = estadisticas['rechazados_por']
         rechazos_totales = sum(rechazos.values())
         if rechazos_totales > 0:
@@ -143,128 +203,85 @@ class FiltroConsensus:
             for razon, cantidad in rechazos.items():
                 if cantidad > 0:
                     logger.info(f"   • {razon}: {cantidad}")
-        
-        return consensos_validos, estadisticas
     
-    def _evaluar_consenso(self, consenso: Dict, tipo_filtro: str) -> Dict:
-        """Evaluar si un consenso cumple los filtros"""
+    def _extraer_atributos(self, consenso: Dict) -> Dict:
+        """Calcular una vez los valores del consenso que usan los filtros"""
+        hora_juego = consenso.get('hora_juego')
+        return {
+            'tiene_equipos': bool(consenso.get('equipo_visitante') and consenso.get('equipo_local')),
+            'completitud': self._ratio_completitud(consenso.get('completitud', '0/3')),
+            'tiene_hora': bool(hora_juego),
+            'hora_24': self._hora_24(hora_juego) if hora_juego else None,
+            'porcentaje': consenso.get('porcentaje_consenso', 0),
+            'num_experts': max(consenso.get('num_experts', 0), consenso.get('total_picks', 0)),
+            'direccion': (consenso.get('direccion_consenso') or '').upper(),
+            'total_line': consenso.get('total_line')
+        }
+    
+    def _rechazo_por_atributos(self, atributos: Dict, filtros: FiltrosConsensus,
+                               completitud_minima: Optional[float]) -> Optional[str]:
+        """Devuelve la razón de rechazo o None si el consenso es aprobado"""
         
         # FILTRO 1: COMPLETITUD DE DATOS
-        if not self._tiene_datos_minimos(consenso):
-            return {
-                'aprobado': False,
-                'razon_rechazo': 'datos_incompletos',
-                'detalle': 'Faltan datos esenciales'
-            }
+        if filtros.requerir_equipos and not atributos['tiene_equipos']:
+            return 'datos_incompletos'
+        if (atributos['completitud'] is None or completitud_minima is None
+                or atributos['completitud'] < completitud_minima):
+            return 'datos_incompletos'
+        if filtros.requerir_hora and not atributos['tiene_hora']:
+            return 'datos_incompletos'
+        if filtros.requerir_total_line and not atributos['total_line']:
+            return 'datos_incompletos'
         
         # FILTRO 2: UMBRAL DE CONSENSO
-        porcentaje = consenso.get('porcentaje_consenso', 0)
-        if porcentaje < self.filtros.umbral_minimo or porcentaje > self.filtros.umbral_maximo:
-            return {
-                'aprobado': False,
-                'razon_rechazo': 'umbral_consenso',
-                'detalle': f'Porcentaje {porcentaje}% fuera del rango {self.filtros.umbral_minimo}-{self.filtros.umbral_maximo}%'
-            }
+        porcentaje = atributos['porcentaje']
+        if porcentaje < filtros.umbral_minimo or porcentaje > filtros.umbral_maximo:
+            return 'umbral_consenso'
         
         # FILTRO 3: NÚMERO DE EXPERTOS
-        num_experts = max(consenso.get('num_experts', 0), consenso.get('total_picks', 0))
-        if num_experts < self.filtros.expertos_minimos:
-            return {
-                'aprobado': False,
-                'razon_rechazo': 'pocos_expertos',
-                'detalle': f'{num_experts} expertos < {self.filtros.expertos_minimos} mínimo'
-            }
+        if atributos['num_experts'] < filtros.expertos_minimos:
+            return 'pocos_expertos'
         
         # FILTRO 4: DIRECCIÓN DEL CONSENSO
-        direccion = consenso.get('direccion_consenso', '').upper()
-        if direccion and direccion not in self.filtros.direcciones_permitidas:
-            return {
-                'aprobado': False,
-                'razon_rechazo': 'direccion_no_permitida',
-                'detalle': f'Dirección {direccion} no permitida'
-            }
+        direccion = atributos['direccion']
+        if direccion and direccion not in filtros.direcciones_permitidas:
+            return 'direccion_no_permitida'
         
         # FILTRO 5: TOTAL LINE
-        total_line = consenso.get('total_line')
-        if total_line and (total_line < self.filtros.total_line_min or total_line > self.filtros.total_line_max):
-            return {
-                'aprobado': False,
-                'razon_rechazo': 'total_line_invalido',
-                'detalle': f'Total line {total_line} fuera del rango {self.filtros.total_line_min}-{self.filtros.total_line_max}'
-            }
+        total_line = atributos['total_line']
+        if total_line and (total_line < filtros.total_line_min or total_line > filtros.total_line_max):
+            return 'total_line_invalido'
         
         # FILTRO 6: HORARIO (si está especificado)
-        if self.filtros.horas_permitidas and consenso.get('hora_juego'):
-            if not self._hora_permitida(consenso['hora_juego']):
-                return {
-                    'aprobado': False,
-                    'razon_rechazo': 'fuera_de_horario',
-                    'detalle': f'Hora {consenso["hora_juego"]} no permitida'
-                }
+        if filtros.horas_permitidas and atributos['tiene_hora']:
+            # Si no se puede parsear la hora, se acepta
+            if atributos['hora_24'] and atributos['hora_24'] not in filtros.horas_permitidas:
+                return 'fuera_de_horario'
         
-        # Si llega aquí, aprobado
-        return {
-            'aprobado': True,
-            'razon': f'{tipo_filtro}_aprobado',
-            'detalle': f'Cumple todos los criterios para {tipo_filtro}'
-        }
-    
-    def _tiene_datos_minimos(self, consenso: Dict) -> bool:
-        """Verificar si tiene los datos mínimos requeridos"""
-        
-        # Verificar equipos si es requerido
-        if self.filtros.requerir_equipos:
-            if not consenso.get('equipo_visitante') or not consenso.get('equipo_local'):
-                return False
-        
-        # Verificar completitud mínima
-        completitud_actual = consenso.get('completitud', '0/3')
-        if not self._cumple_completitud_minima(completitud_actual):
-            return False
-        
-        # Verificar campos específicos si son requeridos
-        if self.filtros.requerir_hora and not consenso.get('hora_juego'):
-            return False
-        
-        if self.filtros.requerir_total_line and not consenso.get('total_line'):
-            return False
-        
-        return True
+        return None
     
-    def _cumple_completitud_minima(self, completitud_actual: str) -> bool:
-        """Verificar si cumple la completitud mínima"""
+    def _ratio_completitud(self, completitud: str) -> Optional[float]:
+        """Convertir '2/3' en 0.66; None si no se puede parsear"""
         try:
-            actual_num, actual_den = map(int, completitud_actual.split('/'))
-            min_num, min_den = map(int, self.filtros.completitud_minima.split('/'))
-            
-            # Calcular porcentajes
-            porcentaje_actual = actual_num / actual_den if actual_den > 0 else 0
-            porcentaje_minimo = min_num / min_den if min_den > 0 else 0
-            
-            return porcentaje_actual >= porcentaje_minimo
+            num, den = map(int, completitud.split('/'))
+            return num / den if den > 0 else 0
         except:
-            return False
+            return None
     
-    def _hora_permitida(self, hora_juego: str) -> bool:
-        """Verificar si la hora está permitida"""
-        if not self.filtros.horas_permitidas:
-            return True  # Si no hay restricciones, todas las horas son válidas
+    def _hora_24(self, hora_juego: str) -> Optional[str]:
+        """Convertir "7:10 pm ET" -> "19:10"; None si no se puede parsear"""
+        match = PATRON_HORA.search(hora_juego.lower())
+        if not match:
+            return None
         
-        # Extraer solo la hora de la cadena (ej: "7:10 pm ET" -> "19:10")
-        import re
-        match = re.search(r'(\d{1,2}):(\d{2})\s*([ap])m', hora_juego.lower())
-        if match:
-            hora, minuto, periodo = match.groups()
-            hora_24 = int(hora)
-            if periodo == 'p' and hora_24 != 12:
-                hora_24 += 12
-            elif periodo == 'a' and hora_24 == 12:
-                hora_24 = 0
-            
-            hora_formateada = f"{hora_24:02d}:{minuto}"
-            return hora_formateada in self.filtros.horas_permitidas
+        hora, minuto, periodo = match.groups()
+        hora_24 = int(hora)
+        if periodo == 'p' and hora_24 != 12:
+            hora_24 += 12
+        elif periodo == 'a' and hora_24 == 12:
+            hora_24 = 0
         
-        return True  # Si no puede parsear, aceptar
+        return f"{hora_24:02d}:{minuto}"
     
     def filtros_por_horario(self, consensos: List[Dict]) -> Dict[str, List[Dict]]:
         """Organizar consensos por horarios para scraping programado"""
@@ -287,31 +304,22 @@ class FiltroConsensus:
                 continue
             
             # Determinar categoría por hora
-            try:
-                # Parsear hora
-                import re
-                match = re.search(r'(\d{1,2}):(\d{2})\s*([ap])m', hora_juego.lower())
-                if match:
-                    hora, minuto, periodo = match.groups()
-                    hora_24 = int(hora)
-                    if periodo == 'p' and hora_24 != 12:
-                        hora_24 += 12
-                    elif periodo == 'a' and hora_24 == 12:
-                        hora_24 = 0
-                    
-                    # Clasificar por franja horaria
-                    if 6 <= hora_24 < 12:
-                        consensos_por_hora['matutino'].append(consenso)
-                    elif 12 <= hora_24 < 18:
-                        consensos_por_hora['tarde'].append(consenso)
-                    else:
-                        consensos_por_hora['noche'].append(consenso)
-                    
-                    # Verificar si es urgente (próximo a comenzar)
-                    # TODO: Implementar lógica de tiempo real
-                    
-            except:
+            hora_24 = self._hora_24(str(hora_juego))
+            if hora_24 is None:
                 consensos_por_hora['sin_hora'].append(consenso)
+                continue
+            
+            # Clasificar por franja horaria
+            hora = int(hora_24[:2])
+            if 6 <= hora < 12:
+                consensos_por_hora['matutino'].append(consenso)
+            elif 12 <= hora < 18:
+                consensos_por_hora['tarde'].append(consenso)
+            else:
+                consensos_por_hora['noche'].append(consenso)
+            
+            # Verificar si es urgente (próximo a comenzar)
+            # TODO: Implementar lógica de tiempo real
         
         return consensos_por_hora
     
@@ -2,7 +2,21 @@
 Módulo de utilidades para el sistema de scraping
 """
 
-from .logger import get_logger
-from .error_handler import ErrorHandler, retry_on_failure, log_exception
+from .lazy_import import atributos_perezosos
 
-__all__ = ['get_logger', 'ErrorHandler', 'retry_on_failure', 'log_exception']
+# Se importan al primer acceso: lazy_import vive en este paquete y cada
+# paquete perezoso lo carga, así que no debe arrastrar asyncio (error_handler)
+# ni http.server/urllib (metrics, tracing)
+_EXPORTADOS = {
+    'get_logger': '.logger',
+    'ErrorHandler': '.error_handler',
+    'retry_on_failure': '.error_handler',
+    'log_exception': '.error_handler',
+    'metricas': '.metrics',
+    'traza': '.tracing',
+    'trazado': '.tracing',
+}
+
+__getattr__, __dir__ = atributos_perezosos(__name__, _EXPORTADOS)
+
+__all__ = ['get_logger', 'ErrorHandler', 'retry_on_failure', 'log_exception', 'metricas', 'traza', 'trazado']
@@ -0,0 +1,57 @@
+"""
+Importaciones diferidas para acortar el arranque
+Los paquetes exportan sus clases pesadas con atributos perezosos (PEP 562):
+el submódulo recién se importa cuando alguien accede al nombre, así un
+proceso que solo usa la cola de trabajos no paga Selenium, APScheduler
+o el cliente de Supabase.
+"""
+
+import importlib
+import importlib.util
+import sys
+from types import ModuleType
+from typing import Callable, Dict, List, Tuple
+
+def importar_perezoso(nombre: str) -> ModuleType:
+    """
+    Devuelve el módulo sin ejecutarlo: se carga en el primer acceso a un atributo
+
+    Si el módulo no está instalado lanza ImportError de inmediato, igual que
+    un import normal, para que los try/except ImportError sigan funcionando.
+    """
+    if nombre in sys.modules:
+        return sys.modules[nombre]
+
+    spec = importlib.util.find_spec(nombre)
+    if spec is None:
+        raise ImportError(f"No module named {nombre!r}", name=nombre)
+
+    cargador = importlib.util.LazyLoader(spec.loader)
+    spec.loader = cargador
+    modulo = importlib.util.module_from_spec(spec)
+    sys.modules[nombre] = modulo
+    cargador.exec_module(modulo)
+    return modulo
+
+def atributos_perezosos(paquete: str, exportados: Dict[str, str]) -> Tuple[Callable, Callable]:
+    """
+    __getattr__ y __dir__ de módulo que importan cada nombre al primer acceso
+
+    Args:
+        paquete: __name__ del paquete que exporta
+        exportados: {nombre exportado: submódulo relativo ('.mlb_scraper')}
+    """
+    def __getattr__(nombre: str):
+        submodulo = exportados.get(nombre)
+        if submodulo is None:
+            raise AttributeError(f"module {paquete!r} has no attribute {nombre!r}")
+
+        valor = getattr(importlib.import_module(submodulo, paquete), nombre)
+        # Los accesos siguientes ya no pasan por __getattr__
+        setattr(sys.modules[paquete], nombre, valor)
+        return valor
+
+    def __dir__() -> List[str]:
+        return sorted(set(vars(sys.modules[paquete])) | set(exportados))
+
+    return __getattr__, __dir__
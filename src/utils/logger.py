@@ -2,18 +2,205 @@
 Sistema de logging avanzado para el proyecto
 """
 
+import atexit
+import json
 import logging
 import os
+import queue
 import sys
+import threading
 from datetime import datetime, timedelta
-from logging.handlers import RotatingFileHandler
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
 from pathlib import Path
 from typing import Optional
 
+# Formato de salida: 'texto' (por defecto) o 'json' (una línea JSON por registro)
+LOG_FORMAT = os.getenv('LOG_FORMAT', 'texto').lower()
+
+# Nivel mínimo de los loggers del proyecto; sin definir se usa el de setup_logger
+LOG_LEVEL = os.getenv('LOG_LEVEL')
+
+class JsonFormatter(logging.Formatter):
+    """Formatea cada registro como una línea JSON (los eventos agregan sus campos)"""
+    
+    def format(self, record: logging.LogRecord) -> str:
+        registro = {
+            'ts': datetime.fromtimestamp(record.created).isoformat(timespec='milliseconds'),
+            'level': record.levelname,
+            'logger': record.name,
+            'thread': record.threadName,
+            'msg': record.getMessage()
+        }
+        
+        evento = getattr(record, 'evento', None)
+        if evento:
+            registro['evento'] = evento
+        
+        if record.exc_info:
+            registro['exc'] = self.formatException(record.exc_info)
+        
+        return json.dumps(registro, ensure_ascii=False, default=str)
+
+class _QueueHandlerDiferido(QueueHandler):
+    """
+    Encola el registro sin formatearlo
+    
+    QueueHandler.prepare formatea el mensaje en el hilo que loguea; aquí el
+    mensaje (msg % args) se arma recién en el hilo del QueueListener. Los
+    argumentos deben ser valores que no cambien después de loguear.
+    """
+    
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        return record
+
+# Campos del registro de logging que se guardan como columnas del evento
+_CAMPOS_EVENTO = ('sport', 'alert_type', 'event_type', 'consensus_count',
+                  'high_consensus_count', 'duration_seconds')
+
+class EventosHandler(logging.Handler):
+    """
+    Persiste los eventos tipados y los errores en la tabla `eventos`
+    
+    Corre en el hilo del QueueListener: los registros con `evento` (ver
+    log_scraping_event/log_alert_event) y los de nivel ERROR o mayor se
+    guardan como filas, y el reporte diario se arma con consultas agregadas.
+    Solo se agrega con instalar_eventos().
+    """
+    
+    def __init__(self, persistencia=None):
+        super().__init__(level=logging.DEBUG)
+        self._persistencia = persistencia
+    
+    def filter(self, record: logging.LogRecord) -> bool:
+        return getattr(record, 'evento', None) is not None or record.levelno >= logging.ERROR
+    
+    def emit(self, record: logging.LogRecord):
+        try:
+            if self._persistencia is None:
+                # Import diferido: data_manager crea la base al importarse
+                from src.database.data_manager import data_manager
+                self._persistencia = data_manager
+            
+            self._persistencia.registrar_evento(evento_desde_registro(record))
+        except Exception:
+            # Nunca loguear desde aquí: el error volvería a este handler
+            self.handleError(record)
+
+def evento_desde_registro(record: logging.LogRecord) -> dict:
+    """Convierte un registro de logging en un evento tipado para registrar_evento"""
+    detalles = dict(getattr(record, 'evento', None) or {})
+    
+    evento = {
+        'timestamp': datetime.fromtimestamp(record.created).isoformat(timespec='milliseconds'),
+        'categoria': detalles.pop('tipo', 'error'),
+        'nivel': record.levelname,
+        'logger': record.name,
+        'mensaje': detalles.pop('error_message', None) or record.getMessage()
+    }
+    for campo in _CAMPOS_EVENTO:
+        if campo in detalles:
+            evento[campo] = detalles.pop(campo)
+    
+    evento.update(detalles)
+    return evento
+
+_queue_handler: Optional[QueueHandler] = None
+_listener: Optional[QueueListener] = None
+_eventos_handler: Optional[EventosHandler] = None
+_lock_handlers = threading.Lock()
+
+def _crear_formatter() -> logging.Formatter:
+    """Formatter según LOG_FORMAT"""
+    if LOG_FORMAT == 'json':
+        return JsonFormatter()
+    
+    return logging.Formatter(
+        '[%(asctime)s] [%(levelname)s] [%(name)s] %(message)s',
+        datefmt='%Y-%m-%d %H:%M:%S'
+    )
+
+def _obtener_queue_handler() -> QueueHandler:
+    """
+    Handler compartido por todos los loggers del proyecto
+    
+    La consola, el archivo y la tabla de eventos (si se instaló) se escriben
+    desde un único QueueListener, fuera de los hilos de scraping.
+    """
+    global _queue_handler, _listener
+    
+    with _lock_handlers:
+        if _queue_handler is not None:
+            return _queue_handler
+        
+        formatter = _crear_formatter()
+        
+        # Handler para consola
+        console_handler = logging.StreamHandler(sys.stdout)
+        console_handler.setLevel(logging.INFO)
+        console_handler.setFormatter(formatter)
+        
+        # Handler para archivo con rotación diaria
+        log_dir = Path("logs")
+        log_dir.mkdir(exist_ok=True)
+        
+        log_file = log_dir / f"scraper_{datetime.now().strftime('%Y-%m-%d')}.log"
+        file_handler = RotatingFileHandler(
+            log_file,
+            maxBytes=10*1024*1024,  # 10 MB
+            backupCount=7,  # Mantener 7 días de logs
+            encoding='utf-8'
+        )
+        file_handler.setLevel(logging.DEBUG)
+        file_handler.setFormatter(formatter)
+        
+        cola = queue.SimpleQueue()
+        _listener = QueueListener(cola, console_handler, file_handler, respect_handler_level=True)
+        _listener.start()
+        # Vaciar la cola al salir para no perder los últimos registros
+        atexit.register(_listener.stop)
+        
+        _queue_handler = _QueueHandlerDiferido(cola)
+        return _queue_handler
+
+def instalar_eventos(persistencia=None) -> EventosHandler:
+    """
+    Empieza a guardar eventos tipados y errores en la tabla `eventos`
+    
+    La llaman los procesos de larga duración al arrancar (servicio en
+    background, scheduler, sistema de consensos). Sin esta llamada, como
+    en los tests, el logging no escribe en ninguna base.
+    
+    Args:
+        persistencia: DataManager donde guardar (por defecto el global)
+    """
+    global _eventos_handler
+    
+    _obtener_queue_handler()
+    with _lock_handlers:
+        if _eventos_handler is None:
+            _eventos_handler = EventosHandler(persistencia)
+            # El listener lee la tupla en cada registro: reemplazarla es atómico
+            _listener.handlers = _listener.handlers + (_eventos_handler,)
+        elif persistencia is not None:
+            _eventos_handler._persistencia = persistencia
+        return _eventos_handler
+
+def desinstalar_eventos():
+    """Deja de guardar eventos en la base"""
+    global _eventos_handler
+    
+    with _lock_handlers:
+        if _eventos_handler is not None and _listener is not None:
+            _listener.handlers = tuple(h for h in _listener.handlers if h is not _eventos_handler)
+        _eventos_handler = None
+
 def setup_logger(name: str, level: str = "DEBUG") -> logging.Logger:
     """
     Configurar logger con rotación de archivos y formato personalizado
     
+    Los registros se encolan y se escriben en otro hilo (QueueListener);
+    LOG_FORMAT=json emite JSON lines y LOG_LEVEL sube el nivel mínimo.
+    
     Args:
         name: Nombre del logger
         level: Nivel de logging (DEBUG, INFO, WARNING, ERROR, CRITICAL)
@@ -24,38 +211,13 @@ def setup_logger(name: str, level: str = "DEBUG") -> logging.Logger:
     
     # Crear logger
     logger = logging.getLogger(name)
-    logger.setLevel(getattr(logging, level.upper()))
+    logger.setLevel(getattr(logging, (LOG_LEVEL or level).upper()))
     
     # Evitar duplicar handlers
     if logger.handlers:
         return logger
     
-    # Formato de mensajes
-    formatter = logging.Formatter(
-        '[%(asctime)s] [%(levelname)s] [%(name)s] %(message)s',
-        datefmt='%Y-%m-%d %H:%M:%S'
-    )
-    
-    # Handler para consola
-    console_handler = logging.StreamHandler(sys.stdout)
-    console_handler.setLevel(logging.INFO)
-    console_handler.setFormatter(formatter)
-    logger.addHandler(console_handler)
-    
-    # Handler para archivo con rotación diaria
-    log_dir = Path("logs")
-    log_dir.mkdir(exist_ok=True)
-    
-    log_file = log_dir / f"scraper_{datetime.now().strftime('%Y-%m-%d')}.log"
-    file_handler = RotatingFileHandler(
-        log_file,
-        maxBytes=10*1024*1024,  # 10 MB
-        backupCount=7,  # Mantener 7 días de logs
-        encoding='utf-8'
-    )
-    file_handler.setLevel(logging.DEBUG)
-    file_handler.setFormatter(formatter)
-    logger.addHandler(file_handler)
+    logger.addHandler(_obtener_queue_handler())
     
     return logger
 
@@ -127,7 +289,7 @@ def log_scraping_event(logger: logging.Logger, sport: str, event_type: str, deta
         event_msg += f" | Intento: {details.get('attempt', 1)}"
         event_msg += f" | Espera: {details.get('delay_seconds', 0)}s"
     
-    logger.info(event_msg)
+    logger.info(event_msg, extra={'evento': {'tipo': 'scraping', 'sport': sport, 'event_type': event_type, **details}})
 
 def log_alert_event(logger: logging.Logger, alert_type: str, event_type: str, details: dict):
     """
@@ -159,108 +321,35 @@ def log_alert_event(logger: logging.Logger, alert_type: str, event_type: str, de
         event_msg += f" | Intento: {details.get('attempt', 1)}"
         event_msg += f" | Espera: {details.get('delay_seconds', 0)}s"
     
-    logger.info(event_msg)
+    logger.info(event_msg, extra={'evento': {'tipo': 'alerta', 'alert_type': alert_type, 'event_type': event_type, **details}})
 
-def generate_daily_report(logger: logging.Logger, log_file_path: str) -> dict:
+def generate_daily_report(logger: logging.Logger, log_file_path: Optional[str] = None,
+                          fecha: Optional[str] = None) -> dict:
     """
-    Genera reporte diario basado en logs
+    Genera reporte diario a partir de la tabla de eventos
+    
+    Los eventos de scraping/alertas y los errores se guardan como registros
+    tipados (ver EventosHandler), así que el reporte es una consulta agregada
+    sobre los eventos del día; el log de texto ya no se relee.
     
     Args:
         logger: Logger a usar
-        log_file_path: Ruta al archivo de log del día
+        log_file_path: Archivo de log del día (solo para informar su tamaño)
+        fecha: Día a reportar (YYYY-MM-DD), por defecto hoy
         
     Returns:
         Diccionario con estadísticas del día
     """
     try:
-        if not os.path.exists(log_file_path):
-            logger.warning(f"Archivo de log no encontrado: {log_file_path}")
-            return {}
+        from src.database.data_manager import data_manager
         
-        stats = {
-            'fecha': datetime.now().strftime('%Y-%m-%d'),
-            'scraping_events': {
-                'total_attempts': 0,
-                'successful': 0,
-                'failed': 0,
-                'retries': 0,
-                'total_consensus': 0,
-                'high_consensus': 0
-            },
-            'alert_events': {
-                'total_sent': 0,
-                'failed': 0,
-                'consensus_alerts': 0,
-                'error_alerts': 0,
-                'daily_reports': 0
-            },
-            'error_summary': {
-                'total_errors': 0,
-                'critical_errors': 0,
-                'network_errors': 0,
-                'telegram_errors': 0
-            },
-            'system_info': {
-                'uptime_hours': 0,
-                'log_file_size': 0,
-                'total_log_lines': 0
-            }
+        stats = data_manager.obtener_resumen_eventos(fecha or datetime.now().strftime('%Y-%m-%d'))
+        stats['system_info'] = {
+            'uptime_hours': 0,
+            'log_file_size': os.path.getsize(log_file_path) if log_file_path and os.path.exists(log_file_path) else 0,
+            'total_eventos': stats.pop('total_eventos')
         }
         
-        with open(log_file_path, 'r', encoding='utf-8') as f:
-            lines = f.readlines()
-            stats['system_info']['total_log_lines'] = len(lines)
-            
-            for line in lines:
-                # Analizar eventos de scraping
-                if 'SCRAPING_START' in line:
-                    stats['scraping_events']['total_attempts'] += 1
-                elif 'SCRAPING_SUCCESS' in line:
-                    stats['scraping_events']['successful'] += 1
-                    # Extraer número de consensos
-                    if 'Consensos:' in line:
-                        try:
-                            consensus_count = int(line.split('Consensos:')[1].split('|')[0].strip())
-                            stats['scraping_events']['total_consensus'] += consensus_count
-                        except:
-                            pass
-                    # Extraer consensos altos
-                    if 'Alto_consenso:' in line:
-                        try:
-                            high_count = int(line.split('Alto_consenso:')[1].split('|')[0].strip())
-                            stats['scraping_events']['high_consensus'] += high_count
-                        except:
-                            pass
-                elif 'SCRAPING_ERROR' in line:
-                    stats['scraping_events']['failed'] += 1
-                elif 'SCRAPING_RETRY' in line:
-                    stats['scraping_events']['retries'] += 1
-                
-                # Analizar eventos de alertas
-                if 'ALERT_SENT' in line:
-                    stats['alert_events']['total_sent'] += 1
-                    if 'consensus' in line.lower():
-                        stats['alert_events']['consensus_alerts'] += 1
-                    elif 'error' in line.lower():
-                        stats['alert_events']['error_alerts'] += 1
-                    elif 'daily' in line.lower():
-                        stats['alert_events']['daily_reports'] += 1
-                elif 'ALERT_FAILED' in line:
-                    stats['alert_events']['failed'] += 1
-                
-                # Analizar errores
-                if '[ERROR]' in line:
-                    stats['error_summary']['total_errors'] += 1
-                    if 'network' in line.lower() or 'connection' in line.lower():
-                        stats['error_summary']['network_errors'] += 1
-                    elif 'telegram' in line.lower():
-                        stats['error_summary']['telegram_errors'] += 1
-                elif '[CRITICAL]' in line:
-                    stats['error_summary']['critical_errors'] += 1
-        
-        # Calcular tamaño del archivo
-        stats['system_info']['log_file_size'] = os.path.getsize(log_file_path)
-        
         logger.info(f"📊 Reporte diario generado: {stats['scraping_events']['successful']} scraping exitosos")
         return stats
         
@@ -300,7 +389,7 @@ def log_daily_summary(logger: logging.Logger, stats: dict):
     
     # System stats
     system = stats.get('system_info', {})
-    logger.info(f"🔧 SISTEMA | Líneas de log: {system.get('total_log_lines', 0)} | Tamaño: {system.get('log_file_size', 0)} bytes")
+    logger.info(f"🔧 SISTEMA | Eventos: {system.get('total_eventos', 0)} | Tamaño log: {system.get('log_file_size', 0)} bytes")
     
     logger.info("=" * 80)
 
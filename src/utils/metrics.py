@@ -0,0 +1,337 @@
+"""
+Registro de métricas estilo Prometheus
+Contadores, gauges e histogramas con etiquetas, expuestos en formato de
+texto de Prometheus por un endpoint HTTP local (/metrics). Sin
+dependencias externas: prometheus_client no forma parte del proyecto.
+"""
+
+import bisect
+import os
+import threading
+import time
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+from src.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+# Puerto del endpoint /metrics (solo escucha en localhost por defecto)
+METRICS_PORT = int(os.getenv('METRICS_PORT', '9108'))
+METRICS_HOST = os.getenv('METRICS_HOST', '127.0.0.1')
+
+# Buckets por defecto (segundos): de milisegundos a los ~60s de una carga con Selenium
+BUCKETS_SEGUNDOS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60)
+
+def _escapar_etiqueta(valor: str) -> str:
+    return str(valor).replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+
+def _formatear_etiquetas(nombres: Tuple[str, ...], valores: Tuple[str, ...], extra: str = '') -> str:
+    pares = [f'{nombre}="{_escapar_etiqueta(valor)}"' for nombre, valor in zip(nombres, valores)]
+    if extra:
+        pares.append(extra)
+    return '{' + ','.join(pares) + '}' if pares else ''
+
+def _formatear_numero(valor: float) -> str:
+    if valor == float('inf'):
+        return '+Inf'
+    return repr(float(valor)) if isinstance(valor, float) and not valor.is_integer() else str(int(valor))
+
+class _Metrica:
+    """Base: una serie por combinación de valores de etiquetas"""
+
+    tipo = ''
+
+    def __init__(self, nombre: str, descripcion: str, etiquetas: Iterable[str] = ()):
+        self.nombre = nombre
+        self.descripcion = descripcion
+        self.etiquetas = tuple(etiquetas)
+        self._lock = threading.Lock()
+        self._series: Dict[Tuple[str, ...], object] = {}
+
+    def _clave(self, etiquetas: Dict[str, str]) -> Tuple[str, ...]:
+        if set(etiquetas) != set(self.etiquetas):
+            raise ValueError(f"{self.nombre}: se esperaban las etiquetas {self.etiquetas}, "
+                             f"se recibieron {tuple(etiquetas)}")
+        return tuple(str(etiquetas[nombre]) for nombre in self.etiquetas)
+
+    def exportar(self) -> List[str]:
+        """Líneas en formato de texto de Prometheus"""
+        lineas = [f"# HELP {self.nombre} {self.descripcion}", f"# TYPE {self.nombre} {self.tipo}"]
+        with self._lock:
+            series = list(self._series.items())
+        for clave, valor in series:
+            lineas.extend(self._exportar_serie(clave, valor))
+        return lineas
+
+    def _exportar_serie(self, clave: Tuple[str, ...], valor) -> List[str]:
+        return [f"{self.nombre}{_formatear_etiquetas(self.etiquetas, clave)} {_formatear_numero(valor)}"]
+
+class Counter(_Metrica):
+    """Contador monótono"""
+
+    tipo = 'counter'
+
+    def inc(self, cantidad: float = 1, **etiquetas):
+        if cantidad < 0:
+            raise ValueError("Un contador no puede decrementarse")
+        clave = self._clave(etiquetas)
+        with self._lock:
+            self._series[clave] = self._series.get(clave, 0) + cantidad
+
+    def valor(self, **etiquetas) -> float:
+        return self._series.get(self._clave(etiquetas), 0)
+
+    def _acumular(self, clave: Tuple[str, ...], valor: float):
+        with self._lock:
+            self._series[clave] = self._series.get(clave, 0) + valor
+
+class Gauge(_Metrica):
+    """Valor instantáneo; puede fijarse o calcularse al exportar (set_funcion)"""
+
+    tipo = 'gauge'
+
+    def __init__(self, nombre: str, descripcion: str, etiquetas: Iterable[str] = ()):
+        super().__init__(nombre, descripcion, etiquetas)
+        self._funciones: Dict[Tuple[str, ...], Callable[[], float]] = {}
+
+    def set(self, valor: float, **etiquetas):
+        clave = self._clave(etiquetas)
+        with self._lock:
+            self._series[clave] = valor
+
+    def inc(self, cantidad: float = 1, **etiquetas):
+        clave = self._clave(etiquetas)
+        with self._lock:
+            self._series[clave] = self._series.get(clave, 0) + cantidad
+
+    def dec(self, cantidad: float = 1, **etiquetas):
+        self.inc(-cantidad, **etiquetas)
+
+    def set_funcion(self, funcion: Callable[[], float], **etiquetas):
+        """El valor se lee al exportar (p.ej. profundidad de una cola)"""
+        clave = self._clave(etiquetas)
+        with self._lock:
+            self._funciones[clave] = funcion
+
+    def valor(self, **etiquetas) -> float:
+        clave = self._clave(etiquetas)
+        funcion = self._funciones.get(clave)
+        return funcion() if funcion else self._series.get(clave, 0)
+
+    def exportar(self) -> List[str]:
+        with self._lock:
+            funciones = list(self._funciones.items())
+        for clave, funcion in funciones:
+            try:
+                valor = funcion()
+            except Exception as e:
+                logger.error(f"❌ Error leyendo gauge {self.nombre}: {e}")
+                continue
+            with self._lock:
+                self._series[clave] = valor
+        return super().exportar()
+
+class Histogram(_Metrica):
+    """Histograma acumulado por buckets (más _sum y _count)"""
+
+    tipo = 'histogram'
+
+    def __init__(self, nombre: str, descripcion: str, etiquetas: Iterable[str] = (),
+                 buckets: Iterable[float] = BUCKETS_SEGUNDOS):
+        super().__init__(nombre, descripcion, etiquetas)
+        self.buckets = tuple(sorted(buckets))
+
+    def observe(self, valor: float, **etiquetas):
+        clave = self._clave(etiquetas)
+        indice = bisect.bisect_left(self.buckets, valor)
+        with self._lock:
+            serie = self._series.get(clave)
+            if serie is None:
+                # [conteos por bucket (+Inf al final), suma]
+                serie = self._series[clave] = [[0] * (len(self.buckets) + 1), 0.0]
+            serie[0][indice] += 1
+            serie[1] += valor
+
+    @contextmanager
+    def medir(self, **etiquetas):
+        """Observa la duración del bloque (también si lanza una excepción)"""
+        inicio = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - inicio, **etiquetas)
+
+    def _acumular(self, clave: Tuple[str, ...], serie):
+        conteos, suma = serie
+        if len(conteos) != len(self.buckets) + 1:
+            raise ValueError(f"{self.nombre}: los buckets no coinciden")
+        with self._lock:
+            propia = self._series.get(clave)
+            if propia is None:
+                propia = self._series[clave] = [[0] * (len(self.buckets) + 1), 0.0]
+            propia[0] = [a + b for a, b in zip(propia[0], conteos)]
+            propia[1] += suma
+
+    def conteo(self, **etiquetas) -> int:
+        serie = self._series.get(self._clave(etiquetas))
+        return sum(serie[0]) if serie else 0
+
+    def _exportar_serie(self, clave: Tuple[str, ...], serie) -> List[str]:
+        conteos, suma = serie
+        lineas = []
+        acumulado = 0
+        for limite, conteo in zip(self.buckets + (float('inf'),), conteos):
+            acumulado += conteo
+            le = f'le="{_formatear_numero(limite)}"'
+            lineas.append(f"{self.nombre}_bucket{_formatear_etiquetas(self.etiquetas, clave, le)} {acumulado}")
+        etiquetas = _formatear_etiquetas(self.etiquetas, clave)
+        lineas.append(f"{self.nombre}_sum{etiquetas} {_formatear_numero(suma)}")
+        lineas.append(f"{self.nombre}_count{etiquetas} {acumulado}")
+        return lineas
+
+class MetricsRegistry:
+    """Registro de métricas del proceso"""
+
+    def __init__(self):
+        self._metricas: Dict[str, _Metrica] = {}
+        self._lock = threading.Lock()
+        self._servidor: Optional[ThreadingHTTPServer] = None
+
+    def _registrar(self, clase, nombre: str, *args, **kwargs):
+        with self._lock:
+            existente = self._metricas.get(nombre)
+            if existente is not None:
+                if not isinstance(existente, clase):
+                    raise ValueError(f"La métrica {nombre} ya existe como {existente.tipo}")
+                return existente
+            metrica = self._metricas[nombre] = clase(nombre, *args, **kwargs)
+            return metrica
+
+    def counter(self, nombre: str, descripcion: str, etiquetas: Iterable[str] = ()) -> Counter:
+        return self._registrar(Counter, nombre, descripcion, etiquetas)
+
+    def gauge(self, nombre: str, descripcion: str, etiquetas: Iterable[str] = ()) -> Gauge:
+        return self._registrar(Gauge, nombre, descripcion, etiquetas)
+
+    def histogram(self, nombre: str, descripcion: str, etiquetas: Iterable[str] = (),
+                  buckets: Iterable[float] = BUCKETS_SEGUNDOS) -> Histogram:
+        return self._registrar(Histogram, nombre, descripcion, etiquetas, buckets=buckets)
+
+    def instantanea(self) -> Dict[str, Dict[Tuple[str, ...], object]]:
+        """
+        Series de contadores e histogramas, serializables
+
+        Un proceso hijo (ScrapePool) las devuelve junto con su resultado para
+        que el padre las sume con acumular(); los gauges no se trasladan.
+        """
+        with self._lock:
+            metricas = [m for m in self._metricas.values() if isinstance(m, (Counter, Histogram))]
+        instantanea = {}
+        for metrica in metricas:
+            with metrica._lock:
+                series = {clave: (list(valor[0]), valor[1]) if isinstance(metrica, Histogram) else valor
+                          for clave, valor in metrica._series.items()}
+            if series:
+                instantanea[metrica.nombre] = series
+        return instantanea
+
+    def acumular(self, instantanea: Dict[str, Dict[Tuple[str, ...], object]]):
+        """Suma las series de instantanea() de otro proceso a las de este registro"""
+        for nombre, series in instantanea.items():
+            with self._lock:
+                metrica = self._metricas.get(nombre)
+            if not isinstance(metrica, (Counter, Histogram)):
+                logger.warning(f"⚠️ Métrica desconocida de otro proceso: {nombre}")
+                continue
+            for clave, valor in series.items():
+                metrica._acumular(tuple(clave), valor)
+
+    def vaciar(self):
+        """Borra las series de contadores e histogramas (un hijo con fork no arrastra las del padre)"""
+        with self._lock:
+            metricas = [m for m in self._metricas.values() if isinstance(m, (Counter, Histogram))]
+        for metrica in metricas:
+            with metrica._lock:
+                metrica._series.clear()
+
+    def exportar(self) -> str:
+        """Todas las métricas en formato de texto de Prometheus (0.0.4)"""
+        with self._lock:
+            metricas = list(self._metricas.values())
+        lineas = []
+        for metrica in metricas:
+            lineas.extend(metrica.exportar())
+        return '\n'.join(lineas) + '\n'
+
+    def iniciar_servidor(self, puerto: int = METRICS_PORT, host: str = METRICS_HOST) -> bool:
+        """
+        Expone /metrics por HTTP en un hilo daemon
+
+        Returns:
+            True si el servidor quedó escuchando (o ya lo estaba)
+        """
+        if self._servidor is not None:
+            return True
+
+        registro = self
+
+        class _Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.split('?')[0] not in ('/metrics', '/'):
+                    self.send_error(404)
+                    return
+                cuerpo = registro.exportar().encode('utf-8')
+                self.send_response(200)
+                self.send_header('Content-Type', 'text/plain; version=0.0.4; charset=utf-8')
+                self.send_header('Content-Length', str(len(cuerpo)))
+                self.end_headers()
+                self.wfile.write(cuerpo)
+
+            def log_message(self, formato, *args):
+                logger.debug("📈 /metrics %s", formato % args)
+
+        try:
+            self._servidor = ThreadingHTTPServer((host, puerto), _Handler)
+        except OSError as e:
+            logger.error(f"❌ No se pudo iniciar el endpoint de métricas en {host}:{puerto}: {e}")
+            return False
+
+        self._servidor.daemon_threads = True
+        threading.Thread(target=self._servidor.serve_forever, name="metrics-http", daemon=True).start()
+        logger.info(f"📈 Métricas disponibles en http://{host}:{self._servidor.server_address[1]}/metrics")
+        return True
+
+    def detener_servidor(self):
+        """Detiene el endpoint HTTP"""
+        if self._servidor is not None:
+            self._servidor.shutdown()
+            self._servidor.server_close()
+            self._servidor = None
+
+# Registro global del proceso
+metricas = MetricsRegistry()
+
+# === MÉTRICAS DEL PIPELINE ===
+
+FETCH_SEGUNDOS = metricas.histogram(
+    'scraper_fetch_seconds', 'Latencia de descarga de la página por tier (requests, httpx, selenium)', ['tier'])
+PARSE_SEGUNDOS = metricas.histogram(
+    'scraper_parse_seconds', 'Tiempo de parseo de la página por parser', ['parser'])
+FILAS_EXTRAIDAS = metricas.counter(
+    'scraper_rows_extracted_total', 'Consensos extraídos por parser', ['parser'])
+RECHAZOS_FILTRO = metricas.counter(
+    'filter_rejections_total', 'Consensos rechazados por perfil y razón', ['perfil', 'razon'])
+ENVIO_ALERTA_SEGUNDOS = metricas.histogram(
+    'alert_send_seconds', 'Latencia de envío de un mensaje de alerta', ['canal'])
+ENTREGA_ALERTA_SEGUNDOS = metricas.histogram(
+    'alert_delivery_seconds', 'Tiempo desde que la alerta se encola hasta su confirmación', ['canal'],
+    buckets=(1, 5, 15, 30, 60, 120, 300, 600, 1800))
+ALERTAS_ENVIADAS = metricas.counter(
+    'alerts_sent_total', 'Alertas confirmadas por canal', ['canal'])
+PROFUNDIDAD_COLA = metricas.gauge(
+    'queue_depth', 'Trabajos o alertas pendientes por cola', ['cola'])
+CICLO_SEGUNDOS = metricas.histogram(
+    'scraping_cycle_seconds', 'Duración de un ciclo completo de scraping', ['pipeline'],
+    buckets=(1, 5, 10, 20, 30, 60, 120, 300, 600))
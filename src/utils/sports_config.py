@@ -1,19 +1,455 @@
 """
 Configuración específica por deporte para consensos y alertas
+La configuración se compila al cargar en un SnapshotDeportes inmutable: un
+ConfigDeporte tipado por deporte con los umbrales ya resueltos y los meses
+de temporada y las horas silenciosas como máscaras de bits. Las consultas
+frecuentes (deportes activos, umbrales, consenso alto) no recorren
+diccionarios anidados. Si el archivo cambia se compila un snapshot nuevo y
+se reemplaza la referencia de una vez; si no valida, sigue el anterior.
+
+Acepta los dos formatos de archivo que existen en el proyecto:
+- el de config/sports_config.json (claves en minúsculas, active,
+  season_months, consensus_threshold, pregame_minutes, covers_url)
+- el anidado de get_default_config (enabled, consensus_thresholds,
+  alert_settings, scraping_settings, season_info)
 """
 
-from typing import Dict, Any
-from datetime import datetime
+import copy
 import json
+import os
+import tempfile
+import threading
+import time
+from dataclasses import dataclass, field
+from datetime import datetime
 from pathlib import Path
+from types import MappingProxyType
+from typing import Any, Dict, List, Mapping, Optional, Tuple
+
+from .logger import get_logger
+
+logger = get_logger(__name__)
+
+ARCHIVO_CONFIG = Path(__file__).resolve().parents[2] / 'config' / 'sports_config.json'
+
+# Cada cuánto se mira el mtime del archivo (stat) para detectar cambios
+INTERVALO_REVISION_SEGUNDOS = 5.0
+
+TIPOS_CONSENSO = ('spread', 'total', 'moneyline')
+
+# Tipo de consenso -> campo del consenso scrapeado que se compara con el umbral
+CAMPOS_PORCENTAJE = {
+    'spread': 'porcentaje_spread',
+    'total': 'porcentaje_total',
+    'moneyline': 'porcentaje_moneyline',
+}
+
+UMBRAL_POR_DEFECTO = 75
+MINUTOS_PREGAME_POR_DEFECTO = 15
+
+# Claves que no son deportes
+CLAVES_GLOBALES = ('global_settings',)
+
+# Variable de entorno que pisa el umbral de alerta de un deporte
+# (MLB_CONSENSUS_THRESHOLD); Settings y la app leen el umbral de acá
+VARIABLE_UMBRAL_ALERTA = '{codigo}_CONSENSUS_THRESHOLD'
+
+# Claves planas de config/sports_config.json -> ruta en el formato anidado
+_CLAVES_PLANAS = {
+    'active': ('enabled',),
+    'season_months': ('season_info', 'active_months'),
+    'consensus_threshold': ('alert_settings', 'min_consensus_for_alert'),
+    'pregame_minutes': ('scraping_settings', 'pregame_scraping_minutes'),
+    'covers_url': ('url_base',),
+}
+
+CONFIG_POR_DEFECTO = {
+    'MLB': {
+        'enabled': True,
+        'consensus_thresholds': {
+            'spread': 80,
+            'total': 75,
+            'moneyline': 70
+        },
+        'alert_settings': {
+            'min_consensus_for_alert': 80,
+            'max_alerts_per_day': 20,
+            'quiet_hours': {
+                'start': 23,
+                'end': 7
+            }
+        },
+        'scraping_settings': {
+            'main_scraping_hour': 11,
+            'live_update_interval': 120,  # minutos
+            'pregame_scraping_minutes': 15
+        },
+        'season_info': {
+            'active_months': [3, 4, 5, 6, 7, 8, 9, 10],
+            'typical_game_hours': [13, 14, 15, 16, 17, 18, 19, 20, 21]
+        }
+    },
+    'NBA': {
+        'enabled': False,
+        'consensus_thresholds': {
+            'spread': 70,
+            'total': 75,
+            'moneyline': 65
+        },
+        'alert_settings': {
+            'min_consensus_for_alert': 70,
+            'max_alerts_per_day': 25,
+            'quiet_hours': {
+                'start': 23,
+                'end': 7
+            }
+        },
+        'scraping_settings': {
+            'main_scraping_hour': 11,
+            'live_update_interval': 120,
+            'pregame_scraping_minutes': 15
+        },
+        'season_info': {
+            'active_months': [10, 11, 12, 1, 2, 3, 4, 5, 6],
+            'typical_game_hours': [19, 20, 21, 22]
+        }
+    },
+    'NFL': {
+        'enabled': False,
+        'consensus_thresholds': {
+            'spread': 75,
+            'total': 80,
+            'moneyline': 70
+        },
+        'alert_settings': {
+            'min_consensus_for_alert': 75,
+            'max_alerts_per_day': 15,
+            'quiet_hours': {
+                'start': 23,
+                'end': 7
+            }
+        },
+        'scraping_settings': {
+            'main_scraping_hour': 11,
+            'live_update_interval': 180,
+            'pregame_scraping_minutes': 15
+        },
+        'season_info': {
+            'active_months': [9, 10, 11, 12, 1, 2],
+            'typical_game_hours': [13, 16, 17, 20, 21]
+        }
+    },
+    'NHL': {
+        'enabled': False,
+        'consensus_thresholds': {
+            'spread': 75,
+            'total': 70,
+            'moneyline': 75
+        },
+        'alert_settings': {
+            'min_consensus_for_alert': 75,
+            'max_alerts_per_day': 18,
+            'quiet_hours': {
+                'start': 23,
+                'end': 7
+            }
+        },
+        'scraping_settings': {
+            'main_scraping_hour': 11,
+            'live_update_interval': 120,
+            'pregame_scraping_minutes': 15
+        },
+        'season_info': {
+            'active_months': [10, 11, 12, 1, 2, 3, 4, 5, 6],
+            'typical_game_hours': [17, 18, 19, 20, 21]
+        }
+    }
+}
+
+class ConfigDeportesInvalida(ValueError):
+    """La configuración de deportes no pasó la validación (lista todos los errores)"""
+
+    def __init__(self, errores: List[str]):
+        self.errores = errores
+        super().__init__("; ".join(errores))
+
+# === SNAPSHOT INMUTABLE ===
+
+@dataclass(frozen=True)
+class ConfigDeporte:
+    """Configuración compilada de un deporte"""
+    codigo: str
+    nombre: str
+    habilitado: bool
+    # Bit m encendido = el mes m (1-12) es temporada
+    mascara_temporada: int
+    umbrales: Mapping[str, float]
+    umbral_alerta: float
+    max_alertas_dia: int
+    minutos_pregame: int
+    hora_scraping_principal: int
+    intervalo_vivo_minutos: int
+    # Bit h encendido = la hora h (0-23) es silenciosa (0 si no hay horas silenciosas)
+    mascara_silencio: int
+    url_base: str
+    horarios_scraping: Tuple[str, ...]
+    # (campo del consenso, umbral) listos para es_consenso_alto
+    _comparaciones: Tuple[Tuple[str, float], ...] = field(repr=False, compare=False)
+    # Vista en el formato anidado, para quien sigue leyendo diccionarios
+    como_dict: Mapping[str, Any] = field(repr=False, compare=False)
+
+    def en_temporada(self, mes: int) -> bool:
+        return bool(self.mascara_temporada >> mes & 1)
+
+    @property
+    def meses_temporada(self) -> List[int]:
+        return [mes for mes in range(1, 13) if self.en_temporada(mes)]
+
+    def en_horas_silencio(self, hora: int) -> bool:
+        return bool(self.mascara_silencio >> hora & 1)
+
+    def es_consenso_alto(self, consenso: Mapping[str, Any]) -> bool:
+        """Si algún porcentaje del consenso alcanza el umbral de su tipo"""
+        for campo, umbral in self._comparaciones:
+            if (consenso.get(campo) or 0) >= umbral:
+                return True
+        return False
+
+@dataclass(frozen=True)
+class SnapshotDeportes:
+    """Configuración completa compilada; se reemplaza entera, nunca se modifica"""
+    deportes: Mapping[str, ConfigDeporte]
+    global_settings: Mapping[str, Any]
+    # Índice = mes (1-12; el 0 queda vacío): deportes habilitados en temporada
+    activos_por_mes: Tuple[Tuple[str, ...], ...]
+    # mtime del archivo del que salió (None = configuración por defecto)
+    mtime: Optional[float] = None
+    # Configuración original tal como se leyó (base para update/save)
+    crudo: Mapping[str, Any] = field(default_factory=dict, repr=False, compare=False)
+
+    def deporte(self, codigo: str) -> ConfigDeporte:
+        """Configuración del deporte; la genérica si no está configurado"""
+        return self.deportes.get(codigo.upper()) or DEPORTE_GENERICO
+
+    def activos(self, mes: Optional[int] = None) -> Tuple[str, ...]:
+        return self.activos_por_mes[mes or datetime.now().month]
+
+# === COMPILACIÓN Y VALIDACIÓN ===
+
+def _fusionar(base: Dict[str, Any], encima: Mapping[str, Any]) -> Dict[str, Any]:
+    """Fusión recursiva de diccionarios (encima gana)"""
+    resultado = copy.deepcopy(base)
+    for clave, valor in encima.items():
+        if isinstance(valor, Mapping) and isinstance(resultado.get(clave), dict):
+            resultado[clave] = _fusionar(resultado[clave], valor)
+        else:
+            resultado[clave] = copy.deepcopy(valor)
+    return resultado
+
+def normalizar_deporte(codigo: str, crudo: Mapping[str, Any]) -> Dict[str, Any]:
+    """
+    Lleva la configuración de un deporte al formato anidado, sobre los valores por defecto
+
+    Las claves anidadas explícitas ganan a las planas: así update_sport_config
+    con 'enabled' sobre un archivo que tiene 'active' hace lo que se espera.
+    """
+    planas: Dict[str, Any] = {}
+    for clave, ruta in _CLAVES_PLANAS.items():
+        if clave in crudo:
+            destino = planas
+            for parte in ruta[:-1]:
+                destino = destino.setdefault(parte, {})
+            destino[ruta[-1]] = crudo[clave]
+
+    anidadas = {clave: valor for clave, valor in crudo.items() if clave not in _CLAVES_PLANAS}
+    return _fusionar(_fusionar(CONFIG_POR_DEFECTO.get(codigo, {}), planas), anidadas)
+
+def _mascara(valores, minimo: int, maximo: int, campo: str, errores: List[str]) -> int:
+    mascara = 0
+    for valor in valores:
+        if isinstance(valor, bool) or not isinstance(valor, int) or not minimo <= valor <= maximo:
+            errores.append(f"{campo}: {valor!r} fuera de rango {minimo}-{maximo}")
+            continue
+        mascara |= 1 << valor
+    return mascara
+
+def _numero(valor: Any, campo: str, errores: List[str], minimo: float = 0, maximo: Optional[float] = None) -> float:
+    if isinstance(valor, bool) or not isinstance(valor, (int, float)):
+        errores.append(f"{campo}: se esperaba un número y llegó {valor!r}")
+        return minimo
+    if valor < minimo or (maximo is not None and valor > maximo):
+        errores.append(f"{campo}: {valor} fuera de rango {minimo}-{maximo if maximo is not None else '∞'}")
+    return valor
+
+def compilar_deporte(codigo: str, crudo: Mapping[str, Any]) -> Tuple[ConfigDeporte, List[str]]:
+    """Compila un deporte; devuelve también los errores de validación encontrados"""
+    errores: List[str] = []
+    config = normalizar_deporte(codigo, crudo)
+
+    umbrales_crudos = config.get('consensus_thresholds', {})
+    umbrales = {
+        tipo: _numero(umbrales_crudos.get(tipo, UMBRAL_POR_DEFECTO), f"{codigo}.consensus_thresholds.{tipo}", errores, 0, 100)
+        for tipo in TIPOS_CONSENSO
+    }
+
+    alertas = config.get('alert_settings', {})
+    umbral_alerta = alertas.get('min_consensus_for_alert', UMBRAL_POR_DEFECTO)
+    variable = VARIABLE_UMBRAL_ALERTA.format(codigo=codigo)
+    if os.getenv(variable):
+        try:
+            umbral_alerta = float(os.environ[variable])
+        except ValueError:
+            errores.append(f"{variable}: se esperaba un número y llegó {os.environ[variable]!r}")
+
+    scraping = config.get('scraping_settings', {})
+    temporada = config.get('season_info', {})
+
+    meses = temporada.get('active_months', [])
+    mascara_temporada = _mascara(meses, 1, 12, f"{codigo}.season_months", errores)
+    if config.get('enabled') and not mascara_temporada:
+        errores.append(f"{codigo}: habilitado pero sin meses de temporada")
+
+    mascara_silencio = 0
+    silencio = alertas.get('quiet_hours', {})
+    inicio = _numero(silencio.get('start', 23), f"{codigo}.quiet_hours.start", errores, 0, 23)
+    fin = _numero(silencio.get('end', 7), f"{codigo}.quiet_hours.end", errores, 0, 23)
+    if silencio.get('enabled', False):
+        # Rango inclusivo; si inicio > fin cruza la medianoche
+        inicio, fin = int(inicio), int(fin)
+        horas = range(inicio, fin + 1) if inicio <= fin else [*range(inicio, 24), *range(0, fin + 1)]
+        mascara_silencio = sum(1 << hora for hora in horas if 0 <= hora <= 23)
+
+    deporte = ConfigDeporte(
+        codigo=codigo,
+        nombre=config.get('name', codigo),
+        habilitado=bool(config.get('enabled', False)),
+        mascara_temporada=mascara_temporada,
+        umbrales=MappingProxyType(umbrales),
+        umbral_alerta=_numero(umbral_alerta, f"{codigo}.consensus_threshold", errores, 0, 100),
+        max_alertas_dia=int(_numero(alertas.get('max_alerts_per_day', 20), f"{codigo}.max_alerts_per_day", errores)),
+        minutos_pregame=int(_numero(scraping.get('pregame_scraping_minutes', MINUTOS_PREGAME_POR_DEFECTO),
+                                    f"{codigo}.pregame_minutes", errores, 1)),
+        hora_scraping_principal=int(_numero(scraping.get('main_scraping_hour', 11),
+                                            f"{codigo}.main_scraping_hour", errores, 0, 23)),
+        intervalo_vivo_minutos=int(_numero(scraping.get('live_update_interval', 120),
+                                           f"{codigo}.live_update_interval", errores, 1)),
+        mascara_silencio=mascara_silencio,
+        url_base=config.get('url_base', ''),
+        horarios_scraping=tuple(config.get('scraping_times', ())),
+        _comparaciones=tuple((CAMPOS_PORCENTAJE[tipo], umbral) for tipo, umbral in umbrales.items()),
+        como_dict=MappingProxyType(config)
+    )
+    return deporte, errores
+
+def compilar_config(crudo: Mapping[str, Any], mtime: Optional[float] = None) -> SnapshotDeportes:
+    """
+    Valida y compila la configuración completa
+
+    Raises:
+        ConfigDeportesInvalida: con todos los errores encontrados (no compila a medias)
+    """
+    if not isinstance(crudo, Mapping):
+        raise ConfigDeportesInvalida([f"se esperaba un objeto JSON y llegó {type(crudo).__name__}"])
+
+    deportes: Dict[str, ConfigDeporte] = {}
+    errores: List[str] = []
+    for clave, valor in crudo.items():
+        if clave in CLAVES_GLOBALES:
+            continue
+        codigo = clave.upper()
+        if not isinstance(valor, Mapping):
+            errores.append(f"{codigo}: se esperaba un objeto")
+            continue
+        if codigo in deportes:
+            errores.append(f"{codigo}: deporte repetido")
+            continue
+        deportes[codigo], errores_deporte = compilar_deporte(codigo, valor)
+        errores.extend(errores_deporte)
+
+    if errores:
+        raise ConfigDeportesInvalida(errores)
+
+    activos_por_mes = ((),) + tuple(
+        tuple(codigo for codigo, deporte in deportes.items() if deporte.habilitado and deporte.en_temporada(mes))
+        for mes in range(1, 13)
+    )
+    return SnapshotDeportes(
+        deportes=MappingProxyType(deportes),
+        global_settings=MappingProxyType(dict(crudo.get('global_settings', {}))),
+        activos_por_mes=activos_por_mes,
+        mtime=mtime,
+        crudo=MappingProxyType(copy.deepcopy(dict(crudo)))
+    )
+
+# Deporte sin configurar: deshabilitado, umbrales genéricos
+DEPORTE_GENERICO, _ = compilar_deporte('GENERICO', {})
+
+# === CONFIGURACIÓN CON RECARGA ===
 
 class SportsConfiguration:
     """Configuración específica por deporte"""
-    
-    def __init__(self, config_file: str = "config/sports_config.json"):
+
+    def __init__(self, config_file=ARCHIVO_CONFIG, intervalo_revision: float = INTERVALO_REVISION_SEGUNDOS):
         self.config_file = Path(config_file)
-        self.config = self.load_config()
-    
+        self.intervalo_revision = intervalo_revision
+        self._lock = threading.Lock()
+        self._mtime_visto = self._mtime_archivo()
+        self._proxima_revision = time.monotonic() + intervalo_revision
+        try:
+            self._snapshot = self._compilar_archivo(self._mtime_visto)
+        except (ValueError, OSError) as e:
+            logger.error(f"❌ Configuración de deportes inválida en {self.config_file}, se usan los valores por defecto: {e}")
+            self._snapshot = compilar_config(self.get_default_config())
+
+    # === SNAPSHOT ===
+
+    def snapshot(self) -> SnapshotDeportes:
+        """Snapshot vigente (revisa el archivo como mucho cada intervalo_revision segundos)"""
+        if time.monotonic() >= self._proxima_revision:
+            self.recargar_si_cambio()
+        return self._snapshot
+
+    def recargar_si_cambio(self) -> bool:
+        """
+        Recompila si cambió el mtime del archivo; True si se reemplazó el snapshot
+
+        El snapshot nuevo se arma completo antes de publicarlo: quien leyó el
+        anterior lo sigue usando entero. Si el archivo no valida se conserva el
+        anterior y no se reintenta hasta el próximo cambio.
+        """
+        with self._lock:
+            self._proxima_revision = time.monotonic() + self.intervalo_revision
+            mtime = self._mtime_archivo()
+            if mtime == self._mtime_visto:
+                return False
+            self._mtime_visto = mtime
+
+            try:
+                nuevo = self._compilar_archivo(mtime)
+            except (ValueError, OSError) as e:
+                logger.error(f"❌ Cambio inválido en {self.config_file}, se mantiene la configuración anterior: {e}")
+                return False
+
+            self._snapshot = nuevo
+            logger.info(f"🔄 Configuración de deportes recargada (activos: {', '.join(nuevo.activos()) or 'ninguno'})")
+            return True
+
+    def _mtime_archivo(self) -> Optional[float]:
+        try:
+            return self.config_file.stat().st_mtime
+        except OSError:
+            return None
+
+    def _compilar_archivo(self, mtime: Optional[float]) -> SnapshotDeportes:
+        return compilar_config(self.load_config(), mtime)
+
+    @property
+    def config(self) -> Dict[str, Any]:
+        """Copia de la configuración cruda vigente"""
+        return copy.deepcopy(dict(self.snapshot().crudo))
+
+    # === ARCHIVO ===
+
     def load_config(self) -> Dict[str, Any]:
         """Carga configuración desde archivo"""
         if self.config_file.exists():
@@ -21,165 +457,76 @@ class SportsConfiguration:
                 return json.load(f)
         else:
             return self.get_default_config()
-    
+
     def get_default_config(self) -> Dict[str, Any]:
         """Configuración por defecto para todos los deportes"""
-        return {
-            'MLB': {
-                'enabled': True,
-                'consensus_thresholds': {
-                    'spread': 80,
-                    'total': 75,
-                    'moneyline': 70
-                },
-                'alert_settings': {
-                    'min_consensus_for_alert': 80,
-                    'max_alerts_per_day': 20,
-                    'quiet_hours': {
-                        'start': 23,
-                        'end': 7
-                    }
-                },
-                'scraping_settings': {
-                    'main_scraping_hour': 11,
-                    'live_update_interval': 120,  # minutos
-                    'pregame_scraping_minutes': 15
-                },
-                'season_info': {
-                    'active_months': [3, 4, 5, 6, 7, 8, 9, 10],
-                    'typical_game_hours': [13, 14, 15, 16, 17, 18, 19, 20, 21]
-                }
-            },
-            'NBA': {
-                'enabled': False,
-                'consensus_thresholds': {
-                    'spread': 70,
-                    'total': 75,
-                    'moneyline': 65
-                },
-                'alert_settings': {
-                    'min_consensus_for_alert': 70,
-                    'max_alerts_per_day': 25,
-                    'quiet_hours': {
-                        'start': 23,
-                        'end': 7
-                    }
-                },
-                'scraping_settings': {
-                    'main_scraping_hour': 11,
-                    'live_update_interval': 120,
-                    'pregame_scraping_minutes': 15
-                },
-                'season_info': {
-                    'active_months': [10, 11, 12, 1, 2, 3, 4, 5, 6],
-                    'typical_game_hours': [19, 20, 21, 22]
-                }
-            },
-            'NFL': {
-                'enabled': False,
-                'consensus_thresholds': {
-                    'spread': 75,
-                    'total': 80,
-                    'moneyline': 70
-                },
-                'alert_settings': {
-                    'min_consensus_for_alert': 75,
-                    'max_alerts_per_day': 15,
-                    'quiet_hours': {
-                        'start': 23,
-                        'end': 7
-                    }
-                },
-                'scraping_settings': {
-                    'main_scraping_hour': 11,
-                    'live_update_interval': 180,
-                    'pregame_scraping_minutes': 15
-                },
-                'season_info': {
-                    'active_months': [9, 10, 11, 12, 1, 2],
-                    'typical_game_hours': [13, 16, 17, 20, 21]
-                }
-            },
-            'NHL': {
-                'enabled': False,
-                'consensus_thresholds': {
-                    'spread': 75,
-                    'total': 70,
-                    'moneyline': 75
-                },
-                'alert_settings': {
-                    'min_consensus_for_alert': 75,
-                    'max_alerts_per_day': 18,
-                    'quiet_hours': {
-                        'start': 23,
-                        'end': 7
-                    }
-                },
-                'scraping_settings': {
-                    'main_scraping_hour': 11,
-                    'live_update_interval': 120,
-                    'pregame_scraping_minutes': 15
-                },
-                'season_info': {
-                    'active_months': [10, 11, 12, 1, 2, 3, 4, 5, 6],
-                    'typical_game_hours': [17, 18, 19, 20, 21]
-                }
-            }
-        }
-    
-    def save_config(self):
-        """Guarda configuración actual"""
+        return copy.deepcopy(CONFIG_POR_DEFECTO)
+
+    def save_config(self, config: Optional[Dict[str, Any]] = None):
+        """
+        Valida y guarda la configuración (la actual si no se pasa otra)
+
+        Se escribe a un temporal y se renombra: ni este proceso ni otro que
+        vigile el archivo llegan a leerlo a medio escribir.
+        """
+        config = self.config if config is None else config
+        compilar_config(config)
+
         self.config_file.parent.mkdir(parents=True, exist_ok=True)
-        with open(self.config_file, 'w', encoding='utf-8') as f:
-            json.dump(self.config, f, indent=2, ensure_ascii=False)
-    
-    def get_sport_config(self, sport: str) -> Dict[str, Any]:
-        """Obtiene configuración de un deporte específico"""
-        return self.config.get(sport, {})
-    
+        descriptor, temporal = tempfile.mkstemp(dir=self.config_file.parent, suffix='.tmp')
+        try:
+            with os.fdopen(descriptor, 'w', encoding='utf-8') as f:
+                json.dump(config, f, indent=2, ensure_ascii=False)
+            os.replace(temporal, self.config_file)
+        except Exception:
+            Path(temporal).unlink(missing_ok=True)
+            raise
+
+        with self._lock:
+            self._mtime_visto = self._mtime_archivo()
+            self._snapshot = compilar_config(config, self._mtime_visto)
+
+    def _clave_archivo(self, config: Dict[str, Any], sport: str) -> str:
+        """Clave con la que el deporte figura en el archivo (respeta minúsculas/mayúsculas)"""
+        return next((clave for clave in config if clave.upper() == sport.upper()), sport.upper())
+
+    # === CONSULTAS ===
+
+    def get_sport_config(self, sport: str) -> Mapping[str, Any]:
+        """Obtiene configuración de un deporte específico (formato anidado, solo lectura)"""
+        deporte = self.snapshot().deportes.get(sport.upper())
+        return deporte.como_dict if deporte else MappingProxyType({})
+
     def update_sport_config(self, sport: str, config: Dict[str, Any]):
         """Actualiza configuración de un deporte"""
-        if sport not in self.config:
-            self.config[sport] = {}
-        
-        self.config[sport].update(config)
-        self.save_config()
-    
+        actual = self.config
+        clave = self._clave_archivo(actual, sport)
+        actual[clave] = _fusionar(actual.get(clave, {}), config)
+        self.save_config(actual)
+
     def get_consensus_threshold(self, sport: str, consensus_type: str) -> int:
         """Obtiene umbral de consenso para un deporte y tipo específico"""
-        sport_config = self.get_sport_config(sport)
-        return sport_config.get('consensus_thresholds', {}).get(consensus_type, 75)
-    
+        return self.snapshot().deporte(sport).umbrales.get(consensus_type, UMBRAL_POR_DEFECTO)
+
     def set_consensus_threshold(self, sport: str, consensus_type: str, threshold: int):
         """Establece umbral de consenso"""
-        if sport not in self.config:
-            self.config[sport] = {'consensus_thresholds': {}}
-        elif 'consensus_thresholds' not in self.config[sport]:
-            self.config[sport]['consensus_thresholds'] = {}
-        
-        self.config[sport]['consensus_thresholds'][consensus_type] = threshold
-        self.save_config()
-    
+        self.update_sport_config(sport, {'consensus_thresholds': {consensus_type: threshold}})
+
     def is_sport_enabled(self, sport: str) -> bool:
         """Verifica si un deporte está habilitado"""
-        return self.get_sport_config(sport).get('enabled', False)
-    
-    def get_active_sports(self) -> list:
+        return self.snapshot().deporte(sport).habilitado
+
+    def is_high_consensus(self, sport: str, consensus: Mapping[str, Any]) -> bool:
+        """Si el consenso supera alguno de los umbrales del deporte"""
+        return self.snapshot().deporte(sport).es_consenso_alto(consensus)
+
+    def get_active_sports(self, month: Optional[int] = None) -> list:
         """Obtiene deportes activos según temporada"""
-        current_month = datetime.now().month
-        active_sports = []
-        
-        for sport, config in self.config.items():
-            if (config.get('enabled', False) and 
-                current_month in config.get('season_info', {}).get('active_months', [])):
-                active_sports.append(sport)
-        
-        return active_sports
-    
+        return list(self.snapshot().activos(month))
+
     def get_pregame_scraping_minutes(self, sport: str) -> int:
         """Obtiene minutos antes del partido para scraping"""
-        sport_config = self.get_sport_config(sport)
-        return sport_config.get('scraping_settings', {}).get('pregame_scraping_minutes', 15)
+        return self.snapshot().deporte(sport).minutos_pregame
 
 
 # Instancia global de configuración
@@ -0,0 +1,256 @@
+"""
+Trazas livianas por etapa del pipeline
+Cada etapa (fetch, parse, filtro, dedup, alertas, persistencia) se mide
+como un span anidado con duración y atributos. Al cerrar el span raíz la
+traza completa se exporta a un archivo JSONL local o a un colector OTLP
+(HTTP/JSON), sin dependencias externas. La exportación se activa con
+TRACING_EXPORT=jsonl u TRACING_EXPORT=otlp; sin la variable los spans se
+miden pero no se escriben.
+
+Uso:
+    with traza('ciclo_scraping', fecha=fecha) as span:
+        with traza('fetch', tier='selenium'):
+            ...
+        span.atributos['consensos'] = 42
+
+    @trazado('filtro')
+    def aplicar_filtros(...): ...
+"""
+
+import contextvars
+import functools
+import inspect
+import json
+import os
+import secrets
+import threading
+import time
+import urllib.request
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+from src.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+# Destino de las trazas: 'off' (por defecto), 'jsonl' u 'otlp'
+TRACING_EXPORT = os.getenv('TRACING_EXPORT', 'off').lower()
+
+# Colector OTLP/HTTP (p.ej. http://localhost:4318); se usa /v1/traces
+OTLP_ENDPOINT = os.getenv('OTEL_EXPORTER_OTLP_ENDPOINT', 'http://localhost:4318')
+
+SERVICIO = 'scraper-alertas-consensos'
+
+@dataclass
+class Span:
+    """Etapa medida de una traza"""
+    nombre: str
+    trace_id: str
+    span_id: str
+    parent_id: Optional[str] = None
+    inicio: float = 0.0
+    duracion: float = 0.0
+    estado: str = 'ok'
+    error: Optional[str] = None
+    atributos: Dict[str, Any] = field(default_factory=dict)
+    hijos: List['Span'] = field(default_factory=list, repr=False)
+
+    def etapas(self) -> Dict[str, float]:
+        """Duración (segundos) de cada hijo directo, en orden de ejecución"""
+        tiempos = {}
+        for hijo in self.hijos:
+            tiempos[hijo.nombre] = round(tiempos.get(hijo.nombre, 0) + hijo.duracion, 3)
+        return tiempos
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'nombre': self.nombre,
+            'trace_id': self.trace_id,
+            'span_id': self.span_id,
+            'parent_id': self.parent_id,
+            'inicio': datetime.fromtimestamp(self.inicio).isoformat(timespec='milliseconds'),
+            'duracion_ms': round(self.duracion * 1000, 3),
+            'estado': self.estado,
+            'error': self.error,
+            'atributos': self.atributos
+        }
+
+class ExportadorJSONL:
+    """Una línea JSON por span en logs/traces_YYYY-MM-DD.jsonl"""
+
+    def __init__(self, directorio: str = "logs"):
+        self.directorio = Path(directorio)
+        self._lock = threading.Lock()
+
+    def exportar(self, spans: List[Span]):
+        self.directorio.mkdir(exist_ok=True)
+        archivo = self.directorio / f"traces_{datetime.now().strftime('%Y-%m-%d')}.jsonl"
+        lineas = ''.join(json.dumps(span.to_dict(), ensure_ascii=False, default=str) + '\n' for span in spans)
+        with self._lock:
+            with open(archivo, 'a', encoding='utf-8') as f:
+                f.write(lineas)
+
+class ExportadorOTLP:
+    """Envía la traza a un colector OTLP/HTTP en formato JSON (en un hilo aparte)"""
+
+    def __init__(self, endpoint: str = OTLP_ENDPOINT, timeout: int = 5):
+        self.url = endpoint.rstrip('/') + '/v1/traces'
+        self.timeout = timeout
+
+    def _valor_otlp(self, valor: Any) -> Dict[str, Any]:
+        if isinstance(valor, bool):
+            return {'boolValue': valor}
+        if isinstance(valor, int):
+            return {'intValue': str(valor)}
+        if isinstance(valor, float):
+            return {'doubleValue': valor}
+        return {'stringValue': str(valor)}
+
+    def _span_otlp(self, span: Span) -> Dict[str, Any]:
+        inicio_ns = int(span.inicio * 1e9)
+        datos = {
+            'traceId': span.trace_id,
+            'spanId': span.span_id,
+            'name': span.nombre,
+            'kind': 1,
+            'startTimeUnixNano': str(inicio_ns),
+            'endTimeUnixNano': str(inicio_ns + int(span.duracion * 1e9)),
+            'attributes': [{'key': k, 'value': self._valor_otlp(v)} for k, v in span.atributos.items()],
+            'status': {'code': 2, 'message': span.error or ''} if span.estado == 'error' else {'code': 1}
+        }
+        if span.parent_id:
+            datos['parentSpanId'] = span.parent_id
+        return datos
+
+    def exportar(self, spans: List[Span]):
+        cuerpo = json.dumps({
+            'resourceSpans': [{
+                'resource': {'attributes': [{'key': 'service.name', 'value': {'stringValue': SERVICIO}}]},
+                'scopeSpans': [{'scope': {'name': __name__}, 'spans': [self._span_otlp(s) for s in spans]}]
+            }]
+        }).encode('utf-8')
+        threading.Thread(target=self._enviar, args=(cuerpo,), name="otlp-export", daemon=True).start()
+
+    def _enviar(self, cuerpo: bytes):
+        try:
+            peticion = urllib.request.Request(self.url, data=cuerpo, headers={'Content-Type': 'application/json'})
+            urllib.request.urlopen(peticion, timeout=self.timeout).close()
+        except Exception as e:
+            logger.warning(f"⚠️ No se pudo exportar la traza a {self.url}: {e}")
+
+class RecolectorTrazas:
+    """Exportador en memoria: guarda las trazas para enviarlas a otro proceso"""
+
+    def __init__(self):
+        self.trazas: List[List[Span]] = []
+
+    def exportar(self, spans: List[Span]):
+        self.trazas.append(spans)
+
+def _exportadores_por_defecto() -> List[Any]:
+    if TRACING_EXPORT == 'off':
+        return []
+    if TRACING_EXPORT == 'otlp':
+        return [ExportadorOTLP()]
+    return [ExportadorJSONL()]
+
+# Span activo del contexto (hilo o tarea async)
+_span_actual: contextvars.ContextVar[Optional[Span]] = contextvars.ContextVar('span_actual', default=None)
+
+class Tracer:
+    """Crea spans anidados y exporta la traza al cerrar su span raíz"""
+
+    def __init__(self, exportadores: Optional[List[Any]] = None):
+        self.exportadores = _exportadores_por_defecto() if exportadores is None else exportadores
+        self._pendientes: Dict[str, List[Span]] = {}
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def span(self, nombre: str, **atributos):
+        """Mide el bloque como un span hijo del span activo (o raíz si no hay)"""
+        padre = _span_actual.get()
+        span = Span(
+            nombre=nombre,
+            trace_id=padre.trace_id if padre else secrets.token_hex(16),
+            span_id=secrets.token_hex(8),
+            parent_id=padre.span_id if padre else None,
+            inicio=time.time(),
+            atributos=atributos
+        )
+        token = _span_actual.set(span)
+        inicio = time.perf_counter()
+        try:
+            yield span
+        except BaseException as e:
+            span.estado = 'error'
+            span.error = f"{type(e).__name__}: {e}"
+            raise
+        finally:
+            span.duracion = time.perf_counter() - inicio
+            _span_actual.reset(token)
+            self._finalizar(span, padre)
+
+    def adoptar(self, trazas: List[List[Span]], padre: Span):
+        """
+        Incorpora trazas medidas en otro proceso como hijas de padre
+
+        Se exportan junto con la traza de padre, al cerrar su span raíz.
+        """
+        with self._lock:
+            pendientes = self._pendientes.setdefault(padre.trace_id, [])
+            for spans in trazas:
+                for span in spans:
+                    span.trace_id = padre.trace_id
+                    if span.parent_id is None:
+                        span.parent_id = padre.span_id
+                        padre.hijos.append(span)
+                    pendientes.append(span)
+
+    def _finalizar(self, span: Span, padre: Optional[Span]):
+        with self._lock:
+            self._pendientes.setdefault(span.trace_id, []).append(span)
+            if padre is not None:
+                padre.hijos.append(span)
+                return
+            spans = self._pendientes.pop(span.trace_id)
+
+        for exportador in self.exportadores:
+            try:
+                exportador.exportar(spans)
+            except Exception as e:
+                logger.error(f"❌ Error exportando traza {span.nombre}: {e}")
+
+# Tracer global del proceso
+tracer = Tracer()
+
+def traza(nombre: str, **atributos):
+    """Context manager: span anidado en el tracer global"""
+    return tracer.span(nombre, **atributos)
+
+def span_actual() -> Optional[Span]:
+    """Span activo en este contexto (para agregarle atributos)"""
+    return _span_actual.get()
+
+def trazado(nombre: Optional[str] = None, **atributos) -> Callable:
+    """Decorador: cada llamada a la función (sync o async) es un span"""
+
+    def decorador(funcion: Callable) -> Callable:
+        nombre_span = nombre or funcion.__qualname__
+
+        if inspect.iscoroutinefunction(funcion):
+            @functools.wraps(funcion)
+            async def envoltura_async(*args, **kwargs):
+                with tracer.span(nombre_span, **atributos):
+                    return await funcion(*args, **kwargs)
+            return envoltura_async
+
+        @functools.wraps(funcion)
+        def envoltura(*args, **kwargs):
+            with tracer.span(nombre_span, **atributos):
+                return funcion(*args, **kwargs)
+        return envoltura
+
+    return decorador
@@ -4,11 +4,11 @@ Aplicación web en Streamlit para configuración y monitoreo del sistema
 
 import streamlit as st
 import pandas as pd
-import plotly.express as px
-import plotly.graph_objects as go
 from datetime import datetime, timedelta
 import pytz
 import asyncio
+import hashlib
+import importlib.util
 import json
 from typing import Dict, List, Optional
 import os
@@ -20,11 +20,18 @@ import time
 sys.path.append(os.path.join(os.path.dirname(__file__), '../..'))
 
 try:
-    from src.database.supabase_client import SupabaseClient
-    from src.database.data_manager import data_manager
-    from src.scraper.mlb_selenium_scraper import MLBSeleniumScraper
-    from src.scraper.sistema_scraper_robusto import ScraperRobusto
-    from config.settings import Settings
+    from src.utils.lazy_import import importar_perezoso
+    from src.database.data_manager import data_manager, COLUMNAS_PARTIDOS
+    from src.database.analytics import analytics
+    from src.database.canal_cambios import SuscriptorCambios, aplicar_cambios
+    from src.database.exportador import exportar_partidos, nombre_exportacion, FORMATOS_EXPORTACION
+    from src.scraper.job_runner import trabajos_scraping, ESTADOS_ACTIVOS
+    from src.web.presentacion import preparar_tabla_consensos, procesar_consensos_para_tabla
+    from config.settings import Settings, get_consensus_threshold
+    
+    # plotly solo se carga al abrir la página de estadísticas; Selenium, el
+    # scraper robusto y Supabase se importan al primer uso (ver obtener_*)
+    px = importar_perezoso('plotly.express')
     
     # Importar background_service de forma segura
     try:
@@ -104,6 +111,198 @@ st.markdown("""
 </style>
 """, unsafe_allow_html=True)
 
+# === CACHÉ DE CLIENTES Y LECTURAS ===
+
+# Segundos que una lectura de DataManager se reutiliza entre reruns
+CACHE_TTL_SEGUNDOS = 60
+
+# Cada cuánto se consulta el progreso de un scraping en segundo plano
+INTERVALO_SONDEO_SEGUNDOS = 2
+
+# Cada cuánto el panel en vivo lee el canal de cambios de partidos
+INTERVALO_CAMBIOS_SEGUNDOS = 5
+
+# Partidos cambiados que se listan en el panel en vivo
+MAX_CAMBIOS_VISIBLES = 10
+
+@st.cache_resource(show_spinner=False)
+def obtener_clientes():
+    """Settings compartido por todas las sesiones y reruns"""
+    return Settings()
+
+def umbral_consenso() -> int:
+    """Umbral de alerta de MLB del snapshot de deportes (sigue los cambios del archivo)"""
+    return int(get_consensus_threshold('mlb'))
+
+@st.cache_resource(show_spinner=False)
+def obtener_supabase():
+    """Cliente de Supabase; el SDK se importa recién en el primer uso"""
+    from src.database.supabase_client import SupabaseClient
+    return SupabaseClient()
+
+def _crear_scraper_selenium():
+    """Selenium y webdriver_manager se importan recién al crear el primer scraper"""
+    from src.scraper.mlb_selenium_scraper import MLBSeleniumScraper
+    return MLBSeleniumScraper()
+
+@st.cache_resource(show_spinner=False)
+def obtener_pool_selenium():
+    """Pool acotado compartido: cada scraping toma un scraper propio y al devolverlo se cierra el driver"""
+    from src.scraper.pool_scrapers import PoolScrapers
+    return PoolScrapers(_crear_scraper_selenium)
+
+def selenium_disponible() -> bool:
+    """Si Selenium está instalado, sin importarlo"""
+    return importlib.util.find_spec('selenium') is not None
+
+def _version(tabla: str) -> int:
+    """Versión de la tabla: cambia cuando se guarda una sesión o se programa un scraper"""
+    try:
+        return data_manager.version_datos().get(tabla, 0)
+    except Exception:
+        return -1
+
+@st.cache_data(ttl=CACHE_TTL_SEGUNDOS, show_spinner=False)
+def _sesion_del_dia(fecha: str, version: int):
+    return data_manager.obtener_sesion_del_dia(fecha)
+
+@st.cache_data(ttl=CACHE_TTL_SEGUNDOS, show_spinner=False)
+def _estadisticas_hoy(fecha: str, version: tuple):
+    return data_manager.obtener_estadisticas_hoy()
+
+@st.cache_data(ttl=CACHE_TTL_SEGUNDOS, show_spinner=False)
+def _scrapers_programados(solo_activos: bool, version: int):
+    return data_manager.obtener_scrapers_programados(solo_activos=solo_activos)
+
+@st.cache_data(ttl=CACHE_TTL_SEGUNDOS, max_entries=200, show_spinner=False)
+def _pagina_partidos(filtros: tuple, columnas: tuple, cursor: Optional[tuple], limite: int, version: int):
+    return data_manager.consultar_partidos(**dict(filtros), columnas=list(columnas),
+                                           despues_de=cursor, limite=limite)
+
+def pagina_partidos_cacheada(filtros: Dict, columnas: List[str], cursor: Optional[tuple], limite: int):
+    """Una página de consultar_partidos; se invalida al guardar una sesión nueva"""
+    return _pagina_partidos(tuple(sorted(filtros.items())), tuple(columnas), cursor, limite,
+                            _version('scraping_sessions'))
+
+@st.cache_data(ttl=CACHE_TTL_SEGUNDOS, show_spinner=False)
+def _estadisticas_periodo(desde: str, hasta: str, deporte: Optional[str], version: tuple):
+    return {
+        'resumen': analytics.resumen_periodo(desde, hasta, deporte),
+        'por_dia': analytics.consensos_por_dia(desde, hasta, deporte),
+        'rangos': analytics.distribucion_rangos(desde, hasta, deporte),
+        'alertas': analytics.volumen_alertas(desde, hasta),
+        'latencia': analytics.percentiles_latencia(desde, hasta)
+    }
+
+def estadisticas_periodo_cacheadas(desde: str, hasta: str, deporte: Optional[str] = None):
+    """Estadísticas desde los rollups; se invalidan con sesiones o alertas nuevas"""
+    versiones = (_version('scraping_sessions'), _version('alertas_enviadas'))
+    return _estadisticas_periodo(desde, hasta, deporte, versiones)
+
+# st.fragment (experimental_fragment en versiones anteriores); None si esta versión no lo trae
+_FRAGMENTO = getattr(st, 'fragment', None) or getattr(st, 'experimental_fragment', None)
+
+def _cada(segundos: int):
+    """st.fragment con auto-refresco si esta versión de Streamlit lo trae; si no, la función tal cual"""
+    if _FRAGMENTO is None:
+        return lambda funcion: funcion
+    return _FRAGMENTO(run_every=segundos)
+
+@_cada(INTERVALO_SONDEO_SEGUNDOS)
+def panel_trabajo_scraping(trabajo_id: str):
+    """
+    Progreso y filas parciales del trabajo de scraping en curso
+    
+    Corre como fragmento: cada INTERVALO_SONDEO_SEGUNDOS se re-renderiza
+    solo este panel. Al terminar el trabajo relanza la página completa, que
+    carga el resultado (mostrar_trabajo_scraping).
+    """
+    trabajo = trabajos_scraping.estado(trabajo_id)
+    if not trabajo or trabajo['estado'] not in ESTADOS_ACTIVOS:
+        st.rerun()
+    
+    st.info(f"🔄 Scraping {trabajo['tipo']} en curso (trabajo {trabajo_id})")
+    st.progress(trabajo['progreso'])
+    st.caption(trabajo['mensaje'] or "⏳ En cola...")
+    if trabajo['filas']:
+        st.dataframe(pd.DataFrame(trabajo['filas']), use_container_width=True, height=200)
+    
+    if _FRAGMENTO is None:
+        # Sin fragmentos: sondear relanzando la página
+        time.sleep(INTERVALO_SONDEO_SEGUNDOS)
+        st.rerun()
+
+@_cada(INTERVALO_CAMBIOS_SEGUNDOS)
+def panel_cambios_en_vivo():
+    """
+    Mezcla en la tabla del día solo los partidos cambiados desde el último seq leído
+    
+    Corre como fragmento: cada INTERVALO_CAMBIOS_SEGUNDOS se re-renderiza
+    este panel y no la página completa.
+    """
+    try:
+        if 'suscriptor_cambios' not in st.session_state:
+            # Los datos ya cargados vienen de la sesión guardada: empezar desde ahora
+            st.session_state.suscriptor_cambios = SuscriptorCambios(data_manager)
+        
+        hoy = datetime.now().strftime('%Y-%m-%d')
+        cambios = [cambio for cambio in st.session_state.suscriptor_cambios.nuevos() if cambio['fecha'] == hoy]
+        if cambios:
+            filas, claves = aplicar_cambios(st.session_state.get('consensus_data', []), cambios)
+            st.session_state.consensus_data = filas
+            st.session_state.live_consensus_data = filas
+            st.session_state.all_consensus_data = filas
+            st.session_state.last_update = datetime.now(pytz.timezone('America/Argentina/Buenos_Aires'))
+            
+            recientes = [c for c in st.session_state.get('cambios_recientes', []) if c['partido_id'] not in claves]
+            st.session_state.cambios_recientes = (cambios[::-1] + recientes)[:MAX_CAMBIOS_VISIBLES]
+    except Exception as e:
+        st.caption(f"⚠️ Canal de cambios no disponible: {e}")
+        return
+    
+    recientes = st.session_state.get('cambios_recientes', [])
+    if not recientes:
+        st.caption(f"📡 En vivo: sin cambios de partidos (se revisa cada {INTERVALO_CAMBIOS_SEGUNDOS}s)")
+        return
+    
+    with st.expander(f"📡 **En vivo:** {len(recientes)} partidos cambiados", expanded=True):
+        filas = []
+        for cambio in recientes:
+            datos = cambio['datos']
+            filas.append({
+                'Partido': cambio['partido_id'].replace('@', ' @ '),
+                'Cambio': '🆕 Nuevo' if cambio['tipo'] == 'nuevo' else '🔄 Actualizado',
+                'OVER %': datos.get('over_percentage', datos.get('porcentaje_over', 'N/A')),
+                'UNDER %': datos.get('under_percentage', datos.get('porcentaje_under', 'N/A')),
+                'Origen': cambio['origen'],
+                'Hora': cambio['creado_en'][11:19]
+            })
+        st.dataframe(pd.DataFrame(filas), use_container_width=True, hide_index=True)
+
+def sesion_del_dia_cacheada(fecha: str = None):
+    """obtener_sesion_del_dia cacheada; se invalida al guardar una sesión nueva"""
+    fecha = fecha or datetime.now().strftime('%Y-%m-%d')
+    return _sesion_del_dia(fecha, _version('scraping_sessions'))
+
+def estadisticas_hoy_cacheadas():
+    """obtener_estadisticas_hoy cacheada; se invalida con sesiones o scrapers nuevos"""
+    versiones = (_version('scraping_sessions'), _version('scrapers_programados'))
+    return _estadisticas_hoy(datetime.now().strftime('%Y-%m-%d'), versiones)
+
+def scrapers_programados_cacheados(solo_activos: bool = True):
+    """obtener_scrapers_programados cacheada; se invalida al programar o actualizar"""
+    return _scrapers_programados(solo_activos, _version('scrapers_programados'))
+
+def huella_datos(consensus_data: List[Dict]) -> str:
+    """Hash del contenido de las filas: misma huella = misma tabla, en cualquier sesión"""
+    contenido = json.dumps(consensus_data, sort_keys=True, default=str, ensure_ascii=False)
+    return hashlib.blake2b(contenido.encode('utf-8'), digest_size=16).hexdigest()
+
+@st.cache_data(ttl=3600, max_entries=20, show_spinner=False)
+def tabla_consensos_cacheada(clave_datos: str, _consensus_data: List[Dict]):
+    """Tabla preparada por contenido: los reruns con los mismos datos no la recalculan"""
+    return preparar_tabla_consensos(_consensus_data)
+
 class StreamlitApp:
     """Aplicación principal de Streamlit"""
     
@@ -131,25 +330,36 @@ class StreamlitApp:
         """Inicializa los clientes de base de datos y scraper"""
         if DEPENDENCIES_AVAILABLE:
             try:
-                self.settings = Settings()
-                self.db_client = SupabaseClient()
-                self.mlb_scraper = MLBSeleniumScraper()
+                # Una sola instancia por proceso: no se recrean en cada rerun
+                self.settings = obtener_clientes()
                 
                 # Inicializar data_manager para persistencia
                 self.data_manager = data_manager
-                
-                st.success("✅ Selenium Scraper inicializado correctamente")
             except Exception as e:
                 st.error(f"❌ Error inicializando clientes: {e}")
-                self.db_client = None
-                self.mlb_scraper = None
                 self.data_manager = None
         else:
             st.info("ℹ️ Funcionando en modo limitado sin dependencias completas")
-            self.db_client = None
-            self.mlb_scraper = None
             self.data_manager = None
     
+    @property
+    def db_client(self):
+        """Cliente de Supabase, creado al primer uso (None si no está disponible)"""
+        if not DEPENDENCIES_AVAILABLE:
+            return None
+        try:
+            return obtener_supabase()
+        except Exception as e:
+            print(f"Error inicializando Supabase: {e}")
+            return None
+    
+    @property
+    def pool_selenium(self):
+        """Pool de scrapers Selenium (None si Selenium no está disponible)"""
+        if not DEPENDENCIES_AVAILABLE or not selenium_disponible():
+            return None
+        return obtener_pool_selenium()
+    
     def render_header(self):
         """Renderiza el encabezado principal"""
         st.markdown("""
@@ -191,12 +401,12 @@ class StreamlitApp:
             # Status indicators
             col1, col2 = st.columns(2)
             with col1:
-                if DEPENDENCIES_AVAILABLE and hasattr(self, 'mlb_scraper'):
+                if DEPENDENCIES_AVAILABLE:
                     # Test de conectividad más suave para el sidebar
                     status = "🔄 Ready"
                     try:
-                        # Solo verificar si el scraper está inicializado
-                        if self.mlb_scraper and self.mlb_scraper.base_url:
+                        # Solo verificar que Selenium esté instalado (sin cargarlo)
+                        if selenium_disponible():
                             status = "✅ Config"
                     except Exception as e:
                         print(f"Error verificando scraper: {e}")
@@ -231,7 +441,7 @@ class StreamlitApp:
             current_time = datetime.now(self.timezone)
             
             # Verificar estado del scraper
-            scraper_status = "Activo" if hasattr(self, 'mlb_scraper') and self.mlb_scraper else "Inactivo"
+            scraper_status = "Activo" if DEPENDENCIES_AVAILABLE and selenium_disponible() else "Inactivo"
             
             # Contar consensos disponibles
             consensus_count = len(st.session_state.get('consensus_data', []))
@@ -356,8 +566,8 @@ class StreamlitApp:
         st.markdown("---")
         
         # Verificar si hay datos del día actual en la base de datos
-        sesion_hoy = data_manager.obtener_sesion_del_dia()
-        stats_hoy = data_manager.obtener_estadisticas_hoy()
+        sesion_hoy = sesion_del_dia_cacheada()
+        stats_hoy = estadisticas_hoy_cacheadas()
         
         # Panel de estado del sistema
         self._mostrar_estado_sistema(sesion_hoy, stats_hoy)
@@ -367,8 +577,10 @@ class StreamlitApp:
             # Verificar si necesitamos actualizar los datos
             datos_actuales = st.session_state.get('consensus_data', [])
             
-            # Cargar si no hay datos o si los datos guardados son más recientes
-            if not datos_actuales or len(datos_actuales) != sesion_hoy.total_partidos:
+            # Cargar si no hay datos o si hay una sesión guardada más reciente
+            # (los cambios entre sesiones llegan por el panel en vivo)
+            if not datos_actuales or st.session_state.get('current_session_id') != sesion_hoy.id:
+                st.session_state.current_session_id = sesion_hoy.id
                 st.session_state.consensus_data = sesion_hoy.datos_raw
                 st.session_state.live_consensus_data = sesion_hoy.datos_raw
                 st.session_state.all_consensus_data = sesion_hoy.datos_raw
@@ -377,6 +589,8 @@ class StreamlitApp:
             # Solo mostrar mensaje si realmente no hay datos
             st.info("ℹ️ No hay datos del día actual. Usa el scraping manual para obtener datos.")
         
+        panel_cambios_en_vivo()
+        
         # Intro y pasos principales
         st.markdown("""
         ### 🚀 Bienvenido al Sistema de Consensos MLB
@@ -893,7 +1107,7 @@ class StreamlitApp:
         with col1:
             st.metric(
                 "� Umbral Configurado",
-                value=f"{self.settings.MLB_CONSENSUS_THRESHOLD if hasattr(self, 'settings') else 70}%",
+                value=f"{umbral_consenso()}%",
                 delta="Activo",
                 help="Umbral de consenso configurado"
             )
@@ -933,7 +1147,7 @@ class StreamlitApp:
             
             # Mostrar configuración actual
             if hasattr(self, 'settings'):
-                st.write(f"🎯 **Umbral configurado:** {self.settings.MLB_CONSENSUS_THRESHOLD}%")
+                st.write(f"🎯 **Umbral configurado:** {umbral_consenso()}%")
                 st.write(f"👥 **Expertos mínimos:** {self.settings.MIN_EXPERTS_VOTING}")
                 st.write(f"🌐 **URL activa:** covers.com/consensus/topoverunderconsensus/mlb/expert")
                 st.write(f"⏰ **Scraping programado:** {self.settings.MORNING_SCRAPING_TIME}")
@@ -941,7 +1155,7 @@ class StreamlitApp:
             # Estado de conectividad mejorado
             st.subheader("🌐 Estado de Conectividad")
             
-            if DEPENDENCIES_AVAILABLE and hasattr(self, 'mlb_scraper'):
+            if DEPENDENCIES_AVAILABLE and selenium_disponible():
                 col_a, col_b = st.columns(2)
                 
                 with col_a:
@@ -955,7 +1169,7 @@ class StreamlitApp:
                     st.info("📡 **URL configurada:**")
                     st.code("contests.covers.com/consensus/topoverunderconsensus/all/expert/", language=None)
                     st.write("🎯 **Configuración activa:**")
-                    st.write(f"• Umbral: {self.settings.MLB_CONSENSUS_THRESHOLD}%")
+                    st.write(f"• Umbral: {umbral_consenso()}%")
                     st.write(f"• Expertos: {self.settings.MIN_EXPERTS_VOTING}")
             else:
                 st.warning("⚠️ Scraper no disponible - Verifica la configuración del sistema")
@@ -967,7 +1181,7 @@ class StreamlitApp:
             config_comparison = pd.DataFrame({
                 'Parámetro': ['Umbral Consenso', 'Expertos Mínimos', 'Scraping Diario'],
                 'Tu Configuración': [
-                    f"{self.settings.MLB_CONSENSUS_THRESHOLD if hasattr(self, 'settings') else 70}%",
+                    f"{umbral_consenso()}%",
                     f"{self.settings.MIN_EXPERTS_VOTING if hasattr(self, 'settings') else 23}",
                     f"{self.settings.MORNING_SCRAPING_TIME if hasattr(self, 'settings') else '11:00'}"
                 ],
@@ -1020,7 +1234,7 @@ class StreamlitApp:
             col1, col2, col3, col4 = st.columns(4)
             
             with col1:
-                st.metric("🎯 Umbral de Consenso", f"{self.settings.MLB_CONSENSUS_THRESHOLD}%", help="Porcentaje mínimo para alertas")
+                st.metric("🎯 Umbral de Consenso", f"{umbral_consenso()}%", help="Porcentaje mínimo para alertas")
             
             with col2:
                 st.metric("👥 Expertos Mínimos", f"{self.settings.MIN_EXPERTS_VOTING}", help="Cantidad mínima de expertos votando")
@@ -1050,7 +1264,7 @@ class StreamlitApp:
                 
                 # Obtener valores actuales de configuración
                 current_hour = int(self.settings.MORNING_SCRAPING_TIME.split(':')[0]) if hasattr(self, 'settings') and ':' in self.settings.MORNING_SCRAPING_TIME else 11
-                current_threshold = self.settings.MLB_CONSENSUS_THRESHOLD if hasattr(self, 'settings') else 70
+                current_threshold = umbral_consenso()
                 current_experts = self.settings.MIN_EXPERTS_VOTING if hasattr(self, 'settings') else 23
                 
                 daily_hour = st.slider("Hora de scraping diario", 0, 23, current_hour)
@@ -1139,91 +1353,100 @@ class StreamlitApp:
         with col3:
             sport_filter = st.selectbox("Deporte", ["Todos", "MLB", "NFL", "NBA"])
         
+        if not DEPENDENCIES_AVAILABLE:
+            st.info("ℹ️ Estadísticas no disponibles en modo limitado")
+            return
+        
+        try:
+            stats = estadisticas_periodo_cacheadas(
+                date_from.strftime('%Y-%m-%d'),
+                date_to.strftime('%Y-%m-%d'),
+                None if sport_filter == "Todos" else sport_filter
+            )
+        except Exception as e:
+            st.error(f"❌ Error al cargar estadísticas: {e}")
+            return
+        
+        resumen = stats['resumen']
+        latencia = resumen['latencia']
+        
         # Estadísticas generales
         st.subheader("📊 Resumen del Período")
         
         col1, col2, col3, col4 = st.columns(4)
         
         with col1:
-            st.metric("📈 Total Consensos", "0", "Pendiente")
+            st.metric("📈 Total Consensos", resumen['partidos'], f"{resumen['sesiones']} sesiones")
         with col2:
-            st.metric("🎯 Precisión Media", "N/A", "En desarrollo")
+            st.metric("💪 Consensos ≥70%", resumen['consensos_fuertes'])
         with col3:
-            st.metric("🚨 Alertas Enviadas", "0", "Pendiente")
+            st.metric("🚨 Alertas Enviadas", resumen['alertas'])
         with col4:
-            st.metric("⚡ Tiempo Respuesta", "N/A", "En desarrollo")
+            p50 = f"{latencia['p50']:.1f}s" if latencia['p50'] is not None else "N/A"
+            p95 = f"p95 {latencia['p95']:.1f}s" if latencia['p95'] is not None else None
+            st.metric("⚡ Duración Scraping (p50)", p50, p95, delta_color="off")
         
         # Gráficos detallados
         col1, col2 = st.columns(2)
         
         with col1:
             st.subheader("📈 Tendencia de Consensos")
-            
-            # Generar gráficos de tendencia basados en datos reales
-            try:
-                # Intentar obtener datos reales de consensos por fecha
-                # Datos de ejemplo mientras no haya datos reales en la base de datos
-                consensus_trend = pd.DataFrame({
-                    'Fecha': pd.date_range(start=date_from, end=date_to, freq='D'),
-                    'Consensos': [0] * len(pd.date_range(start=date_from, end=date_to, freq='D'))
-                })
-                
-                # TODO: Reemplazar con consulta real a base de datos cuando esté implementada
-                st.info("📊 Datos estadísticos en desarrollo - conectar con base de datos real")
-                
-            except Exception as e:
-                st.error(f"Error al cargar tendencias: {e}")
-                consensus_trend = pd.DataFrame({
-                    'Fecha': [datetime.now().date()],
-                    'Consensos': [0]
-                })
-            
+            consensus_trend = pd.DataFrame(stats['por_dia']).rename(columns={
+                'fecha': 'Fecha', 'partidos': 'Consensos', 'consensos_fuertes': 'Fuertes (≥70%)'
+            })
             fig = px.line(
                 consensus_trend,
                 x='Fecha',
-                y='Consensos',
+                y=['Consensos', 'Fuertes (≥70%)'],
                 title="Consensos por Día"
             )
             st.plotly_chart(fig, use_container_width=True)
         
         with col2:
-            st.subheader("🎯 Efectividad por Tipo")
-            
-            effectiveness = pd.DataFrame({
-                'Tipo': ['Spread', 'Total', 'Moneyline'],
-                'Efectividad': [78.5, 82.1, 75.3],
-                'Cantidad': [45, 38, 23]
+            st.subheader("🎯 Distribución por Rango de Consenso")
+            rangos = pd.DataFrame({
+                'Rango': list(stats['rangos'].keys()),
+                'Partidos': list(stats['rangos'].values())
             })
-            
-            fig = px.scatter(
-                effectiveness,
-                x='Cantidad',
-                y='Efectividad',
-                size='Cantidad',
-                color='Tipo',
-                title="Efectividad vs Cantidad"
-            )
+            fig = px.bar(rangos, x='Rango', y='Partidos', title="Partidos por Rango de Consenso")
             st.plotly_chart(fig, use_container_width=True)
         
+        col1, col2 = st.columns(2)
+        
+        with col1:
+            st.subheader("🚨 Volumen de Alertas")
+            if stats['alertas']:
+                alertas = pd.DataFrame(stats['alertas'])
+                fig = px.bar(alertas, x='fecha', y='enviadas', color='canal', title="Alertas Enviadas por Día")
+                st.plotly_chart(fig, use_container_width=True)
+            else:
+                st.info("📭 No hay alertas enviadas en el período")
+        
+        with col2:
+            st.subheader("⏱️ Duración del Scraping")
+            percentiles = {clave: valor for clave, valor in stats['latencia'].items() if clave.startswith('p')}
+            if stats['latencia']['sesiones']:
+                st.dataframe(
+                    pd.DataFrame({
+                        'Percentil': list(percentiles.keys()),
+                        'Segundos': list(percentiles.values())
+                    }),
+                    use_container_width=True,
+                    hide_index=True
+                )
+                st.caption(f"{stats['latencia']['sesiones']} sesiones en el período")
+            else:
+                st.info("📭 No hay sesiones de scraping en el período")
+        
         # Tabla detallada
-        st.subheader("📋 Detalle de Consensos")
-        
-        # Datos históricos reales (placeholder hasta implementar base de datos completa)
-        st.subheader("📋 Detalle de Consensos")
-        st.info("🔧 Tabla de históricos en desarrollo - datos reales disponibles en la pestaña 'Scraping en Vivo'")
-        
-        # Mostrar datos vacíos hasta que se implemente la base de datos completa
-        df_placeholder = pd.DataFrame({
-            'Fecha': [],
-            'Hora': [],
-            'Deporte': [],
-            'Partido': [],
-            'Tipo': [],
-            'Consenso': [],
-            'Resultado': [],
-            'ROI': []
-        })
-        st.dataframe(df_placeholder, use_container_width=True)
+        st.subheader("📋 Detalle por Día")
+        st.dataframe(
+            pd.DataFrame(stats['por_dia']).rename(columns={
+                'fecha': 'Fecha', 'partidos': 'Partidos', 'consensos_fuertes': 'Consensos ≥70%', 'sesiones': 'Sesiones'
+            }),
+            use_container_width=True,
+            hide_index=True
+        )
     
     def render_logs(self):
         """Renderiza la página de logs"""
@@ -1395,10 +1618,11 @@ class StreamlitApp:
         try:
             if DEPENDENCIES_AVAILABLE and hasattr(self, 'data_manager'):
                 # Intentar cargar datos de la sesión de hoy
-                sesion_hoy = self.data_manager.obtener_sesion_hoy()
+                sesion_hoy = sesion_del_dia_cacheada()
                 
                 if sesion_hoy and sesion_hoy.datos_raw:
                     # Cargar datos existentes
+                    st.session_state.current_session_id = sesion_hoy.id
                     st.session_state.consensus_data = sesion_hoy.datos_raw
                     st.session_state.live_consensus_data = sesion_hoy.datos_raw
                     st.session_state.all_consensus_data = sesion_hoy.datos_raw
@@ -1415,290 +1639,197 @@ class StreamlitApp:
         st.session_state.last_update = datetime.now(self.timezone)
         st.rerun()
     
-    def run_manual_scraping(self):
-        """Ejecuta scraping manual"""
-        st.info("🕷️ Ejecutando scraping con Selenium...")
+    def run_manual_scraping(self, programar: bool = False):
+        """Encola un scraping Selenium simple en segundo plano"""
+        self._enviar_trabajo_scraping('manual', self._trabajo_scraping_manual, programar)
+    
+    def run_manual_scraping_robusto(self, programar: bool = False):
+        """Encola un scraping con el sistema robusto en segundo plano"""
+        self._enviar_trabajo_scraping('robusto', self._trabajo_scraping_robusto, programar)
+    
+    def _enviar_trabajo_scraping(self, tipo: str, funcion, programar: bool = False):
+        """Envía el trabajo (o se une al que ya corre) y guarda su ID en la sesión"""
+        if not DEPENDENCIES_AVAILABLE:
+            st.warning("⚠️ Scraper no disponible, usando datos dummy")
+            self._crear_datos_reales_dummy(5)
+            return
         
-        if hasattr(self, 'mlb_scraper') and self.mlb_scraper:
-            try:
-                # Obtener fecha actual
-                from datetime import datetime
-                current_date = datetime.now().strftime('%Y-%m-%d')
-                
-                # Ejecutar scraping real con Selenium
-                with st.spinner("🚀 Ejecutando scraping Selenium - Esto puede tomar unos segundos..."):
-                    # Mostrar información de la URL
-                    url = f"https://contests.covers.com/consensus/topoverunderconsensus/all/expert/{current_date}"
-                    st.info(f"📡 Accediendo a: {url}")
-                    
-                    # Ejecutar el scraping
-                    consensos = self.mlb_scraper.scrape_mlb_consensus(current_date)
-                    
-                st.success("✅ Scraping Selenium completado exitosamente")
-                st.info(f"📡 URL utilizada: covers.com/consensus/...")
-                st.write(f"� Consensos encontrados: {len(consensos)}")
-                
-                if consensos:
-                    # Filtrar datos según configuración (sin usar función obsoleta)
-                    umbral = self.settings.MLB_CONSENSUS_THRESHOLD if hasattr(self, 'settings') else 70
-                    min_experts = self.settings.MIN_EXPERTS_VOTING if hasattr(self, 'settings') else 15
-                    
-                    filtered_consensos = []
-                    for consenso in consensos:
-                        porcentaje = consenso.get('porcentaje_consenso', 0)
-                        num_experts = consenso.get('num_experts', 0)
-                        
-                        if porcentaje >= umbral and num_experts >= min_experts:
-                            filtered_consensos.append(consenso)
-                    
-                    # Guardar TODOS los datos en session state para visualización
-                    st.session_state.consensus_data = consensos  # TODOS los datos
-                    st.session_state.live_consensus_data = consensos  # TODOS los datos
-                    st.session_state.all_consensus_data = consensos  # TODOS los datos
-                    
-                    st.success(f"✅ Se encontraron {len(consensos)} consensos en total")
-                    st.info(f"📊 Filtrados con criterios (≥{umbral}%, ≥{min_experts} expertos): {len(filtered_consensos)} válidos")
-                    
-                    # Mostrar resumen de datos filtrados
-                    if filtered_consensos:
-                        st.subheader("🎯 Consensos que Cumplen Filtros de Alerta")
-                        for i, consenso in enumerate(filtered_consensos[:5], 1):
-                            col1, col2, col3, col4 = st.columns(4)
-                            
-                            with col1:
-                                st.write(f"**{i}. {consenso.get('equipo_visitante', 'N/A')} @ {consenso.get('equipo_local', 'N/A')}**")
-                            with col2:
-                                st.write(f"**{consenso.get('direccion_consenso', 'N/A')}**")
-                            with col3:
-                                st.write(f"**{consenso.get('porcentaje_consenso', 0)}%**")
-                            with col4:
-                                st.write(f"**{consenso.get('num_experts', 0)} expertos**")
-                    else:
-                        st.info("ℹ️ Ningún consenso cumple los filtros de alerta actuales")
-                else:
-                    st.info("ℹ️ No se encontraron consensos para la fecha actual")
-                    st.session_state.live_consensus_data = []
-                    st.session_state.all_consensus_data = []
-                    
-            except Exception as e:
-                st.error(f"❌ Error en scraping: {e}")
-                st.info("No se pudieron obtener datos")
-                st.session_state.live_consensus_data = []
-                st.session_state.all_consensus_data = []
+        try:
+            trabajo_id = trabajos_scraping.enviar(tipo, funcion)
+        except Exception as e:
+            st.error(f"❌ No se pudo encolar el scraping: {e}")
+            return
+        
+        st.session_state.trabajo_scraping_id = trabajo_id
+        st.session_state.programar_al_completar = programar
+        st.info(f"📥 Scraping {tipo} en segundo plano (trabajo {trabajo_id}). Puedes seguir navegando.")
+    
+    def _trabajo_scraping_manual(self, progreso) -> Dict:
+        """Cuerpo del trabajo manual (corre fuera del script de Streamlit: sin llamadas a st)"""
+        pool = self.pool_selenium
+        if not pool:
+            raise RuntimeError("Scraper no inicializado")
+        
+        current_date = datetime.now().strftime('%Y-%m-%d')
+        url = f"https://contests.covers.com/consensus/topoverunderconsensus/all/expert/{current_date}"
+        progreso.reportar(10, f"Accediendo a: {url}")
+        
+        with pool.prestar() as scraper:
+            consensos = scraper.scrape_mlb_consensus(
+                current_date,
+                al_avanzar=lambda filas: progreso.reportar(50, f"{len(filas)} consensos extraídos", filas=filas)
+            )
+        
+        # Filtrar datos según configuración (sin usar función obsoleta)
+        umbral = umbral_consenso()
+        min_experts = self.settings.MIN_EXPERTS_VOTING if hasattr(self, 'settings') else 15
+        filtered_consensos = [
+            consenso for consenso in consensos
+            if consenso.get('porcentaje_consenso', 0) >= umbral and consenso.get('num_experts', 0) >= min_experts
+        ]
+        
+        return {
+            'umbral': umbral,
+            'min_experts': min_experts,
+            'filtrados': len(filtered_consensos),
+            'destacados': filtered_consensos[:5],
+            'filas': consensos  # TODOS los datos para visualización
+        }
+    
+    def _trabajo_scraping_robusto(self, progreso) -> Dict:
+        """Cuerpo del trabajo robusto: ciclo con reintentos + datos completos guardados en la base"""
+        progreso.reportar(5, "Inicializando sistema scraper robusto")
+        from src.scraper.sistema_scraper_robusto import ScraperRobusto
+        sistema_robusto = ScraperRobusto()
+        
+        progreso.reportar(10, "Ejecutando scraping con reintentos automáticos (máx. 3 intentos)")
+        resultado = sistema_robusto.ejecutar_ciclo_completo()
+        resumen = {
+            clave: resultado.get(clave)
+            for clave in ('exito', 'consensos_encontrados', 'alertas_enviadas', 'tiempo_procesamiento', 'error')
+        }
+        
+        if resultado['exito'] and not resultado['consensos_encontrados']:
+            return {'resumen': resumen, 'filas': []}
+        
+        if resultado['exito']:
+            progreso.reportar(60, "Obteniendo datos completos para visualización")
         else:
-            st.warning("⚠️ Scraper no inicializado")
-            
-        st.success("✅ Proceso completado")
+            progreso.reportar(60, "Scraping robusto falló, intentando con scraper simple como respaldo")
+        
+        pool = self.pool_selenium
+        if not pool:
+            raise RuntimeError("Scraper no disponible")
+        
+        inicio = time.time()
+        with pool.prestar() as scraper:
+            consensos_completos = scraper.scrape_mlb_consensus(
+                al_avanzar=lambda filas: progreso.reportar(
+                    75, f"{len(filas)} consensos extraídos", filas=self._procesar_datos_para_tabla(filas)
+                )
+            )
+        if not consensos_completos:
+            raise RuntimeError("No se pudieron obtener datos frescos")
+        
+        # Procesar y limpiar los datos para la interfaz
+        datos_procesados = self._procesar_datos_para_tabla(consensos_completos)
+        progreso.reportar(90, f"Guardando {len(datos_procesados)} consensos", filas=datos_procesados)
+        
+        # Guardar en base de datos usando DataManager
+        session_id = data_manager.guardar_sesion_scraping(
+            datos=datos_procesados,
+            filtros={},  # No se aplicaron filtros en la visualización
+            duracion=time.time() - inicio,
+            errores=[]
+        )
+        
+        return {'resumen': resumen, 'session_id': session_id, 'filas': datos_procesados}
     
-    def run_manual_scraping_robusto(self):
-        """Ejecuta scraping manual con sistema robusto"""
-        st.info("🕷️ Ejecutando scraping con sistema robusto...")
+    def mostrar_trabajo_scraping(self):
+        """
+        Muestra el progreso del scraping en segundo plano y sondea hasta que termina
+        
+        Si esta sesión no lanzó ninguno pero otro usuario sí, se muestra (y
+        se carga al terminar) el mismo trabajo compartido.
+        """
+        if not DEPENDENCIES_AVAILABLE:
+            return
         
-        try:
-            # Inicializar sistema robusto
-            with st.spinner("🚀 Inicializando sistema scraper robusto..."):
-                sistema_robusto = ScraperRobusto()
-                
-                # Mostrar configuración actual
-                config = sistema_robusto.obtener_resumen_configuracion()
-                st.info(f"⚙️ Filtros: Umbral {config['filtros_basicos']['umbral_minimo']}, "
-                        f"Expertos {config['filtros_basicos']['expertos_minimos']}+")
-            
-            # Ejecutar ciclo completo con reintentos
-            with st.spinner("🔄 Ejecutando scraping con reintentos automáticos..."):
-                st.info("⏳ Esto puede tomar varios minutos si hay reintentos (máx. 3 intentos)")
-                
-                # Usar progress bar para mostrar progreso
-                progress_bar = st.progress(0)
-                progress_text = st.empty()
-                
-                progress_text.text("🔍 Iniciando scraping robusto...")
-                progress_bar.progress(33)
-                
-                resultado = sistema_robusto.ejecutar_ciclo_completo()
-                progress_bar.progress(100)
-                progress_text.text("✅ Completado")
-                
-            # Mostrar resultados
-            if resultado['exito']:
+        trabajo_id = st.session_state.get('trabajo_scraping_id')
+        if not trabajo_id:
+            trabajo_id = next(filter(None, (trabajos_scraping.trabajo_activo(tipo) for tipo in ('robusto', 'manual'))), None)
+            if not trabajo_id:
+                return
+            st.session_state.trabajo_scraping_id = trabajo_id
+        
+        trabajo = trabajos_scraping.estado(trabajo_id)
+        if not trabajo:
+            st.session_state.trabajo_scraping_id = None
+            return
+        
+        if trabajo['estado'] in ESTADOS_ACTIVOS:
+            panel_trabajo_scraping(trabajo_id)
+            return
+        
+        st.session_state.trabajo_scraping_id = None
+        self._cargar_resultado_trabajo(trabajo)
+    
+    def _cargar_resultado_trabajo(self, trabajo: Dict):
+        """Vuelca el resultado de un trabajo terminado en session_state"""
+        resultado = trabajo['resultado'] or {}
+        programar = st.session_state.pop('programar_al_completar', False)
+        
+        if trabajo['estado'] == 'error':
+            st.error(f"❌ Error en scraping {trabajo['tipo']}: {trabajo['error']}")
+            if trabajo['tipo'] == 'robusto':
+                st.warning("🔄 Usando datos de ejemplo como respaldo...")
+                self._crear_datos_reales_dummy(5)
+            return
+        
+        filas = trabajo['filas']
+        
+        if trabajo['tipo'] == 'robusto':
+            resumen = resultado.get('resumen', {})
+            if resumen.get('exito'):
                 st.success("✅ Scraping robusto completado exitosamente")
-                
                 col1, col2, col3 = st.columns(3)
                 with col1:
-                    st.metric("🎯 Consensos encontrados", resultado['consensos_encontrados'])
+                    st.metric("🎯 Consensos encontrados", resumen['consensos_encontrados'])
                 with col2:
-                    st.metric("📢 Nuevas alertas", resultado['alertas_enviadas'])
+                    st.metric("📢 Nuevas alertas", resumen['alertas_enviadas'])
                 with col3:
-                    st.metric("⏱️ Tiempo (seg)", resultado['tiempo_procesamiento'])
-                
-                if resultado['alertas_enviadas'] > 0:
-                    st.success(f"🎉 ¡Se procesaron {resultado['alertas_enviadas']} nuevas alertas!")
-                else:
-                    st.info("ℹ️ No hay alertas nuevas (ya enviadas anteriormente o no cumplen filtros)")
-                
-                # Obtener y guardar datos para visualización
-                if resultado['consensos_encontrados'] > 0:
-                    self._obtener_datos_para_visualizacion(sistema_robusto, resultado)
-                else:
-                    st.warning("⚠️ No se encontraron consensos en el scraping")
-                    
+                    st.metric("⏱️ Tiempo (seg)", resumen['tiempo_procesamiento'])
             else:
-                st.error("❌ Scraping falló después de todos los reintentos")
-                if 'error' in resultado:
-                    st.error(f"💥 Error: {resultado['error']}")
-                
-                # Intentar fallback
-                st.warning("🔄 Intentando con scraper simple como respaldo...")
-                self.run_manual_scraping_fallback()
-                        
-        except Exception as e:
-            st.error(f"❌ Error en scraping robusto: {e}")
-            st.warning("🔄 Intentando con scraper simple como respaldo...")
-            self.run_manual_scraping_fallback()
-                    
-        st.success("✅ Proceso completado")
-
-    def _obtener_datos_para_visualizacion(self, sistema_robusto, resultado):
-        """Obtiene datos para mostrar en la interfaz web y los guarda en la base de datos"""
-        try:
-            # Opción 1: Hacer un scraping fresh directo para obtener datos sin filtrar
-            st.info("🔄 Obteniendo datos completos para visualización...")
-            inicio = time.time()
-            
-            if hasattr(self, 'mlb_scraper') and self.mlb_scraper:
-                consensos_completos = self.mlb_scraper.scrape_mlb_consensus()
-                if consensos_completos:
-                    # Procesar y limpiar los datos para la interfaz
-                    datos_procesados = self._procesar_datos_para_tabla(consensos_completos)
-                    duracion = time.time() - inicio
-                    
-                    # Guardar en base de datos usando DataManager
-                    session_id = data_manager.guardar_sesion_scraping(
-                        datos=datos_procesados,
-                        filtros={},  # No se aplicaron filtros en la visualización
-                        duracion=duracion,
-                        errores=[]
-                    )
-                    
-                    # Guardar en session_state para uso inmediato
-                    st.session_state.consensus_data = datos_procesados
-                    st.session_state.live_consensus_data = datos_procesados
-                    st.session_state.all_consensus_data = datos_procesados
-                    st.session_state.last_update = datetime.now(self.timezone)
-                    st.session_state.current_session_id = session_id
-                    
-                    st.success(f"📊 Se guardaron {len(datos_procesados)} consensos (ID: {session_id})")
-                    return
-                else:
-                    st.warning("⚠️ No se pudieron obtener datos frescos")
-            
-            # Opción 2: Usar datos dummy basados en lo que se extrajo
-            st.info("🔄 Creando datos de ejemplo basados en el scraping exitoso...")
-            datos_dummy = self._crear_datos_reales_dummy(resultado['consensos_encontrados'])
-            duracion = time.time() - inicio
-            
-            # Guardar datos dummy también en la base de datos
-            session_id = data_manager.guardar_sesion_scraping(
-                datos=datos_dummy,
-                filtros={},
-                duracion=duracion,
-                errores=["Usados datos de ejemplo - scraping real no disponible"]
-            )
-            
-            st.session_state.current_session_id = session_id
-            st.info(f"💡 Datos de ejemplo guardados (ID: {session_id})")
-                
-        except Exception as e:
-            st.error(f"❌ Error obteniendo datos para visualización: {e}")
-            # Como último recurso, crear datos dummy
-            st.info("🔄 Creando datos de ejemplo para visualización...")
-            try:
-                datos_dummy = self._crear_datos_reales_dummy(resultado.get('consensos_encontrados', 5))
-                session_id = data_manager.guardar_sesion_scraping(
-                    datos=datos_dummy,
-                    filtros={},
-                    duracion=0,
-                    errores=[f"Error en scraping: {str(e)}"]
-                )
-                st.session_state.current_session_id = session_id
-            except Exception as e2:
-                st.error(f"❌ Error crítico: {e2}")
+                st.warning(f"⚠️ Scraping robusto falló ({resumen.get('error', 'sin detalle')}); se usaron los datos del scraper simple")
+        else:
+            st.success(f"✅ Se encontraron {len(filas)} consensos en total")
+            st.info(f"📊 Filtrados con criterios (≥{resultado.get('umbral')}%, ≥{resultado.get('min_experts')} expertos): {resultado.get('filtrados', 0)} válidos")
+            for i, consenso in enumerate(resultado.get('destacados', []), 1):
+                st.write(f"**{i}. {consenso.get('equipo_visitante', 'N/A')} @ {consenso.get('equipo_local', 'N/A')}** - "
+                         f"{consenso.get('direccion_consenso', 'N/A')} {consenso.get('porcentaje_consenso', 0)}% "
+                         f"({consenso.get('num_experts', 0)} expertos)")
+        
+        if not filas:
+            st.warning("⚠️ No se encontraron consensos en el scraping")
+            st.session_state.live_consensus_data = []
+            st.session_state.all_consensus_data = []
+            return
+        
+        # Guardar en session_state para uso inmediato
+        st.session_state.consensus_data = filas
+        st.session_state.live_consensus_data = filas
+        st.session_state.all_consensus_data = filas
+        st.session_state.last_update = datetime.now(self.timezone)
+        if resultado.get('session_id'):
+            st.session_state.current_session_id = resultado['session_id']
+            st.success(f"📊 Se guardaron {len(filas)} consensos (ID: {resultado['session_id']})")
+        
+        if programar:
+            self.programar_scrapers_automaticos()
 
     def _procesar_datos_para_tabla(self, consensos_raw):
         """Procesa datos raw del scraper para la tabla de visualización"""
-        datos_procesados = []
-        
-        for consenso in consensos_raw:
-            # Extraer datos del consenso con manejo de errores
-            try:
-                # El scraper devuelve esta estructura:
-                # 'equipo_visitante', 'equipo_local', 'hora_juego', 'fecha_juego'
-                # 'porcentaje_over', 'porcentaje_under', 'total_line', 'num_experts'
-                
-                visitante = consenso.get('equipo_visitante', 'N/A')
-                local = consenso.get('equipo_local', 'N/A')
-                
-                # Extraer porcentajes
-                over_pct = consenso.get('porcentaje_over', 0)
-                under_pct = consenso.get('porcentaje_under', 0)
-                
-                # Asegurar que son números
-                if isinstance(over_pct, (int, float)):
-                    over_pct = float(over_pct)
-                else:
-                    over_pct = 0.0
-                    
-                if isinstance(under_pct, (int, float)):
-                    under_pct = float(under_pct)
-                else:
-                    under_pct = 0.0
-                
-                # Obtener otros datos
-                total_line = consenso.get('total_line', 0.0)
-                if isinstance(total_line, (int, float)) and total_line > 0:
-                    total_str = f"{total_line:.1f}"
-                else:
-                    total_str = 'N/A'
-                
-                # Número de expertos
-                expertos = consenso.get('num_experts', 0)
-                if isinstance(expertos, (int, float)) and expertos > 0:
-                    expertos_str = str(int(expertos))
-                else:
-                    expertos_str = 'N/A'
-                
-                # Hora del juego
-                hora = consenso.get('hora_juego', 'TBD')
-                
-                # Fecha del juego
-                fecha = consenso.get('fecha_juego', datetime.now(self.timezone).strftime('%Y-%m-%d'))
-                
-                datos_procesados.append({
-                    'fecha': fecha,
-                    'hora': hora,
-                    'visitante': visitante,
-                    'local': local,
-                    'over_percentage': f"{over_pct:.1f}%",
-                    'under_percentage': f"{under_pct:.1f}%",
-                    'total': total_str,
-                    'expertos': expertos_str
-                })
-                
-            except Exception as e:
-                # Si hay error procesando este consenso específico, usar datos de error
-                print(f"Error procesando consenso para tabla: {e}")
-                datos_procesados.append({
-                    'fecha': datetime.now(self.timezone).strftime('%Y-%m-%d'),
-                    'hora': 'ERROR',
-                    'visitante': 'ERR',
-                    'local': 'ERR', 
-                    'over_percentage': '0.0%',
-                    'under_percentage': '0.0%',
-                    'total': 'N/A',
-                    'expertos': 'N/A'
-                })
-                
-        return datos_procesados
+        return procesar_consensos_para_tabla(consensos_raw, datetime.now(self.timezone).strftime('%Y-%m-%d'))
 
     def _crear_datos_reales_dummy(self, num_consensos):
         """Crea datos dummy realistas basados en los datos reales scrapeados"""
@@ -1745,34 +1876,15 @@ class StreamlitApp:
         
         st.success(f"📊 Se crearon {len(dummy_data)} datos realistas basados en Covers.com")
     
-    def run_manual_scraping_fallback(self):
-        """Fallback al scraper simple si el robusto falla"""
-        if hasattr(self, 'mlb_scraper') and self.mlb_scraper:
-            try:
-                consensos = self.mlb_scraper.scrape_mlb_consensus()
-                if consensos:
-                    datos_procesados = self._procesar_datos_para_tabla(consensos)
-                    st.session_state.consensus_data = datos_procesados
-                    st.session_state.live_consensus_data = datos_procesados
-                    st.session_state.all_consensus_data = datos_procesados
-                    st.session_state.last_update = datetime.now(self.timezone)
-                    st.info(f"✅ Fallback exitoso: {len(datos_procesados)} consensos obtenidos")
-                else:
-                    st.warning("⚠️ No se obtuvieron datos del fallback")
-                    self._crear_datos_reales_dummy(5)  # Crear 5 datos dummy
-            except Exception as fallback_error:
-                st.error(f"❌ Error en fallback: {fallback_error}")
-                self._crear_datos_reales_dummy(5)  # Crear 5 datos dummy
-        else:
-            st.warning("⚠️ Scraper no disponible, usando datos dummy")
-            self._crear_datos_reales_dummy(5)  # Crear 5 datos dummy
-
     def run(self):
         """Método principal que ejecuta toda la aplicación"""
         try:
             # Renderizar header
             self.render_header()
             
+            # Progreso del scraping en segundo plano (se completa al final del script)
+            panel_trabajo = st.container()
+            
             # Renderizar sidebar y obtener página seleccionada
             selected_page = self.render_sidebar()
             
@@ -1781,9 +1893,8 @@ class StreamlitApp:
                 self.render_dashboard()
             elif selected_page == "🕷️ Scraping Actual":
                 self.render_scraping_page()
-            elif selected_page == "� Base de Datos":
-                st.header("� Base de Datos")
-                st.info("📋 Funcionalidad de base de datos en desarrollo")
+            elif selected_page == "💾 Base de Datos":
+                self.render_database()
             elif selected_page == "📈 Estadísticas":
                 self.render_statistics()
             elif selected_page == "⚙️ Configuración":
@@ -1797,11 +1908,130 @@ class StreamlitApp:
             else:
                 # Por defecto mostrar página de inicio
                 self.render_dashboard()
+            
+            # Al final: el panel de progreso se refresca solo, sin relanzar la página
+            with panel_trabajo:
+                self.mostrar_trabajo_scraping()
         
         except Exception as e:
             st.error(f"❌ Error en la aplicación: {e}")
             st.info("🔄 Recarga la página para intentar de nuevo")
 
+    def render_database(self):
+        """Historial de partidos guardados, una página por consulta (filtros en SQL)"""
+        st.header("💾 Base de Datos")
+        
+        if not DEPENDENCIES_AVAILABLE:
+            st.info("ℹ️ Base de datos no disponible en modo limitado")
+            return
+        
+        etiquetas = {
+            'fecha': 'Fecha', 'hora': 'Hora', 'visitante': 'Visitante', 'local': 'Local',
+            'over_pct': 'OVER %', 'under_pct': 'UNDER %', 'consenso_pct': 'Consenso %',
+            'direccion': 'Dirección', 'total_line': 'Total', 'expertos': 'Expertos', 'sesion_id': 'Sesión'
+        }
+        
+        # === FILTROS ===
+        col1, col2, col3, col4 = st.columns(4)
+        with col1:
+            fecha_desde = st.date_input("Desde", value=datetime.now().date() - timedelta(days=30), key="db_desde")
+        with col2:
+            fecha_hasta = st.date_input("Hasta", value=datetime.now().date(), key="db_hasta")
+        with col3:
+            equipo = st.text_input("Equipo (abreviatura)", key="db_equipo").strip()
+        with col4:
+            consenso_minimo = st.slider("% Mínimo de Consenso", 0, 100, 0, key="db_consenso")
+        
+        col1, col2 = st.columns([3, 1])
+        with col1:
+            columnas = st.multiselect(
+                "Columnas",
+                list(COLUMNAS_PARTIDOS),
+                default=['fecha', 'hora', 'visitante', 'local', 'over_pct', 'under_pct', 'total_line', 'expertos'],
+                format_func=lambda columna: etiquetas.get(columna, columna),
+                key="db_columnas"
+            )
+        with col2:
+            limite = st.selectbox("Filas por página", [25, 50, 100], index=1, key="db_limite")
+        
+        filtros = {
+            'fecha_desde': fecha_desde.strftime('%Y-%m-%d'),
+            'fecha_hasta': fecha_hasta.strftime('%Y-%m-%d'),
+            'equipo': equipo or None,
+            'consenso_minimo': consenso_minimo or None
+        }
+        
+        # Cursores de inicio de cada página visitada; se reinician al cambiar los filtros
+        clave_consulta = (tuple(sorted(filtros.items())), limite)
+        if st.session_state.get('db_consulta') != clave_consulta:
+            st.session_state.db_consulta = clave_consulta
+            st.session_state.db_cursores = [None]
+        cursores = st.session_state.db_cursores
+        
+        try:
+            pagina = pagina_partidos_cacheada(filtros, columnas or ['fecha'], cursores[-1], limite)
+        except Exception as e:
+            st.error(f"❌ Error consultando la base de datos: {e}")
+            return
+        
+        if not pagina['filas']:
+            st.info("📭 No hay partidos guardados que coincidan con los filtros")
+        else:
+            st.dataframe(
+                pd.DataFrame(pagina['filas']).rename(columns=etiquetas),
+                use_container_width=True,
+                hide_index=True
+            )
+        
+        col1, col2, col3 = st.columns([1, 2, 1])
+        with col1:
+            if st.button("⬅️ Anterior", disabled=len(cursores) == 1, key="db_anterior"):
+                cursores.pop()
+                st.rerun()
+        with col2:
+            st.caption(f"Página {len(cursores)} · {len(pagina['filas'])} partidos")
+        with col3:
+            if st.button("Siguiente ➡️", disabled=pagina['siguiente'] is None, key="db_siguiente"):
+                cursores.append(pagina['siguiente'])
+                st.rerun()
+        
+        # === EXPORTACIÓN ===
+        st.subheader("💾 Exportar")
+        col1, col2 = st.columns([1, 3])
+        with col1:
+            formato = st.selectbox("Formato", list(FORMATOS_EXPORTACION), key="db_formato",
+                                   format_func=str.upper)
+        with col2:
+            st.caption("Exporta TODOS los partidos que coinciden con los filtros (no solo esta página), "
+                       "leyendo y escribiendo por lotes.")
+            if st.button("📦 Generar archivo", key="db_exportar"):
+                anterior = st.session_state.pop('db_exportacion', None)
+                if anterior:
+                    anterior['archivo'].close()
+                try:
+                    with st.spinner("Exportando..."):
+                        archivo = exportar_partidos(formato, columnas=columnas or None, **filtros)
+                    st.session_state.db_exportacion = {
+                        'archivo': archivo,
+                        'nombre': nombre_exportacion(formato),
+                        'mime': FORMATOS_EXPORTACION[formato][0]
+                    }
+                except ImportError as e:
+                    st.warning(f"⚠️ {e}")
+                except Exception as e:
+                    st.error(f"❌ Error exportando: {e}")
+        
+        exportacion = st.session_state.get('db_exportacion')
+        if exportacion:
+            exportacion['archivo'].seek(0)
+            st.download_button(
+                label=f"⬇️ Descargar {exportacion['nombre']}",
+                data=exportacion['archivo'],
+                file_name=exportacion['nombre'],
+                mime=exportacion['mime'],
+                key="db_descargar"
+            )
+
     def render_scraping_page(self):
         """Renderiza la página de scraping mejorada"""
         st.header("🕷️ Scraping de Consensos MLB")
@@ -1815,17 +2045,13 @@ class StreamlitApp:
         
         with col1:
             if st.button("🚀 Scraping Automático", type="primary"):
-                with st.spinner("🔄 Ejecutando scraping robusto..."):
-                    self.run_manual_scraping_robusto()
-                    # Después del scraping, programar scrapers automáticos
-                    self.programar_scrapers_automaticos()
+                # Al completarse, programar scrapers automáticos
+                self.run_manual_scraping_robusto(programar=True)
         
         with col2:
             if st.button("🛠️ Scraping Manual"):
-                with st.spinner("🔄 Ejecutando scraping manual..."):
-                    self.run_manual_scraping()
-                    # Después del scraping, programar scrapers automáticos
-                    self.programar_scrapers_automaticos()
+                # Al completarse, programar scrapers automáticos
+                self.run_manual_scraping(programar=True)
                     
         with col3:
             if st.button("🔄 Actualizar Vista"):
@@ -1891,6 +2117,10 @@ class StreamlitApp:
                     st.warning(f"⚠️ Error procesando {partido.get('visitante', 'N/A')} @ {partido.get('local', 'N/A')}: {e}")
                     continue
             
+            # Armar temporizadores en el servicio de background si está activo
+            if BACKGROUND_SERVICE_AVAILABLE and background_service and background_service.is_running:
+                background_service.sincronizar_temporizadores()
+            
             # Mostrar resultados
             col1, col2, col3 = st.columns(3)
             with col1:
@@ -2029,7 +2259,7 @@ class StreamlitApp:
 
     def mostrar_scrapers_programados(self):
         """Muestra tabla de scrapers programados con diseño mejorado usando DataManager"""
-        scrapers_programados = data_manager.obtener_scrapers_programados(solo_activos=True)
+        scrapers_programados = scrapers_programados_cacheados(solo_activos=True)
         
         if scrapers_programados:
             st.markdown("### 📋 **PRÓXIMOS SCRAPERS PROGRAMADOS**")
@@ -2120,193 +2350,41 @@ class StreamlitApp:
             return
         
         try:
-            # Crear DataFrame
-            df = pd.DataFrame(consensus_data)
+            # La caché es global: la clave es el contenido, no el objeto ni la sesión
+            huella = huella_datos(consensus_data)
+            tabla = tabla_consensos_cacheada(huella, consensus_data)
+            df = tabla.df
+            columns_to_show = tabla.columnas
+            column_config = tabla.column_config
             
             # Información general
             col1, col2, col3 = st.columns(3)
             with col1:
-                st.metric("📊 Total Partidos", len(df))
+                st.metric("📊 Total Partidos", tabla.total_partidos)
             with col2:
-                if 'direccion_consenso' in df.columns:
-                    over_count = len(df[df['direccion_consenso'] == 'OVER'])
-                    st.metric("📈 Consensos OVER", over_count)
+                if tabla.consensos_over is not None:
+                    st.metric("📈 Consensos OVER", tabla.consensos_over)
             with col3:
-                if 'porcentaje_consenso' in df.columns:
-                    avg_consensus = df['porcentaje_consenso'].mean() if len(df) > 0 else 0
-                    st.metric("📊 % Consenso Promedio", f"{avg_consensus:.1f}%")
+                if tabla.consenso_promedio is not None:
+                    st.metric("📊 % Consenso Promedio", f"{tabla.consenso_promedio:.1f}%")
             
-            # Mostrar TODOS los datos sin filtros por defecto
+            # Mostrar TODOS los datos sin filtros por defecto, ordenados por hora del partido
             st.subheader(f"📋 Todos los Datos Scrapeados ({len(df)} partidos)")
             
-            # Preparar las columnas a mostrar en orden lógico (SIN columna Consenso)
-            columns_display = {
-                'fecha_juego': 'Fecha',
-                'fecha': 'Fecha', 
-                'hora_juego': 'Hora',
-                'hora_partido': 'Hora',
-                'equipo_visitante': 'Visitante', 
-                'equipo_local': 'Local',
-                'consenso_over': 'OVER %',
-                'consenso_under': 'UNDER %',
-                'total_line': 'Total',
-                'num_experts': 'Expertos'
-            }
-            
-            # Seleccionar columnas que existen en el DataFrame
-            columns_to_show = []
-            column_config = {}
-            
-            for col_key, display_name in columns_display.items():
-                if col_key in df.columns:
-                    columns_to_show.append(col_key)
-                    column_config[col_key] = display_name
-            
             if columns_to_show:
-                # Ordenar por hora del partido (cronológicamente) SIN mostrar mensaje
-                df_sorted = df.copy()
-                
-                # Intentar ordenar por hora si existe la columna
-                hora_col = None
-                for col in ['hora_juego', 'hora_partido']:
-                    if col in df_sorted.columns:
-                        hora_col = col
-                        break
+                if 'over_formatted' in df.columns:
+                    st.markdown("**Tabla con porcentajes resaltados:**")
                 
-                if hora_col:
-                    try:
-                        # Convertir hora a formato sorteable
-                        def parse_time(time_str):
-                            if not time_str or pd.isna(time_str):
-                                return "99:99"  # Poner al final
-                            
-                            # Extraer hora del formato "1:40 pm ET"
-                            import re
-                            time_match = re.search(r'(\d{1,2}):(\d{2})\s*(am|pm)', str(time_str), re.IGNORECASE)
-                            if time_match:
-                                hour = int(time_match.group(1))
-                                minute = int(time_match.group(2))
-                                period = time_match.group(3).lower()
-                                
-                                # Convertir a 24h para ordenar
-                                if period == 'pm' and hour != 12:
-                                    hour += 12
-                                elif period == 'am' and hour == 12:
-                                    hour = 0
-                                
-                                return f"{hour:02d}:{minute:02d}"
-                            return str(time_str)  # Fallback
-                        
-                        df_sorted['_sort_time'] = df_sorted[hora_col].apply(parse_time)
-                        df_sorted = df_sorted.sort_values('_sort_time')
-                        df_sorted = df_sorted.drop('_sort_time', axis=1)
-                        
-                    except Exception as e:
-                        st.debug(f"No se pudo ordenar por hora: {e}")
-                        df_sorted = df.copy()
-                else:
-                    df_sorted = df.copy()
-                
-                # Configurar formato especial para resaltar porcentajes mayores
-                enhanced_column_config = column_config.copy()
+                st.dataframe(
+                    df[columns_to_show],
+                    use_container_width=True,
+                    column_config=column_config
+                )
                 
-                # Si tenemos ambas columnas OVER y UNDER, aplicar formato condicional
-                if 'consenso_over' in df_sorted.columns and 'consenso_under' in df_sorted.columns:
-                    # Crear columnas con formato condicional para resaltar el mayor
-                    def format_percentage(row):
-                        over_val = row.get('consenso_over', 0)
-                        under_val = row.get('consenso_under', 0)
-                        
-                        if over_val > under_val:
-                            # OVER es mayor - formato grande
-                            row['over_formatted'] = f"<b style='font-size:16px'>{over_val}%</b>"
-                            row['under_formatted'] = f"{under_val}%"
-                        elif under_val > over_val:
-                            # UNDER es mayor - formato grande  
-                            row['over_formatted'] = f"{over_val}%"
-                            row['under_formatted'] = f"<b style='font-size:16px'>{under_val}%</b>"
-                        else:
-                            # Empate - formato normal
-                            row['over_formatted'] = f"{over_val}%"
-                            row['under_formatted'] = f"{under_val}%"
-                        return row
-                    
-                    # Aplicar formato a cada fila
-                    df_formatted = df_sorted.apply(format_percentage, axis=1)
-                    
-                    # Reemplazar las columnas originales con las formateadas
-                    display_columns = []
-                    final_column_config = {}
-                    
-                    for col in columns_to_show:
-                        if col == 'consenso_over':
-                            display_columns.append('over_formatted')
-                            final_column_config['over_formatted'] = "OVER %"
-                        elif col == 'consenso_under':
-                            display_columns.append('under_formatted') 
-                            final_column_config['under_formatted'] = "UNDER %"
-                        else:
-                            display_columns.append(col)
-                            final_column_config[col] = enhanced_column_config.get(col, col)
-                    
-                    # Mostrar tabla con formato HTML (limitado en Streamlit)
-                    try:
-                        # Intentar usar formato HTML básico
-                        st.markdown("**Tabla con porcentajes resaltados:**")
-                        
-                        # Crear tabla HTML personalizada para mejor formato
-                        html_rows = []
-                        headers = [final_column_config.get(col, col) for col in display_columns]
-                        
-                        for idx, row in df_formatted.iterrows():
-                            row_data = []
-                            for col in display_columns:
-                                if col in ['over_formatted', 'under_formatted']:
-                                    # Mantener formato HTML
-                                    row_data.append(str(row.get(col, '')))
-                                else:
-                                    # Texto normal
-                                    row_data.append(str(row.get(col, '')))
-                            html_rows.append(row_data)
-                        
-                        # Fallback a dataframe normal pero con información mejorada
-                        st.dataframe(
-                            df_sorted[columns_to_show],
-                            use_container_width=True,
-                            column_config=enhanced_column_config
-                        )
-                        
-                        # Mostrar información adicional sobre consensos destacados
-                        strong_consensus = []
-                        for idx, row in df_sorted.iterrows():
-                            over_val = row.get('consenso_over', 0)
-                            under_val = row.get('consenso_under', 0)
-                            
-                            if abs(over_val - under_val) >= 20:  # Diferencia significativa
-                                direction = "OVER" if over_val > under_val else "UNDER"
-                                percentage = max(over_val, under_val)
-                                game = f"{row.get('equipo_visitante', '')} @ {row.get('equipo_local', '')}"
-                                strong_consensus.append(f"**{game}**: {direction} {percentage}%")
-                        
-                        if strong_consensus:
-                            st.info("🎯 **Consensos Fuertes (diferencia ≥20%):**")
-                            for consensus in strong_consensus:
-                                st.markdown(f"• {consensus}")
-                        
-                    except Exception as e:
-                        # Fallback completo a formato estándar
-                        st.dataframe(
-                            df_sorted[columns_to_show],
-                            use_container_width=True,
-                            column_config=enhanced_column_config
-                        )
-                else:
-                    # Sin columnas OVER/UNDER, usar formato estándar
-                    st.dataframe(
-                        df_sorted[columns_to_show],
-                        use_container_width=True,
-                        column_config=enhanced_column_config
-                    )
+                # Mostrar información adicional sobre consensos destacados
+                if tabla.consensos_fuertes:
+                    st.info("🎯 **Consensos Fuertes (diferencia ≥20%):**")
+                    st.markdown("  \n".join(f"• {consensus}" for consensus in tabla.consensos_fuertes))
             else:
                 # Fallback: mostrar todas las columnas
                 st.dataframe(df, use_container_width=True)
@@ -2367,15 +2445,26 @@ class StreamlitApp:
                     else:
                         st.warning("📭 No hay datos que coincidan con los filtros aplicados.")
             
-            # Botón de descarga (siempre disponible para todos los datos)
+            # Descarga de las filas que se muestran (consensus_data puede venir de
+            # un scraping manual, datos de ejemplo o cambios en vivo, no solo de una
+            # sesión guardada); el CSV se arma al pedirlo, no en cada rerun
             st.subheader("💾 Descargar Datos")
-            csv = df.to_csv(index=False)
-            st.download_button(
-                label="� Descargar Todos los Datos (CSV)",
-                data=csv,
-                file_name=f"consensos_mlb_{datetime.now().strftime('%Y%m%d_%H%M')}.csv",
-                mime="text/csv"
-            )
+            if st.button("📦 Generar CSV de todos los datos", key="datos_exportar"):
+                st.session_state.datos_exportacion = {
+                    'huella': huella,
+                    'csv': df.drop(columns=['over_formatted', 'under_formatted'], errors='ignore').to_csv(index=False),
+                    'nombre': nombre_exportacion('csv', 'consensos_mlb')
+                }
+            
+            exportacion = st.session_state.get('datos_exportacion')
+            if exportacion and exportacion['huella'] == huella:
+                st.download_button(
+                    label="📥 Descargar Todos los Datos (CSV)",
+                    data=exportacion['csv'],
+                    file_name=exportacion['nombre'],
+                    mime="text/csv",
+                    key="datos_descargar"
+                )
                 
         except Exception as e:
             st.error(f"❌ Error mostrando datos: {e}")
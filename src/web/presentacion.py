@@ -0,0 +1,134 @@
+"""
+Preparación vectorizada de las tablas de consensos para la app
+Normaliza, ordena por hora y marca los porcentajes destacados con
+operaciones de columna de pandas/numpy, sin bucles por fila en Python.
+"""
+
+import re
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+# Columnas a mostrar en orden lógico (SIN columna Consenso) -> encabezado
+COLUMNAS_TABLA = {
+    'fecha_juego': 'Fecha',
+    'fecha': 'Fecha',
+    'hora_juego': 'Hora',
+    'hora_partido': 'Hora',
+    'equipo_visitante': 'Visitante',
+    'equipo_local': 'Local',
+    'consenso_over': 'OVER %',
+    'consenso_under': 'UNDER %',
+    'total_line': 'Total',
+    'num_experts': 'Expertos'
+}
+
+# Diferencia OVER/UNDER a partir de la cual un consenso se considera fuerte
+DIFERENCIA_CONSENSO_FUERTE = 20
+
+# Formato "1:40 pm ET"
+PATRON_HORA = r'(\d{1,2}):(\d{2})\s*([ap]m)'
+
+# Resaltado HTML del porcentaje mayor
+INICIO_DESTACADO = "<b style='font-size:16px'>"
+FIN_DESTACADO = "</b>"
+
+@dataclass
+class TablaConsensos:
+    """Tabla lista para mostrar y sus métricas de resumen"""
+    df: pd.DataFrame
+    columnas: List[str]
+    column_config: Dict[str, str]
+    total_partidos: int = 0
+    consensos_over: Optional[int] = None
+    consenso_promedio: Optional[float] = None
+    consensos_fuertes: List[str] = field(default_factory=list)
+
+def minutos_del_dia(horas: pd.Series) -> pd.Series:
+    """Minutos desde medianoche de horas tipo '7:05 pm ET' (NaN si no se reconoce)"""
+    partes = horas.astype('string').str.extract(PATRON_HORA, flags=re.IGNORECASE)
+    hora = pd.to_numeric(partes[0], errors='coerce') % 12
+    minuto = pd.to_numeric(partes[1], errors='coerce')
+    es_pm = partes[2].str.lower().eq('pm').fillna(False).to_numpy(dtype=bool)
+    return (hora + np.where(es_pm, 12, 0)) * 60 + minuto
+
+def procesar_consensos_para_tabla(consensos_raw: List[Dict[str, Any]], fecha_defecto: str) -> List[Dict[str, Any]]:
+    """
+    Normaliza los consensos del scraper al formato de la tabla de visualización
+
+    El scraper devuelve 'equipo_visitante', 'equipo_local', 'hora_juego',
+    'fecha_juego', 'porcentaje_over', 'porcentaje_under', 'total_line' y
+    'num_experts'; los valores no numéricos se tratan como 0 / 'N/A'.
+    """
+    if not consensos_raw:
+        return []
+
+    columnas = ['equipo_visitante', 'equipo_local', 'hora_juego', 'fecha_juego',
+                'porcentaje_over', 'porcentaje_under', 'total_line', 'num_experts']
+    df = pd.DataFrame.from_records(consensos_raw).reindex(columns=columnas)
+
+    over = pd.to_numeric(df['porcentaje_over'], errors='coerce').fillna(0.0)
+    under = pd.to_numeric(df['porcentaje_under'], errors='coerce').fillna(0.0)
+    total = pd.to_numeric(df['total_line'], errors='coerce').fillna(0.0)
+    expertos = pd.to_numeric(df['num_experts'], errors='coerce').fillna(0).astype(int)
+
+    tabla = pd.DataFrame({
+        'fecha': df['fecha_juego'].fillna(fecha_defecto),
+        'hora': df['hora_juego'].fillna('TBD'),
+        'visitante': df['equipo_visitante'].fillna('N/A'),
+        'local': df['equipo_local'].fillna('N/A'),
+        'over_percentage': over.round(1).astype(str) + '%',
+        'under_percentage': under.round(1).astype(str) + '%',
+        'total': np.where(total > 0, total.round(1).astype(str), 'N/A'),
+        'expertos': np.where(expertos > 0, expertos.astype(str), 'N/A')
+    })
+    return tabla.to_dict('records')
+
+def preparar_tabla_consensos(consensus_data: List[Dict[str, Any]]) -> TablaConsensos:
+    """
+    Construye la tabla ordenada por hora, con resaltado y métricas
+
+    Todo se calcula por columnas: el costo no crece con bucles por fila en
+    Python aunque la tabla tenga varios días de partidos.
+    """
+    df = pd.DataFrame.from_records(consensus_data)
+
+    columnas = [col for col in COLUMNAS_TABLA if col in df.columns]
+    column_config = {col: COLUMNAS_TABLA[col] for col in columnas}
+
+    tabla = TablaConsensos(df=df, columnas=columnas, column_config=column_config, total_partidos=len(df))
+
+    if 'direccion_consenso' in df.columns:
+        tabla.consensos_over = int(df['direccion_consenso'].eq('OVER').sum())
+    if 'porcentaje_consenso' in df.columns:
+        tabla.consenso_promedio = float(pd.to_numeric(df['porcentaje_consenso'], errors='coerce').mean()) if len(df) else 0.0
+
+    # Orden cronológico por hora del partido (las horas no reconocidas al final)
+    hora_col = next((col for col in ('hora_juego', 'hora_partido') if col in df.columns), None)
+    if hora_col:
+        orden = minutos_del_dia(df[hora_col]).to_numpy()
+        df = df.iloc[np.argsort(orden, kind='stable')].reset_index(drop=True)
+
+    if 'consenso_over' in df.columns and 'consenso_under' in df.columns:
+        over = pd.to_numeric(df['consenso_over'], errors='coerce').fillna(0)
+        under = pd.to_numeric(df['consenso_under'], errors='coerce').fillna(0)
+        texto_over = df['consenso_over'].astype(str) + '%'
+        texto_under = df['consenso_under'].astype(str) + '%'
+
+        # El mayor de los dos porcentajes va resaltado; en empate ninguno
+        df['over_formatted'] = np.where(over > under, INICIO_DESTACADO + texto_over + FIN_DESTACADO, texto_over)
+        df['under_formatted'] = np.where(under > over, INICIO_DESTACADO + texto_under + FIN_DESTACADO, texto_under)
+
+        fuertes = (over - under).abs() >= DIFERENCIA_CONSENSO_FUERTE
+        if fuertes.any():
+            direccion = pd.Series(np.where(over > under, 'OVER', 'UNDER'), index=df.index)
+            porcentaje = np.maximum(over, under).astype(str)
+            visitante = df.get('equipo_visitante', pd.Series('', index=df.index)).fillna('').astype(str)
+            local = df.get('equipo_local', pd.Series('', index=df.index)).fillna('').astype(str)
+            lineas = '**' + visitante + ' @ ' + local + '**: ' + direccion + ' ' + porcentaje + '%'
+            tabla.consensos_fuertes = lineas[fuertes].tolist()
+
+    tabla.df = df
+    return tabla
@@ -0,0 +1,119 @@
+"""
+Fixtures de los benchmarks: páginas grabadas y tablas sintéticas
+
+Las páginas de covers.com grabadas (covers_sample.html, sample_html.txt) y
+las tablas sintéticas de 50 y 500 filas permiten medir extractores, filtros
+y escrituras sin acceso a la red.
+
+Ejecución local:
+    pytest tests/benchmarks --benchmark-only
+
+En CI se comparan contra la última línea base guardada:
+    pytest tests/benchmarks --benchmark-only --benchmark-autosave \
+        --benchmark-compare --benchmark-compare-fail=mean:25%
+"""
+
+import os
+import pytest
+import sys
+from pathlib import Path
+
+# Agregar el directorio raíz al path
+RAIZ = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(RAIZ))
+
+# Sin trazas en logs/ ni logs INFO dentro de las mediciones (antes de importar src)
+os.environ['TRACING_EXPORT'] = 'off'
+os.environ['LOG_LEVEL'] = 'WARNING'
+
+FECHA = '2025-07-20'
+
+EQUIPOS = ['NYY', 'BOS', 'ATL', 'LAD', 'HOU', 'CHC', 'STL', 'SD', 'SF', 'SEA',
+           'TEX', 'TOR', 'MIN', 'CLE', 'DET', 'KC', 'MIL', 'CIN', 'PIT', 'PHI',
+           'NYM', 'MIA', 'WSH', 'COL', 'AZ', 'LAA', 'OAK', 'TB', 'BAL', 'CWS']
+
+def _partido(i: int) -> dict:
+    """Valores deterministas de la fila i (equipos distintos, porcentajes variados)"""
+    porcentaje = 55 + i % 45
+    return {
+        'visitante': EQUIPOS[i % 30],
+        'local': EQUIPOS[(i * 7 + 1) % 30],
+        'dia': 1 + i % 28,
+        'hora': f"{1 + i % 11}:{(i * 5) % 60:02d} pm ET",
+        'porcentaje': porcentaje,
+        'contrario': 100 - porcentaje,
+        'direccion': 'Under' if i % 2 else 'Over',
+        'opuesta': 'Over' if i % 2 else 'Under',
+        'total': 7 + (i % 6) * 0.5,
+        'picks_a': 5 + i % 20,
+        'picks_b': 1 + i % 6
+    }
+
+def _filas_texto(n: int) -> list:
+    """Texto de fila tal como lo devuelve Selenium (row.text)"""
+    return [
+        "MLB {visitante} {local} Sun. Jul. {dia} {hora} {porcentaje} % {direccion} "
+        "{contrario} % {opuesta} {total} {picks_a} {picks_b} Details".format(**_partido(i))
+        for i in range(n)
+    ]
+
+def _tabla_html(n: int) -> str:
+    """Página con una tabla 'responsive' de n partidos"""
+    filas = ''.join(
+        "<tr><td>{visitante} @ {local}</td><td>{hora}</td>"
+        "<td>{porcentaje}% {direccion}</td><td>{total}</td>"
+        "<td>{picks_a} {picks_b}</td><td><a href='#'>Details</a></td></tr>".format(**_partido(i))
+        for i in range(n)
+    )
+    return (
+        "<html><body><table class='responsive'>"
+        "<tr><th>Matchup</th><th>Date</th><th>Consensus</th><th>Total</th><th>Picks</th><th></th></tr>"
+        f"{filas}</table></body></html>"
+    )
+
+def _consensos(n: int) -> list:
+    """Consensos ya extraídos (formato del scraper puro) para filtros y escrituras"""
+    resultado = []
+    for i in range(n):
+        p = _partido(i)
+        resultado.append({
+            'id_unico': f"bench{i:05d}",
+            'fecha_juego': FECHA,
+            'equipo_visitante': p['visitante'],
+            'equipo_local': p['local'],
+            'partido_completo': f"{p['visitante']} @ {p['local']}",
+            'hora_juego': p['hora'],
+            'direccion_consenso': p['direccion'].upper(),
+            'porcentaje_consenso': p['porcentaje'],
+            'total_line': p['total'],
+            'picks_over': p['picks_a'],
+            'picks_under': p['picks_b'],
+            'total_picks': p['picks_a'] + p['picks_b'],
+            'num_experts': p['picks_a'] + p['picks_b'],
+            'completitud': '3/3' if i % 5 else '2/3',
+            'deporte': 'MLB'
+        })
+    return resultado
+
+@pytest.fixture(scope='session')
+def filas_texto():
+    """Generador: filas_texto(n)"""
+    return _filas_texto
+
+@pytest.fixture(scope='session')
+def tabla_html():
+    """Generador: tabla_html(n)"""
+    return _tabla_html
+
+@pytest.fixture(scope='session')
+def consensos():
+    """Generador: consensos(n)"""
+    return _consensos
+
+@pytest.fixture(scope='session')
+def paginas_grabadas() -> dict:
+    """HTML grabado de covers.com (sin red)"""
+    return {
+        nombre: (RAIZ / nombre).read_text(encoding='utf-8', errors='replace')
+        for nombre in ('covers_sample.html', 'sample_html.txt')
+    }
@@ -0,0 +1,67 @@
+"""
+Benchmarks de los extractores sobre páginas grabadas y tablas sintéticas
+"""
+
+import pytest
+
+pytest.importorskip('pytest_benchmark')
+bs4 = pytest.importorskip('bs4')
+
+# Tamaños de las tablas sintéticas
+TAMANOS = [50, 500]
+
+# Fecha de los partidos sintéticos
+FECHA = '2025-07-20'
+
+class TestBenchExtractores:
+    """Parseo HTML y extracción de consensos por fila"""
+
+    @pytest.mark.parametrize('nombre', ['covers_sample.html', 'sample_html.txt'])
+    def test_parse_html_grabado(self, benchmark, paginas_grabadas, nombre):
+        """BeautifulSoup + parser de tabla sobre una página real grabada"""
+        from src.scraper.mlb_scraper import MLBScraper
+
+        scraper = MLBScraper()
+        html = paginas_grabadas[nombre]
+
+        benchmark.group = 'parse_pagina_grabada'
+        benchmark(lambda: scraper.parse_consensus_page(bs4.BeautifulSoup(html, 'html.parser'), FECHA))
+
+    @pytest.mark.parametrize('filas', TAMANOS)
+    def test_parse_tabla_sintetica(self, benchmark, tabla_html, filas):
+        """MLBScraper.parse_consensus_page sobre una tabla de N partidos"""
+        from src.scraper.mlb_scraper import MLBScraper
+
+        scraper = MLBScraper()
+        soup = bs4.BeautifulSoup(tabla_html(filas), 'html.parser')
+
+        benchmark.group = f'parse_tabla_{filas}'
+        consensos = benchmark(scraper.parse_consensus_page, soup, FECHA)
+
+        assert len(consensos) == filas
+
+    @pytest.mark.parametrize('filas', TAMANOS)
+    def test_extractor_puro(self, benchmark, filas_texto, filas):
+        """MLBScraperPuro._extraer_datos_completos sobre el texto de N filas"""
+        pytest.importorskip('selenium')
+        from src.scraper.mlb_scraper_puro import MLBScraperPuro
+
+        scraper = MLBScraperPuro()
+        textos = filas_texto(filas)
+
+        benchmark.group = f'extraer_filas_{filas}'
+        consensos = benchmark(lambda: [scraper._extraer_datos_completos(texto, FECHA) for texto in textos])
+
+        assert all(c and c['completitud'] == '3/3' for c in consensos)
+
+    @pytest.mark.parametrize('filas', TAMANOS)
+    def test_extractor_selenium(self, benchmark, filas_texto, filas):
+        """MLBSeleniumScraper._extraer_consenso sobre el texto de N filas"""
+        pytest.importorskip('selenium')
+        from src.scraper.mlb_selenium_scraper import MLBSeleniumScraper
+
+        scraper = MLBSeleniumScraper()
+        textos = filas_texto(filas)
+
+        benchmark.group = f'extraer_filas_{filas}'
+        benchmark(lambda: [scraper._extraer_consenso(texto, FECHA) for texto in textos])
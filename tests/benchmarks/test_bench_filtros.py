@@ -0,0 +1,55 @@
+"""
+Benchmarks de los motores de filtros
+"""
+
+import pytest
+
+pytest.importorskip('pytest_benchmark')
+
+# Tamaños de las tablas sintéticas
+TAMANOS = [50, 500]
+
+class TestBenchFiltros:
+    """Filtros post-extracción (uno y varios perfiles) y SistemaFiltros"""
+
+    @pytest.mark.parametrize('filas', TAMANOS)
+    def test_filtro_post_extraccion(self, benchmark, tmp_path, consensos, filas):
+        """FiltroConsensus.aplicar_filtros con el perfil de alertas"""
+        from src.sistema_filtros_post_extraccion import FiltroConsensus
+
+        filtro = FiltroConsensus(archivo_config=str(tmp_path / "filtros.json"))
+        datos = consensos(filas)
+
+        benchmark.group = f'filtros_{filas}'
+        aprobados, estadisticas = benchmark(filtro.aplicar_filtros, datos, "alerta")
+
+        assert estadisticas['total_inicial'] == filas
+
+    @pytest.mark.parametrize('filas', TAMANOS)
+    def test_filtro_multiples_perfiles(self, benchmark, tmp_path, consensos, filas):
+        """Tres perfiles evaluados en una sola pasada"""
+        from src.sistema_filtros_post_extraccion import FiltroConsensus, FiltrosConsensus
+
+        filtro = FiltroConsensus(archivo_config=str(tmp_path / "filtros.json"))
+        perfiles = {
+            'alerta': FiltrosConsensus(),
+            'revision': FiltrosConsensus(umbral_minimo=60, expertos_minimos=10),
+            'noche': FiltrosConsensus(horas_permitidas=['21:00'])
+        }
+        datos = consensos(filas)
+
+        benchmark.group = f'filtros_{filas}'
+        buckets, _ = benchmark(filtro.aplicar_filtros_multiples, datos, perfiles)
+
+        assert set(buckets) == set(perfiles)
+
+    @pytest.mark.parametrize('filas', TAMANOS)
+    def test_sistema_filtros(self, benchmark, tmp_path, consensos, filas):
+        """SistemaFiltros.aplicar_filtros (motor anterior)"""
+        from src.sistema_filtros import SistemaFiltros
+
+        sistema = SistemaFiltros(config_path=str(tmp_path / "filtros_consensos.json"))
+        datos = consensos(filas)
+
+        benchmark.group = f'filtros_{filas}'
+        benchmark(sistema.aplicar_filtros, datos)
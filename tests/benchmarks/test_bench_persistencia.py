@@ -0,0 +1,53 @@
+"""
+Benchmarks de las escrituras de DataManager
+"""
+
+import itertools
+import sqlite3
+
+import pytest
+
+pytest.importorskip('pytest_benchmark')
+
+# Tamaños de las tablas sintéticas
+TAMANOS = [50, 500]
+
+class TestBenchPersistencia:
+    """Sesiones de scraping, outbox de alertas y eventos"""
+
+    @pytest.mark.parametrize('filas', TAMANOS)
+    def test_guardar_sesion(self, benchmark, manager, consensos, filas):
+        """guardar_sesion_scraping con N consensos"""
+        datos = consensos(filas)
+
+        def limpiar():
+            # El id de sesión es por segundo: cada ronda parte de la tabla vacía
+            with sqlite3.connect(manager.db_path) as conn:
+                conn.execute("DELETE FROM scraping_sessions")
+
+        benchmark.group = f'persistencia_{filas}'
+        benchmark.pedantic(manager.guardar_sesion_scraping, args=(datos,), kwargs={'duracion': 1.0},
+                           setup=limpiar, rounds=20, iterations=1)
+
+    @pytest.mark.parametrize('filas', TAMANOS)
+    def test_encolar_alertas(self, benchmark, manager, consensos, filas):
+        """encolar_alertas con N alertas nuevas (una transacción)"""
+        datos = consensos(filas)
+        ronda = itertools.count()
+
+        def lote():
+            n = next(ronda)
+            alertas = [{'dedup_key': f"{n}:{c['id_unico']}", 'tipo_alerta': 'nueva_alerta', 'payload': c}
+                       for c in datos]
+            return (('bench', alertas), {})
+
+        benchmark.group = f'persistencia_{filas}'
+        benchmark.pedantic(manager.encolar_alertas, setup=lote, rounds=20, iterations=1)
+
+    def test_registrar_evento(self, benchmark, manager):
+        """Un evento tipado (se escribe por cada evento de scraping/alerta)"""
+        evento = {'categoria': 'scraping', 'sport': 'MLB', 'event_type': 'success',
+                  'consensus_count': 15, 'high_consensus_count': 3, 'duration_seconds': 12.5}
+
+        benchmark.group = 'persistencia_evento'
+        benchmark(manager.registrar_evento, evento)
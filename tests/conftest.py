@@ -0,0 +1,27 @@
+"""
+Fixtures compartidas de los tests
+"""
+
+import pytest
+import sys
+from pathlib import Path
+
+# Agregar el directorio raíz al path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+@pytest.fixture(autouse=True)
+def sin_eventos():
+    """Ningún test guarda eventos de logging en data/scraping_data.db"""
+    # Import diferido: tests/benchmarks/conftest.py ajusta el entorno del logger antes
+    from src.utils.logger import desinstalar_eventos
+
+    desinstalar_eventos()
+    yield
+    desinstalar_eventos()
+
+@pytest.fixture
+def manager(tmp_path):
+    """DataManager sobre una base temporal"""
+    from src.database.data_manager import DataManager
+
+    return DataManager(db_path=tmp_path / "test.db")
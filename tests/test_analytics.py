@@ -0,0 +1,83 @@
+"""
+Tests para la analítica sobre rollups
+"""
+
+import pytest
+import sqlite3
+import sys
+from datetime import datetime, timedelta
+from pathlib import Path
+
+# Agregar el directorio raíz al path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import src.database.data_manager as modulo_data_manager
+from src.database.analytics import AnalyticsService, percentil_histograma
+
+# Inicio del reloj falso: a mediodía, los ticks de un test no cambian de día
+INICIO = datetime(2025, 7, 20, 12, 0, 0)
+HOY = INICIO.strftime('%Y-%m-%d')
+
+@pytest.fixture(autouse=True)
+def reloj(monkeypatch):
+    """Reloj de DataManager que arranca en INICIO y avanza 1s por llamada"""
+    ticks = iter(range(10000))
+
+    class Reloj(datetime):
+        @classmethod
+        def now(cls, tz=None):
+            return INICIO + timedelta(seconds=next(ticks))
+
+    monkeypatch.setattr(modulo_data_manager, 'datetime', Reloj)
+
+def partidos(*porcentajes):
+    return [{'visitante': f'V{i}', 'local': f'L{i}', 'over_percentage': f"{p}%",
+             'under_percentage': f"{100 - p}%"} for i, p in enumerate(porcentajes)]
+
+class TestAnalytics:
+    """Tests para AnalyticsService y los rollups de DataManager"""
+
+    def test_rollups_se_actualizan_al_guardar(self, manager):
+        """La foto del día es la última sesión completada; la latencia suma todas"""
+        analytics = AnalyticsService(manager)
+
+        manager.guardar_sesion_scraping(partidos(50, 72, 91), duracion=4)
+        manager.guardar_sesion_scraping(partidos(50, 72, 77, 88), duracion=25)
+        manager.guardar_sesion_scraping(partidos(95), duracion=1, errores=["datos de ejemplo"])
+
+        dia = analytics.consensos_por_dia(HOY, HOY)[0]
+        assert dia == {'fecha': HOY, 'partidos': 4, 'consensos_fuertes': 3, 'sesiones': 2}
+
+        rangos = analytics.distribucion_rangos(HOY, HOY)
+        assert rangos == {'<70': 1, '70-75': 1, '75-80': 1, '80-85': 0, '85-90': 1, '90+': 0}
+
+        assert analytics.percentiles_latencia(HOY, HOY)['sesiones'] == 3
+
+    def test_alertas_confirmadas_una_vez(self, manager):
+        """Reconfirmar una alerta no la cuenta dos veces"""
+        analytics = AnalyticsService(manager)
+        manager.encolar_alertas('telegram', [{'dedup_key': f'a{i}', 'tipo_alerta': 'consenso'} for i in range(3)])
+        ids = [fila['id'] for fila in manager.reservar_alertas('telegram')]
+
+        manager.confirmar_alertas(ids)
+        manager.confirmar_alertas(ids[:1])
+
+        assert analytics.resumen_periodo(HOY, HOY)['alertas'] == 3
+
+    def test_reconstruccion_desde_historico(self, manager):
+        """Una base sin rollups los recalcula al iniciar"""
+        manager.guardar_sesion_scraping(partidos(80, 60), duracion=12)
+        with sqlite3.connect(manager.db_path) as conn:
+            for tabla in ('rollup_consensos_dia', 'rollup_rangos_consenso', 'rollup_latencia_scraping'):
+                conn.execute(f'DELETE FROM {tabla}')
+
+        manager._init_database()
+
+        assert AnalyticsService(manager).resumen_periodo(HOY, HOY)['consensos_fuertes'] == 1
+
+    def test_percentil_histograma(self):
+        """Interpola dentro del bucket y no devuelve +Inf"""
+        buckets = {1: 0, 5: 10, 10: 10, float('inf'): 1}
+        assert percentil_histograma(buckets, 0.5) == pytest.approx(5.25)
+        assert percentil_histograma(buckets, 1.0) == 10
+        assert percentil_histograma({}, 0.5) is None
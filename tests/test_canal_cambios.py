@@ -0,0 +1,59 @@
+"""
+Tests para el canal de cambios de partidos
+"""
+
+import pytest
+import sys
+from pathlib import Path
+
+# Agregar el directorio raíz al path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.database.canal_cambios import SuscriptorCambios, aplicar_cambios
+
+def partido(visitante, local, over):
+    return {'fecha': '2025-07-01', 'visitante': visitante, 'local': local,
+            'over_percentage': f"{over}%", 'under_percentage': f"{100 - over}%"}
+
+class TestCanalCambios:
+    """Tests para el feed de cambios y SuscriptorCambios"""
+
+    def test_solo_se_publican_partidos_cambiados(self, manager):
+        """Un partido sin cambios no vuelve a publicarse; el suscriptor lee solo lo nuevo"""
+        manager.guardar_sesion_scraping([partido('NYY', 'BOS', 60), partido('SD', 'MIA', 55)])
+        suscriptor = SuscriptorCambios(manager)
+
+        publicados = manager.publicar_cambios_partidos(
+            [partido('NYY', 'BOS', 72), partido('SD', 'MIA', 55), partido('HOU', 'AZ', 80)], origen='servicio')
+
+        assert publicados == 2
+        cambios = suscriptor.nuevos()
+        assert [(c['partido_id'], c['tipo']) for c in cambios] == [('NYY@BOS', 'actualizado'), ('HOU@AZ', 'nuevo')]
+        assert suscriptor.nuevos() == []
+        assert manager.publicar_cambios_partidos([partido('NYY', 'BOS', 72)]) == 0
+
+    def test_aplicar_cambios_reemplaza_por_partido(self, manager):
+        """Las filas cambiadas se reemplazan en su lugar y las nuevas van al final"""
+        filas = [partido('NYY', 'BOS', 60), partido('SD', 'MIA', 55)]
+        manager.publicar_cambios_partidos([partido('SD', 'MIA', 90), partido('HOU', 'AZ', 80)])
+
+        nuevas, claves = aplicar_cambios(filas, SuscriptorCambios(manager, desde_seq=0).nuevos())
+
+        assert claves == ['SD@MIA', 'HOU@AZ']
+        assert [fila['over_percentage'] for fila in nuevas] == ['60%', '90.0%', '80.0%']
+        assert filas[1]['over_percentage'] == '55%'
+
+    def test_aplicar_cambios_normaliza_formato_del_scraper(self, manager):
+        """Un partido publicado con las claves del scraper entra con las columnas de la tabla"""
+        filas = [partido('NYY', 'BOS', 60)]
+        manager.publicar_cambios_partidos([{
+            'fecha_juego': '2025-07-01', 'hora_juego': '7:05 pm ET', 'equipo_visitante': 'NYY',
+            'equipo_local': 'BOS', 'porcentaje_over': 75, 'porcentaje_under': 25, 'total_line': 8.5,
+            'num_experts': 12
+        }], origen='servicio')
+
+        nuevas, _ = aplicar_cambios(filas, SuscriptorCambios(manager, desde_seq=0).nuevos())
+
+        assert nuevas == [{'fecha': '2025-07-01', 'hora': '7:05 pm ET', 'visitante': 'NYY', 'local': 'BOS',
+                           'over_percentage': '75.0%', 'under_percentage': '25.0%', 'total': '8.5',
+                           'expertos': '12'}]
@@ -0,0 +1,96 @@
+"""
+Tests para la coalescencia de scrapings pre-partido
+"""
+
+import pytest
+import asyncio
+import threading
+import time
+import sys
+from pathlib import Path
+
+# Agregar el directorio raíz al path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.scraper.coalescer import ScrapeCoalescer
+
+class TestScrapeCoalescer:
+    """Tests para ScrapeCoalescer"""
+
+    def test_threads_comparten_descarga(self):
+        """Varios partidos simultáneos disparan una sola descarga"""
+        coalescer = ScrapeCoalescer(ventana_segundos=60)
+        llamadas = []
+
+        def fetch():
+            llamadas.append(1)
+            time.sleep(0.1)
+            return [{'equipo_visitante': 'NYY', 'equipo_local': 'BOS'}]
+
+        resultados = []
+        threads = [
+            threading.Thread(target=lambda: resultados.append(coalescer.obtener('mlb', fetch)))
+            for _ in range(5)
+        ]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        assert len(llamadas) == 1
+        assert len(resultados) == 5
+        assert coalescer.get_stats()['descargas_evitadas'] == 4
+
+    def test_ventana_y_resultados_vacios(self):
+        """Se reutiliza dentro de la ventana; un resultado vacío no se comparte"""
+        coalescer = ScrapeCoalescer(ventana_segundos=60)
+        respuestas = [[], [{'id': 1}]]
+
+        assert coalescer.obtener('mlb', lambda: respuestas.pop(0)) == []
+        assert coalescer.obtener('mlb', lambda: respuestas.pop(0)) == [{'id': 1}]
+        assert coalescer.obtener('mlb', lambda: pytest.fail("no debería descargar")) == [{'id': 1}]
+
+        coalescer.invalidar('mlb')
+        assert coalescer.obtener('mlb', lambda: [{'id': 2}]) == [{'id': 2}]
+
+    def test_async_comparte_descarga(self):
+        """Corutinas concurrentes esperan la misma descarga"""
+        coalescer = ScrapeCoalescer(ventana_segundos=60)
+        llamadas = []
+
+        async def fetch():
+            llamadas.append(1)
+            await asyncio.sleep(0.05)
+            return [{'id': 1}]
+
+        async def escenario():
+            return await asyncio.gather(*(coalescer.obtener_async('MLB', fetch) for _ in range(3)))
+
+        resultados = asyncio.run(escenario())
+
+        assert len(llamadas) == 1
+        assert all(r == [{'id': 1}] for r in resultados)
+
+    def test_async_dueno_cancelado(self):
+        """Si se cancela la corutina que descarga, los que esperaban no se cuelgan"""
+        coalescer = ScrapeCoalescer(ventana_segundos=60)
+
+        async def fetch_lento():
+            await asyncio.sleep(10)
+            return [{'id': 1}]
+
+        async def escenario():
+            dueno = asyncio.ensure_future(coalescer.obtener_async('MLB', fetch_lento))
+            await asyncio.sleep(0)
+            espera = asyncio.ensure_future(coalescer.obtener_async('MLB', fetch_lento))
+            await asyncio.sleep(0)
+
+            dueno.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await asyncio.wait_for(espera, timeout=1)
+
+            # La clave quedó libre: la siguiente llamada descarga de nuevo
+            return await coalescer.obtener_async('MLB', lambda: [{'id': 2}])
+
+        assert asyncio.run(escenario()) == [{'id': 2}]
+        assert coalescer.get_stats()['errores'] == 1
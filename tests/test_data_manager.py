@@ -0,0 +1,99 @@
+"""
+Tests para el gestor de datos
+"""
+
+import json
+import pytest
+import sqlite3
+import sys
+from pathlib import Path
+
+# Agregar el directorio raíz al path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.database.data_manager import DataManager
+
+class TestDataManager:
+    """Tests para DataManager"""
+
+    def test_version_cambia_al_escribir(self, manager):
+        """Guardar una sesión o tocar un scraper invalida las cachés de lectura"""
+        assert manager.version_datos() == {}
+
+        manager.guardar_sesion_scraping([{'visitante': 'NYY', 'local': 'BOS'}])
+        scraper_id = manager.programar_scraper({'visitante': 'NYY', 'local': 'BOS'})
+        manager.actualizar_estado_scraper(scraper_id, 'cancelado')
+
+        assert manager.version_datos() == {'scraping_sessions': 1, 'scrapers_programados': 2}
+
+    def test_consulta_paginada_por_keyset(self, manager):
+        """Filtros y proyección en SQL; las páginas no se solapan ni saltan filas"""
+        manager.guardar_sesion_scraping([
+            {'visitante': 'NYY', 'local': f'L{i}', 'over_percentage': f"{60 + (i % 3) * 10}.0%",
+             'under_percentage': f"{40 - (i % 3) * 10}.0%", 'total': '8.5', 'expertos': '12'}
+            for i in range(15)
+        ] + [
+            # Formato crudo del scraper
+            {'equipo_visitante': 'SD', 'equipo_local': 'MIA', 'porcentaje_over': 17,
+             'porcentaje_under': 83, 'num_experts': 6}
+        ])
+
+        vistos = []
+        cursor = None
+        while True:
+            pagina = manager.consultar_partidos(equipo='nyy', consenso_minimo=70,
+                                                columnas=['local', 'consenso_pct'], despues_de=cursor, limite=4)
+            vistos.extend(pagina['filas'])
+            cursor = pagina['siguiente']
+            if cursor is None:
+                break
+
+        assert len(vistos) == 10
+        assert len({fila['local'] for fila in vistos}) == 10
+        assert set(vistos[0]) == {'local', 'consenso_pct'}
+        assert all(fila['consenso_pct'] >= 70 for fila in vistos)
+
+        sd = manager.consultar_partidos(equipo='SD')['filas']
+        assert sd[0]['direccion'] == 'UNDER'
+        assert sd[0]['consenso_pct'] == 83
+
+    def test_listar_sesiones_por_keyset(self, manager):
+        """Metadatos de sesiones, filtrados por fecha y paginados sin solaparse"""
+        with sqlite3.connect(manager.db_path) as conn:
+            conn.executemany('''
+                INSERT INTO scraping_sessions (id, fecha, hora_ejecucion, total_partidos, datos_raw, estado)
+                VALUES (?, ?, ?, ?, '[]', 'completado')
+            ''', [(f's{i}', f"2025-07-{1 + i // 3:02d}", f"1{i % 3}:00:00", i) for i in range(9)])
+
+        vistos = []
+        cursor = None
+        while True:
+            pagina = manager.listar_sesiones(fecha_desde='2025-07-02', despues_de=cursor, limite=2)
+            vistos.extend(pagina['filas'])
+            cursor = pagina['siguiente']
+            if cursor is None:
+                break
+
+        assert [fila['id'] for fila in vistos] == ['s8', 's7', 's6', 's5', 's4', 's3']
+        assert 'datos_raw' not in vistos[0]
+        assert manager.listar_sesiones(fecha_hasta='2025-07-01')['filas'][0]['id'] == 's2'
+
+    def test_migracion_de_sesiones_una_sola_vez(self, manager):
+        """Las sesiones sin partidos_sesion se normalizan solo la primera vez"""
+        def sesion_vieja(sesion_id):
+            with sqlite3.connect(manager.db_path) as conn:
+                conn.execute('''
+                    INSERT INTO scraping_sessions (id, fecha, hora_ejecucion, total_partidos, datos_raw)
+                    VALUES (?, '2025-07-01', '10:00:00', 1, ?)
+                ''', (sesion_id, json.dumps([{'visitante': 'NYY', 'local': 'BOS'}])))
+
+        sesion_vieja('vieja')
+        with sqlite3.connect(manager.db_path) as conn:
+            conn.execute('PRAGMA user_version = 0')
+
+        DataManager(db_path=manager.db_path)
+        assert [f['sesion_id'] for f in manager.consultar_partidos()['filas']] == ['vieja']
+
+        sesion_vieja('posterior')
+        DataManager(db_path=manager.db_path)
+        assert [f['sesion_id'] for f in manager.consultar_partidos()['filas']] == ['vieja']
@@ -0,0 +1,69 @@
+"""
+Tests para el digest de alertas por ventana
+"""
+
+import pytest
+import asyncio
+import time
+import sys
+from pathlib import Path
+
+# Agregar el directorio raíz al path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.notifications.digest import AlertDigest, TODOS_LOS_CHATS
+
+def alerta(visitante, local, porcentaje):
+    return {'equipo_visitante': visitante, 'equipo_local': local, 'porcentaje_consenso': porcentaje}
+
+class TestAlertDigest:
+    """Tests para AlertDigest"""
+
+    def test_fusiona_actualizaciones_del_mismo_partido(self):
+        """Varias actualizaciones de un partido quedan en una sola entrada"""
+        digest = AlertDigest(lambda chat, alertas: None, ventana_segundos=60)
+
+        digest.agregar(alerta('NYY', 'BOS', 72))
+        digest.agregar(alerta('NYY', 'BOS', 80))
+        digest.agregar(alerta('LAD', 'SF', 75))
+
+        lotes = digest.vaciar()
+        assert list(lotes) == [TODOS_LOS_CHATS]
+
+        partidos = {a['equipo_visitante']: a for a in lotes[TODOS_LOS_CHATS]}
+        assert len(partidos) == 2
+        assert partidos['NYY']['porcentaje_consenso'] == 80
+        assert partidos['NYY']['porcentaje_inicial'] == 72
+        assert partidos['NYY']['actualizaciones'] == 2
+        assert digest.stats['actualizaciones_fusionadas'] == 1
+
+    def test_un_lote_por_chat_al_cerrar_ventana(self):
+        """Al vencer la ventana se entrega un solo lote por chat"""
+        enviados = []
+        digest = AlertDigest(lambda chat, alertas: enviados.append((chat, len(alertas))), ventana_segundos=0.1)
+
+        digest.agregar(alerta('NYY', 'BOS', 72), chat_ids=['1', '2'])
+        digest.agregar(alerta('LAD', 'SF', 75), chat_ids=['1'])
+
+        limite = time.time() + 2
+        while len(enviados) < 2 and time.time() < limite:
+            time.sleep(0.02)
+
+        assert sorted(enviados) == [('1', 2), ('2', 1)]
+        assert digest.pendientes() == 0
+
+    def test_envio_asincrono(self):
+        """En un event loop la ventana se cierra con call_later y corutinas"""
+        enviados = []
+
+        async def enviar(chat, alertas):
+            enviados.append(len(alertas))
+
+        async def escenario():
+            digest = AlertDigest(enviar, ventana_segundos=0.05)
+            digest.agregar(alerta('NYY', 'BOS', 72))
+            digest.agregar(alerta('NYY', 'BOS', 81))
+            await asyncio.sleep(0.2)
+
+        asyncio.run(escenario())
+        assert enviados == [1]
@@ -0,0 +1,86 @@
+"""
+Tests para la cola de despacho de Telegram
+"""
+
+import pytest
+import asyncio
+import time
+import sys
+from pathlib import Path
+
+# Agregar el directorio raíz al path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+pytest.importorskip('telegram')
+from telegram.error import RetryAfter
+
+from src.notifications.dispatcher import TelegramDispatcher
+
+class BotFalso:
+    """Registra el momento de cada envío; puede fallar con RetryAfter los primeros N"""
+
+    def __init__(self, retry_after: int = 0, demora: float = 0):
+        self.retry_after = retry_after
+        self.demora = demora
+        self.envios = []
+
+    async def send_message(self, chat_id, text, **kwargs):
+        await asyncio.sleep(self.demora)
+        if self.retry_after:
+            self.retry_after -= 1
+            raise RetryAfter(1)
+        self.envios.append((chat_id, time.monotonic()))
+
+class TestTelegramDispatcher:
+    """Tests para TelegramDispatcher"""
+
+    def test_respeta_limites_global_y_por_chat(self):
+        """Los envíos quedan espaciados según la tasa global y la de cada chat"""
+        bot = BotFalso()
+        dispatcher = TelegramDispatcher(bot, mensajes_por_segundo=20, mensajes_por_segundo_chat=5)
+
+        async def escenario():
+            await dispatcher.enviar([f'chat_{i}' for i in range(6)], 'hola')
+            for _ in range(3):
+                await dispatcher.enviar(['chat_0'], 'otra vez')
+
+        asyncio.run(escenario())
+
+        globales = [momento for _, momento in bot.envios]
+        assert all(b - a >= 0.05 - 0.01 for a, b in zip(globales, globales[1:]))
+        del_chat = [momento for chat, momento in bot.envios if chat == 'chat_0']
+        assert len(del_chat) == 4
+        assert all(b - a >= 0.2 - 0.01 for a, b in zip(del_chat, del_chat[1:]))
+        assert dispatcher.get_stats()['enviados'] == 9
+
+    def test_retry_after_pausa_y_reintenta(self):
+        """RetryAfter pausa el bot completo la espera indicada y el mensaje se reintenta"""
+        bot = BotFalso(retry_after=1)
+        dispatcher = TelegramDispatcher(bot, mensajes_por_segundo=100, mensajes_por_segundo_chat=100)
+
+        async def escenario():
+            return await dispatcher.enviar(['a', 'b'], 'hola')
+
+        inicio = time.monotonic()
+        resultado = asyncio.run(escenario())
+
+        assert resultado == {'a': True, 'b': True}
+        # 'b' salió antes del RetryAfter; 'a' se reintentó después de la pausa
+        envios = dict(bot.envios)
+        assert envios['a'] - inicio >= 1 - 0.01
+        assert envios['a'] > envios['b']
+        stats = dispatcher.get_stats()
+        assert stats['retry_after'] == 1
+        assert stats['reintentos'] == 1
+
+    def test_funciona_en_varios_event_loops(self):
+        """Los locks se crean en el loop que envía: el dispatcher sobrevive a varios asyncio.run"""
+        # Envíos lentos con concurrencia 1: el semáforo tiene que esperar
+        bot = BotFalso(demora=0.02)
+        dispatcher = TelegramDispatcher(bot, mensajes_por_segundo=200, mensajes_por_segundo_chat=200,
+                                        max_concurrencia=1)
+
+        for _ in range(2):
+            asyncio.run(dispatcher.enviar(['a', 'b', 'c'], 'hola'))
+
+        assert dispatcher.get_stats()['enviados'] == 6
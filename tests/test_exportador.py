@@ -0,0 +1,70 @@
+"""
+Tests para la exportación por lotes
+"""
+
+import csv
+import io
+import json
+import pytest
+import sqlite3
+import sys
+from pathlib import Path
+
+# Agregar el directorio raíz al path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.database.exportador import exportar_partidos
+
+@pytest.fixture
+def manager(manager):
+    """DataManager sobre una base temporal con 12 partidos guardados"""
+    manager.guardar_sesion_scraping([
+        {'fecha': f"2025-07-{1 + i % 4:02d}", 'visitante': 'NYY' if i % 2 else 'SD', 'local': f'L{i}',
+         'over_percentage': f"{60 + i}%", 'under_percentage': f"{40 - i}%", 'expertos': '10'}
+        for i in range(12)
+    ])
+    return manager
+
+class TestExportador:
+    """Tests para exportar_partidos"""
+
+    def test_csv_filtrado_por_lotes(self, manager):
+        """Filtros de fecha y equipo; el resultado no depende del tamaño de lote"""
+        archivo = exportar_partidos('csv', fecha_desde='2025-07-02', fecha_hasta='2025-07-04', equipo='nyy',
+                                    columnas=['fecha', 'local', 'expertos'], tamano_lote=2, persistencia=manager)
+        with archivo:
+            filas = list(csv.DictReader(io.TextIOWrapper(archivo, encoding='utf-8')))
+
+        assert [fila['local'] for fila in filas] == ['L1', 'L5', 'L9', 'L3', 'L7', 'L11']
+        assert [fila['fecha'] for fila in filas] == sorted(fila['fecha'] for fila in filas)
+        assert set(filas[0]) == {'fecha', 'local', 'expertos'}
+
+    def test_jsonl_y_formato_invalido(self, manager, tmp_path):
+        """JSONL a un archivo destino; un formato desconocido se rechaza"""
+        destino = tmp_path / "partidos.jsonl"
+        exportar_partidos('jsonl', consenso_minimo=70, destino=destino, persistencia=manager).close()
+
+        filas = [json.loads(linea) for linea in destino.read_text(encoding='utf-8').splitlines()]
+        assert len(filas) == 2
+        assert all(fila['consenso_pct'] >= 70 for fila in filas)
+
+        with pytest.raises(ValueError):
+            exportar_partidos('xlsx', persistencia=manager)
+
+    def test_rango_viejo_despues_de_la_limpieza(self, manager):
+        """La limpieza diaria recorta datos_raw pero conserva los partidos exportables"""
+        with sqlite3.connect(manager.db_path) as conn:
+            conn.execute("UPDATE scraping_sessions SET fecha = '2025-07-01'")
+
+        manager.limpiar_datos_antiguos(dias=7)
+
+        archivo = exportar_partidos('csv', fecha_desde='2025-07-01', fecha_hasta='2025-07-04', persistencia=manager)
+        with archivo:
+            filas = list(csv.DictReader(io.TextIOWrapper(archivo, encoding='utf-8')))
+        assert len(filas) == 12
+
+        with sqlite3.connect(manager.db_path) as conn:
+            assert conn.execute("SELECT datos_raw FROM scraping_sessions").fetchall() == [('[]',)]
+
+        manager.limpiar_datos_antiguos(dias=7, dias_partidos=30)
+        assert list(manager.iterar_partidos()) == []
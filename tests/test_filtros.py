@@ -0,0 +1,90 @@
+"""
+Tests para el sistema de filtros post-extracción
+"""
+
+import pytest
+import sys
+from pathlib import Path
+
+# Agregar el directorio raíz al path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.sistema_filtros_post_extraccion import FiltroConsensus, FiltrosConsensus
+
+class TestFiltrosMultiples:
+    """Tests para la evaluación de varios perfiles en una pasada"""
+
+    @pytest.fixture
+    def filtro(self, tmp_path):
+        """Fixture con configuración por defecto en un directorio temporal"""
+        return FiltroConsensus(archivo_config=str(tmp_path / "filtros.json"))
+
+    @pytest.fixture
+    def consensos(self):
+        """Consensos de ejemplo"""
+        return [
+            {
+                'equipo_visitante': 'NYY', 'equipo_local': 'BOS',
+                'direccion_consenso': 'OVER', 'porcentaje_consenso': 85,
+                'num_experts': 25, 'total_line': 9.5,
+                'hora_juego': '7:10 pm ET', 'completitud': '3/3'
+            },
+            {
+                'equipo_visitante': 'STL', 'equipo_local': 'AZ',
+                'direccion_consenso': 'UNDER', 'porcentaje_consenso': 65,
+                'num_experts': 12, 'total_line': 8.0, 'completitud': '2/3'
+            },
+            {
+                'equipo_visitante': None, 'equipo_local': 'CHI',
+                'direccion_consenso': 'OVER', 'porcentaje_consenso': 88,
+                'completitud': '1/3'
+            }
+        ]
+
+    def test_enruta_a_cada_perfil(self, filtro, consensos):
+        """Un consenso aparece en todos los perfiles que cumple"""
+        perfiles = {
+            'alerta': FiltrosConsensus(),
+            'revision': FiltrosConsensus(umbral_minimo=60, expertos_minimos=10),
+            'noche': FiltrosConsensus(horas_permitidas=['21:00'])
+        }
+
+        buckets, estadisticas = filtro.aplicar_filtros_multiples(consensos, perfiles)
+
+        assert [c['equipo_visitante'] for c in buckets['alerta']] == ['NYY']
+        assert [c['equipo_visitante'] for c in buckets['revision']] == ['NYY', 'STL']
+        assert buckets['noche'] == []
+        assert buckets['revision'][1]['filtro_aplicado'] == 'revision'
+
+        assert estadisticas['alerta']['rechazados_por']['umbral_consenso'] == 1
+        assert estadisticas['alerta']['rechazados_por']['datos_incompletos'] == 1
+        assert estadisticas['noche']['rechazados_por']['fuera_de_horario'] == 1
+        assert estadisticas['revision']['filtrados'] == 2
+
+    def test_equivale_a_aplicar_filtros(self, filtro, consensos):
+        """Un solo perfil da el mismo resultado que aplicar_filtros"""
+        validos, stats = filtro.aplicar_filtros(consensos, "alerta")
+        buckets, stats_multi = filtro.aplicar_filtros_multiples(consensos, {'alerta': filtro.filtros})
+
+        assert stats == stats_multi['alerta']
+        assert [c['equipo_local'] for c in validos] == [c['equipo_local'] for c in buckets['alerta']]
+
+    def test_rechazo_individual_por_umbral(self, filtro, consensos):
+        """Un consenso fuera del umbral queda afuera y se cuenta con su razón"""
+        validos, stats = filtro.aplicar_filtros([consensos[1]], "alerta")
+
+        assert validos == []
+        assert stats['rechazados_por']['umbral_consenso'] == 1
+        assert sum(stats['rechazados_por'].values()) == 1
+
+    def test_filtros_por_horario(self, filtro):
+        """Las franjas usan la misma conversión a 24 h que el filtro de horario"""
+        franjas = filtro.filtros_por_horario([
+            {'hora_juego': '12:05 pm ET'}, {'hora_juego': '12:30 am ET'},
+            {'hora_juego': '9:10 am ET'}, {'hora_juego': 'TBD'}, {}
+        ])
+
+        assert franjas['tarde'] == [{'hora_juego': '12:05 pm ET'}]
+        assert franjas['noche'] == [{'hora_juego': '12:30 am ET'}]
+        assert franjas['matutino'] == [{'hora_juego': '9:10 am ET'}]
+        assert len(franjas['sin_hora']) == 2
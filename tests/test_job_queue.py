@@ -0,0 +1,102 @@
+"""
+Tests para la cola de trabajos con plazos
+"""
+
+import pytest
+import threading
+import sys
+from concurrent.futures import Future
+from datetime import datetime, timedelta
+from pathlib import Path
+
+# Agregar el directorio raíz al path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.scraper.job_queue import (DeadlineJobQueue, PRIORIDAD_BACKFILL, PRIORIDAD_DIARIO,
+                                   PRIORIDAD_PREPARTIDO, TrabajoRechazadoError)
+
+@pytest.fixture
+def cola():
+    cola = DeadlineJobQueue(max_workers=1, max_pendientes=3, duracion_estimada_segundos=1)
+    yield cola
+    cola.stop()
+
+def bloquear_worker(cola: DeadlineJobQueue) -> threading.Event:
+    """Ocupa el único worker hasta que se libere el evento devuelto"""
+    liberar = threading.Event()
+    ocupado = threading.Event()
+
+    def esperar():
+        ocupado.set()
+        liberar.wait(5)
+
+    cola.enviar('bloqueo', esperar, prioridad=PRIORIDAD_PREPARTIDO)
+    assert ocupado.wait(5)
+    return liberar
+
+class TestDeadlineJobQueue:
+    """Tests para DeadlineJobQueue"""
+
+    def test_orden_prioridad_y_plazo(self, cola):
+        """Se despacha por prioridad y, dentro de ella, por plazo más próximo"""
+        liberar = bloquear_worker(cola)
+        orden = []
+        ahora = datetime.now()
+
+        futuros = [
+            cola.enviar('diario_tarde', orden.append, 'diario_tarde', prioridad=PRIORIDAD_DIARIO,
+                        deadline=ahora + timedelta(hours=3)),
+            cola.enviar('diario_pronto', orden.append, 'diario_pronto', prioridad=PRIORIDAD_DIARIO,
+                        deadline=ahora + timedelta(hours=1)),
+            cola.enviar('prepartido', orden.append, 'prepartido', prioridad=PRIORIDAD_PREPARTIDO,
+                        deadline=ahora + timedelta(hours=2)),
+        ]
+        liberar.set()
+        for futuro in futuros:
+            futuro.result(timeout=5)
+
+        assert orden == ['prepartido', 'diario_pronto', 'diario_tarde']
+
+    def test_desplazamiento_fuera_del_lock(self, cola):
+        """Con la cola llena un pre-partido desplaza al peor; el callback corre sin el lock"""
+        liberar = bloquear_worker(cola)
+        backfills = [cola.enviar(f'backfill_{i}', lambda: None, prioridad=PRIORIDAD_BACKFILL) for i in range(3)]
+
+        lock_libre = []
+
+        def al_rechazar(futuro):
+            # Otro thread tiene que poder usar la cola mientras corre el callback
+            consulta = threading.Thread(target=cola.get_stats)
+            consulta.start()
+            consulta.join(timeout=1)
+            lock_libre.append(not consulta.is_alive())
+
+        backfills[-1].add_done_callback(al_rechazar)
+        prepartido = cola.enviar('prepartido', lambda: 'ok', prioridad=PRIORIDAD_PREPARTIDO)
+
+        with pytest.raises(TrabajoRechazadoError):
+            backfills[-1].result(timeout=1)
+        assert lock_libre == [True]
+
+        # Un backfill no desplaza a nadie: la cola sigue llena
+        with pytest.raises(TrabajoRechazadoError):
+            cola.enviar('otro_backfill', lambda: None, prioridad=PRIORIDAD_BACKFILL).result(timeout=1)
+
+        liberar.set()
+        assert prepartido.result(timeout=5) == 'ok'
+        stats = cola.get_stats()
+        assert stats['desplazados'] == 1
+        assert stats['rechazados'] == 1
+
+    def test_trabajo_que_devuelve_future(self, cola):
+        """Un trabajo que devuelve un Future no retiene al worker"""
+        externo = Future()
+        encadenado = cola.enviar('pool', lambda: externo)
+        siguiente = cola.enviar('siguiente', lambda: 'listo')
+
+        assert siguiente.result(timeout=5) == 'listo'
+        assert not encadenado.done()
+
+        externo.set_result([{'id': 1}])
+        assert encadenado.result(timeout=5) == [{'id': 1}]
+        assert cola.get_stats()['completados'] == 2
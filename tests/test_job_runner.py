@@ -0,0 +1,69 @@
+"""
+Tests para el ejecutor de trabajos de scraping en segundo plano
+"""
+
+import pytest
+import sys
+import threading
+import time
+from pathlib import Path
+
+# Agregar el directorio raíz al path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.scraper.job_runner import ScrapeJobRunner
+
+def esperar_fin(runner, trabajo_id, timeout=5):
+    limite = time.monotonic() + timeout
+    while time.monotonic() < limite:
+        trabajo = runner.estado(trabajo_id)
+        if trabajo['estado'] in ('completado', 'error'):
+            return trabajo
+        time.sleep(0.01)
+    raise AssertionError(f"El trabajo {trabajo_id} no terminó")
+
+class TestScrapeJobRunner:
+    """Tests para ScrapeJobRunner"""
+
+    def test_trabajo_en_vuelo_se_comparte(self, manager):
+        """Dos pedidos del mismo scraping reciben el mismo ID y una sola ejecución"""
+        runner = ScrapeJobRunner(manager)
+        liberar = threading.Event()
+        ejecuciones = []
+
+        def scraping(progreso):
+            ejecuciones.append(1)
+            progreso.reportar(50, "Parseando", filas=[{'visitante': 'NYY'}])
+            liberar.wait(5)
+            return {'session_id': 's1', 'filas': [{'visitante': 'NYY'}, {'visitante': 'BOS'}]}
+
+        trabajo_id = runner.enviar('robusto', scraping)
+        assert runner.enviar('robusto', scraping) == trabajo_id
+
+        # Progreso parcial visible desde el almacén compartido
+        limite = time.monotonic() + 5
+        while runner.estado(trabajo_id)['progreso'] < 50 and time.monotonic() < limite:
+            time.sleep(0.01)
+        parcial = runner.estado(trabajo_id)
+        assert parcial['estado'] == 'ejecutando'
+        assert parcial['filas'] == [{'visitante': 'NYY'}]
+
+        liberar.set()
+        trabajo = esperar_fin(runner, trabajo_id)
+        assert trabajo['estado'] == 'completado'
+        assert trabajo['resultado'] == {'session_id': 's1'}
+        assert len(trabajo['filas']) == 2
+        assert ejecuciones == [1]
+        assert runner.trabajo_activo('robusto') is None
+
+    def test_error_queda_registrado(self, manager):
+        """Una falla del scraping queda en el trabajo y libera la clave"""
+        runner = ScrapeJobRunner(manager)
+
+        def scraping(progreso):
+            raise RuntimeError("Chrome no arrancó")
+
+        trabajo = esperar_fin(runner, runner.enviar('manual', scraping))
+        assert trabajo['estado'] == 'error'
+        assert 'Chrome' in trabajo['error']
+        assert runner.enviar('manual', scraping) != trabajo['id']
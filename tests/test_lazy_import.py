@@ -0,0 +1,77 @@
+"""
+Tests para las importaciones diferidas
+"""
+
+import pytest
+import subprocess
+import sys
+import types
+from pathlib import Path
+
+# Agregar el directorio raíz al path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.utils.lazy_import import atributos_perezosos, importar_perezoso
+
+@pytest.fixture
+def paquete(tmp_path, monkeypatch):
+    """Paquete temporal cuyo submódulo anota en EJECUTADOS cuando se ejecuta"""
+    raiz = tmp_path / "paquete_perezoso"
+    raiz.mkdir()
+    (raiz / "__init__.py").write_text("")
+    (raiz / "pesado.py").write_text(
+        "import builtins\n"
+        "builtins.EJECUTADOS = getattr(builtins, 'EJECUTADOS', []) + [__name__]\n"
+        "class Pesado:\n"
+        "    pass\n"
+    )
+    monkeypatch.syspath_prepend(str(tmp_path))
+    monkeypatch.setattr('builtins.EJECUTADOS', [], raising=False)
+    yield 'paquete_perezoso'
+    for nombre in [n for n in sys.modules if n.startswith('paquete_perezoso')]:
+        del sys.modules[nombre]
+
+class TestLazyImport:
+    """Tests para importar_perezoso y atributos_perezosos"""
+
+    def test_modulo_se_ejecuta_al_primer_acceso(self, paquete):
+        """importar_perezoso no ejecuta el módulo hasta que se usa un atributo"""
+        import builtins
+
+        modulo = importar_perezoso(f'{paquete}.pesado')
+        assert builtins.EJECUTADOS == []
+
+        assert modulo.Pesado.__name__ == 'Pesado'
+        assert builtins.EJECUTADOS == [f'{paquete}.pesado']
+
+        with pytest.raises(ImportError):
+            importar_perezoso(f'{paquete}.no_existe')
+
+    def test_atributos_del_paquete(self, paquete):
+        """El paquete exporta el nombre sin importar el submódulo hasta pedirlo"""
+        import builtins
+
+        modulo = types.ModuleType('exportador')
+        sys.modules['exportador'] = modulo
+        modulo.__getattr__, modulo.__dir__ = atributos_perezosos('exportador', {'Pesado': f'{paquete}.pesado'})
+        try:
+            assert 'Pesado' in dir(modulo)
+            assert builtins.EJECUTADOS == []
+
+            assert modulo.Pesado.__name__ == 'Pesado'
+            assert 'Pesado' in vars(modulo)
+            with pytest.raises(AttributeError):
+                modulo.Otro
+        finally:
+            del sys.modules['exportador']
+
+    def test_utils_no_carga_metricas_ni_trazas(self):
+        """Importar lazy_import no arrastra metrics, tracing ni asyncio por el paquete src.utils"""
+        codigo = (
+            "import sys, src.utils.lazy_import\n"
+            "print([m for m in ('src.utils.metrics', 'src.utils.tracing', 'asyncio', 'http.server') if m in sys.modules])"
+        )
+        salida = subprocess.run([sys.executable, '-c', codigo], cwd=Path(__file__).parent.parent,
+                                capture_output=True, text=True, check=True).stdout
+
+        assert salida.strip() == '[]'
@@ -0,0 +1,111 @@
+"""
+Tests para el logging estructurado
+"""
+
+import pytest
+import json
+import logging
+import sys
+import threading
+from datetime import datetime
+from pathlib import Path
+
+# Agregar el directorio raíz al path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.utils.logger import (JsonFormatter, _QueueHandlerDiferido, desinstalar_eventos, get_logger,
+                              instalar_eventos, log_alert_event, log_scraping_event)
+
+class _Capturador(logging.Handler):
+    def __init__(self):
+        super().__init__()
+        self.registros = []
+
+    def emit(self, record):
+        self.registros.append(record)
+
+class _PersistenciaFalsa:
+    def __init__(self):
+        self.eventos = []
+        self.recibido = threading.Event()
+
+    def registrar_evento(self, evento):
+        self.eventos.append(evento)
+        self.recibido.set()
+
+class TestLogger:
+    """Tests para JsonFormatter y el handler diferido"""
+
+    def test_json_incluye_campos_del_evento(self):
+        """Los eventos estructurados quedan como campos en la línea JSON"""
+        logger = logging.getLogger('test_json_evento')
+        logger.propagate = False
+        capturador = _Capturador()
+        logger.addHandler(capturador)
+        logger.setLevel(logging.INFO)
+
+        log_scraping_event(logger, 'MLB', 'success', {'consensus_count': 12, 'duration_seconds': 1.5})
+
+        linea = json.loads(JsonFormatter().format(capturador.registros[0]))
+        assert linea['level'] == 'INFO'
+        assert 'SCRAPING_SUCCESS' in linea['msg']
+        assert linea['evento']['sport'] == 'MLB'
+        assert linea['evento']['consensus_count'] == 12
+
+    def test_mensaje_se_formatea_en_el_listener(self):
+        """El handler de cola no arma el mensaje en el hilo que loguea"""
+        record = logging.LogRecord('x', logging.DEBUG, __file__, 1, "Fila %s: %s", (3, 'NYY'), None)
+
+        preparado = _QueueHandlerDiferido(None).prepare(record)
+
+        assert preparado.msg == "Fila %s: %s"
+        assert preparado.args == (3, 'NYY')
+        assert preparado.getMessage() == "Fila 3: NYY"
+
+    def test_reporte_diario_desde_eventos(self, manager):
+        """El reporte diario es una consulta agregada sobre los eventos tipados"""
+        from src.utils.logger import evento_desde_registro
+
+        logger = logging.getLogger('test_eventos')
+        logger.propagate = False
+        capturador = _Capturador()
+        logger.addHandler(capturador)
+        logger.setLevel(logging.INFO)
+
+        log_scraping_event(logger, 'MLB', 'start', {'url': 'x'})
+        log_scraping_event(logger, 'MLB', 'success', {'consensus_count': 12, 'high_consensus_count': 3})
+        log_scraping_event(logger, 'NBA', 'success', {'consensus_count': 5, 'high_consensus_count': 1})
+        log_alert_event(logger, 'consensus', 'sent', {'chat_count': 2})
+        logger.error("Telegram no responde")
+
+        for registro in capturador.registros:
+            manager.registrar_evento(evento_desde_registro(registro))
+
+        fecha = datetime.now().strftime('%Y-%m-%d')
+        resumen = manager.obtener_resumen_eventos(fecha)
+        assert resumen['scraping_events']['total_attempts'] == 1
+        assert resumen['scraping_events']['total_consensus'] == 17
+        assert resumen['alert_events']['consensus_alerts'] == 1
+        assert resumen['error_summary'] == {'total_errors': 1, 'critical_errors': 0,
+                                            'network_errors': 0, 'telegram_errors': 1}
+        assert manager.obtener_resumen_eventos(fecha, 'NBA')['scraping_events']['high_consensus'] == 1
+
+    def test_eventos_solo_con_instalar(self):
+        """Sin instalar_eventos() el logging no escribe en ninguna base"""
+        logger = get_logger('test_instalar_eventos')
+        persistencia = _PersistenciaFalsa()
+
+        instalar_eventos(persistencia)
+        try:
+            logger.info("Sin evento")
+            logger.error("Falla de red")
+            assert persistencia.recibido.wait(5)
+        finally:
+            desinstalar_eventos()
+
+        assert [e['mensaje'] for e in persistencia.eventos] == ["Falla de red"]
+
+        persistencia.recibido.clear()
+        logger.error("Después de desinstalar")
+        assert not persistencia.recibido.wait(0.3)
+        assert len(persistencia.eventos) == 1
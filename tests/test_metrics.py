@@ -0,0 +1,80 @@
+"""
+Tests para el registro de métricas
+"""
+
+import pytest
+import sys
+import urllib.request
+from pathlib import Path
+
+# Agregar el directorio raíz al path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.utils.metrics import MetricsRegistry
+
+class TestMetricas:
+    """Tests para MetricsRegistry y el endpoint /metrics"""
+
+    def test_exportacion_formato_prometheus(self):
+        """Contadores, gauges e histogramas se exportan con sus etiquetas"""
+        registro = MetricsRegistry()
+        rechazos = registro.counter('rechazos_total', 'Rechazos', ['razon'])
+        cola = registro.gauge('profundidad', 'Pendientes', ['cola'])
+        fetch = registro.histogram('fetch_seconds', 'Descarga', ['tier'], buckets=(0.1, 1))
+
+        rechazos.inc(2, razon='umbral_consenso')
+        rechazos.inc(razon='umbral_consenso')
+        cola.set_funcion(lambda: 7, cola='outbox')
+        for valor in (0.05, 0.1, 0.5, 3):
+            fetch.observe(valor, tier='requests')
+
+        texto = registro.exportar()
+
+        assert '# TYPE rechazos_total counter' in texto
+        assert 'rechazos_total{razon="umbral_consenso"} 3' in texto
+        assert 'profundidad{cola="outbox"} 7' in texto
+        assert 'fetch_seconds_bucket{tier="requests",le="0.1"} 2' in texto
+        assert 'fetch_seconds_bucket{tier="requests",le="1"} 3' in texto
+        assert 'fetch_seconds_bucket{tier="requests",le="+Inf"} 4' in texto
+        assert 'fetch_seconds_count{tier="requests"} 4' in texto
+        assert 'fetch_seconds_sum{tier="requests"} 3.65' in texto
+
+    def test_etiquetas_invalidas_y_tipo_duplicado(self):
+        """Las etiquetas deben coincidir y un nombre no puede cambiar de tipo"""
+        registro = MetricsRegistry()
+        contador = registro.counter('eventos_total', 'Eventos', ['tipo'])
+
+        with pytest.raises(ValueError):
+            contador.inc(perfil='x')
+        with pytest.raises(ValueError):
+            registro.gauge('eventos_total', 'Eventos')
+        assert registro.counter('eventos_total', 'Eventos', ['tipo']) is contador
+
+    def test_instantanea_se_acumula_en_otro_registro(self):
+        """Las series de otro proceso se suman a las propias"""
+        hijo, padre = MetricsRegistry(), MetricsRegistry()
+        for registro in (hijo, padre):
+            registro.counter('filas_total', 'Filas', ['parser']).inc(2, parser='celdas')
+            registro.histogram('parse_seconds', 'Parseo', buckets=(0.1, 1)).observe(0.5)
+
+        padre.acumular(hijo.instantanea())
+        hijo.vaciar()
+
+        assert padre.counter('filas_total', 'Filas', ['parser']).valor(parser='celdas') == 4
+        assert padre.histogram('parse_seconds', 'Parseo', buckets=(0.1, 1)).conteo() == 2
+        assert 'parse_seconds_sum 1\n' in padre.exportar()
+        assert hijo.instantanea() == {}
+
+    def test_endpoint_http(self):
+        """El endpoint local sirve el texto de las métricas"""
+        registro = MetricsRegistry()
+        registro.counter('pings_total', 'Pings').inc()
+        assert registro.iniciar_servidor(puerto=0)
+
+        try:
+            puerto = registro._servidor.server_address[1]
+            with urllib.request.urlopen(f"http://127.0.0.1:{puerto}/metrics", timeout=5) as respuesta:
+                assert respuesta.headers['Content-Type'].startswith('text/plain')
+                assert 'pings_total 1' in respuesta.read().decode('utf-8')
+        finally:
+            registro.detener_servidor()
@@ -0,0 +1,83 @@
+"""
+Tests para el outbox de alertas
+"""
+
+import pytest
+import sqlite3
+import sys
+from pathlib import Path
+
+# Agregar el directorio raíz al path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.notifications.outbox import OutboxSender
+
+def alertas(n, prefijo='a'):
+    return [{'dedup_key': f'{prefijo}{i}', 'tipo_alerta': 'consenso', 'payload': {'n': i}} for i in range(n)]
+
+class TestOutbox:
+    """Tests para el outbox y OutboxSender"""
+
+    def test_encolar_deduplica(self, manager):
+        """Una alerta ya encolada no se vuelve a encolar"""
+        assert manager.encolar_alertas('test', alertas(3)) == ['a0', 'a1', 'a2']
+        assert manager.encolar_alertas('test', alertas(4)) == ['a3']
+        assert manager.alerta_encolada('a1')
+
+    def test_reserva_vencida_se_reentrega(self, manager):
+        """Si el worker cae sin ack, la alerta vuelve a entregarse"""
+        manager.encolar_alertas('test', alertas(2))
+
+        assert len(manager.reservar_alertas('test', reserva_segundos=60)) == 2
+        assert manager.reservar_alertas('test', reserva_segundos=60) == []
+
+        # Reserva vencida: simula un worker caído a mitad de envío
+        with sqlite3.connect(manager.db_path) as conn:
+            conn.execute("UPDATE alertas_outbox SET reservado_hasta = '2000-01-01T00:00:00'")
+
+        assert len(manager.reservar_alertas('test')) == 2
+
+    def test_reintento_y_ack(self, manager):
+        """Un lote fallido se reprograma; al entregarse queda confirmado"""
+        intentos = []
+
+        def enviar(filas):
+            intentos.append(len(filas))
+            return len(intentos) > 1
+
+        sender = OutboxSender('test', enviar, manager, backoff_base_segundos=0)
+        manager.encolar_alertas('test', alertas(3))
+
+        assert sender.procesar_pendientes() == 0
+        assert sender.procesar_pendientes() == 3
+        assert intentos == [3, 3]
+
+        stats = sender.get_stats()
+        assert stats['enviadas'] == 3
+        assert stats['reintentos'] == 3
+        assert stats['outbox']['por_estado'] == {'enviado': 3}
+
+        with sqlite3.connect(manager.db_path) as conn:
+            assert conn.execute("SELECT COUNT(*) FROM alertas_enviadas WHERE exitoso = 1").fetchone()[0] == 3
+
+    def test_confirmacion_parcial_y_corutinas(self, manager):
+        """enviar_lote puede ser async y confirmar solo parte del lote"""
+        async def enviar(filas):
+            return [fila['id'] for fila in filas if fila['payload']['n'] % 2 == 0]
+
+        sender = OutboxSender('test', enviar, manager, backoff_base_segundos=60, max_intentos=1)
+        manager.encolar_alertas('test', alertas(4))
+
+        assert sender.procesar_pendientes() == 2
+        assert manager.obtener_estadisticas_outbox('test')['por_estado'] == {'enviado': 2, 'fallido': 2}
+
+    def test_rafaga_se_drena_por_lotes(self, manager):
+        """Una ráfaga grande se entrega completa en lotes"""
+        lotes = []
+        sender = OutboxSender('test', lambda filas: lotes.append(len(filas)) or True, manager, tamano_lote=50)
+        sender.encolar(alertas(230), despertar=False)
+        sender.stop(vaciar=True)
+
+        assert sum(lotes) == 230
+        assert max(lotes) == 50
+        assert manager.obtener_estadisticas_outbox('test')['pendientes'] == 0
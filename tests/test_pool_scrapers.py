@@ -0,0 +1,77 @@
+"""
+Tests para el pool acotado de scrapers Selenium
+"""
+
+import pytest
+import sys
+import threading
+from pathlib import Path
+
+# Agregar el directorio raíz al path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.scraper.pool_scrapers import PoolScrapers, ScrapersOcupadosError
+
+class ScraperFalso:
+    """Registra cuántas veces se cerró su driver"""
+
+    def __init__(self):
+        self.cierres = 0
+
+    def close(self):
+        self.cierres += 1
+
+class TestPoolScrapers:
+    """Tests para PoolScrapers"""
+
+    def test_prestamos_exclusivos_y_cierre_al_devolver(self):
+        """Dos préstamos simultáneos reciben scrapers distintos; al devolver se cierra el driver"""
+        pool = PoolScrapers(ScraperFalso, max_scrapers=2)
+
+        with pool.prestar() as primero, pool.prestar() as segundo:
+            assert primero is not segundo
+            assert primero.cierres == 0
+
+        assert (primero.cierres, segundo.cierres) == (1, 1)
+
+        # El scraper devuelto se reutiliza, sin crear otro
+        with pool.prestar() as tercero:
+            assert tercero in (primero, segundo)
+        stats = pool.get_stats()
+        assert (stats['creados'], stats['prestamos'], stats['libres']) == (2, 3, 2)
+
+    def test_limite_de_scrapers_en_uso(self):
+        """Con todos prestados se espera a una devolución o se falla al vencer el plazo"""
+        pool = PoolScrapers(ScraperFalso, max_scrapers=1)
+        prestado = threading.Event()
+        devolver = threading.Event()
+
+        def ocupar():
+            with pool.prestar():
+                prestado.set()
+                devolver.wait(5)
+
+        hilo = threading.Thread(target=ocupar)
+        hilo.start()
+        assert prestado.wait(5)
+
+        with pytest.raises(ScrapersOcupadosError):
+            with pool.prestar(timeout=0.1):
+                pass
+
+        devolver.set()
+        with pool.prestar(timeout=5) as scraper:
+            assert scraper.cierres == 1
+        hilo.join(5)
+        assert pool.get_stats()['esperas_vencidas'] == 1
+
+    def test_error_en_la_fabrica_libera_el_cupo(self):
+        """Si crear el scraper falla el cupo vuelve al pool"""
+        def fabrica_rota():
+            raise RuntimeError("chromedriver no encontrado")
+
+        pool = PoolScrapers(fabrica_rota, max_scrapers=1)
+        for _ in range(2):
+            with pytest.raises(RuntimeError, match="chromedriver"):
+                with pool.prestar(timeout=0.1):
+                    pass
@@ -0,0 +1,52 @@
+"""
+Tests para la preparación vectorizada de tablas de la app
+"""
+
+import pytest
+import sys
+from pathlib import Path
+
+# Agregar el directorio raíz al path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.web.presentacion import preparar_tabla_consensos, procesar_consensos_para_tabla
+
+class TestPresentacion:
+    """Tests para preparar_tabla_consensos y procesar_consensos_para_tabla"""
+
+    def test_orden_por_hora_y_resaltado(self):
+        """Se ordena por hora real (am/pm) y se resalta el porcentaje mayor"""
+        datos = [
+            {'equipo_visitante': 'NYY', 'equipo_local': 'BOS', 'hora_juego': '7:05 pm ET',
+             'consenso_over': 83, 'consenso_under': 17},
+            {'equipo_visitante': 'SD', 'equipo_local': 'MIA', 'hora_juego': 'TBD',
+             'consenso_over': 50, 'consenso_under': 50},
+            {'equipo_visitante': 'HOU', 'equipo_local': 'AZ', 'hora_juego': '12:10 pm ET',
+             'consenso_over': 30, 'consenso_under': 70},
+            {'equipo_visitante': 'CIN', 'equipo_local': 'WAS', 'hora_juego': '11:35 AM ET',
+             'consenso_over': 55, 'consenso_under': 45}
+        ]
+
+        tabla = preparar_tabla_consensos(datos)
+
+        assert tabla.df['equipo_visitante'].tolist() == ['CIN', 'HOU', 'NYY', 'SD']
+        assert tabla.df['over_formatted'].tolist()[2] == "<b style='font-size:16px'>83%</b>"
+        assert tabla.df['under_formatted'].tolist()[2] == "17%"
+        assert tabla.df['over_formatted'].tolist()[3] == "50%"
+        assert tabla.consensos_fuertes == ['**HOU @ AZ**: UNDER 70%', '**NYY @ BOS**: OVER 83%']
+        assert tabla.column_config['hora_juego'] == 'Hora'
+
+    def test_procesar_normaliza_valores(self):
+        """Los valores no numéricos o faltantes quedan como 0 / 'N/A'"""
+        filas = procesar_consensos_para_tabla([
+            {'equipo_visitante': 'NYY', 'equipo_local': 'BOS', 'hora_juego': '7:05 pm ET',
+             'porcentaje_over': 83, 'porcentaje_under': 'x', 'total_line': 8.5, 'num_experts': 12},
+            {'equipo_visitante': 'SD'}
+        ], '2025-07-01')
+
+        assert filas[0] == {'fecha': '2025-07-01', 'hora': '7:05 pm ET', 'visitante': 'NYY', 'local': 'BOS',
+                            'over_percentage': '83.0%', 'under_percentage': '0.0%',
+                            'total': '8.5', 'expertos': '12'}
+        assert filas[1]['hora'] == 'TBD'
+        assert filas[1]['total'] == 'N/A'
+        assert filas[1]['expertos'] == 'N/A'
@@ -0,0 +1,71 @@
+"""
+Tests para el registro de scrapers por deporte y el extractor de covers.com
+"""
+
+import pytest
+import sys
+from pathlib import Path
+
+# Agregar el directorio raíz al path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.scraper.registro_scrapers import (PERFILES_COVERS, crear_scraper, deportes_registrados,
+                                           registrar_scraper, tiene_scraper)
+
+class TestRegistroScrapers:
+    """Tests para el registro y ExtractorConsensosCovers"""
+
+    def test_registro_por_deporte(self):
+        """Los cuatro deportes vienen registrados y se pueden agregar otros"""
+        assert deportes_registrados() == ['MLB', 'NBA', 'NFL', 'NHL']
+
+        @registrar_scraper('wnba')
+        def scraper_wnba():
+            return 'scraper wnba'
+
+        try:
+            assert tiene_scraper('WNBA')
+            assert crear_scraper('Wnba') == 'scraper wnba'
+        finally:
+            from src.scraper import registro_scrapers
+            del registro_scrapers._FABRICAS['WNBA']
+
+        with pytest.raises(ValueError):
+            crear_scraper('CRICKET')
+
+    def test_extractor_usa_perfil_del_deporte(self):
+        """Columnas del perfil y rango de total del deporte (NBA: 150-280)"""
+        pytest.importorskip('bs4')
+        pytest.importorskip('httpx')
+        from src.scraper.covers_extractor import ExtractorConsensosCovers
+
+        extractor = ExtractorConsensosCovers(PERFILES_COVERS['NBA'])
+        fila = extractor._extraer_fila(['BOS @ LAL', '7:30 pm ET', '78% Under', '224.5', '14 + 3'], '2025-01-10')
+
+        assert fila['deporte'] == 'NBA'
+        assert (fila['equipo_visitante'], fila['equipo_local']) == ('BOS', 'LAL')
+        assert (fila['consenso_over'], fila['consenso_under'], fila['direccion_consenso']) == (22, 78, 'UNDER')
+        assert fila['total_line'] == 224.5
+        assert fila['num_experts'] == 17
+        assert fila['hora_partido'] == '7:30 pm ET'
+        assert extractor._extraer_fila(['Matchup', 'Time', 'Consensus'], '2025-01-10') is None
+
+    def test_extractor_no_toma_la_hora_como_equipos(self):
+        """'7:05 PM ET' no se confunde con un partido "CHI NYR" sin arroba"""
+        pytest.importorskip('bs4')
+        pytest.importorskip('httpx')
+        from bs4 import BeautifulSoup
+        from src.scraper.covers_extractor import ExtractorConsensosCovers
+
+        html = """<table class="responsive">
+            <tr><th>Matchup</th><th>Time</th><th>Consensus</th></tr>
+            <tr><td>CHI NYR</td><td>7:05 PM ET</td><td>65% Over</td><td>6.5</td><td>12 + 2</td></tr>
+            <tr><td>Postponed</td><td>8:10 PM ET</td><td>70% Under</td><td>6</td><td>10 + 1</td></tr>
+            <tr><td>TOR@BOS</td><td>1:35 PM ET</td><td>58% Under</td><td>5.5</td><td>9 + 4</td></tr>
+        </table>"""
+        extractor = ExtractorConsensosCovers(PERFILES_COVERS['NHL'])
+        filas = extractor.parse_consensus_page(BeautifulSoup(html, 'html.parser'), '2025-01-10')
+
+        assert [(f['equipo_visitante'], f['equipo_local']) for f in filas] == [('CHI', 'NYR'), ('TOR', 'BOS')]
+        assert [f['hora_partido'] for f in filas] == ['7:05 PM ET', '1:35 PM ET']
+        assert [f['total_line'] for f in filas] == [6.5, 5.5]
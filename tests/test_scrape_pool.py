@@ -0,0 +1,129 @@
+"""
+Tests para el pool de procesos de scraping
+"""
+
+import os
+import pytest
+import subprocess
+import sys
+import time
+from concurrent.futures import CancelledError
+from pathlib import Path
+
+# Agregar el directorio raíz al path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.scraper import scrape_pool
+from src.scraper.scrape_pool import ScrapePool, ScrapeTimeoutError
+from src.utils.metrics import FETCH_SEGUNDOS, FILAS_EXTRAIDAS
+from src.utils.tracing import RecolectorTrazas, traza, tracer
+
+pytestmark = pytest.mark.skipif(not hasattr(os, 'fork'), reason="los tests usan el contexto fork")
+
+def sumar(a, b):
+    return a + b
+
+def scraping_medido():
+    """Simula un scraping que registra métricas y spans dentro del hijo"""
+    with traza('fetch', tier='selenium'), FETCH_SEGUNDOS.medir(tier='selenium'):
+        time.sleep(0.01)
+    FILAS_EXTRAIDAS.inc(4, parser='selenium_celdas')
+    return 4
+
+def lanzar_navegador_y_esperar(archivo_pid):
+    """Simula un scraping que deja un proceso hijo (como chromedriver) y se cuelga"""
+    navegador = subprocess.Popen(['sleep', '60'])
+    Path(archivo_pid).write_text(str(navegador.pid))
+    time.sleep(60)
+
+def proceso_vivo(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    # Un zombie todavía responde a kill(pid, 0)
+    estado = Path(f'/proc/{pid}/stat')
+    return not (estado.exists() and estado.read_text().split()[2] == 'Z')
+
+@pytest.fixture
+def pool():
+    pool = ScrapePool(max_workers=1, timeout_segundos=30, contexto='fork')
+    yield pool
+    pool.stop()
+
+class TestScrapePool:
+    """Tests para ScrapePool"""
+
+    def test_enviar_devuelve_resultado(self, pool):
+        """El resultado del proceso hijo llega al Future y cuenta como completado"""
+        assert pool.enviar(sumar, 2, 3).result(timeout=10) == 5
+        assert pool.enviar(sumar, 'a', 'b').result(timeout=10) == 'ab'
+        assert pool.get_stats()['completados'] == 2
+
+    def test_resultado_limpio_no_termina_el_grupo(self, pool, monkeypatch):
+        """Si el hijo respondió y terminó, no se envían señales a su grupo"""
+        terminados = []
+        monkeypatch.setattr(scrape_pool, '_terminar_proceso', lambda proceso, plazo=0: terminados.append(proceso.pid))
+
+        assert pool.enviar(sumar, 1, 2).result(timeout=10) == 3
+        pool.stop()
+        assert terminados == []
+
+    def test_timeout_termina_al_navegador(self, pool, tmp_path):
+        """Al vencer el timeout se termina el grupo del proceso, sin dejar huérfanos"""
+        archivo_pid = tmp_path / 'navegador.pid'
+        futuro = pool.enviar(lanzar_navegador_y_esperar, str(archivo_pid), timeout=1)
+
+        with pytest.raises(ScrapeTimeoutError):
+            futuro.result(timeout=15)
+
+        pid = int(archivo_pid.read_text())
+        limite = time.monotonic() + 5
+        while proceso_vivo(pid) and time.monotonic() < limite:
+            time.sleep(0.05)
+        assert not proceso_vivo(pid)
+        assert pool.get_stats()['timeouts'] == 1
+
+    def test_cancelar_en_cola_y_en_ejecucion(self, pool):
+        """Cancelar saca de la cola o termina el proceso que corre"""
+        corriendo = pool.enviar(time.sleep, 60, job_id='largo')
+        en_cola = pool.enviar(sumar, 1, 1, job_id='siguiente')
+
+        limite = time.monotonic() + 5
+        while pool.get_stats()['en_ejecucion'] == 0 and time.monotonic() < limite:
+            time.sleep(0.02)
+
+        assert pool.cancelar('siguiente')
+        assert en_cola.cancelled()
+
+        assert pool.cancelar('largo')
+        with pytest.raises(CancelledError):
+            corriendo.result(timeout=10)
+
+        assert not pool.cancelar('inexistente')
+        limite = time.monotonic() + 5
+        while pool.get_stats()['cancelados'] < 2 and time.monotonic() < limite:
+            time.sleep(0.02)
+        assert pool.get_stats()['cancelados'] == 2
+
+    def test_metricas_y_trazas_del_hijo_llegan_al_padre(self, pool):
+        """Lo medido en el proceso hijo se suma al registro y a la traza del padre"""
+        filas_antes = FILAS_EXTRAIDAS.valor(parser='selenium_celdas')
+        fetch_antes = FETCH_SEGUNDOS.conteo(tier='selenium')
+        recolector = RecolectorTrazas()
+        exportadores = tracer.exportadores
+        tracer.exportadores = [recolector]
+
+        try:
+            assert pool.enviar(scraping_medido, job_id='medido').result(timeout=10) == 4
+        finally:
+            tracer.exportadores = exportadores
+
+        assert FILAS_EXTRAIDAS.valor(parser='selenium_celdas') == filas_antes + 4
+        assert FETCH_SEGUNDOS.conteo(tier='selenium') == fetch_antes + 1
+
+        [spans] = recolector.trazas
+        raiz = next(s for s in spans if s.parent_id is None)
+        fetch = next(s for s in spans if s.nombre == 'fetch')
+        assert raiz.nombre == 'scrape_proceso'
+        assert fetch.parent_id == raiz.span_id and fetch.trace_id == raiz.trace_id
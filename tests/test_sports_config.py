@@ -0,0 +1,88 @@
+"""
+Tests para la configuración compilada por deporte
+"""
+
+import json
+import os
+import pytest
+import sys
+from pathlib import Path
+
+# Agregar el directorio raíz al path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.utils.sports_config import ConfigDeportesInvalida, SportsConfiguration, compilar_config
+
+CONFIG_ARCHIVO = {
+    'mlb': {'name': 'Major League Baseball', 'active': True, 'season_months': [3, 4, 5, 6, 7, 8, 9, 10],
+            'consensus_threshold': 60.0, 'pregame_minutes': 15},
+    'nba': {'active': True, 'season_months': [10, 11, 12, 1, 2], 'pregame_minutes': 20,
+            'consensus_thresholds': {'total': 68}},
+    'nfl': {'active': False, 'season_months': [9, 10, 11, 12, 1, 2]},
+    'global_settings': {'request_timeout': 30},
+}
+
+def escribir(ruta: Path, config: dict, mtime: float):
+    ruta.write_text(json.dumps(config), encoding='utf-8')
+    os.utime(ruta, (mtime, mtime))
+
+class TestSportsConfig:
+    """Tests para SnapshotDeportes y SportsConfiguration"""
+
+    def test_compila_formato_del_archivo(self):
+        """Claves en minúsculas y campos planos se compilan sobre los valores por defecto"""
+        snapshot = compilar_config(CONFIG_ARCHIVO)
+
+        assert set(snapshot.deportes) == {'MLB', 'NBA', 'NFL'}
+        assert snapshot.activos(7) == ('MLB',)
+        assert snapshot.activos(10) == ('MLB', 'NBA')
+        assert snapshot.activos(9) == ('MLB',)
+
+        nba = snapshot.deporte('nba')
+        assert nba.minutos_pregame == 20
+        assert dict(nba.umbrales) == {'spread': 70, 'total': 68, 'moneyline': 65}
+        assert nba.es_consenso_alto({'porcentaje_total': 68})
+        assert not nba.es_consenso_alto({'porcentaje_total': 67, 'porcentaje_spread': 69})
+        mlb = snapshot.deporte('MLB')
+        assert mlb.umbral_alerta == 60.0
+        # El umbral plano es el de alerta; los umbrales por tipo siguen siendo los propios
+        assert dict(mlb.umbrales) == {'spread': 80, 'total': 75, 'moneyline': 70}
+        assert not mlb.es_consenso_alto({'porcentaje_total': 74})
+        assert snapshot.deporte('CRICKET').umbrales['total'] == 75
+
+        with pytest.raises(TypeError):
+            snapshot.deportes['NHL'] = nba
+
+        with pytest.raises(ConfigDeportesInvalida) as error:
+            compilar_config({'mlb': {'season_months': [0, 13], 'consensus_thresholds': {'total': 120}}})
+        assert len(error.value.errores) == 4
+
+    def test_umbral_de_alerta_desde_el_entorno(self, monkeypatch):
+        """MLB_CONSENSUS_THRESHOLD pisa el umbral del archivo; un valor inválido no compila"""
+        monkeypatch.setenv('MLB_CONSENSUS_THRESHOLD', '72')
+        assert compilar_config(CONFIG_ARCHIVO).deporte('MLB').umbral_alerta == 72
+
+        monkeypatch.setenv('MLB_CONSENSUS_THRESHOLD', 'alto')
+        with pytest.raises(ConfigDeportesInvalida):
+            compilar_config(CONFIG_ARCHIVO)
+
+    def test_recarga_atomica(self, tmp_path):
+        """Un cambio válido reemplaza el snapshot; uno inválido deja el anterior"""
+        ruta = tmp_path / 'sports_config.json'
+        escribir(ruta, CONFIG_ARCHIVO, 1_000_000)
+        config = SportsConfiguration(ruta, intervalo_revision=0)
+        anterior = config.snapshot()
+        assert config.get_active_sports(10) == ['MLB', 'NBA']
+
+        escribir(ruta, dict(CONFIG_ARCHIVO, nfl={'active': True, 'season_months': [9]}), 1_000_100)
+        assert config.get_active_sports(9) == ['MLB', 'NFL']
+        # El snapshot anterior no cambió
+        assert anterior.activos(9) == ('MLB',)
+
+        vigente = config.snapshot()
+        escribir(ruta, dict(CONFIG_ARCHIVO, nfl={'active': True, 'season_months': []}), 1_000_200)
+        assert config.snapshot() is vigente
+
+        config.set_consensus_threshold('NFL', 'total', 90)
+        assert config.get_consensus_threshold('nfl', 'total') == 90
+        assert 'nfl' in json.loads(ruta.read_text(encoding='utf-8'))
@@ -0,0 +1,75 @@
+"""
+Tests para las plantillas de mensajes de Telegram
+"""
+
+import pytest
+import sys
+from pathlib import Path
+
+# Agregar el directorio raíz al path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.notifications.templates import (
+    FRAGMENTO_DIGEST_ACTUALIZACIONES, LIMITE_TELEGRAM, PLANTILLA_ALERTA_CONSENSOS, PLANTILLA_DIGEST, PlantillaMensaje,
+    dividir_mensaje, escapar_markdown, lineas_porcentajes
+)
+
+class TestPlantillas:
+    """Tests para PlantillaMensaje y utilidades"""
+
+    def test_render_escapa_valores_pero_no_crudos(self):
+        """Los valores se escapan para Markdown salvo los campos crudos"""
+        plantilla = PlantillaMensaje(encabezado="*{titulo}*\n", item="{indice}. {equipo}\n{extra}",
+                                     crudos=('extra',))
+        texto = plantilla.render({'titulo': 'Top_5'}, [{'equipo': 'D*backs', 'extra': '*ok*\n'}])
+
+        assert texto == "*Top\\_5*\n1. D\\*backs\n*ok*\n"
+        assert escapar_markdown('a_b[c]`') == 'a\\_b\\[c]\\`'
+
+    def test_fragmentos_estaticos_y_formato(self):
+        """Los textos sin campos se cachean y los specs de formato se respetan"""
+        plantilla = PlantillaMensaje(encabezado="Sin {{campos}}\n", pie="{pct:.1f}%")
+        assert plantilla.render({'pct': 72.456}) == "Sin {campos}\n72.5%"
+
+    def test_lineas_porcentajes_respeta_umbrales(self):
+        """Solo se muestran los porcentajes que superan su umbral"""
+        consenso = {'porcentaje_spread': 80, 'porcentaje_total': 70, 'porcentaje_moneyline': 90}
+
+        assert lineas_porcentajes(consenso) == "   🎯 Spread: *80%*\n   💰 ML: *90%*\n"
+        assert lineas_porcentajes(consenso, {'moneyline': 95, 'total': 60}) == (
+            "   🎯 Spread: *80%*\n   🔢 Total: *70%*\n"
+        )
+
+    def test_digest_escapa_equipos_y_urgencia(self):
+        """Los valores del digest no rompen el Markdown de Telegram"""
+        texto = PLANTILLA_DIGEST.render({'cantidad': 1}, [{
+            'visitante': 'St_Louis', 'local': 'D*backs', 'direccion': 'OVER', 'porcentaje': 82,
+            'urgencia': 'ALTA_[x]', 'actualizaciones': FRAGMENTO_DIGEST_ACTUALIZACIONES(76, 3)
+        }])
+
+        assert texto == (
+            "📢 *DIGEST DE ALERTAS* - 1 partidos\n\n"
+            "• St\\_Louis @ D\\*backs - OVER 82% \\[ALTA\\_\\[x]] (antes 76%, 3 actualizaciones)\n"
+        )
+
+    def test_digest_largo_se_divide_sin_truncar(self):
+        """Un digest con muchos partidos se divide en partes sin perder ninguno"""
+        partidos = 300
+        texto = PLANTILLA_ALERTA_CONSENSOS.render(
+            {'emoji': '📊', 'titulo': 'CONSENSOS', 'fecha': 'hoy', 'cantidad': partidos, 'procesados': partidos},
+            ({'visitante': f'Visitante {i}', 'local': f'Local {i}',
+              'lineas': lineas_porcentajes({'porcentaje_spread': 80})} for i in range(partidos))
+        )
+
+        partes = dividir_mensaje(texto)
+
+        assert len(partes) > 1
+        assert all(len(parte) <= LIMITE_TELEGRAM for parte in partes)
+        # Los cortes caen entre bloques de partido
+        assert all(parte.startswith('*') for parte in partes[1:])
+        assert sum(parte.count(' @ ') for parte in partes) == partidos
+
+    def test_linea_sin_cortes_se_divide_igual(self):
+        """Una línea más larga que el límite se corta en duro"""
+        partes = dividir_mensaje('x' * 10000)
+        assert [len(p) for p in partes] == [LIMITE_TELEGRAM, LIMITE_TELEGRAM, 10000 - 2 * LIMITE_TELEGRAM]
@@ -0,0 +1,92 @@
+"""
+Tests para el programador de temporizadores por partido
+"""
+
+import pytest
+import threading
+import time
+from datetime import datetime, timedelta
+import sys
+from pathlib import Path
+
+# Agregar el directorio raíz al path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.scraper.timer_scheduler import TimerScheduler
+
+class PersistenciaMemoria:
+    """Persistencia en memoria con la misma interfaz que DataManager"""
+
+    def __init__(self, pendientes=None):
+        self.registros = {r['clave']: dict(r, estado='pendiente') for r in (pendientes or [])}
+
+    def guardar_temporizador(self, clave, run_at, payload=None):
+        self.registros[clave] = {'clave': clave, 'run_at': run_at, 'payload': payload or {}, 'estado': 'pendiente'}
+
+    def obtener_temporizadores_pendientes(self):
+        return [r for r in self.registros.values() if r['estado'] == 'pendiente']
+
+    def actualizar_estado_temporizador(self, clave, estado):
+        if clave in self.registros:
+            self.registros[clave]['estado'] = estado
+
+class TestTimerScheduler:
+    """Tests para TimerScheduler"""
+
+    @pytest.fixture
+    def disparos(self):
+        return []
+
+    @pytest.fixture
+    def scheduler(self, disparos):
+        evento = threading.Event()
+
+        def callback(clave, payload):
+            disparos.append(clave)
+            evento.set()
+
+        scheduler = TimerScheduler(callback, persistencia=PersistenciaMemoria())
+        scheduler.evento = evento
+        yield scheduler
+        scheduler.stop()
+
+    def test_dispara_en_orden(self, scheduler, disparos):
+        """Los temporizadores se disparan por orden de vencimiento"""
+        ahora = datetime.now()
+        scheduler.programar('tarde', ahora + timedelta(milliseconds=200))
+        scheduler.programar('temprano', ahora + timedelta(milliseconds=50))
+        scheduler.start()
+
+        limite = time.time() + 5
+        while len(disparos) < 2 and time.time() < limite:
+            time.sleep(0.02)
+
+        assert disparos == ['temprano', 'tarde']
+        assert scheduler.persistencia.registros['tarde']['estado'] == 'disparado'
+
+    def test_cancelar(self, scheduler, disparos):
+        """Un temporizador cancelado no se dispara"""
+        scheduler.programar('partido', datetime.now() + timedelta(milliseconds=50))
+        assert scheduler.cancelar('partido') is True
+        scheduler.start()
+
+        assert scheduler.evento.wait(0.3) is False
+        assert disparos == []
+        assert scheduler.persistencia.registros['partido']['estado'] == 'cancelado'
+
+    def test_recupera_persistidos(self, disparos):
+        """Al iniciar se re-arman los temporizadores persistidos y vencidos se expiran"""
+        ahora = datetime.now()
+        persistencia = PersistenciaMemoria([
+            {'clave': 'futuro', 'run_at': (ahora + timedelta(hours=1)).isoformat(), 'payload': {}},
+            {'clave': 'viejo', 'run_at': (ahora - timedelta(days=1)).isoformat(), 'payload': {}}
+        ])
+        scheduler = TimerScheduler(lambda clave, payload: disparos.append(clave), persistencia=persistencia)
+        scheduler.start()
+
+        try:
+            assert scheduler.esta_programado('futuro')
+            assert not scheduler.esta_programado('viejo')
+            assert persistencia.registros['viejo']['estado'] == 'expirado'
+        finally:
+            scheduler.stop()
@@ -0,0 +1,80 @@
+"""
+Tests para las trazas por etapa
+"""
+
+import pytest
+import asyncio
+import json
+import sys
+from pathlib import Path
+
+# Agregar el directorio raíz al path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.utils import tracing
+from src.utils.tracing import ExportadorJSONL, ExportadorOTLP, Tracer
+
+class _Memoria:
+    def __init__(self):
+        self.trazas = []
+
+    def exportar(self, spans):
+        self.trazas.append(spans)
+
+@pytest.fixture
+def exportador(monkeypatch):
+    """Tracer global con un exportador en memoria"""
+    memoria = _Memoria()
+    monkeypatch.setattr(tracing, 'tracer', Tracer([memoria]))
+    return memoria
+
+class TestTracing:
+    """Tests para Tracer, traza y trazado"""
+
+    def test_spans_anidados_y_etapas(self, exportador):
+        """Los hijos comparten trace_id y la traza se exporta al cerrar la raíz"""
+        with tracing.traza('ciclo', pipeline='test') as raiz:
+            with tracing.traza('fetch', tier='requests'):
+                pass
+            with tracing.traza('filtro') as filtro:
+                filtro.atributos['aprobados'] = 3
+            assert exportador.trazas == []
+
+        spans = exportador.trazas[0]
+        assert [s.nombre for s in spans] == ['fetch', 'filtro', 'ciclo']
+        assert {s.trace_id for s in spans} == {raiz.trace_id}
+        assert all(s.parent_id == raiz.span_id for s in spans[:2])
+        assert list(raiz.etapas()) == ['fetch', 'filtro']
+        assert spans[1].atributos == {'aprobados': 3}
+
+    def test_decorador_async_y_errores(self, exportador):
+        """El decorador mide corutinas y marca el span con error"""
+        @tracing.trazado('alertas')
+        async def enviar():
+            raise RuntimeError("sin red")
+
+        with pytest.raises(RuntimeError):
+            asyncio.run(enviar())
+
+        span = exportador.trazas[0][0]
+        assert span.estado == 'error'
+        assert span.error == "RuntimeError: sin red"
+        assert span.parent_id is None
+
+    def test_exportadores_jsonl_y_otlp(self, tmp_path):
+        """JSONL escribe una línea por span; OTLP arma el payload estándar"""
+        tracer = Tracer([ExportadorJSONL(str(tmp_path))])
+        with tracer.span('ciclo'):
+            with tracer.span('parse', filas=50):
+                pass
+
+        lineas = [json.loads(l) for f in tmp_path.glob('traces_*.jsonl') for l in f.read_text().splitlines()]
+        assert [l['nombre'] for l in lineas] == ['parse', 'ciclo']
+        assert lineas[0]['parent_id'] == lineas[1]['span_id']
+
+        span = tracing.Span('parse', 'a' * 32, 'b' * 16, parent_id='c' * 16, inicio=1.0,
+                            duracion=0.5, atributos={'filas': 50})
+        otlp = ExportadorOTLP('http://colector:4318')._span_otlp(span)
+        assert otlp['parentSpanId'] == 'c' * 16
+        assert otlp['endTimeUnixNano'] == str(1_500_000_000)
+        assert otlp['attributes'] == [{'key': 'filas', 'value': {'intValue': '50'}}]